@@ -10,6 +10,7 @@ from datetime import datetime
 import MetaTrader5 as mt5
 
 from utils.logger_factory import get_logger
+from execution.mt5_io import MT5Priority, mt5_call
 
 logger = get_logger("hft_engine", "logs/live/engine/hft_engine.log")
 
@@ -509,7 +510,7 @@ class MicroProfitEngine:
                     time.sleep(0.05)  # 50ms delay to ensure deal is recorded
                     
                     # Get deal history for this position
-                    deals = mt5.history_deals_get(position=ticket)
+                    deals = mt5_call(mt5_connector, mt5.history_deals_get, position=ticket, priority=MT5Priority.MONITORING)
                     if deals and len(deals) > 0:
                         # Sort deals by time to get the most recent
                         deals_sorted = sorted(deals, key=lambda d: d.time, reverse=True)
@@ -60,6 +60,9 @@ class ProfitLockingEngine:
         self._sl_update_locks = {}  # {ticket: threading.Lock()}
         self._sl_locks_lock = threading.Lock()  # Lock for managing ticket locks
         
+        # Shared SLModifyQueue (set by RiskManager.set_profit_locking_engine); None = direct modify
+        self.sl_modify_queue = None
+        
         # Dynamic sweet spot configuration
         dynamic_config = lock_config.get('dynamic_sweet_spot', {})
         self.dynamic_sweet_spot_enabled = dynamic_config.get('enabled', True)
@@ -635,7 +638,15 @@ class ProfitLockingEngine:
                 
                 # Attempt to modify order with broker
                 logger.info(f"🔥 SL UPDATE ATTEMPT (ProfitLockingEngine): Ticket={ticket} Symbol={symbol} OldSL={current_sl:.5f} NewSL={target_sl_price:.5f} TargetLock=${target_lock_profit:.2f}")
-                success = self.order_manager.modify_order(ticket, stop_loss_price=target_sl_price)
+                if self.sl_modify_queue is not None:
+                    # Coalesced with SLManager modifies for the same ticket (last writer wins)
+                    success, target_sl_price = self.sl_modify_queue.submit(
+                        ticket, order_type, target_sl_price,
+                        lambda sl_price: self.order_manager.modify_order(ticket, stop_loss_price=sl_price),
+                        point=point
+                    )
+                else:
+                    success = self.order_manager.modify_order(ticket, stop_loss_price=target_sl_price)
                 if success:
                     logger.info(f"[OK] SL UPDATE SUCCESS (ProfitLockingEngine): Ticket={ticket} Symbol={symbol} NewSL={target_sl_price:.5f}")
                 else:
@@ -8,13 +8,15 @@ import json
 import os
 import random
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Callable, Dict, Any, Optional, List, Tuple
 
 from execution.mt5_connector import MT5Connector
 from execution.order_manager import OrderManager, OrderType
+from execution.position_snapshot import read_open_positions
 from execution.position_monitor import PositionMonitor
-from strategies.trend_filter import TrendFilter
+from strategies.trend_filter import TrendFilter, BATCH_RATES_COUNT
 from risk.risk_manager import RiskManager
 from risk.pair_filter import PairFilter
 from risk.halal_compliance import HalalCompliance
@@ -32,6 +34,9 @@ logger = None
 scheduler_logger = None
 error_logger = None
 
+# _scan_symbol() result: SIM_LIVE asked to defer the whole scan cycle
+_SCAN_DEFERRED = object()
+
 
 def _get_log_paths(is_backtest: bool):
     """Get log paths based on mode."""
@@ -154,7 +159,9 @@ class TradingBot:
         self.risk_manager.bot = self
         
         # Initialize Position Monitor for closure detection
-        self.position_monitor = PositionMonitor(self.config, self.trade_logger)
+        self.position_monitor = PositionMonitor(self.config, self.trade_logger,
+                                                deal_journal=self.order_manager.deal_journal)
+        self.position_monitor.set_closure_callback(self._on_positions_closed)
         self.position_monitor_running = False
         self.position_monitor_thread = None
         
@@ -209,6 +216,15 @@ class TradingBot:
         # Symbol-specific cooldown tracking (for market closed symbols)
         self.symbol_cooldowns = {}  # {symbol: cooldown_until_timestamp}
         self.symbol_cooldown_seconds = trading_config.get('symbol_cooldown_seconds', 300)  # 5 minutes default
+        
+        # Parallel symbol scan: symbols are evaluated on a bounded worker pool (MT5 calls
+        # are additionally capped by the connector's concurrency limit)
+        parallel_scan_config = trading_config.get('parallel_scan', {})
+        self.parallel_scan_enabled = parallel_scan_config.get('enabled', True)
+        self.scan_max_workers = max(1, int(parallel_scan_config.get('max_workers', 4)))
+        self._scan_pool = None
+        self._scan_pool_lock = threading.Lock()
+        self._scan_stats_lock = threading.Lock()
         self.kill_switch_enabled = self.supervisor_config.get('kill_switch_enabled', True)
         
         # State tracking
@@ -587,31 +603,39 @@ class TradingBot:
         # For SL worker health issues, just halt new trades - don't close existing positions
         if close_positions:
             positions = self.order_manager.get_open_positions()
+            tickets = []
             for position in positions:
                 ticket = position.get('ticket') if isinstance(position, dict) else getattr(position, 'ticket', None)
                 if ticket:
                     error_logger.warning(f"Closing position {ticket} due to kill switch")
                     logger.warning(f"Closing position {ticket} due to kill switch")
-                    try:
-                        # Log trade outcome before closing
-                        if hasattr(self, 'trade_reason_logger'):
-                            try:
-                                close_price = position.get('price_current', 0.0)
-                                profit = position.get('profit', 0.0)
-                                self.trade_reason_logger.log_trade_outcome(
-                                    ticket=ticket,
-                                    exit_price=close_price,
-                                    profit_usd=profit,
-                                    close_reason=f"Kill switch activated: {reason}",
-                                    duration_minutes=0.0  # Unknown duration
-                                )
-                            except Exception as outcome_error:
-                                logger.debug(f"Error logging trade outcome for ticket {ticket}: {outcome_error}")
-                        
-                        self.order_manager.close_position(ticket, comment=f"Kill switch activated: {reason}")
-                    except Exception as e:
-                        error_logger.error(f"Failed to close position {ticket}: {e}", exc_info=True)
-                        logger.error(f"Failed to close position {ticket}: {e}", exc_info=True)
+                    tickets.append(ticket)
+                    # Log trade outcome before closing
+                    if hasattr(self, 'trade_reason_logger'):
+                        try:
+                            close_price = position.get('price_current', 0.0)
+                            profit = position.get('profit', 0.0)
+                            self.trade_reason_logger.log_trade_outcome(
+                                ticket=ticket,
+                                exit_price=close_price,
+                                profit_usd=profit,
+                                close_reason=f"Kill switch activated: {reason}",
+                                duration_minutes=0.0  # Unknown duration
+                            )
+                        except Exception as outcome_error:
+                            logger.debug(f"Error logging trade outcome for ticket {ticket}: {outcome_error}")
+            
+            # Close all positions concurrently (per-ticket retries, completion summary logged)
+            if tickets:
+                try:
+                    report = self.order_manager.close_positions(tickets, comment=f"Kill switch activated: {reason}",
+                                                                reason="Kill switch")
+                    if not report.all_closed:
+                        error_logger.error(f"Kill switch could not close positions {report.failed_tickets}: "
+                                           f"{report.format()}")
+                except Exception as e:
+                    error_logger.error(f"Failed to close positions {tickets}: {e}", exc_info=True)
+                    logger.error(f"Failed to close positions {tickets}: {e}", exc_info=True)
         else:
             logger.info(f"Kill switch activated - halting new trades only (not closing existing positions)")
     
@@ -847,6 +871,26 @@ class TradingBot:
             
             logger.debug(f"📊 Updated realized P/L: +${profit:.2f} | Today: ${self.realized_pnl_today:.2f} | Total: ${self.realized_pnl:.2f}")
     
+    def _on_positions_closed(self, closures: List[Dict[str, Any]]):
+        """
+        Account a batch of closures logged by PositionMonitor.
+        
+        Circuit breaker state is updated under one lock acquisition; tickets
+        RiskManager's own closure detection already recorded are skipped, so
+        each closure updates realized P/L once.
+        
+        Args:
+            closures: Closure dicts from PositionMonitor.detect_and_log_closures()
+        """
+        recorded = set(self.risk_manager.record_closed_trades(
+            [(closure['ticket'], closure['profit']) for closure in closures]))
+        for closure in closures:
+            if closure['ticket'] in recorded:
+                self._update_realized_pnl_on_closure(closure['profit'], closure['close_time'])
+        if len(closures) > 1:
+            logger.info(f"[CLOSURE_BATCH] {len(closures)} closures logged | {len(recorded)} newly recorded | "
+                        f"Total P/L: ${sum(closure['profit'] for closure in closures):.2f}")
+    
     def _update_state(self, state: str, symbol: str = 'N/A', action: str = 'N/A'):
         """Update bot state for lightweight logger (thread-safe)."""
         with self._state_lock:
@@ -1080,10 +1124,6 @@ class TradingBot:
             logger.info(f"[CIRCUIT_BREAKER] Trading paused: {pause_reason}")
             return []  # Return empty list, no opportunities
         
-        # Import SIM_LIVE diagnostic logging functions if in SIM_LIVE mode
-        if self.is_sim_live:
-            from sim_live.sim_live_logger import log_entry_rejected, log_entry_evaluation_start
-        
         try:
             # Update state
             self._update_state('SCANNING', 'N/A', 'Scanning for opportunities')
@@ -1095,788 +1135,977 @@ class TradingBot:
             if not symbols:
                 logger.warning("[WARNING] No tradeable symbols found! Check symbol filters.")
             
+            batch_trend_signals = {}
+            prefilter_results = None
+            scan_symbols = symbols
+            results = []
+            if symbols and not self.is_sim_live:
+                # Cheap filters first, so rates are only read for symbols still in play
+                prefilter_results = {}
+                scan_symbols = []
+                for symbol, filter_results, error in self._map_on_scan_pool(self._prefilter_symbol, symbols):
+                    if error is not None:
+                        results.append((symbol, None, error))
+                    elif filter_results is not None:
+                        prefilter_results[symbol] = filter_results
+                        scan_symbols.append(symbol)
+                # Trend signals for the remaining symbols in one vectorized pass
+                # (symbols missing from the batch fall back to get_trend_signal() below)
+                batch_trend_signals = self._get_batch_trend_signals(scan_symbols)
+            
+            results.extend(self._run_symbol_scans(scan_symbols, batch_trend_signals, prefilter_results))
+            for symbol, result, error in results:
+                if error is not None:
+                    logger.error(f"[ERROR] Error scanning {symbol}: {error}", exc_info=error)
+                    self.handle_error(error, f"Scanning {symbol}")
+                    continue
+                if result is _SCAN_DEFERRED:
+                    return []  # SIM_LIVE: defer opportunities until the market is frozen
+                if result is not None:
+                    opportunities.append(result)
+        
+        except Exception as e:
+            logger.error(f"[ERROR] Error in scan_for_opportunities: {e}", exc_info=True)
+            self.handle_error(e, "Scanning for opportunities")
+        
+        logger.info(f"🎯 Found {len(opportunities)} trading opportunity(ies)")
+        
+        # Update state back to IDLE if no opportunities
+        if not opportunities:
+            self._update_state('IDLE', 'N/A', 'Scan completed - no opportunities')
+        
+        # Log scan completion with summary
+        total_scanned = len(symbols) if 'symbols' in locals() else 0
+        total_opportunities = len(opportunities)
+        logger.info(f"🔍 Scan completed: {total_scanned} symbols scanned, {total_opportunities} opportunity(ies) found")
+        
+        return opportunities
+    
+    def _get_scan_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Thread pool for parallel symbol scans (None when scans run sequentially)."""
+        if not self.parallel_scan_enabled or self.scan_max_workers <= 1 or self.is_sim_live or self.is_backtest:
+            return None
+        with self._scan_pool_lock:
+            if self._scan_pool is None:
+                self._scan_pool = ThreadPoolExecutor(max_workers=self.scan_max_workers,
+                                                     thread_name_prefix="SymbolScan")
+            return self._scan_pool
+    
+    def _shutdown_scan_pool(self):
+        """Stop the symbol scan pool (idle workers exit, running scans finish)."""
+        with self._scan_pool_lock:
+            pool, self._scan_pool = self._scan_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+    
+    def _count_filtered_opportunity(self):
+        """Increment the filtered-opportunity counter (scan workers run concurrently)."""
+        with self._scan_stats_lock:
+            self.trade_stats['filtered_opportunities'] += 1
+    
+    def _map_on_scan_pool(self, fn: Callable[[str], Any], symbols: List[str]) -> List[Tuple[str, Any, Optional[Exception]]]:
+        """
+        Call fn(symbol) for every symbol, in parallel when a scan pool is configured.
+        
+        Returns:
+            [(symbol, result, error)] in the order of `symbols`
+        """
+        pool = self._get_scan_pool() if len(symbols) > 1 else None
+        futures = []
+        for symbol in symbols:
+            future = None
+            if pool is not None:
+                try:
+                    future = pool.submit(fn, symbol)
+                except RuntimeError:
+                    pass  # Pool shut down concurrently (bot stopping) - evaluate inline
+            futures.append((symbol, future))
+        results = []
+        for symbol, future in futures:
+            try:
+                results.append((symbol, future.result() if future is not None else fn(symbol), None))
+            except Exception as e:
+                results.append((symbol, None, e))
+        return results
+    
+    def _get_batch_trend_signals(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Batched trend signals of symbols, with their rates read on the scan pool.
+        
+        Returns:
+            {symbol: signal} (empty if the batch failed; callers fall back per symbol)
+        """
+        if not symbols:
+            return {}
+        frames = {}
+        for symbol, df, error in self._map_on_scan_pool(
+                lambda symbol: self.trend_filter.get_rates(symbol, count=BATCH_RATES_COUNT), symbols):
+            if error is not None:
+                logger.debug(f"{symbol}: Batch trend rates failed: {error}")
+            elif df is not None:
+                frames[symbol] = df
+        try:
+            batch_trend_signals = self.trend_filter.get_trend_signals_batch(symbols, frames=frames)
+        except Exception as e:
+            logger.debug(f"[TREND_BATCH] Batch trend evaluation failed, using per-symbol signals: {e}")
+            return {}
+        return batch_trend_signals if isinstance(batch_trend_signals, dict) else {}
+    
+    def _run_symbol_scans(self, symbols: List[str], batch_trend_signals: Dict[str, Dict[str, Any]],
+                          prefilter_results: Optional[Dict[str, Dict[str, Any]]] = None
+                          ) -> List[Tuple[str, Any, Optional[Exception]]]:
+        """
+        Evaluate every symbol, in parallel when a scan pool is configured.
+        
+        Results are returned in the order of `symbols` (PairFilter priority), so
+        the merged opportunity list does not depend on worker timing.
+        
+        Args:
+            symbols: Symbols to evaluate
+            batch_trend_signals: Precomputed trend signals ({symbol: signal}), may be empty
+            prefilter_results: _prefilter_symbol() results of symbols whose cheap filters already ran
+        
+        Returns:
+            [(symbol, result, error)] where result is the _scan_symbol() return value
+        """
+        def scan(symbol: str):
+            if prefilter_results is not None and symbol in prefilter_results:
+                return self._scan_symbol(symbol, batch_trend_signals, prefilter_results[symbol])
+            return self._scan_symbol(symbol, batch_trend_signals)
+        
+        pool = self._get_scan_pool() if len(symbols) > 1 else None
+        if pool is None:
+            results = []
             for symbol in symbols:
                 try:
-                    # Update current symbol being scanned
-                    self._update_state('SCANNING', symbol, f'Scanning {symbol}')
-                    logger.debug(f"📊 Analyzing {symbol}...")
-                    
-                    # 0. Check if symbol was previously restricted (prevent duplicate attempts)
-                    if hasattr(self, '_restricted_symbols') and symbol.upper() in self._restricted_symbols:
-                        logger.debug(f"[SKIP] [SKIP] {symbol} | Reason: Previously restricted - skipping to avoid duplicate attempts")
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # 0b. Check symbol cooldown (if market was closed recently)
-                    symbol_upper = symbol.upper()
-                    if symbol_upper in self.symbol_cooldowns:
-                        cooldown_until = self.symbol_cooldowns[symbol_upper]
-                        if time.time() < cooldown_until:
-                            remaining = int(cooldown_until - time.time())
-                            logger.debug(f"[SKIP] [SKIP] {symbol} | Reason: Symbol in cooldown ({remaining}s remaining) - market was recently closed")
-                            self.trade_stats['filtered_opportunities'] += 1
-                            continue
-                        else:
-                            # Cooldown expired, remove from cooldown dict
-                            del self.symbol_cooldowns[symbol_upper]
-                    
-                    # 0a. Check if symbol is tradeable/executable RIGHT NOW (market is open, trade mode enabled)
-                    # This prevents non-executable symbols from appearing in opportunity lists
-                    is_tradeable, reason = self.mt5_connector.is_symbol_tradeable_now(symbol)
-                    if not is_tradeable:
-                        # Market closed for this symbol - add to cooldown
-                        cooldown_until = time.time() + self.symbol_cooldown_seconds
-                        self.symbol_cooldowns[symbol_upper] = cooldown_until
-                        logger.debug(f"[SKIP] [SKIP] {symbol} | Reason: NOT EXECUTABLE - {reason} | Added to cooldown for {self.symbol_cooldown_seconds}s")
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue  # Skip this symbol - not tradeable right now
-                    else:
-                        logger.debug(f"[OK] {symbol}: Symbol is tradeable and executable")
-                    
-                    # P3-18 FIX: Decision Context Logging - Log all filter results
-                    filter_results = {}  # Track all filter decisions
-                    
-                    # 0b. Check if market is closing soon (30 minutes filter)
-                    should_skip_close, close_reason = self.market_closing_filter.should_skip(symbol)
-                    filter_results['market_closing'] = {'passed': not should_skip_close, 'reason': close_reason}
-                    if should_skip_close:
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: {close_reason}")
-                        # P3-18 FIX: Log decision context
-                        logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: market_closing | Result: REJECTED | Reason: {close_reason}")
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
+                    result = scan(symbol)
+                except Exception as e:
+                    results.append((symbol, None, e))
+                    continue
+                results.append((symbol, result, None))
+                if result is _SCAN_DEFERRED:
+                    break  # Remaining symbols are not evaluated this cycle
+            return results
+        
+        start = time.time()
+        results = self._map_on_scan_pool(scan, symbols)
+        logger.debug(f"[SCAN_POOL] {len(symbols)} symbols scanned in {(time.time() - start) * 1000:.0f}ms "
+                     f"({self.scan_max_workers} workers)")
+        return results
+    
+    def _prefilter_symbol(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Run the cheap per-symbol filters of scan_for_opportunities() (no rates read).
+        
+        Covers restriction, cooldown, tradeability, market closing, volume and news.
+        Safe to run on scan worker threads.
+        
+        Returns:
+            Filter decisions ({filter: result}) if the symbol passed, None if it was filtered
+        """
+        # Update current symbol being scanned
+        self._update_state('SCANNING', symbol, f'Scanning {symbol}')
+        logger.debug(f"📊 Analyzing {symbol}...")
+        
+        # 0. Check if symbol was previously restricted (prevent duplicate attempts)
+        if hasattr(self, '_restricted_symbols') and symbol.upper() in self._restricted_symbols:
+            logger.debug(f"[SKIP] [SKIP] {symbol} | Reason: Previously restricted - skipping to avoid duplicate attempts")
+            self._count_filtered_opportunity()
+            return None
+        
+        # 0b. Check symbol cooldown (if market was closed recently)
+        symbol_upper = symbol.upper()
+        if symbol_upper in self.symbol_cooldowns:
+            cooldown_until = self.symbol_cooldowns[symbol_upper]
+            if time.time() < cooldown_until:
+                remaining = int(cooldown_until - time.time())
+                logger.debug(f"[SKIP] [SKIP] {symbol} | Reason: Symbol in cooldown ({remaining}s remaining) - market was recently closed")
+                self._count_filtered_opportunity()
+                return None
+            else:
+                # Cooldown expired, remove from cooldown dict
+                del self.symbol_cooldowns[symbol_upper]
+        
+        # 0a. Check if symbol is tradeable/executable RIGHT NOW (market is open, trade mode enabled)
+        # This prevents non-executable symbols from appearing in opportunity lists
+        is_tradeable, reason = self.mt5_connector.is_symbol_tradeable_now(symbol)
+        if not is_tradeable:
+            # Market closed for this symbol - add to cooldown
+            cooldown_until = time.time() + self.symbol_cooldown_seconds
+            self.symbol_cooldowns[symbol_upper] = cooldown_until
+            logger.debug(f"[SKIP] [SKIP] {symbol} | Reason: NOT EXECUTABLE - {reason} | Added to cooldown for {self.symbol_cooldown_seconds}s")
+            self._count_filtered_opportunity()
+            return None  # Skip this symbol - not tradeable right now
+        else:
+            logger.debug(f"[OK] {symbol}: Symbol is tradeable and executable")
+        
+        # P3-18 FIX: Decision Context Logging - Log all filter results
+        filter_results = {}  # Track all filter decisions
+        
+        # 0b. Check if market is closing soon (30 minutes filter)
+        should_skip_close, close_reason = self.market_closing_filter.should_skip(symbol)
+        filter_results['market_closing'] = {'passed': not should_skip_close, 'reason': close_reason}
+        if should_skip_close:
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: {close_reason}")
+            # P3-18 FIX: Log decision context
+            logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: market_closing | Result: REJECTED | Reason: {close_reason}")
+            self._count_filtered_opportunity()
+            return None
+        else:
+            logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: market_closing | Result: PASSED")
+        
+        # 0c. Check if volume/liquidity is sufficient
+        should_skip_volume, volume_reason, volume_value = self.volume_filter.should_skip(symbol)
+        filter_results['volume'] = {'passed': not should_skip_volume, 'reason': volume_reason, 'value': volume_value}
+        if should_skip_volume:
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: {volume_reason}")
+            # P3-18 FIX: Log decision context
+            logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: volume | Result: REJECTED | Reason: {volume_reason} | Value: {volume_value}")
+            self._count_filtered_opportunity()
+            return None
+        else:
+            logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: volume | Result: PASSED | Value: {volume_value}")
+        
+        # 1. Check if news is blocking (but allow trading if API fails)
+        news_blocking = self.news_filter.is_news_blocking(symbol)
+        filter_results['news'] = {'passed': not news_blocking, 'blocking': news_blocking}
+        if news_blocking:
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: NEWS BLOCKING (high-impact news within 10 min window)")
+            # P3-18 FIX: Log decision context
+            logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: news | Result: REJECTED | Reason: High-impact news blocking")
+            self._count_filtered_opportunity()
+            return None
+        else:
+            logger.debug(f"[OK] {symbol}: No news blocking")
+            logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: news | Result: PASSED")
+        
+        return filter_results
+    
+    def _pop_pending_signal(self, symbol: str, pending_signal: Dict[str, Any]) -> bool:
+        """
+        Remove a symbol's pending signal if it is still the one that was read.
+        
+        Returns:
+            True if removed, False if it was replaced or removed in the meantime
+        """
+        with self._pending_signals_lock:
+            if self._pending_signals.get(symbol) is not pending_signal:
+                return False
+            del self._pending_signals[symbol]
+            return True
+    
+    def _scan_symbol(self, symbol: str, batch_trend_signals: Dict[str, Dict[str, Any]],
+                     filter_results: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Run the per-symbol filter pipeline of scan_for_opportunities().
+        
+        Safe to run on scan worker threads: shared state is touched only under
+        locks (pending signals, bot state, filter counters).
+        
+        Args:
+            symbol: Symbol to evaluate
+            batch_trend_signals: Precomputed trend signals ({symbol: signal}), may be empty
+            filter_results: _prefilter_symbol() result if the cheap filters already ran
+        
+        Returns:
+            Opportunity dict, None if the symbol was filtered, or _SCAN_DEFERRED
+            if SIM_LIVE asked to defer the whole scan
+        """
+        if filter_results is None:
+            filter_results = self._prefilter_symbol(symbol)
+            if filter_results is None:
+                return None
+        
+        if self.is_sim_live:
+            from sim_live.sim_live_logger import log_entry_rejected, log_entry_evaluation_start
+        
+        scan_result = None
+        
+        # 2a. ONE-CANDLE CONFIRMATION: Check for pending signal first
+        # This check happens BEFORE filters to confirm direction consistency only
+        # The lock only guards the dict: trend/rates reads run outside it so one pending
+        # symbol does not serialize the whole scan pool behind its broker calls
+        with self._pending_signals_lock:
+            pending_signal = self._pending_signals.get(symbol)
+        
+        if pending_signal is not None:
+            # We have a pending signal - check if direction is still valid (one candle has closed)
+            # Get current trend signal to check direction consistency
+            current_trend_signal = batch_trend_signals.get(symbol) or self.trend_filter.get_trend_signal(symbol)
+            current_direction = current_trend_signal.get('signal', 'NONE')
+            
+            # Get current candle time to compare
+            df_current = self.trend_filter.get_rates(symbol, count=1)
+            if df_current is not None and len(df_current) > 0:
+                current_candle_time = int(df_current.iloc[0]['time'])
+                pending_candle_time = pending_signal['candle_time']
+                
+                # Check if a new candle has closed (current candle time is different from pending)
+                if current_candle_time != pending_candle_time:
+                    # New candle has closed - check direction consistency only
+                    if current_direction == pending_signal['direction']:
+                        if not self._pop_pending_signal(symbol, pending_signal):
+                            return None  # Replaced or consumed while we read the broker
+                        # Direction held - confirm entry using stored opportunity data
+                        logger.info(f"[ENTRY CONFIRMED] {symbol}: direction {current_direction} held for 1 candle")
+                        return pending_signal['opportunity_data']  # Skip rest of processing for this symbol (use stored data)
                     else:
-                        logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: market_closing | Result: PASSED")
+                        # Direction changed - discard pending signal
+                        logger.info(f"[ENTRY CONFIRMATION FAILED] {symbol}: direction changed from {pending_signal['direction']} to {current_direction}")
+                        self._pop_pending_signal(symbol, pending_signal)
+                        self._count_filtered_opportunity()
+                        return None  # Skip this symbol
+                else:
+                    # Same candle still - wait for next candle
+                    logger.debug(f"[ENTRY PENDING] {symbol}: waiting for candle close (current: {current_candle_time}, pending: {pending_candle_time})")
+                    self._count_filtered_opportunity()
+                    return None  # Skip this symbol, wait for next candle
+            else:
+                # Can't get current candle - discard pending signal
+                logger.debug(f"[ENTRY CONFIRMATION FAILED] {symbol}: cannot get current candle time")
+                self._pop_pending_signal(symbol, pending_signal)
+                self._count_filtered_opportunity()
+                return None
+        
+        # 2. Get SIMPLE trend signal (SMA20 vs SMA50 only)
+        
+        # 🔒 SIM_LIVE: Assert trend contract before strategy evaluation
+        # CRITICAL: Validate using EXACT candles that get_trend_signal() will use
+        if self.is_sim_live:
+            try:
+                import pandas as pd
+                from sim_live.sim_live_connector import SimLiveMT5Connector
+                if isinstance(self.mt5_connector, SimLiveMT5Connector):
+                    market_engine = self.mt5_connector.market_engine
+                    symbol_upper = symbol.upper()
                     
-                    # 0c. Check if volume/liquidity is sufficient
-                    should_skip_volume, volume_reason, volume_value = self.volume_filter.should_skip(symbol)
-                    filter_results['volume'] = {'passed': not should_skip_volume, 'reason': volume_reason, 'value': volume_value}
-                    if should_skip_volume:
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: {volume_reason}")
-                        # P3-18 FIX: Log decision context
-                        logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: volume | Result: REJECTED | Reason: {volume_reason} | Value: {volume_value}")
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    else:
-                        logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: volume | Result: PASSED | Value: {volume_value}")
+                    # 🔒 PHASE 5 DEFERRAL: Strategy evaluation must wait until market is frozen
+                    # This is NON-FATAL - defer evaluation until entry generation completes
+                    is_frozen = market_engine._market_frozen.get(symbol_upper, False)
+                    if not is_frozen:
+                        # Market not frozen yet - entry generation still in progress
+                        # Defer strategy evaluation, allow scenario loop to continue
+                        from sim_live.sim_live_logger import get_sim_live_logger
+                        logger_sim = get_sim_live_logger()
+                        logger_sim.info(f"[SIM_LIVE] [PHASE_5] Evaluation deferred — market not frozen for {symbol} (entry generation in progress)")
+                        # Return early - do not evaluate strategy yet
+                        return _SCAN_DEFERRED  # Defer opportunities for this cycle
                     
-                    # 1. Check if news is blocking (but allow trading if API fails)
-                    news_blocking = self.news_filter.is_news_blocking(symbol)
-                    filter_results['news'] = {'passed': not news_blocking, 'blocking': news_blocking}
-                    if news_blocking:
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: NEWS BLOCKING (high-impact news within 10 min window)")
-                        # P3-18 FIX: Log decision context
-                        logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: news | Result: REJECTED | Reason: High-impact news blocking")
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    else:
-                        logger.debug(f"[OK] {symbol}: No news blocking")
-                        logger.debug(f"[DECISION_CONTEXT] {symbol} | Filter: news | Result: PASSED")
+                    # Market is frozen - proceed with evaluation
+                    from sim_live.sim_live_logger import get_sim_live_logger
+                    logger_sim = get_sim_live_logger()
+                    logger_sim.info(f"[SIM_LIVE] [PHASE_5] Market frozen for {symbol} — proceeding with strategy evaluation")
+                    logger_sim.info(f"[SIM_LIVE] [EVAL_START] Starting strategy evaluation for {symbol}")
                     
-                    # 2a. ONE-CANDLE CONFIRMATION: Check for pending signal first
-                    # This check happens BEFORE filters to confirm direction consistency only
-                    with self._pending_signals_lock:
-                        pending_signal = self._pending_signals.get(symbol)
-                        
-                        if pending_signal is not None:
-                            # We have a pending signal - check if direction is still valid (one candle has closed)
-                            # Get current trend signal to check direction consistency
-                            current_trend_signal = self.trend_filter.get_trend_signal(symbol)
-                            current_direction = current_trend_signal.get('signal', 'NONE')
+                    # Get EXACT candles that TrendFilter will use (via get_rates -> copy_rates_from_pos)
+                    # TrendFilter requests 100 candles, but may get fewer
+                    rates_df = self.trend_filter.get_rates(symbol, count=100)
+                    if rates_df is not None and len(rates_df) >= 50:
+                        # Convert DataFrame back to candle list format for validation
+                        candles_for_validation = []
+                        for idx in range(len(rates_df)):
+                            row = rates_df.iloc[idx]
+                            # Handle pandas Timestamp or int
+                            time_val = row['time']
+                            try:
+                                import pandas as pd
+                                if isinstance(time_val, pd.Timestamp):
+                                    time_val = int(time_val.timestamp())
+                                elif hasattr(time_val, 'timestamp'):
+                                    time_val = int(time_val.timestamp())
+                                elif isinstance(time_val, (float, int)):
+                                    time_val = int(time_val)
+                                else:
+                                    # Try direct conversion as last resort
+                                    time_val = int(float(time_val))
+                            except Exception as e:
+                                # If conversion fails, try to extract as int from string representation
+                                try:
+                                    import pandas as pd
+                                    if pd.isna(time_val):
+                                        time_val = 0
+                                    else:
+                                        time_val = int(str(time_val).split('.')[0]) if '.' in str(time_val) else int(time_val)
+                                except:
+                                    # Last resort: use 0 and log error
+                                    try:
+                                        from sim_live.sim_live_logger import get_sim_live_logger
+                                        logger_sim = get_sim_live_logger()
+                                        logger_sim.warning(f"[SIM_LIVE] [PHASE_5] Failed to convert time value {time_val} (type: {type(time_val)}) to int, using 0")
+                                    except:
+                                        pass
+                                    time_val = 0
                             
-                            # Get current candle time to compare
-                            df_current = self.trend_filter.get_rates(symbol, count=1)
-                            if df_current is not None and len(df_current) > 0:
-                                current_candle_time = int(df_current.iloc[0]['time'])
-                                pending_candle_time = pending_signal['candle_time']
-                                
-                                # Check if a new candle has closed (current candle time is different from pending)
-                                if current_candle_time != pending_candle_time:
-                                    # New candle has closed - check direction consistency only
-                                    if current_direction == pending_signal['direction']:
-                                        # Direction held - confirm entry using stored opportunity data
-                                        logger.info(f"[ENTRY CONFIRMED] {symbol}: direction {current_direction} held for 1 candle")
-                                        stored_opportunity = pending_signal['opportunity_data']
-                                        opportunities.append(stored_opportunity)
-                                        del self._pending_signals[symbol]
-                                        continue  # Skip rest of processing for this symbol (use stored data)
+                            # Helper to safely convert to int, handling NaN
+                            def safe_int(val, default=0):
+                                try:
+                                    import pandas as pd
+                                    if pd.isna(val):
+                                        return default
+                                    return int(val)
+                                except:
+                                    try:
+                                        return int(val) if val is not None else default
+                                    except:
+                                        return default
+                            
+                            candles_for_validation.append({
+                                'time': time_val,
+                                'open': float(row['open']),
+                                'high': float(row['high']),
+                                'low': float(row['low']),
+                                'close': float(row['close']),
+                                'tick_volume': safe_int(row.get('tick_volume', 0), 0),
+                                'spread': safe_int(row.get('spread', 0), 0),
+                                'real_volume': safe_int(row.get('real_volume', 0), 0)
+                            })
+                        
+                        # 🔒 CRITICAL: get_rates() returns newest-first, but _validate_trend_contract expects oldest-first
+                        # Reverse to match validation function expectations
+                        candles_for_validation = list(reversed(candles_for_validation))
+                        
+                        # Get trend direction from scenario
+                        scenario = getattr(market_engine, '_scenario', {})
+                        trend_direction = scenario.get('trend_direction', 'BUY')
+                        
+                        # 🔒 PHASE 5 ASSERTION 1: Data identity check
+                        # CRITICAL FIX: Compare same candles - both should use newest-first order
+                        # candles_for_validation is oldest-first, so we need the last 50 (newest) AND reverse them to match TrendFilter order
+                        import hashlib
+                        # Get last 50 candles from validation (newest candles, since list is oldest-first)
+                        validation_newest_50 = candles_for_validation[-50:] if len(candles_for_validation) >= 50 else candles_for_validation
+                        # Reverse to newest-first to match TrendFilter order (TrendFilter returns newest-first)
+                        validation_newest_50_reversed = list(reversed(validation_newest_50))
+                        validation_hash = hashlib.md5(str([(c['time'], c['close']) for c in validation_newest_50_reversed]).encode()).hexdigest()
+                        
+                        # Get candles TrendFilter will actually use (via its get_rates method)
+                        # TrendFilter.get_rates() returns newest-first, so first 50 are newest
+                        rates_for_trendfilter = self.trend_filter.get_rates(symbol, count=100)
+                        if rates_for_trendfilter is not None and len(rates_for_trendfilter) >= 50:
+                            trendfilter_candles = []
+                            # Get first 50 rows (newest candles, since DataFrame is newest-first)
+                            for idx in range(min(50, len(rates_for_trendfilter))):
+                                row = rates_for_trendfilter.iloc[idx]
+                                # Fix Timestamp conversion - same logic as candles_for_validation
+                                tf_time_val = row['time']
+                                try:
+                                    import pandas as pd
+                                    if isinstance(tf_time_val, pd.Timestamp):
+                                        tf_time_val = int(tf_time_val.timestamp())
+                                    elif hasattr(tf_time_val, 'timestamp'):
+                                        tf_time_val = int(tf_time_val.timestamp())
+                                    elif isinstance(tf_time_val, (float, int)):
+                                        tf_time_val = int(tf_time_val)
                                     else:
-                                        # Direction changed - discard pending signal
-                                        logger.info(f"[ENTRY CONFIRMATION FAILED] {symbol}: direction changed from {pending_signal['direction']} to {current_direction}")
-                                        del self._pending_signals[symbol]
-                                        self.trade_stats['filtered_opportunities'] += 1
-                                        continue  # Skip this symbol
-                                else:
-                                    # Same candle still - wait for next candle
-                                    logger.debug(f"[ENTRY PENDING] {symbol}: waiting for candle close (current: {current_candle_time}, pending: {pending_candle_time})")
-                                    self.trade_stats['filtered_opportunities'] += 1
-                                    continue  # Skip this symbol, wait for next candle
-                            else:
-                                # Can't get current candle - discard pending signal
-                                logger.debug(f"[ENTRY CONFIRMATION FAILED] {symbol}: cannot get current candle time")
-                                del self._pending_signals[symbol]
-                                self.trade_stats['filtered_opportunities'] += 1
-                                continue
-                    
-                    # 2. Get SIMPLE trend signal (SMA20 vs SMA50 only)
-                    
-                    # 🔒 SIM_LIVE: Assert trend contract before strategy evaluation
-                    # CRITICAL: Validate using EXACT candles that get_trend_signal() will use
-                    if self.is_sim_live:
-                        try:
-                            import pandas as pd
-                            from sim_live.sim_live_connector import SimLiveMT5Connector
-                            if isinstance(self.mt5_connector, SimLiveMT5Connector):
-                                market_engine = self.mt5_connector.market_engine
-                                symbol_upper = symbol.upper()
-                                
-                                # 🔒 PHASE 5 DEFERRAL: Strategy evaluation must wait until market is frozen
-                                # This is NON-FATAL - defer evaluation until entry generation completes
-                                is_frozen = market_engine._market_frozen.get(symbol_upper, False)
-                                if not is_frozen:
-                                    # Market not frozen yet - entry generation still in progress
-                                    # Defer strategy evaluation, allow scenario loop to continue
+                                        tf_time_val = int(float(tf_time_val))
+                                except Exception as e:
+                                    try:
+                                        import pandas as pd
+                                        if pd.isna(tf_time_val):
+                                            tf_time_val = 0
+                                        else:
+                                            tf_time_val = int(str(tf_time_val).split('.')[0]) if '.' in str(tf_time_val) else int(tf_time_val)
+                                    except:
+                                        tf_time_val = 0
+                                trendfilter_candles.append((tf_time_val, float(row['close'])))
+                            trendfilter_hash = hashlib.md5(str(trendfilter_candles).encode()).hexdigest()
+                            
+                            if validation_hash != trendfilter_hash:
+                                # Market is frozen, but data desync detected - this is a HARD FAILURE
+                                # Log both sets of candles for debugging
+                                try:
                                     from sim_live.sim_live_logger import get_sim_live_logger
                                     logger_sim = get_sim_live_logger()
-                                    logger_sim.info(f"[SIM_LIVE] [PHASE_5] Evaluation deferred — market not frozen for {symbol} (entry generation in progress)")
-                                    # Return early - do not evaluate strategy yet
-                                    return []  # Return empty list to defer opportunities
-                                
-                                # Market is frozen - proceed with evaluation
-                                from sim_live.sim_live_logger import get_sim_live_logger
-                                logger_sim = get_sim_live_logger()
-                                logger_sim.info(f"[SIM_LIVE] [PHASE_5] Market frozen for {symbol} — proceeding with strategy evaluation")
-                                logger_sim.info(f"[SIM_LIVE] [EVAL_START] Starting strategy evaluation for {symbol}")
-                                
-                                # Get EXACT candles that TrendFilter will use (via get_rates -> copy_rates_from_pos)
-                                # TrendFilter requests 100 candles, but may get fewer
-                                rates_df = self.trend_filter.get_rates(symbol, count=100)
-                                if rates_df is not None and len(rates_df) >= 50:
-                                    # Convert DataFrame back to candle list format for validation
-                                    candles_for_validation = []
-                                    for idx in range(len(rates_df)):
-                                        row = rates_df.iloc[idx]
-                                        # Handle pandas Timestamp or int
-                                        time_val = row['time']
-                                        try:
-                                            import pandas as pd
-                                            if isinstance(time_val, pd.Timestamp):
-                                                time_val = int(time_val.timestamp())
-                                            elif hasattr(time_val, 'timestamp'):
-                                                time_val = int(time_val.timestamp())
-                                            elif isinstance(time_val, (float, int)):
-                                                time_val = int(time_val)
-                                            else:
-                                                # Try direct conversion as last resort
-                                                time_val = int(float(time_val))
-                                        except Exception as e:
-                                            # If conversion fails, try to extract as int from string representation
-                                            try:
-                                                import pandas as pd
-                                                if pd.isna(time_val):
-                                                    time_val = 0
-                                                else:
-                                                    time_val = int(str(time_val).split('.')[0]) if '.' in str(time_val) else int(time_val)
-                                            except:
-                                                # Last resort: use 0 and log error
-                                                try:
-                                                    from sim_live.sim_live_logger import get_sim_live_logger
-                                                    logger_sim = get_sim_live_logger()
-                                                    logger_sim.warning(f"[SIM_LIVE] [PHASE_5] Failed to convert time value {time_val} (type: {type(time_val)}) to int, using 0")
-                                                except:
-                                                    pass
-                                                time_val = 0
-                                        
-                                        # Helper to safely convert to int, handling NaN
-                                        def safe_int(val, default=0):
-                                            try:
-                                                import pandas as pd
-                                                if pd.isna(val):
-                                                    return default
-                                                return int(val)
-                                            except:
-                                                try:
-                                                    return int(val) if val is not None else default
-                                                except:
-                                                    return default
-                                        
-                                        candles_for_validation.append({
-                                            'time': time_val,
-                                            'open': float(row['open']),
-                                            'high': float(row['high']),
-                                            'low': float(row['low']),
-                                            'close': float(row['close']),
-                                            'tick_volume': safe_int(row.get('tick_volume', 0), 0),
-                                            'spread': safe_int(row.get('spread', 0), 0),
-                                            'real_volume': safe_int(row.get('real_volume', 0), 0)
-                                        })
-                                    
-                                    # 🔒 CRITICAL: get_rates() returns newest-first, but _validate_trend_contract expects oldest-first
-                                    # Reverse to match validation function expectations
-                                    candles_for_validation = list(reversed(candles_for_validation))
-                                    
-                                    # Get trend direction from scenario
-                                    scenario = getattr(market_engine, '_scenario', {})
-                                    trend_direction = scenario.get('trend_direction', 'BUY')
-                                    
-                                    # 🔒 PHASE 5 ASSERTION 1: Data identity check
-                                    # CRITICAL FIX: Compare same candles - both should use newest-first order
-                                    # candles_for_validation is oldest-first, so we need the last 50 (newest) AND reverse them to match TrendFilter order
-                                    import hashlib
-                                    # Get last 50 candles from validation (newest candles, since list is oldest-first)
-                                    validation_newest_50 = candles_for_validation[-50:] if len(candles_for_validation) >= 50 else candles_for_validation
-                                    # Reverse to newest-first to match TrendFilter order (TrendFilter returns newest-first)
-                                    validation_newest_50_reversed = list(reversed(validation_newest_50))
-                                    validation_hash = hashlib.md5(str([(c['time'], c['close']) for c in validation_newest_50_reversed]).encode()).hexdigest()
-                                    
-                                    # Get candles TrendFilter will actually use (via its get_rates method)
-                                    # TrendFilter.get_rates() returns newest-first, so first 50 are newest
-                                    rates_for_trendfilter = self.trend_filter.get_rates(symbol, count=100)
-                                    if rates_for_trendfilter is not None and len(rates_for_trendfilter) >= 50:
-                                        trendfilter_candles = []
-                                        # Get first 50 rows (newest candles, since DataFrame is newest-first)
-                                        for idx in range(min(50, len(rates_for_trendfilter))):
-                                            row = rates_for_trendfilter.iloc[idx]
-                                            # Fix Timestamp conversion - same logic as candles_for_validation
-                                            tf_time_val = row['time']
-                                            try:
-                                                import pandas as pd
-                                                if isinstance(tf_time_val, pd.Timestamp):
-                                                    tf_time_val = int(tf_time_val.timestamp())
-                                                elif hasattr(tf_time_val, 'timestamp'):
-                                                    tf_time_val = int(tf_time_val.timestamp())
-                                                elif isinstance(tf_time_val, (float, int)):
-                                                    tf_time_val = int(tf_time_val)
-                                                else:
-                                                    tf_time_val = int(float(tf_time_val))
-                                            except Exception as e:
-                                                try:
-                                                    import pandas as pd
-                                                    if pd.isna(tf_time_val):
-                                                        tf_time_val = 0
-                                                    else:
-                                                        tf_time_val = int(str(tf_time_val).split('.')[0]) if '.' in str(tf_time_val) else int(tf_time_val)
-                                                except:
-                                                    tf_time_val = 0
-                                            trendfilter_candles.append((tf_time_val, float(row['close'])))
-                                        trendfilter_hash = hashlib.md5(str(trendfilter_candles).encode()).hexdigest()
-                                        
-                                        if validation_hash != trendfilter_hash:
-                                            # Market is frozen, but data desync detected - this is a HARD FAILURE
-                                            # Log both sets of candles for debugging
-                                            try:
-                                                from sim_live.sim_live_logger import get_sim_live_logger
-                                                logger_sim = get_sim_live_logger()
-                                                logger_sim.error(f"[SIM_LIVE] [PHASE_5_VIOLATION] Data desync detected:")
-                                                logger_sim.error(f"  Validation newest 5 (time, close): {[(c['time'], c['close']) for c in validation_newest_50_reversed[:5]]}")  # First 5 (newest-first)
-                                                logger_sim.error(f"  TrendFilter newest 5 (time, close): {trendfilter_candles[:5]}")  # First 5 (newest-first)
-                                                logger_sim.error(f"  Validation hash: {validation_hash[:16]}...")
-                                                logger_sim.error(f"  TrendFilter hash: {trendfilter_hash[:16]}...")
-                                            except:
-                                                pass
-                                            error_msg = (
-                                                f"[SIM_LIVE] [PHASE_5_VIOLATION] TrendFilter is using different candle data than validation\n"
-                                                f"Validation hash: {validation_hash[:16]}...\n"
-                                                f"TrendFilter hash: {trendfilter_hash[:16]}...\n"
-                                                f"Symbol: {symbol}\n"
-                                                f"Market is frozen: {is_frozen}\n"
-                                                f"This indicates data source desync."
-                                            )
-                                            from sim_live.sim_live_logger import get_sim_live_logger
-                                            logger_sim = get_sim_live_logger()
-                                            logger_sim.error(error_msg)
-                                            raise AssertionError(error_msg)
-                                    
-                                    # 🔒 PHASE 5 ASSERTION: Trend contract must be preserved (only assert if frozen)
-                                    # Use MT5 source to ensure same data as TrendFilter
-                                    is_valid, indicators = market_engine._validate_trend_contract(symbol_upper, candles_for_validation, trend_direction, use_mt5_source=True)
-                                    
-                                    if not is_valid:
-                                        # Market is frozen, but trend contract is violated - this is a HARD FAILURE
-                                        sma20 = indicators.get('sma20')
-                                        sma50 = indicators.get('sma50')
-                                        separation_pct = indicators.get('separation_pct', 0.0)
-                                        scenario_name = getattr(market_engine, '_current_scenario_name', 'unknown')
-                                        
-                                        error_msg = (
-                                            f"[SIM_LIVE] [PHASE_5_VIOLATION] Trend contract violated before strategy evaluation\n"
-                                            f"Market is frozen: {is_frozen}\n"
-                                            f"Scenario: {scenario_name}\n"
-                                            f"Symbol: {symbol}\n"
-                                            f"Direction: {trend_direction}\n"
-                                            f"SMA20: {sma20:.5f}\n"
-                                            f"SMA50: {sma50:.5f}\n"
-                                            f"Separation: {separation_pct*100:.4f}% (required: >=0.05%)\n"
-                                            f"Last 20 closes: {[round(c['close'], 5) for c in candles_for_validation[-20:]]}\n"
-                                            f"This indicates candles were modified AFTER entry generation (Phase 4 violation)."
-                                        )
-                                        
-                                        from sim_live.sim_live_logger import get_sim_live_logger
-                                        logger_sim = get_sim_live_logger()
-                                        logger_sim.error(error_msg)
-                                        raise AssertionError(error_msg)
-                        except AssertionError:
-                            raise  # Re-raise assertion errors
-                        except Exception as e:
-                            # If validation fails (e.g., market_engine not available), log but don't block
-                            try:
+                                    logger_sim.error(f"[SIM_LIVE] [PHASE_5_VIOLATION] Data desync detected:")
+                                    logger_sim.error(f"  Validation newest 5 (time, close): {[(c['time'], c['close']) for c in validation_newest_50_reversed[:5]]}")  # First 5 (newest-first)
+                                    logger_sim.error(f"  TrendFilter newest 5 (time, close): {trendfilter_candles[:5]}")  # First 5 (newest-first)
+                                    logger_sim.error(f"  Validation hash: {validation_hash[:16]}...")
+                                    logger_sim.error(f"  TrendFilter hash: {trendfilter_hash[:16]}...")
+                                except:
+                                    pass
+                                error_msg = (
+                                    f"[SIM_LIVE] [PHASE_5_VIOLATION] TrendFilter is using different candle data than validation\n"
+                                    f"Validation hash: {validation_hash[:16]}...\n"
+                                    f"TrendFilter hash: {trendfilter_hash[:16]}...\n"
+                                    f"Symbol: {symbol}\n"
+                                    f"Market is frozen: {is_frozen}\n"
+                                    f"This indicates data source desync."
+                                )
                                 from sim_live.sim_live_logger import get_sim_live_logger
                                 logger_sim = get_sim_live_logger()
-                                logger_sim.warning(f"[SIM_LIVE] [TREND_CONTRACT_CHECK] Could not validate trend contract: {e}")
-                            except:
-                                pass
-                    
-                    trend_signal = self.trend_filter.get_trend_signal(symbol)
-                    
-                    # SIM_LIVE diagnostic: Log evaluation start
-                    if self.is_sim_live:
-                        log_entry_evaluation_start(symbol, trend_signal)
-                    
-                    if trend_signal['signal'] == 'NONE':
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: No trend signal (SMA20 == SMA50 or invalid data)")
-                        if self.is_sim_live:
-                            log_entry_rejected(symbol, "TREND_FILTER_NO_SIGNAL", {
-                                'trend_signal': trend_signal,
-                                'additional_context': "SMA20 == SMA50 or invalid data"
-                            })
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # 2a. Check RSI filter (30-50 range for entries)
-                    # FOR BACKTEST MODE: Force disable RSI filter to allow trade execution for verification
-                    if self.is_backtest:
-                        # In backtest mode, skip RSI filter check to allow trades for logic verification
-                        logger.debug(f"[BACKTEST] {symbol}: RSI filter check skipped (backtest mode - allowing trade for verification)")
-                    elif self.trend_filter.use_rsi_filter and not trend_signal.get('rsi_filter_passed', True):
-                        # Live mode: Apply RSI filter normally
-                        rsi_value = trend_signal.get('rsi', 50)
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: RSI filter failed (RSI: {rsi_value:.1f} not in range {self.trend_filter.rsi_entry_range_min}-{self.trend_filter.rsi_entry_range_max})")
-                        if self.is_sim_live:
-                            log_entry_rejected(symbol, "RSI_FILTER", {
-                                'trend_signal': trend_signal,
-                                'additional_context': f"RSI {rsi_value:.1f} not in range {self.trend_filter.rsi_entry_range_min}-{self.trend_filter.rsi_entry_range_max}"
-                            })
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    # If RSI filter is disabled in config, log it for verification
-                    elif not self.trend_filter.use_rsi_filter:
-                        logger.debug(f"[OK] {symbol}: RSI filter disabled in config - allowing trade regardless of RSI value")
-                    
-                    # 3. Check halal compliance (ALWAYS skip in test mode per requirements)
-                    test_mode = self.config.get('pairs', {}).get('test_mode', False)
-                    
-                    if test_mode:
-                        # Test mode: ALWAYS ignore halal checks (per requirements)
-                        logger.debug(f"[OK] {symbol}: Halal check skipped (test mode)")
-                    else:
-                        # Live mode: enforce halal if enabled
-                        if not self.halal_compliance.validate_trade(symbol, trend_signal['signal']):
-                            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: HALAL COMPLIANCE CHECK FAILED")
-                            self.trade_stats['filtered_opportunities'] += 1
-                            continue
-                    
-                    # 3a. TESTING MODE: Check min lot size requirements (0.01-0.1, risk <= $2)
-                    min_lot_valid = True
-                    min_lot = 0.01
-                    min_lot_reason = ""
-                    if test_mode:
-                        min_lot_valid, min_lot, min_lot_reason = self.risk_manager.check_min_lot_size_for_testing(symbol)
-                        if not min_lot_valid:
-                            logger.info(f"[SKIP] [SKIP] {symbol} | Signal: {trend_signal['signal']} | "
-                                      f"MinLot: {min_lot:.4f} | Reason: {min_lot_reason}")
-                            self.trade_stats['filtered_opportunities'] += 1
-                            continue
-                        logger.debug(f"[OK] {symbol}: Min lot check passed - {min_lot_reason}")
-                    
-                    # 4. SIMPLIFIED setup validation (only checks if signal != NONE)
-                    # Add detailed logging for SIM_LIVE debugging
-                    if self.is_sim_live:
-                        logger.debug(f"[SIM_LIVE] {symbol}: Calling is_setup_valid_for_scalping with signal='{trend_signal.get('signal')}', keys={list(trend_signal.keys())}")
-                    
-                    if not self.trend_filter.is_setup_valid_for_scalping(symbol, trend_signal):
-                        signal_value = trend_signal.get('signal', 'MISSING')
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Setup validation failed (signal: '{signal_value}')")
-                        if self.is_sim_live:
-                            logger.warning(f"[SIM_LIVE] {symbol}: Setup validation failed - trend_signal: {trend_signal}")
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # 4a. Check trend strength minimum (SMA separation percentage)
-                    sma_separation_pct = abs((trend_signal.get('sma_fast', 0) - trend_signal.get('sma_slow', 0)) / trend_signal.get('sma_slow', 1) * 100) if trend_signal.get('sma_slow', 0) > 0 else 0
-                    min_trend_strength_pct = self.trading_config.get('min_trend_strength_pct', 0.05)  # Default 0.05%
-                    if sma_separation_pct < min_trend_strength_pct:
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Trend strength too weak (SMA separation: {sma_separation_pct:.4f}% < {min_trend_strength_pct}%)")
-                        if self.is_sim_live:
-                            log_entry_rejected(symbol, "TREND_STRENGTH", {
-                                'trend_signal': trend_signal,
-                                'additional_context': f"SMA separation {sma_separation_pct:.4f}% < {min_trend_strength_pct}%"
-                            })
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # 5. Calculate quality score for trade selection
-                    quality_assessment = self.trend_filter.assess_setup_quality(symbol, trend_signal)
-                    quality_score = quality_assessment.get('quality_score', 0.0)
-                    high_quality_setup = quality_assessment.get('is_high_quality', False)
-                    min_quality_score = self.trading_config.get('min_quality_score', 50.0)
-                    
-                    # Filter by quality score - only trade high-quality setups
-                    if quality_score < min_quality_score:
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Quality score {quality_score:.1f} < threshold {min_quality_score} | Details: {', '.join(quality_assessment.get('reasons', []))}")
-                        if self.is_sim_live:
-                            log_entry_rejected(symbol, "QUALITY_SCORE", {
-                                'trend_signal': trend_signal,
-                                'quality_score': quality_score,
-                                'min_quality_score': min_quality_score,
-                                'quality_reasons': quality_assessment.get('reasons', [])
-                            })
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # 5a. ENTRY TIMING GUARDS (structure-only, no threshold changes)
-                    # Trend phase / maturity check – block late, overextended trends
-                    trend_phase_ok, trend_phase_reason = self.trend_filter.check_trend_maturity(symbol, trend_signal)
-                    if not trend_phase_ok:
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: {trend_phase_reason}")
-                        if self.is_sim_live:
-                            log_entry_rejected(symbol, "TIMING_GUARD_TREND_MATURITY", {
-                                'trend_signal': trend_signal,
-                                'quality_score': quality_score,
-                                'min_quality_score': min_quality_score,
-                                'timing_guards': {
-                                    'trend_maturity': {'ok': False, 'reason': trend_phase_reason},
-                                    'impulse_exhaustion': {'ok': True, 'reason': 'Not checked'}
-                                }
-                            })
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # Impulse / exhaustion candle guard – avoid entering on runaway spikes
-                    impulse_ok, impulse_reason = self.trend_filter.check_impulse_exhaustion(symbol, trend_signal)
-                    if not impulse_ok:
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: {impulse_reason}")
-                        if self.is_sim_live:
-                            log_entry_rejected(symbol, "TIMING_GUARD_IMPULSE_EXHAUSTION", {
-                                'trend_signal': trend_signal,
-                                'quality_score': quality_score,
-                                'min_quality_score': min_quality_score,
-                                'timing_guards': {
-                                    'trend_maturity': {'ok': True, 'reason': 'PASS'},
-                                    'impulse_exhaustion': {'ok': False, 'reason': impulse_reason}
-                                }
-                            })
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # Check portfolio risk limit before opening trade
-                    # With USD-based SL, risk is always fixed at max_risk_usd ($2.00)
-                    estimated_risk = self.risk_manager.max_risk_usd
-                    
-                    # Check portfolio risk
-                    portfolio_risk_ok, portfolio_reason = self.risk_manager.check_portfolio_risk(new_trade_risk_usd=estimated_risk)
-                    if not portfolio_risk_ok:
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Portfolio risk limit - {portfolio_reason}")
-                        if self.is_sim_live:
-                            spread_points_for_log = self.pair_filter.get_spread_points(symbol)
-                            log_entry_rejected(symbol, "RISK_CHECK_PORTFOLIO", {
-                                'trend_signal': trend_signal,
-                                'quality_score': quality_score,
-                                'min_quality_score': min_quality_score,
-                                'timing_guards': {
-                                    'trend_maturity': {'ok': True, 'reason': 'PASS'},
-                                    'impulse_exhaustion': {'ok': True, 'reason': 'PASS'}
-                                },
-                                'risk_checks': {
-                                    'portfolio': {'ok': False, 'reason': portfolio_reason},
-                                    'spread': {'ok': True, 'points': spread_points_for_log or 0, 'max': self.pair_filter.max_spread_points}
-                                }
-                            })
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # 6. Check if we can open a new trade (with staged open support)
-                    can_open, reason = self.risk_manager.can_open_trade(
-                        symbol=symbol,
-                        signal=trend_signal['signal'],
-                        quality_score=quality_score,
-                        high_quality_setup=high_quality_setup
-                    )
-                    if not can_open:
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Cannot open trade - {reason}")
-                        symbol_logger = get_symbol_logger(symbol, is_backtest=self.is_backtest)
-                        symbol_logger.debug(f"[SKIP] Cannot open trade: {reason}")
-                        if self.is_sim_live:
-                            spread_points_for_log = self.pair_filter.get_spread_points(symbol)
-                            log_entry_rejected(symbol, "RISK_CHECK_CAN_OPEN", {
-                                'trend_signal': trend_signal,
-                                'quality_score': quality_score,
-                                'min_quality_score': min_quality_score,
-                                'timing_guards': {
-                                    'trend_maturity': {'ok': True, 'reason': 'PASS'},
-                                    'impulse_exhaustion': {'ok': True, 'reason': 'PASS'}
-                                },
-                                'risk_checks': {
-                                    'portfolio': {'ok': True, 'reason': 'PASS'},
-                                    'can_open': {'ok': False, 'reason': reason},
-                                    'spread': {'ok': True, 'points': spread_points_for_log or 0, 'max': self.pair_filter.max_spread_points}
-                                }
-                            })
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # 7. Check spread
-                    spread_points = self.pair_filter.get_spread_points(symbol)
-                    if spread_points is None:
-                        logger.warning(f"[WARNING] {symbol}: Cannot get spread information - skipping")
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # Check spread acceptability
-                    if not self.pair_filter.check_spread(symbol):
-                        max_spread = self.pair_filter.max_spread_points
-                        logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Spread {spread_points:.2f} points > {max_spread} limit")
-                        if self.is_sim_live:
-                            log_entry_rejected(symbol, "RISK_CHECK_SPREAD", {
-                                'trend_signal': trend_signal,
-                                'quality_score': quality_score,
-                                'min_quality_score': min_quality_score,
-                                'timing_guards': {
-                                    'trend_maturity': {'ok': True, 'reason': 'PASS'},
-                                    'impulse_exhaustion': {'ok': True, 'reason': 'PASS'}
-                                },
-                                'risk_checks': {
-                                    'portfolio': {'ok': True, 'reason': 'PASS'},
-                                    'can_open': {'ok': True, 'reason': 'PASS'},
-                                    'spread': {'ok': False, 'points': spread_points, 'max': max_spread}
-                                }
-                            })
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue
-                    
-                    # 7a. TESTING MODE: Check spread + fees <= $0.30 (STRICTLY ENFORCED)
-                    total_cost = 0.0
-                    cost_description = ""
-                    if test_mode:
-                        # Use min_lot already calculated above
-                        if not min_lot_valid:
-                            # Already logged above, skip (filtered_opportunities already incremented)
-                            continue
+                                logger_sim.error(error_msg)
+                                raise AssertionError(error_msg)
                         
-                        # Calculate spread + fees cost using minimum lot size
-                        total_cost, cost_description = self.risk_manager.calculate_spread_and_fees_cost(symbol, min_lot)
-                        max_cost = 0.30  # $0.30 limit for testing mode (STRICT)
-                        
-                        # STRICT ENFORCEMENT: Reject if spread+fees > $0.30
-                        if total_cost > max_cost:
-                            logger.info(f"[SKIP] [SKIP] {symbol} | Signal: {trend_signal['signal']} | "
-                                      f"MinLot: {min_lot:.4f} | Spread: {spread_points:.1f}pts | "
-                                      f"Spread+Fees: ${total_cost:.2f} > ${max_cost:.2f} | "
-                                      f"Reason: Spread+Fees exceed limit (STRICT) | ({cost_description})")
-                            if self.is_sim_live:
-                                log_entry_rejected(symbol, "RISK_CHECK_SPREAD_FEES", {
-                                    'trend_signal': trend_signal,
-                                    'quality_score': quality_score,
-                                    'min_quality_score': min_quality_score,
-                                    'timing_guards': {
-                                        'trend_maturity': {'ok': True, 'reason': 'PASS'},
-                                        'impulse_exhaustion': {'ok': True, 'reason': 'PASS'}
-                                    },
-                                    'risk_checks': {
-                                        'portfolio': {'ok': True, 'reason': 'PASS'},
-                                        'can_open': {'ok': True, 'reason': 'PASS'},
-                                        'spread': {'ok': True, 'points': spread_points, 'max': self.pair_filter.max_spread_points}
-                                    },
-                                    'additional_context': f"Spread+Fees ${total_cost:.2f} > ${max_cost:.2f} ({cost_description})"
-                                })
-                            self.trade_stats['filtered_opportunities'] += 1
-                            continue
+                        # 🔒 PHASE 5 ASSERTION: Trend contract must be preserved (only assert if frozen)
+                        # Use MT5 source to ensure same data as TrendFilter
+                        is_valid, indicators = market_engine._validate_trend_contract(symbol_upper, candles_for_validation, trend_direction, use_mt5_source=True)
                         
-                        logger.debug(f"[OK] {symbol}: Spread+Fees check passed - ${total_cost:.2f} <= ${max_cost:.2f} ({cost_description})")
-                    else:
-                        # Non-test mode: still calculate for sorting, but don't enforce strict limit
-                        total_cost, cost_description = self.risk_manager.calculate_spread_and_fees_cost(symbol, min_lot if min_lot_valid else 0.01)
-                    
-                    # 8. ALL CHECKS PASSED - Add to opportunities
-                    signal_type = trend_signal['signal']
-                    
-                    # Get testing mode info for comprehensive logging
-                    min_lot_info = ""
-                    spread_fees_info = ""
-                    pass_reason = f"All checks passed (Quality: {quality_score:.1f})"
-                    calculated_risk = 0.0
-                    symbol_info_for_risk = self.mt5_connector.get_symbol_info(symbol)
-                    
-                    if test_mode:
-                        # Re-validate min lot (should already be valid at this point)
-                        min_lot_valid_check, min_lot_check, min_lot_reason_check = self.risk_manager.check_min_lot_size_for_testing(symbol)
-                        if min_lot_valid_check:
-                            total_cost, cost_description = self.risk_manager.calculate_spread_and_fees_cost(symbol, min_lot_check)
-                            # Extract source from reason (format: "Min lot X.XXXX (source) passes...")
-                            if '(' in min_lot_reason_check and ')' in min_lot_reason_check:
-                                source = min_lot_reason_check.split('(')[1].split(')')[0]
-                            else:
-                                source = "broker"
-                            min_lot_info = f" | MinLot: {min_lot_check:.4f} ({source})"
-                            spread_fees_info = f" | Spread+Fees: ${total_cost:.2f}"
-                            pass_reason = f"MinLot OK, Spread+Fees OK (${total_cost:.2f} <= $0.30)"
+                        if not is_valid:
+                            # Market is frozen, but trend contract is violated - this is a HARD FAILURE
+                            sma20 = indicators.get('sma20')
+                            sma50 = indicators.get('sma50')
+                            separation_pct = indicators.get('separation_pct', 0.0)
+                            scenario_name = getattr(market_engine, '_current_scenario_name', 'unknown')
                             
-                            # Calculate estimated risk for logging
-                            if symbol_info_for_risk:
-                                point = symbol_info_for_risk.get('point', 0.00001)
-                                pip_value = point * 10 if symbol_info_for_risk.get('digits', 5) == 5 or symbol_info_for_risk.get('digits', 3) == 3 else point
-                                contract_size = symbol_info_for_risk.get('contract_size', 1.0)
-                                # With USD-based SL, risk is always $2.00 fixed
-                                calculated_risk = self.risk_manager.max_risk_usd
-                    
-                    # 10. Enhanced opportunity logging with detailed breakdown (after confirmation)
-                    quality_threshold = self.trading_config.get('min_quality_score', 50.0)
-                    logger.info("=" * 80)
-                    logger.info(f"[OPPORTUNITY CHECK]")
-                    logger.info(f"Symbol: {symbol}")
-                    logger.info(f"Signal: {signal_type}")
-                    logger.info(f"Quality Score: {quality_score:.1f} (Threshold: {quality_threshold})")
-                    logger.info(f"Trend Strength: {sma_separation_pct:.4f}%")
-                    logger.info(f"Spread: {spread_points:.2f} points")
-                    if test_mode and total_cost > 0:
-                        logger.info(f"Fees: {cost_description}")
-                        logger.info(f"Total Cost: ${total_cost:.2f} USD (PASS ≤ $0.30)")
-                    logger.info(f"Min Lot: {min_lot:.4f}")
-                    if calculated_risk > 0:
-                        logger.info(f"Calculated Lot: {min_lot:.4f} (PASS)")
-                        logger.info(f"Risk: ${calculated_risk:.2f} (PASS ≤ $2.00)")
-                    logger.info(f"Reason: Quality score {quality_score:.1f} >= {quality_threshold} → Trade Executed")
-                    logger.info("=" * 80)
-                    
-                    # Legacy concise logging
-                    logger.info(f"[OK] {symbol} | Signal: {signal_type} | Quality: {quality_score:.1f} | MinLot: {min_lot:.4f} | "
-                              f"Spread: {spread_points:.1f}pts{spread_fees_info} | Pass: {pass_reason}")
-                    
-                    # Log signal type for debugging trade direction
-                    if signal_type == 'SHORT':
-                        logger.info(f"📉 {symbol}: SHORT signal detected - will place SELL order")
-                    elif signal_type == 'LONG':
-                        logger.info(f"[STATS] {symbol}: LONG signal detected - will place BUY order")
-                    
-                    # Get min_lot for opportunity (use symbol_info_for_risk if available)
-                    opp_min_lot = min_lot if test_mode else (symbol_info_for_risk.get('volume_min', 0.01) if symbol_info_for_risk else 0.01)
-                    
-                    # Check volume status for entry conditions (already checked above, but need to store result)
-                    # Volume check was done at line 570, so volume_ok = not should_skip_volume
-                    # Since we passed the volume filter, volume_ok should be True
-                    volume_ok = True  # If we reach here, volume check passed
-                    
-                    # Convert sma_separation_pct (percentage) to trend_strength (decimal 0.0-1.0)
-                    trend_strength = sma_separation_pct / 100.0
-                    
-                    # Create opportunity data structure
-                    opportunity_data = {
-                        'symbol': symbol,
-                        'signal': trend_signal['signal'],
-                        'trend_signal': trend_signal,  # Include full trend_signal dict for entry conditions check
-                        'trend': trend_signal['trend'],
-                        'sma_fast': trend_signal.get('sma_fast', 0),
-                        'sma_slow': trend_signal.get('sma_slow', 0),
-                        'rsi': trend_signal.get('rsi', 50),
-                        'volume_ok': volume_ok,  # Include volume status for entry conditions check
-                        'spread': spread_points,
-                        'spread_points': spread_points,  # Also include as spread_points for compatibility
-                        'min_lot': opp_min_lot,
-                        'spread_fees_cost': total_cost,  # Always include for sorting
-                        'quality_score': quality_score,  # Include quality score for sorting
-                        'quality_assessment': quality_assessment,  # Include full quality assessment for detailed logging
-                        'high_quality_setup': high_quality_setup,
-                        'trend_strength': trend_strength,
-                        'atr': trend_signal.get('atr', 0.0),
-                        'rsi_entry_range_min': self.trading_config.get('rsi_entry_range_min', 15),
-                        'rsi_entry_range_max': self.trading_config.get('rsi_entry_range_max', 80),
-                        'min_quality_score': min_quality_score,
-                        'max_spread_points': self.pair_filter.max_spread_points if hasattr(self.pair_filter, 'max_spread_points') else 2.0
+                            error_msg = (
+                                f"[SIM_LIVE] [PHASE_5_VIOLATION] Trend contract violated before strategy evaluation\n"
+                                f"Market is frozen: {is_frozen}\n"
+                                f"Scenario: {scenario_name}\n"
+                                f"Symbol: {symbol}\n"
+                                f"Direction: {trend_direction}\n"
+                                f"SMA20: {sma20:.5f}\n"
+                                f"SMA50: {sma50:.5f}\n"
+                                f"Separation: {separation_pct*100:.4f}% (required: >=0.05%)\n"
+                                f"Last 20 closes: {[round(c['close'], 5) for c in candles_for_validation[-20:]]}\n"
+                                f"This indicates candles were modified AFTER entry generation (Phase 4 violation)."
+                            )
+                            
+                            from sim_live.sim_live_logger import get_sim_live_logger
+                            logger_sim = get_sim_live_logger()
+                            logger_sim.error(error_msg)
+                            raise AssertionError(error_msg)
+            except AssertionError:
+                raise  # Re-raise assertion errors
+            except Exception as e:
+                # If validation fails (e.g., market_engine not available), log but don't block
+                try:
+                    from sim_live.sim_live_logger import get_sim_live_logger
+                    logger_sim = get_sim_live_logger()
+                    logger_sim.warning(f"[SIM_LIVE] [TREND_CONTRACT_CHECK] Could not validate trend contract: {e}")
+                except:
+                    pass
+        
+        trend_signal = batch_trend_signals.get(symbol) or self.trend_filter.get_trend_signal(symbol)
+        
+        # SIM_LIVE diagnostic: Log evaluation start
+        if self.is_sim_live:
+            log_entry_evaluation_start(symbol, trend_signal)
+        
+        if trend_signal['signal'] == 'NONE':
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: No trend signal (SMA20 == SMA50 or invalid data)")
+            if self.is_sim_live:
+                log_entry_rejected(symbol, "TREND_FILTER_NO_SIGNAL", {
+                    'trend_signal': trend_signal,
+                    'additional_context': "SMA20 == SMA50 or invalid data"
+                })
+            self._count_filtered_opportunity()
+            return None
+        
+        # 2a. Check RSI filter (30-50 range for entries)
+        # FOR BACKTEST MODE: Force disable RSI filter to allow trade execution for verification
+        if self.is_backtest:
+            # In backtest mode, skip RSI filter check to allow trades for logic verification
+            logger.debug(f"[BACKTEST] {symbol}: RSI filter check skipped (backtest mode - allowing trade for verification)")
+        elif self.trend_filter.use_rsi_filter and not trend_signal.get('rsi_filter_passed', True):
+            # Live mode: Apply RSI filter normally
+            rsi_value = trend_signal.get('rsi', 50)
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: RSI filter failed (RSI: {rsi_value:.1f} not in range {self.trend_filter.rsi_entry_range_min}-{self.trend_filter.rsi_entry_range_max})")
+            if self.is_sim_live:
+                log_entry_rejected(symbol, "RSI_FILTER", {
+                    'trend_signal': trend_signal,
+                    'additional_context': f"RSI {rsi_value:.1f} not in range {self.trend_filter.rsi_entry_range_min}-{self.trend_filter.rsi_entry_range_max}"
+                })
+            self._count_filtered_opportunity()
+            return None
+        # If RSI filter is disabled in config, log it for verification
+        elif not self.trend_filter.use_rsi_filter:
+            logger.debug(f"[OK] {symbol}: RSI filter disabled in config - allowing trade regardless of RSI value")
+        
+        # 3. Check halal compliance (ALWAYS skip in test mode per requirements)
+        test_mode = self.config.get('pairs', {}).get('test_mode', False)
+        
+        if test_mode:
+            # Test mode: ALWAYS ignore halal checks (per requirements)
+            logger.debug(f"[OK] {symbol}: Halal check skipped (test mode)")
+        else:
+            # Live mode: enforce halal if enabled
+            if not self.halal_compliance.validate_trade(symbol, trend_signal['signal']):
+                logger.info(f"[SKIP] [SKIP] {symbol} | Reason: HALAL COMPLIANCE CHECK FAILED")
+                self._count_filtered_opportunity()
+                return None
+        
+        # 3a. TESTING MODE: Check min lot size requirements (0.01-0.1, risk <= $2)
+        min_lot_valid = True
+        min_lot = 0.01
+        min_lot_reason = ""
+        if test_mode:
+            min_lot_valid, min_lot, min_lot_reason = self.risk_manager.check_min_lot_size_for_testing(symbol)
+            if not min_lot_valid:
+                logger.info(f"[SKIP] [SKIP] {symbol} | Signal: {trend_signal['signal']} | "
+                          f"MinLot: {min_lot:.4f} | Reason: {min_lot_reason}")
+                self._count_filtered_opportunity()
+                return None
+            logger.debug(f"[OK] {symbol}: Min lot check passed - {min_lot_reason}")
+        
+        # 4. SIMPLIFIED setup validation (only checks if signal != NONE)
+        # Add detailed logging for SIM_LIVE debugging
+        if self.is_sim_live:
+            logger.debug(f"[SIM_LIVE] {symbol}: Calling is_setup_valid_for_scalping with signal='{trend_signal.get('signal')}', keys={list(trend_signal.keys())}")
+        
+        if not self.trend_filter.is_setup_valid_for_scalping(symbol, trend_signal):
+            signal_value = trend_signal.get('signal', 'MISSING')
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Setup validation failed (signal: '{signal_value}')")
+            if self.is_sim_live:
+                logger.warning(f"[SIM_LIVE] {symbol}: Setup validation failed - trend_signal: {trend_signal}")
+            self._count_filtered_opportunity()
+            return None
+        
+        # 4a. Check trend strength minimum (SMA separation percentage)
+        sma_separation_pct = abs((trend_signal.get('sma_fast', 0) - trend_signal.get('sma_slow', 0)) / trend_signal.get('sma_slow', 1) * 100) if trend_signal.get('sma_slow', 0) > 0 else 0
+        min_trend_strength_pct = self.trading_config.get('min_trend_strength_pct', 0.05)  # Default 0.05%
+        if sma_separation_pct < min_trend_strength_pct:
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Trend strength too weak (SMA separation: {sma_separation_pct:.4f}% < {min_trend_strength_pct}%)")
+            if self.is_sim_live:
+                log_entry_rejected(symbol, "TREND_STRENGTH", {
+                    'trend_signal': trend_signal,
+                    'additional_context': f"SMA separation {sma_separation_pct:.4f}% < {min_trend_strength_pct}%"
+                })
+            self._count_filtered_opportunity()
+            return None
+        
+        # 5. Calculate quality score for trade selection
+        quality_assessment = self.trend_filter.assess_setup_quality(symbol, trend_signal)
+        quality_score = quality_assessment.get('quality_score', 0.0)
+        high_quality_setup = quality_assessment.get('is_high_quality', False)
+        min_quality_score = self.trading_config.get('min_quality_score', 50.0)
+        
+        # Filter by quality score - only trade high-quality setups
+        if quality_score < min_quality_score:
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Quality score {quality_score:.1f} < threshold {min_quality_score} | Details: {', '.join(quality_assessment.get('reasons', []))}")
+            if self.is_sim_live:
+                log_entry_rejected(symbol, "QUALITY_SCORE", {
+                    'trend_signal': trend_signal,
+                    'quality_score': quality_score,
+                    'min_quality_score': min_quality_score,
+                    'quality_reasons': quality_assessment.get('reasons', [])
+                })
+            self._count_filtered_opportunity()
+            return None
+        
+        # 5a. ENTRY TIMING GUARDS (structure-only, no threshold changes)
+        # Trend phase / maturity check – block late, overextended trends
+        trend_phase_ok, trend_phase_reason = self.trend_filter.check_trend_maturity(symbol, trend_signal)
+        if not trend_phase_ok:
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: {trend_phase_reason}")
+            if self.is_sim_live:
+                log_entry_rejected(symbol, "TIMING_GUARD_TREND_MATURITY", {
+                    'trend_signal': trend_signal,
+                    'quality_score': quality_score,
+                    'min_quality_score': min_quality_score,
+                    'timing_guards': {
+                        'trend_maturity': {'ok': False, 'reason': trend_phase_reason},
+                        'impulse_exhaustion': {'ok': True, 'reason': 'Not checked'}
                     }
-                    
-                    # P3-18 FIX: Add decision context to opportunity
-                    opportunity_data['decision_context'] = {
-                        'filter_results': filter_results,
-                        'quality_score': quality_score,
-                        'quality_assessment': quality_assessment,
-                        'trend_strength_pct': sma_separation_pct,
-                        'spread_points': spread_points,
-                        'min_lot': min_lot,
-                        'all_checks_passed': True
+                })
+            self._count_filtered_opportunity()
+            return None
+        
+        # Impulse / exhaustion candle guard – avoid entering on runaway spikes
+        impulse_ok, impulse_reason = self.trend_filter.check_impulse_exhaustion(symbol, trend_signal)
+        if not impulse_ok:
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: {impulse_reason}")
+            if self.is_sim_live:
+                log_entry_rejected(symbol, "TIMING_GUARD_IMPULSE_EXHAUSTION", {
+                    'trend_signal': trend_signal,
+                    'quality_score': quality_score,
+                    'min_quality_score': min_quality_score,
+                    'timing_guards': {
+                        'trend_maturity': {'ok': True, 'reason': 'PASS'},
+                        'impulse_exhaustion': {'ok': False, 'reason': impulse_reason}
                     }
-                    
-                    # ONE-CANDLE CONFIRMATION: Store as pending instead of adding immediately
-                    df_current = self.trend_filter.get_rates(symbol, count=1)
-                    if df_current is not None and len(df_current) > 0:
-                        current_candle_time = int(df_current.iloc[0]['time'])
-                        with self._pending_signals_lock:
-                            self._pending_signals[symbol] = {
-                                'direction': signal_type,
-                                'signal_time': datetime.now(),
-                                'candle_time': current_candle_time,
-                                'quality_score': quality_score,
-                                'trend_signal': trend_signal.copy(),
-                                'opportunity_data': opportunity_data  # Store all opportunity data
-                            }
-                        logger.info(f"[ENTRY PENDING] {symbol}: signal {signal_type} stored, waiting for next candle close")
-                        # P3-18 FIX: Log decision context for pending signals
-                        logger.debug(f"[DECISION_CONTEXT] {symbol} | All filters passed | Quality: {quality_score:.1f} | "
-                                   f"Trend Strength: {sma_separation_pct:.4f}% | Spread: {spread_points:.2f}pts | "
-                                   f"Status: PENDING (waiting for candle confirmation)")
-                        self.trade_stats['filtered_opportunities'] += 1
-                        continue  # Don't add to opportunities yet - wait for confirmation
-                    else:
-                        # Can't get candle time - add immediately (fallback behavior)
-                        logger.debug(f"[WARNING] {symbol}: cannot get candle time for confirmation, adding immediately")
-                        # P3-18 FIX: Log decision context for immediate opportunities
-                        logger.debug(f"[DECISION_CONTEXT] {symbol} | All filters passed | Quality: {quality_score:.1f} | "
-                                   f"Trend Strength: {sma_separation_pct:.4f}% | Spread: {spread_points:.2f}pts | "
-                                   f"Status: IMMEDIATE (candle time unavailable)")
-                        opportunities.append(opportunity_data)
-                    
-                    # DRY-RUN ONLY: Analyze limit entry (does NOT affect execution)
-                    if hasattr(self, 'limit_entry_dry_run') and self.limit_entry_dry_run is not None:
-                        try:
-                            # Get current market price
-                            symbol_info_for_limit = self.mt5_connector.get_symbol_info(symbol)
-                            if symbol_info_for_limit:
-                                market_price = symbol_info_for_limit.get('ask' if signal_type == 'LONG' else 'bid', 0.0)
-                                if market_price > 0:
-                                    # Convert signal to direction
-                                    direction = 'BUY' if signal_type == 'LONG' else 'SELL'
-                                    
-                                    # Analyze limit entry (dry-run only)
-                                    self.limit_entry_dry_run.analyze_limit_entry(
-                                        symbol=symbol,
-                                        direction=direction,
-                                        market_price=market_price,
-                                        quality_score=quality_score,
-                                        entry_time=datetime.now()
-                                    )
-                        except Exception as e:
-                            # Don't let dry-run errors affect real execution
-                            logger.debug(f"Limit entry dry-run analysis failed for {symbol}: {e}")
-                    
-                except Exception as e:
-                    logger.error(f"[ERROR] Error scanning {symbol}: {e}", exc_info=True)
-                    self.handle_error(e, f"Scanning {symbol}")
-                    continue
+                })
+            self._count_filtered_opportunity()
+            return None
         
-        except Exception as e:
-            logger.error(f"[ERROR] Error in scan_for_opportunities: {e}", exc_info=True)
-            self.handle_error(e, "Scanning for opportunities")
+        # Check portfolio risk limit before opening trade
+        # With USD-based SL, risk is always fixed at max_risk_usd ($2.00)
+        estimated_risk = self.risk_manager.max_risk_usd
+        
+        # Check portfolio risk
+        portfolio_risk_ok, portfolio_reason = self.risk_manager.check_portfolio_risk(new_trade_risk_usd=estimated_risk)
+        if not portfolio_risk_ok:
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Portfolio risk limit - {portfolio_reason}")
+            if self.is_sim_live:
+                spread_points_for_log = self.pair_filter.get_spread_points(symbol)
+                log_entry_rejected(symbol, "RISK_CHECK_PORTFOLIO", {
+                    'trend_signal': trend_signal,
+                    'quality_score': quality_score,
+                    'min_quality_score': min_quality_score,
+                    'timing_guards': {
+                        'trend_maturity': {'ok': True, 'reason': 'PASS'},
+                        'impulse_exhaustion': {'ok': True, 'reason': 'PASS'}
+                    },
+                    'risk_checks': {
+                        'portfolio': {'ok': False, 'reason': portfolio_reason},
+                        'spread': {'ok': True, 'points': spread_points_for_log or 0, 'max': self.pair_filter.max_spread_points}
+                    }
+                })
+            self._count_filtered_opportunity()
+            return None
         
-        logger.info(f"🎯 Found {len(opportunities)} trading opportunity(ies)")
+        # 6. Check if we can open a new trade (with staged open support)
+        can_open, reason = self.risk_manager.can_open_trade(
+            symbol=symbol,
+            signal=trend_signal['signal'],
+            quality_score=quality_score,
+            high_quality_setup=high_quality_setup
+        )
+        if not can_open:
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Cannot open trade - {reason}")
+            symbol_logger = get_symbol_logger(symbol, is_backtest=self.is_backtest)
+            symbol_logger.debug(f"[SKIP] Cannot open trade: {reason}")
+            if self.is_sim_live:
+                spread_points_for_log = self.pair_filter.get_spread_points(symbol)
+                log_entry_rejected(symbol, "RISK_CHECK_CAN_OPEN", {
+                    'trend_signal': trend_signal,
+                    'quality_score': quality_score,
+                    'min_quality_score': min_quality_score,
+                    'timing_guards': {
+                        'trend_maturity': {'ok': True, 'reason': 'PASS'},
+                        'impulse_exhaustion': {'ok': True, 'reason': 'PASS'}
+                    },
+                    'risk_checks': {
+                        'portfolio': {'ok': True, 'reason': 'PASS'},
+                        'can_open': {'ok': False, 'reason': reason},
+                        'spread': {'ok': True, 'points': spread_points_for_log or 0, 'max': self.pair_filter.max_spread_points}
+                    }
+                })
+            self._count_filtered_opportunity()
+            return None
         
-        # Update state back to IDLE if no opportunities
-        if not opportunities:
-            self._update_state('IDLE', 'N/A', 'Scan completed - no opportunities')
+        # 7. Check spread
+        spread_points = self.pair_filter.get_spread_points(symbol)
+        if spread_points is None:
+            logger.warning(f"[WARNING] {symbol}: Cannot get spread information - skipping")
+            self._count_filtered_opportunity()
+            return None
         
-        # Log scan completion with summary
-        total_scanned = len(symbols) if 'symbols' in locals() else 0
-        total_opportunities = len(opportunities)
-        logger.info(f"🔍 Scan completed: {total_scanned} symbols scanned, {total_opportunities} opportunity(ies) found")
+        # Check spread acceptability
+        if not self.pair_filter.check_spread(symbol):
+            max_spread = self.pair_filter.max_spread_points
+            logger.info(f"[SKIP] [SKIP] {symbol} | Reason: Spread {spread_points:.2f} points > {max_spread} limit")
+            if self.is_sim_live:
+                log_entry_rejected(symbol, "RISK_CHECK_SPREAD", {
+                    'trend_signal': trend_signal,
+                    'quality_score': quality_score,
+                    'min_quality_score': min_quality_score,
+                    'timing_guards': {
+                        'trend_maturity': {'ok': True, 'reason': 'PASS'},
+                        'impulse_exhaustion': {'ok': True, 'reason': 'PASS'}
+                    },
+                    'risk_checks': {
+                        'portfolio': {'ok': True, 'reason': 'PASS'},
+                        'can_open': {'ok': True, 'reason': 'PASS'},
+                        'spread': {'ok': False, 'points': spread_points, 'max': max_spread}
+                    }
+                })
+            self._count_filtered_opportunity()
+            return None
         
-        return opportunities
+        # 7a. TESTING MODE: Check spread + fees <= $0.30 (STRICTLY ENFORCED)
+        total_cost = 0.0
+        cost_description = ""
+        if test_mode:
+            # Use min_lot already calculated above
+            if not min_lot_valid:
+                # Already logged above, skip (filtered_opportunities already incremented)
+                return None
+            
+            # Calculate spread + fees cost using minimum lot size
+            total_cost, cost_description = self.risk_manager.calculate_spread_and_fees_cost(symbol, min_lot)
+            max_cost = 0.30  # $0.30 limit for testing mode (STRICT)
+            
+            # STRICT ENFORCEMENT: Reject if spread+fees > $0.30
+            if total_cost > max_cost:
+                logger.info(f"[SKIP] [SKIP] {symbol} | Signal: {trend_signal['signal']} | "
+                          f"MinLot: {min_lot:.4f} | Spread: {spread_points:.1f}pts | "
+                          f"Spread+Fees: ${total_cost:.2f} > ${max_cost:.2f} | "
+                          f"Reason: Spread+Fees exceed limit (STRICT) | ({cost_description})")
+                if self.is_sim_live:
+                    log_entry_rejected(symbol, "RISK_CHECK_SPREAD_FEES", {
+                        'trend_signal': trend_signal,
+                        'quality_score': quality_score,
+                        'min_quality_score': min_quality_score,
+                        'timing_guards': {
+                            'trend_maturity': {'ok': True, 'reason': 'PASS'},
+                            'impulse_exhaustion': {'ok': True, 'reason': 'PASS'}
+                        },
+                        'risk_checks': {
+                            'portfolio': {'ok': True, 'reason': 'PASS'},
+                            'can_open': {'ok': True, 'reason': 'PASS'},
+                            'spread': {'ok': True, 'points': spread_points, 'max': self.pair_filter.max_spread_points}
+                        },
+                        'additional_context': f"Spread+Fees ${total_cost:.2f} > ${max_cost:.2f} ({cost_description})"
+                    })
+                self._count_filtered_opportunity()
+                return None
+            
+            logger.debug(f"[OK] {symbol}: Spread+Fees check passed - ${total_cost:.2f} <= ${max_cost:.2f} ({cost_description})")
+        else:
+            # Non-test mode: still calculate for sorting, but don't enforce strict limit
+            total_cost, cost_description = self.risk_manager.calculate_spread_and_fees_cost(symbol, min_lot if min_lot_valid else 0.01)
+        
+        # 8. ALL CHECKS PASSED - Add to opportunities
+        signal_type = trend_signal['signal']
+        
+        # Get testing mode info for comprehensive logging
+        min_lot_info = ""
+        spread_fees_info = ""
+        pass_reason = f"All checks passed (Quality: {quality_score:.1f})"
+        calculated_risk = 0.0
+        symbol_info_for_risk = self.mt5_connector.get_symbol_info(symbol)
+        
+        if test_mode:
+            # Re-validate min lot (should already be valid at this point)
+            min_lot_valid_check, min_lot_check, min_lot_reason_check = self.risk_manager.check_min_lot_size_for_testing(symbol)
+            if min_lot_valid_check:
+                total_cost, cost_description = self.risk_manager.calculate_spread_and_fees_cost(symbol, min_lot_check)
+                # Extract source from reason (format: "Min lot X.XXXX (source) passes...")
+                if '(' in min_lot_reason_check and ')' in min_lot_reason_check:
+                    source = min_lot_reason_check.split('(')[1].split(')')[0]
+                else:
+                    source = "broker"
+                min_lot_info = f" | MinLot: {min_lot_check:.4f} ({source})"
+                spread_fees_info = f" | Spread+Fees: ${total_cost:.2f}"
+                pass_reason = f"MinLot OK, Spread+Fees OK (${total_cost:.2f} <= $0.30)"
+                
+                # Calculate estimated risk for logging
+                if symbol_info_for_risk:
+                    point = symbol_info_for_risk.get('point', 0.00001)
+                    pip_value = point * 10 if symbol_info_for_risk.get('digits', 5) == 5 or symbol_info_for_risk.get('digits', 3) == 3 else point
+                    contract_size = symbol_info_for_risk.get('contract_size', 1.0)
+                    # With USD-based SL, risk is always $2.00 fixed
+                    calculated_risk = self.risk_manager.max_risk_usd
+        
+        # 10. Enhanced opportunity logging with detailed breakdown (after confirmation)
+        quality_threshold = self.trading_config.get('min_quality_score', 50.0)
+        logger.info("=" * 80)
+        logger.info(f"[OPPORTUNITY CHECK]")
+        logger.info(f"Symbol: {symbol}")
+        logger.info(f"Signal: {signal_type}")
+        logger.info(f"Quality Score: {quality_score:.1f} (Threshold: {quality_threshold})")
+        logger.info(f"Trend Strength: {sma_separation_pct:.4f}%")
+        logger.info(f"Spread: {spread_points:.2f} points")
+        if test_mode and total_cost > 0:
+            logger.info(f"Fees: {cost_description}")
+            logger.info(f"Total Cost: ${total_cost:.2f} USD (PASS ≤ $0.30)")
+        logger.info(f"Min Lot: {min_lot:.4f}")
+        if calculated_risk > 0:
+            logger.info(f"Calculated Lot: {min_lot:.4f} (PASS)")
+            logger.info(f"Risk: ${calculated_risk:.2f} (PASS ≤ $2.00)")
+        logger.info(f"Reason: Quality score {quality_score:.1f} >= {quality_threshold} → Trade Executed")
+        logger.info("=" * 80)
+        
+        # Legacy concise logging
+        logger.info(f"[OK] {symbol} | Signal: {signal_type} | Quality: {quality_score:.1f} | MinLot: {min_lot:.4f} | "
+                  f"Spread: {spread_points:.1f}pts{spread_fees_info} | Pass: {pass_reason}")
+        
+        # Log signal type for debugging trade direction
+        if signal_type == 'SHORT':
+            logger.info(f"📉 {symbol}: SHORT signal detected - will place SELL order")
+        elif signal_type == 'LONG':
+            logger.info(f"[STATS] {symbol}: LONG signal detected - will place BUY order")
+        
+        # Get min_lot for opportunity (use symbol_info_for_risk if available)
+        opp_min_lot = min_lot if test_mode else (symbol_info_for_risk.get('volume_min', 0.01) if symbol_info_for_risk else 0.01)
+        
+        # Check volume status for entry conditions (already checked above, but need to store result)
+        # Volume check was done at line 570, so volume_ok = not should_skip_volume
+        # Since we passed the volume filter, volume_ok should be True
+        volume_ok = True  # If we reach here, volume check passed
+        
+        # Convert sma_separation_pct (percentage) to trend_strength (decimal 0.0-1.0)
+        trend_strength = sma_separation_pct / 100.0
+        
+        # Create opportunity data structure
+        opportunity_data = {
+            'symbol': symbol,
+            'signal': trend_signal['signal'],
+            'trend_signal': trend_signal,  # Include full trend_signal dict for entry conditions check
+            'trend': trend_signal['trend'],
+            'sma_fast': trend_signal.get('sma_fast', 0),
+            'sma_slow': trend_signal.get('sma_slow', 0),
+            'rsi': trend_signal.get('rsi', 50),
+            'volume_ok': volume_ok,  # Include volume status for entry conditions check
+            'spread': spread_points,
+            'spread_points': spread_points,  # Also include as spread_points for compatibility
+            'min_lot': opp_min_lot,
+            'spread_fees_cost': total_cost,  # Always include for sorting
+            'quality_score': quality_score,  # Include quality score for sorting
+            'quality_assessment': quality_assessment,  # Include full quality assessment for detailed logging
+            'high_quality_setup': high_quality_setup,
+            'trend_strength': trend_strength,
+            'atr': trend_signal.get('atr', 0.0),
+            'rsi_entry_range_min': self.trading_config.get('rsi_entry_range_min', 15),
+            'rsi_entry_range_max': self.trading_config.get('rsi_entry_range_max', 80),
+            'min_quality_score': min_quality_score,
+            'max_spread_points': self.pair_filter.max_spread_points if hasattr(self.pair_filter, 'max_spread_points') else 2.0
+        }
+        
+        # P3-18 FIX: Add decision context to opportunity
+        opportunity_data['decision_context'] = {
+            'filter_results': filter_results,
+            'quality_score': quality_score,
+            'quality_assessment': quality_assessment,
+            'trend_strength_pct': sma_separation_pct,
+            'spread_points': spread_points,
+            'min_lot': min_lot,
+            'all_checks_passed': True
+        }
+        
+        # ONE-CANDLE CONFIRMATION: Store as pending instead of adding immediately
+        df_current = self.trend_filter.get_rates(symbol, count=1)
+        if df_current is not None and len(df_current) > 0:
+            current_candle_time = int(df_current.iloc[0]['time'])
+            with self._pending_signals_lock:
+                self._pending_signals[symbol] = {
+                    'direction': signal_type,
+                    'signal_time': datetime.now(),
+                    'candle_time': current_candle_time,
+                    'quality_score': quality_score,
+                    'trend_signal': trend_signal.copy(),
+                    'opportunity_data': opportunity_data  # Store all opportunity data
+                }
+            logger.info(f"[ENTRY PENDING] {symbol}: signal {signal_type} stored, waiting for next candle close")
+            # P3-18 FIX: Log decision context for pending signals
+            logger.debug(f"[DECISION_CONTEXT] {symbol} | All filters passed | Quality: {quality_score:.1f} | "
+                       f"Trend Strength: {sma_separation_pct:.4f}% | Spread: {spread_points:.2f}pts | "
+                       f"Status: PENDING (waiting for candle confirmation)")
+            self._count_filtered_opportunity()
+            return None  # Don't add to opportunities yet - wait for confirmation
+        else:
+            # Can't get candle time - add immediately (fallback behavior)
+            logger.debug(f"[WARNING] {symbol}: cannot get candle time for confirmation, adding immediately")
+            # P3-18 FIX: Log decision context for immediate opportunities
+            logger.debug(f"[DECISION_CONTEXT] {symbol} | All filters passed | Quality: {quality_score:.1f} | "
+                       f"Trend Strength: {sma_separation_pct:.4f}% | Spread: {spread_points:.2f}pts | "
+                       f"Status: IMMEDIATE (candle time unavailable)")
+            scan_result = opportunity_data
+        
+        # DRY-RUN ONLY: Analyze limit entry (does NOT affect execution)
+        if hasattr(self, 'limit_entry_dry_run') and self.limit_entry_dry_run is not None:
+            try:
+                # Get current market price
+                symbol_info_for_limit = self.mt5_connector.get_symbol_info(symbol)
+                if symbol_info_for_limit:
+                    market_price = symbol_info_for_limit.get('ask' if signal_type == 'LONG' else 'bid', 0.0)
+                    if market_price > 0:
+                        # Convert signal to direction
+                        direction = 'BUY' if signal_type == 'LONG' else 'SELL'
+                        
+                        # Analyze limit entry (dry-run only)
+                        self.limit_entry_dry_run.analyze_limit_entry(
+                            symbol=symbol,
+                            direction=direction,
+                            market_price=market_price,
+                            quality_score=quality_score,
+                            entry_time=datetime.now()
+                        )
+            except Exception as e:
+                # Don't let dry-run errors affect real execution
+                logger.debug(f"Limit entry dry-run analysis failed for {symbol}: {e}")
+        
+        return scan_result
     
     def execute_trade(self, opportunity: Dict[str, Any], skip_randomness: bool = False) -> Optional[bool]:
         """
@@ -2916,7 +3145,7 @@ class TradingBot:
                     
                     # Cache metrics for timer-based heartbeat (no MT5 calls from heartbeat thread)
                     try:
-                        positions = self.order_manager.get_open_positions()
+                        positions = read_open_positions(self.order_manager, 'trailing')
                         position_count = len(positions) if positions else 0
                         self._trailing_last_position_count = position_count
                     except Exception:
@@ -3044,7 +3273,7 @@ class TradingBot:
                             self.risk_manager.monitor_all_positions_continuous(use_fast_polling=True)
                             # Cache metrics for timer-based heartbeat (no MT5 calls from heartbeat thread)
                             try:
-                                positions = self.order_manager.get_open_positions()
+                                positions = read_open_positions(self.order_manager, 'fast_trailing')
                                 position_count = len(positions) if positions else 0
                                 self._fast_trailing_last_position_count = position_count
                             except Exception:
@@ -3158,6 +3387,16 @@ class TradingBot:
             logger.info("Continuous trailing stop is disabled in config")
             return
         
+        # Start the shared position snapshot producer before its consumers
+        try:
+            self.order_manager.start_position_snapshot_bus()
+        except Exception as e:
+            logger.warning(f"Position snapshot bus failed to start - consumers will fetch directly: {e}")
+        try:
+            self.order_manager.start_deal_journal()
+        except Exception as e:
+            logger.warning(f"Deal journal failed to start - closure lookups will sync on demand: {e}")
+        
         # Start normal trailing stop thread
         self.trailing_stop_running = True
         self.trailing_stop_thread = threading.Thread(
@@ -3266,23 +3505,27 @@ class TradingBot:
                     pass  # Heartbeat failure must not break the loop
                 
                 try:
-                    # Detect and log closures
-                    logged_closures = self.position_monitor.detect_and_log_closures(self.tracked_tickets)
+                    # One snapshot per pass (shared snapshot bus): closures are the tracked tickets missing from it
+                    current_positions = read_open_positions(self.order_manager, 'position_monitor')
+                    if current_positions is None:
+                        # Broker outage - an unknown position set must not be read as closures
+                        logger.warning("[POSITION_MONITOR] No position snapshot within staleness limit - skipping closure detection")
+                    else:
+                        current_tickets = {pos['ticket'] for pos in current_positions}
                     
-                    if logged_closures:
-                        for closure in logged_closures:
-                            logger.info(f"[-] Position {closure['ticket']} ({closure['symbol']}) closed - logged")
+                        # Detect and log closures (accounted as a batch via _on_positions_closed)
+                        logged_closures = self.position_monitor.detect_and_log_closures(self.tracked_tickets, current_tickets)
                     
-                    # Update tracked tickets from current positions
-                    current_positions = self.order_manager.get_open_positions()
-                    current_tickets = {pos['ticket'] for pos in current_positions}
-                    self.tracked_tickets.update(current_tickets)
+                        if logged_closures:
+                            for closure in logged_closures:
+                                logger.info(f"[-] Position {closure['ticket']} ({closure['symbol']}) closed - logged")
                     
-                    # Clean up closed tickets from tracking
-                    self.tracked_tickets.intersection_update(current_tickets)
+                        # Track current positions, clean up closed tickets
+                        self.tracked_tickets.update(current_tickets)
+                        self.tracked_tickets.intersection_update(current_tickets)
                     
-                    # Cache metrics for timer-based heartbeat (no MT5 calls from heartbeat thread)
-                    self._position_monitor_last_position_count = len(current_positions) if current_positions else 0
+                        # Cache metrics for timer-based heartbeat (no MT5 calls from heartbeat thread)
+                        self._position_monitor_last_position_count = len(current_positions) if current_positions else 0
                     
                 except Exception as e:
                     # MANDATORY OBSERVABILITY: Log thread crash
@@ -3391,6 +3634,16 @@ class TradingBot:
         
         # Stop position monitor
         self.stop_position_monitor()
+        
+        # Stop the shared position snapshot producer after its consumers
+        try:
+            self.order_manager.stop_position_snapshot_bus()
+        except Exception as e:
+            logger.debug(f"Error stopping position snapshot bus: {e}")
+        try:
+            self.order_manager.stop_deal_journal()
+        except Exception as e:
+            logger.debug(f"Error stopping deal journal: {e}")
     
     def manage_positions(self):
         """Manage open positions (halal checks, max duration, etc.)."""
@@ -4092,11 +4345,14 @@ class TradingBot:
                             logger.critical(f"[POSITION_VERIFICATION] {len(verification_results['exceeded_risk'])} positions exceed risk limits after reconnection")
                             for pos_info in verification_results['exceeded_risk']:
                                 logger.critical(f"  Ticket {pos_info['ticket']} ({pos_info['symbol']}): ${pos_info['profit']:.2f}")
-                                # Close positions that exceed risk
-                                try:
-                                    self.order_manager.close_position(pos_info['ticket'], comment="Risk limit exceeded after reconnection")
-                                except Exception as close_error:
-                                    logger.error(f"Failed to close position {pos_info['ticket']}: {close_error}")
+                            # Close positions that exceed risk (concurrently, with per-ticket retries)
+                            try:
+                                self.order_manager.close_positions(
+                                    [pos_info['ticket'] for pos_info in verification_results['exceeded_risk']],
+                                    comment="Risk limit exceeded after reconnection",
+                                    reason="Risk limit exceeded after reconnection")
+                            except Exception as close_error:
+                                logger.error(f"Failed to close positions exceeding risk: {close_error}")
                         
                         if verification_results['missing']:
                             logger.warning(f"[POSITION_VERIFICATION] {len(verification_results['missing'])} positions missing after reconnection (may have been closed)")
@@ -5003,10 +5259,9 @@ class TradingBot:
         logger.info("Shutting down trading bot...")
         self.running = False
         
-        # CRITICAL FIX: Stop SLManager worker thread
-        if hasattr(self.risk_manager, 'sl_manager') and self.risk_manager.sl_manager:
-            self.risk_manager.sl_manager.stop_sl_worker()
-            logger.info("[OK] SLManager worker thread stopped")
+        # CRITICAL FIX: Stop SLManager worker thread and write pending contract calibrations
+        self.risk_manager.shutdown()
+        logger.info("[OK] SLManager worker thread stopped")
         
         # Stop continuous trailing stop monitor
         self.stop_continuous_trailing_stop()
@@ -5014,6 +5269,9 @@ class TradingBot:
         # Stop state watchdog
         self.stop_state_watchdog()
         
+        # Stop symbol scan workers
+        self._shutdown_scan_pool()
+        
         self.mt5_connector.shutdown()
         logger.info("Trading bot shutdown complete")
     
@@ -5034,8 +5292,21 @@ class TradingBot:
         orphaned_count = 0
         
         try:
-            # Get current broker positions
-            broker_positions = self.order_manager.get_open_positions(exclude_dec8=False)
+            # Get current broker positions (a failed read must not count every tracked
+            # ticket as orphaned - get_open_positions() returns [] on failure)
+            if hasattr(self.order_manager, 'get_position_table'):
+                position_table = self.order_manager.get_position_table()
+                if position_table is None:
+                    logger.warning("[PERIODIC_RECONCILIATION] Broker position read failed - skipping reconciliation")
+                    return {
+                        'matched': 0,
+                        'missing': 0,
+                        'orphaned': 0,
+                        'error': 'position read failed'
+                    }
+                broker_positions = position_table.as_dicts(exclude_dec8=False)
+            else:
+                broker_positions = self.order_manager.get_open_positions(exclude_dec8=False)  # Backtest providers
             broker_tickets = {pos['ticket']: pos for pos in broker_positions}
             
             # Get bot tracked positions (from tracked_tickets)
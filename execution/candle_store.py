@@ -0,0 +1,305 @@
+"""
+Candle Store
+Shared per-(symbol, timeframe) bar cache backed by fixed-size NumPy ring buffers.
+
+TrendFilter, RiskManager and VolumeFilter used to re-download overlapping M1
+windows independently on every TTL expiry. The store keeps one ring buffer per
+(symbol, timeframe), fetches only the bars newer than the last stored bar (the
+still-forming bar is re-read and overwritten in place), and serves read-only
+views to every consumer.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.logger_factory import get_logger
+
+logger = get_logger("candle_store", "logs/live/system/mt5_connection.log")
+
+# Layout of the structured array returned by mt5.copy_rates_from_pos()
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('tick_volume', '<u8'),
+    ('spread', '<i4'),
+    ('real_volume', '<u8'),
+])
+
+DEFAULT_CAPACITY = 1000
+DEFAULT_INITIAL_BARS = 300
+DEFAULT_MIN_REFRESH_SECONDS = 1.0
+
+# rates_fn(symbol, timeframe, start_pos, count) -> structured array (newest last) or None
+RatesFetchFn = Callable[[str, int, int, int], Any]
+
+
+def timeframe_seconds(timeframe: int) -> int:
+    """
+    Bar duration in seconds for an MT5 timeframe constant.
+
+    MT5 encodes minutes directly (M1=1 ... M30=30), hours as 0x4000|hours
+    (H1=0x4001, D1=0x4018), weeks as 0x8001 and months as 0xC001.
+    """
+    if timeframe & 0xC000 == 0xC000:
+        return 30 * 86400 * (timeframe & 0xFF)
+    if timeframe & 0x8000:
+        return 7 * 86400 * (timeframe & 0xFF)
+    if timeframe & 0x4000:
+        return 3600 * (timeframe & 0xFF)
+    return 60 * max(1, timeframe)
+
+
+def _to_rates_array(rates: Any) -> Optional[np.ndarray]:
+    """Normalize a broker rates result into RATES_DTYPE (fields missing upstream are zero)."""
+    if rates is None or len(rates) == 0:
+        return None
+    names = getattr(getattr(rates, 'dtype', None), 'names', None)
+    if not names or 'time' not in names or 'close' not in names:
+        return None
+    out = np.zeros(len(rates), dtype=RATES_DTYPE)
+    for name in RATES_DTYPE.names:
+        if name in names:
+            out[name] = rates[name]
+    if 'real_volume' not in names and 'tick_volume' in names:
+        out['real_volume'] = rates['tick_volume']
+    return out
+
+
+class CandleRing:
+    """
+    Fixed-capacity ring of bars for one (symbol, timeframe).
+
+    The backing array is double-mapped (each bar is written at slot i and
+    i + capacity) so the newest N bars are always one contiguous slice and
+    reads never allocate.
+    """
+
+    __slots__ = ('capacity', '_buf', '_head', '_size', 'last_refresh', 'version')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = np.zeros(capacity * 2, dtype=RATES_DTYPE)
+        self._head = 0  # Physical slot of the next write (0 <= head < capacity)
+        self._size = 0
+        self.last_refresh = 0.0
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_time(self) -> Optional[int]:
+        if self._size == 0:
+            return None
+        return int(self._buf[(self._head - 1) % self.capacity]['time'])
+
+    def _write(self, slot: int, bar: np.void):
+        self._buf[slot] = bar
+        self._buf[slot + self.capacity] = bar
+
+    def reset(self, bars: np.ndarray):
+        """Replace the contents with the newest `capacity` bars of `bars`."""
+        bars = bars[-self.capacity:]
+        n = len(bars)
+        self._buf[:n] = bars
+        self._buf[self.capacity:self.capacity + n] = bars
+        self._head = n % self.capacity
+        self._size = n
+        self.version += 1
+
+    def merge(self, bars: np.ndarray) -> bool:
+        """
+        Merge bars fetched from the newest end of the history.
+
+        The bar matching the last stored time (the forming bar) is overwritten,
+        newer bars are appended. Returns False if the fetched window does not
+        overlap the stored history (caller must reload).
+        """
+        last_time = self.last_time
+        if last_time is None:
+            self.reset(bars)
+            return True
+        if int(bars[0]['time']) > last_time:
+            return False
+
+        times = bars['time']
+        start = int(np.searchsorted(times, last_time, side='left'))
+        if start < len(bars) and int(times[start]) == last_time:
+            self._write((self._head - 1) % self.capacity, bars[start])
+            start += 1
+        for bar in bars[start:]:
+            self._write(self._head, bar)
+            self._head = (self._head + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+        self.version += 1
+        return True
+
+    def view(self, count: int) -> np.ndarray:
+        """Read-only view of the newest `count` bars (oldest first)."""
+        count = min(count, self._size)
+        end = self._head if self._head >= count else self._head + self.capacity
+        view = self._buf[end - count:end]
+        view.flags.writeable = False
+        return view
+
+
+class CandleStore:
+    """
+    Shared candle cache keyed by (symbol, timeframe).
+
+    get() returns a read-only NumPy structured view of the newest bars. Views
+    reflect the buffer in place: the forming bar may be updated by a later
+    refresh, so copy the view if it must outlive the current computation.
+    """
+
+    def __init__(self, rates_fn: RatesFetchFn, capacity: int = DEFAULT_CAPACITY,
+                 initial_bars: int = DEFAULT_INITIAL_BARS,
+                 min_refresh_seconds: float = DEFAULT_MIN_REFRESH_SECONDS):
+        """
+        Initialize the store.
+
+        Args:
+            rates_fn: Broker read (symbol, timeframe, start_pos, count) -> rates array or None
+            capacity: Bars kept per (symbol, timeframe)
+            initial_bars: Bars loaded on first access (so consumers asking for
+                different depths share one load)
+            min_refresh_seconds: Default max age before a read triggers an incremental fetch
+        """
+        self._rates_fn = rates_fn
+        self.capacity = max(2, int(capacity))
+        self.initial_bars = min(self.capacity, max(1, int(initial_bars)))
+        self.min_refresh_seconds = min_refresh_seconds
+
+        self._rings: Dict[Tuple[str, int], CandleRing] = {}
+        self._rings_lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, int], threading.Lock] = {}
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'incremental_fetches': 0,
+            'full_loads': 0,
+            'bars_fetched': 0,
+            'fetch_failures': 0,
+        }
+
+    def _ring_and_lock(self, key: Tuple[str, int]) -> Tuple[CandleRing, threading.Lock]:
+        with self._rings_lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                ring = CandleRing(self.capacity)
+                self._rings[key] = ring
+                self._key_locks[key] = threading.Lock()
+            return ring, self._key_locks[key]
+
+    def _count_stat(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _fetch(self, symbol: str, timeframe: int, count: int) -> Optional[np.ndarray]:
+        try:
+            bars = _to_rates_array(self._rates_fn(symbol, timeframe, 0, count))
+        except Exception as e:
+            logger.debug(f"[CANDLE_STORE] {symbol} tf={timeframe} fetch raised: {e}")
+            bars = None
+        if bars is None:
+            self._count_stat('fetch_failures')
+        else:
+            self._count_stat('bars_fetched', len(bars))
+        return bars
+
+    def _refresh(self, ring: CandleRing, symbol: str, timeframe: int, count: int, now: float) -> bool:
+        """Bring the ring up to date. Caller holds the key lock."""
+        if len(ring) == 0 or (count > len(ring) and len(ring) < self.capacity):
+            bars = self._fetch(symbol, timeframe, min(self.capacity, max(count, self.initial_bars)))
+            if bars is None:
+                return False
+            ring.reset(bars)
+            self._count_stat('full_loads')
+        else:
+            # Bars elapsed since the last refresh, plus the forming bar and one of margin
+            elapsed_bars = int((now - ring.last_refresh) // timeframe_seconds(timeframe)) + 2
+            bars = self._fetch(symbol, timeframe, min(self.capacity, elapsed_bars))
+            if bars is None:
+                return False
+            if not ring.merge(bars):
+                # Gap (e.g. reconnect after a long outage) - reload the full window
+                bars = self._fetch(symbol, timeframe, min(self.capacity, max(count, self.initial_bars, len(ring))))
+                if bars is None:
+                    return False
+                ring.reset(bars)
+                self._count_stat('full_loads')
+            else:
+                self._count_stat('incremental_fetches')
+        ring.last_refresh = now
+        return True
+
+    def get(self, symbol: str, timeframe: int, count: int,
+            max_age_seconds: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Newest `count` bars for symbol/timeframe as a read-only structured view.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: MT5 timeframe constant
+            count: Number of bars (oldest first, newest last)
+            max_age_seconds: Staleness this caller accepts (default: min_refresh_seconds)
+
+        Returns:
+            Structured array with RATES_DTYPE fields, or None if no data is available
+        """
+        return self.get_versioned(symbol, timeframe, count, max_age_seconds)[0]
+
+    def get_versioned(self, symbol: str, timeframe: int, count: int,
+                      max_age_seconds: Optional[float] = None) -> Tuple[Optional[np.ndarray], int]:
+        """
+        Same as get(), plus the series version.
+
+        The version changes whenever the stored bars change, so consumers can
+        cache derived data (e.g. a DataFrame) until it moves. Uncached reads
+        (count > capacity) return version -1.
+        """
+        if count <= 0:
+            return None, -1
+        if count > self.capacity:
+            # Larger than the ring - serve directly (not cached)
+            return self._fetch(symbol, timeframe, count), -1
+
+        max_age = self.min_refresh_seconds if max_age_seconds is None else max_age_seconds
+        ring, key_lock = self._ring_and_lock((symbol, timeframe))
+        with key_lock:
+            now = time.time()
+            fresh = len(ring) >= count or len(ring) == self.capacity
+            if fresh and len(ring) > 0 and now - ring.last_refresh < max_age:
+                self._count_stat('hits')
+            elif not self._refresh(ring, symbol, timeframe, count, now) and len(ring) == 0:
+                return None, -1
+            return ring.view(count), ring.version
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached bars (all symbols, or one symbol on every timeframe)."""
+        with self._rings_lock:
+            for key in list(self._rings):
+                if symbol is None or key[0] == symbol:
+                    del self._rings[key]
+                    del self._key_locks[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters for monitoring."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        with self._rings_lock:
+            stats['series'] = len(self._rings)
+        return stats
+
+
+def get_candle_store(mt5_connector) -> Optional[CandleStore]:
+    """Candle store attached to a connector, or None (mocks, backtest and SIM_LIVE connectors)."""
+    store = getattr(mt5_connector, 'candle_store', None)
+    return store if isinstance(store, CandleStore) else None
@@ -0,0 +1,459 @@
+"""
+Incremental Deal Journal
+In-memory index of MT5 deals by position ticket and deal ticket.
+
+Closure handling called mt5.history_deals_get(position=ticket) once per ticket
+and lookup (OrderManager.get_deal_history() and get_close_reason_from_deals()
+each fetched the same deals; PositionMonitor fetched them again for the
+symbol), so a burst of simultaneous SL hits cost dozens of broker calls.
+DealJournal pulls history_deals_get(date_from, date_to) incrementally instead:
+
+- each sync requests deals from the high-water mark (newest deal time seen,
+  minus an overlap for deals sharing a second) and merges them by deal ticket
+- lookups are served from memory; a lookup that needs an exit deal the journal
+  has not seen yet triggers one sync (rate limited), so N closures detected
+  together cost one broker call
+- positions older than the journal window fall back to a per-position call,
+  whose result is indexed as well
+- the high-water mark is persisted (JSON, atomic replace) so a restart resumes
+  from it instead of re-reading the whole lookback window; positions opened
+  before the restart have no indexed entry deal and take the per-position
+  fallback once
+- an optional producer thread syncs on a fixed cadence
+
+Broker deal times are server time; date_to is set a day ahead so servers ahead
+of local time are covered.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from execution.mt5_io import MT5Priority, mt5_call
+from utils.logger_factory import get_logger
+
+logger = get_logger("deal_journal", "logs/live/system/order_manager.log")
+
+DEFAULT_STATE_PATH = Path(__file__).parent.parent / 'data' / 'deal_journal_state.json'
+
+# MT5 deal entry codes (mt5.DEAL_ENTRY_IN / mt5.DEAL_ENTRY_OUT)
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+
+
+class DealRecord:
+    """Immutable copy of one MT5 deal."""
+
+    __slots__ = ('ticket', 'order', 'position_id', 'time', 'type', 'entry', 'price', 'volume', 'symbol',
+                 'profit', 'commission', 'swap', 'magic', 'reason', 'comment')
+
+    def __init__(self, deal: Any):
+        """Copy the fields of an MT5 deal record (or a dict with the same keys)."""
+        get = deal.get if isinstance(deal, Mapping) else (lambda name, default=None: getattr(deal, name, default))
+        self.ticket = int(get('ticket', 0))
+        self.order = get('order', 0)
+        self.position_id = int(get('position_id', 0) or 0)
+        self.time = get('time', 0)
+        self.type = get('type', 0)
+        self.entry = get('entry', -1)
+        self.price = get('price', 0.0)
+        self.volume = get('volume', 0.0)
+        self.symbol = get('symbol', '')
+        self.profit = get('profit', 0.0) or 0.0
+        self.commission = get('commission', 0.0) or 0.0
+        self.swap = get('swap', 0.0) or 0.0
+        self.magic = get('magic', 0)
+        self.reason = get('reason', 0)
+        self.comment = get('comment', '')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Deal dict in the get_deal_history() shape."""
+        return {
+            'ticket': self.ticket,
+            'time': datetime.fromtimestamp(self.time),
+            'price': self.price,
+            'volume': self.volume,
+            'symbol': self.symbol,
+            'type': self.type,
+            'profit': self.profit,
+            'commission': self.commission,
+            'swap': self.swap,
+        }
+
+
+def summarize_deals(deals: Iterable[DealRecord], entry_in: int = DEAL_ENTRY_IN,
+                    entry_out: int = DEAL_ENTRY_OUT) -> Optional[Dict[str, Any]]:
+    """
+    get_deal_history() result for the deals of one position.
+
+    Returns:
+        Dict with entry_deal, exit_deal, total_profit, commission, swap and
+        status ('CLOSED' / 'OPEN'), or None without deals
+    """
+    entry_deal = None
+    exit_deal = None
+    total_profit = 0.0
+    commission = 0.0
+    swap = 0.0
+    found = False
+    for deal in deals:
+        found = True
+        if deal.entry == entry_in:
+            entry_deal = deal.to_dict()
+        elif deal.entry == entry_out:
+            exit_deal = deal.to_dict()
+        total_profit += deal.profit
+        commission += deal.commission
+        swap += deal.swap
+    if not found:
+        return None
+    return {
+        'entry_deal': entry_deal,
+        'exit_deal': exit_deal,
+        'total_profit': total_profit,
+        'commission': commission,
+        'swap': swap,
+        'status': 'CLOSED' if exit_deal else 'OPEN'
+    }
+
+
+class DealJournal:
+    """Deals indexed by position ticket, refreshed incrementally from the broker (thread-safe)."""
+
+    def __init__(self, mt5_connector, mt5_provider: Optional[Callable[[], Any]] = None, poll_interval_seconds: float = 1.0,
+                 min_refresh_interval_seconds: float = 0.25, lookback_hours: float = 24.0,
+                 overlap_seconds: float = 60.0, state_path: Optional[Path] = None, enabled: bool = True):
+        """
+        Initialize the journal and load the persisted high-water mark.
+
+        Args:
+            mt5_connector: Connector used for the broker calls (mt5_call)
+            mt5_provider: Returns the MT5 module to call (MetaTrader5 if None); resolved per call
+                so a module swapped after construction (SIM_LIVE) is picked up
+            poll_interval_seconds: Cadence of the producer thread and of lookup-triggered syncs
+            min_refresh_interval_seconds: Minimum time between syncs forced by a missing exit deal
+            lookback_hours: Window read on first sync and kept in memory
+            overlap_seconds: Re-read this far behind the high-water mark
+            state_path: JSON file for the high-water mark (None = not persisted)
+            enabled: False serves every lookup with a per-position call (legacy behaviour)
+        """
+        self.mt5_connector = mt5_connector
+        self._mt5_provider = mt5_provider
+        self.poll_interval_seconds = poll_interval_seconds
+        self.min_refresh_interval_seconds = min_refresh_interval_seconds
+        self.lookback_seconds = lookback_hours * 3600.0
+        self.overlap_seconds = overlap_seconds
+        self.state_path = Path(state_path) if state_path is not None else None
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()  # Single-flight: one broker read at a time
+        self._deals: Dict[int, DealRecord] = {}  # {deal_ticket: deal}
+        self._by_position: Dict[int, Dict[int, DealRecord]] = {}  # {position_ticket: {deal_ticket: deal}}
+        self._high_water_time = 0  # Newest deal time seen (broker epoch seconds)
+        self._last_sync = 0.0
+        self._sync_count = 0
+        self._range_supported = True
+        self._stats = {'syncs': 0, 'sync_failures': 0, 'deals_indexed': 0, 'hits': 0, 'misses': 0,
+                       'position_fallbacks': 0}
+
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown_event = threading.Event()
+
+        self._load_state()
+
+    @classmethod
+    def from_config(cls, mt5_connector, config: Mapping[str, Any],
+                    mt5_provider: Optional[Callable[[], Any]] = None) -> 'DealJournal':
+        """Journal configured by execution.deal_journal (state persisted only with mt5.server outside backtest)."""
+        journal_config = config.get('execution', {}).get('deal_journal', {})
+        is_backtest = config.get('mode') == 'backtest'
+        persist = journal_config.get('persist', True) and bool(config.get('mt5', {}).get('server')) and not is_backtest
+        return cls(
+            mt5_connector,
+            mt5_provider=mt5_provider,
+            poll_interval_seconds=journal_config.get('poll_interval_seconds', 1.0),
+            min_refresh_interval_seconds=journal_config.get('min_refresh_interval_seconds', 0.25),
+            lookback_hours=journal_config.get('lookback_hours', 24.0),
+            overlap_seconds=journal_config.get('overlap_seconds', 60.0),
+            state_path=Path(journal_config.get('state_path') or DEFAULT_STATE_PATH) if persist else None,
+            enabled=journal_config.get('enabled', not is_backtest),
+        )
+
+    @property
+    def mt5(self):
+        if self._mt5_provider is not None:
+            return self._mt5_provider()
+        import MetaTrader5
+        return MetaTrader5
+
+    # ------------------------------------------------------------------ broker reads
+
+    def sync(self, force: bool = False) -> bool:
+        """
+        Read new deals from the broker.
+
+        Args:
+            force: Ignore poll_interval_seconds (min_refresh_interval_seconds still applies)
+
+        Returns:
+            True if a broker read happened and succeeded
+        """
+        if not self.enabled or not self._range_supported:
+            return False
+        sync_count = self._sync_count
+        with self._sync_lock:
+            if self._sync_count != sync_count:
+                return True  # Another thread synced while we waited
+            elapsed = time.time() - self._last_sync
+            if elapsed < (self.min_refresh_interval_seconds if force else self.poll_interval_seconds):
+                return False
+            return self._sync_locked()
+
+    def _sync_locked(self) -> bool:
+        if not self.mt5_connector.ensure_connected():
+            return False
+        now = time.time()
+        start = self._high_water_time - self.overlap_seconds if self._high_water_time else now - self.lookback_seconds
+        date_from = datetime.fromtimestamp(max(0.0, start))
+        date_to = datetime.now() + timedelta(days=1)  # Broker server time may be ahead of local time
+        try:
+            deals = mt5_call(self.mt5_connector, self.mt5.history_deals_get, date_from, date_to,
+                             priority=MT5Priority.MONITORING)
+        except TypeError:
+            # Providers without range queries (SIM_LIVE wrapper): per-position calls only
+            self._range_supported = False
+            logger.info("[DEAL_JOURNAL] history_deals_get(from, to) unsupported - using per-position reads")
+            return False
+        except Exception as e:
+            deals = None
+            logger.warning(f"[DEAL_JOURNAL] Deal history read failed: {e}")
+
+        self._last_sync = now
+        self._sync_count += 1
+        if deals is None:
+            with self._lock:
+                self._stats['sync_failures'] += 1
+            return False
+
+        indexed = self._index(deals)
+        with self._lock:
+            self._stats['syncs'] += 1
+            self._stats['deals_indexed'] += indexed
+        self._prune(now)
+        self._save_state()
+        return True
+
+    def _index(self, deals: Iterable[Any]) -> int:
+        """Merge deals into the indexes; returns the number of new deals."""
+        new = 0
+        with self._lock:
+            for raw in deals:
+                try:
+                    deal = DealRecord(raw)
+                except (TypeError, ValueError):
+                    continue
+                if not deal.ticket:
+                    continue
+                if deal.ticket not in self._deals:
+                    new += 1
+                self._deals[deal.ticket] = deal
+                if deal.position_id:
+                    self._by_position.setdefault(deal.position_id, {})[deal.ticket] = deal
+                if deal.time and deal.time > self._high_water_time:
+                    self._high_water_time = deal.time
+        return new
+
+    def _prune(self, now: float):
+        """Drop positions whose newest deal is older than the lookback window."""
+        cutoff = min(now, self._high_water_time or now) - self.lookback_seconds
+        with self._lock:
+            stale = [position for position, deals in self._by_position.items()
+                     if max(deal.time for deal in deals.values()) < cutoff]
+            for position in stale:
+                for deal_ticket in self._by_position.pop(position):
+                    self._deals.pop(deal_ticket, None)
+
+    def _fetch_position(self, ticket: int) -> List[DealRecord]:
+        """Per-position broker read (positions outside the journal window)."""
+        if not self.mt5_connector.ensure_connected():
+            return []
+        deals = mt5_call(self.mt5_connector, self.mt5.history_deals_get, position=ticket,
+                         priority=MT5Priority.MONITORING)
+        with self._lock:
+            self._stats['position_fallbacks'] += 1
+        if not deals:
+            return []
+        records = []
+        for raw in deals:
+            try:
+                deal = DealRecord(raw)
+            except (TypeError, ValueError):
+                continue
+            if deal.position_id in (0, ticket):  # Providers that ignore the position filter
+                records.append(deal)
+        if self.enabled:
+            with self._lock:
+                for deal in records:
+                    self._by_position.setdefault(ticket, {})[deal.ticket] = deal
+                    self._deals[deal.ticket] = deal
+        return records
+
+    # ------------------------------------------------------------------ lookups
+
+    def _indexed(self, ticket: int) -> Optional[List[DealRecord]]:
+        with self._lock:
+            deals = self._by_position.get(ticket)
+            return sorted(deals.values(), key=lambda deal: (deal.time, deal.ticket)) if deals else None
+
+    def deals_for_position(self, ticket: int, require_exit: bool = False) -> List[DealRecord]:
+        """
+        Deals of a position, oldest first.
+
+        Args:
+            ticket: Position ticket
+            require_exit: The position is known to be closed - sync once if its exit deal is missing
+
+        A position without an indexed entry deal is read from the broker (per-position call).
+        """
+        if not self.enabled:
+            return self._fetch_position(ticket)
+
+        in_code = self._entry_in()
+        out_code = self._entry_out()
+
+        def has_exit(deals):
+            return not require_exit or any(deal.entry == out_code for deal in deals)
+
+        deals = self._indexed(ticket)
+        has_entry = deals is not None and any(deal.entry == in_code for deal in deals)
+        if has_entry and has_exit(deals):
+            with self._lock:
+                self._stats['hits'] += 1
+            return deals
+
+        with self._lock:
+            self._stats['misses'] += 1
+        if deals is None or not has_exit(deals):
+            self.sync(force=True)
+            deals = self._indexed(ticket)
+            has_entry = deals is not None and any(deal.entry == in_code for deal in deals)
+            if has_entry and has_exit(deals):
+                return deals
+        # Outside the journal window, range reads unsupported, or the entry deal predates the
+        # indexed range (position opened before a restart resumed at the high-water mark, or
+        # its entry was pruned) - syncing cannot find it, read the whole position
+        if not has_entry or not self._range_supported:
+            return self._fetch_position(ticket)
+        return deals
+
+    def get_deal(self, deal_ticket: int) -> Optional[DealRecord]:
+        """Deal by deal ticket, if indexed."""
+        with self._lock:
+            return self._deals.get(deal_ticket)
+
+    def get_position_summary(self, ticket: int, require_exit: bool = False) -> Optional[Dict[str, Any]]:
+        """get_deal_history() result for a position (None without deals)."""
+        return summarize_deals(self.deals_for_position(ticket, require_exit=require_exit),
+                               self._entry_in(), self._entry_out())
+
+    def prefetch(self, tickets: Iterable[int]) -> int:
+        """
+        Make sure the exit deals of closed positions are indexed with one broker read.
+
+        Returns:
+            Number of tickets whose exit deal is still unknown afterwards
+        """
+        out_code = self._entry_out()
+
+        def missing():
+            return [ticket for ticket in tickets
+                    if not any(deal.entry == out_code for deal in (self._indexed(ticket) or ()))]
+
+        tickets = list(tickets)
+        if not self.enabled or not missing():
+            return len(missing()) if self.enabled else len(tickets)
+        self.sync(force=True)
+        return len(missing())
+
+    def _entry_in(self) -> int:
+        return getattr(self.mt5, 'DEAL_ENTRY_IN', DEAL_ENTRY_IN)
+
+    def _entry_out(self) -> int:
+        return getattr(self.mt5, 'DEAL_ENTRY_OUT', DEAL_ENTRY_OUT)
+
+    # ------------------------------------------------------------------ producer
+
+    def start(self):
+        """Start the producer thread (idempotent, no-op when disabled)."""
+        if not self.enabled or (self._running and self._thread and self._thread.is_alive()):
+            return
+        self._running = True
+        self._shutdown_event.clear()
+        self._thread = threading.Thread(target=self._producer_loop, name="DealJournal", daemon=True)
+        self._thread.start()
+        logger.info(f"[THREAD_START] DealJournal interval={self.poll_interval_seconds*1000:.0f}ms")
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the producer thread and persist the high-water mark."""
+        if self._running:
+            self._running = False
+            self._shutdown_event.set()
+            if self._thread and self._thread.is_alive():
+                self._thread.join(timeout=timeout)
+            logger.info("[THREAD_STOP] DealJournal reason=shutdown_requested")
+        self._save_state()
+
+    def _producer_loop(self):
+        while self._running and not self._shutdown_event.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error(f"[DEAL_JOURNAL] Producer error: {e}", exc_info=True)
+            self._shutdown_event.wait(self.poll_interval_seconds)
+
+    # ------------------------------------------------------------------ persistence
+
+    def _load_state(self):
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            high_water_time = int(state.get('high_water_time', 0))
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"[DEAL_JOURNAL] Could not read {self.state_path}: {e}")
+            return
+        # Never resume from further back than the lookback window
+        self._high_water_time = max(high_water_time, int(time.time() - self.lookback_seconds))
+
+    def _save_state(self):
+        if self.state_path is None or not self._high_water_time:
+            return
+        tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'high_water_time': self._high_water_time, 'saved_at': time.time()}, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"[DEAL_JOURNAL] Could not write {self.state_path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['positions'] = len(self._by_position)
+            stats['deals'] = len(self._deals)
+        stats.update({
+            'enabled': self.enabled,
+            'running': bool(self._running and self._thread and self._thread.is_alive()),
+            'range_supported': self._range_supported,
+            'high_water_time': self._high_water_time,
+            'last_sync_age_s': time.time() - self._last_sync if self._last_sync else None,
+        })
+        return stats
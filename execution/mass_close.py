@@ -0,0 +1,229 @@
+"""
+Mass-Close Engine
+Closes a set of positions with bounded concurrency and per-ticket retries.
+
+The kill switch closed positions one at a time through
+OrderManager.close_position(), so every close waited for the previous one's
+position read, symbol info, order_send and deal lookup, and a failed close
+held up all the others. MassCloseEngine runs the closes on a small worker
+pool instead:
+
+- up to max_workers closes are in flight; their MT5 calls go through the
+  connector's I/O executor at CLOSE priority like any other close, so the
+  executor always has the next close queued
+- a failed close is retried with exponential backoff on its own worker,
+  without delaying the other tickets
+- a ticket that a successful positions read no longer shows after a failed
+  attempt counts as closed (closed by SL/TP or by another thread in the
+  meantime); a failed read (disconnected) leaves it open and retried
+- an overall deadline bounds the retries; tickets still open then are
+  reported as failed
+
+The MassCloseReport lists every ticket's outcome, attempts and latency
+(engine start to final outcome).
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from utils.logger_factory import get_logger
+
+logger = get_logger("order_manager", "logs/live/system/order_manager.log")
+
+# Outcome status values
+CLOSED = 'closed'
+ALREADY_CLOSED = 'already_closed'
+FAILED = 'failed'
+
+
+class CloseOutcome:
+    """Result of closing one ticket."""
+
+    __slots__ = ('ticket', 'status', 'attempts', 'latency_ms', 'error')
+
+    def __init__(self, ticket: int, status: str, attempts: int, latency_ms: float, error: Optional[str] = None):
+        self.ticket = ticket
+        self.status = status
+        self.attempts = attempts
+        self.latency_ms = latency_ms  # Engine start to final outcome
+        self.error = error
+
+    @property
+    def success(self) -> bool:
+        return self.status != FAILED
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ticket': self.ticket,
+            'status': self.status,
+            'attempts': self.attempts,
+            'latency_ms': round(self.latency_ms, 1),
+            'error': self.error,
+        }
+
+
+class MassCloseReport:
+    """Completion summary of one mass close."""
+
+    def __init__(self, outcomes: List[CloseOutcome], elapsed_ms: float, reason: str):
+        self.outcomes = outcomes
+        self.elapsed_ms = elapsed_ms
+        self.reason = reason
+
+    @property
+    def failed_tickets(self) -> List[int]:
+        return [outcome.ticket for outcome in self.outcomes if not outcome.success]
+
+    @property
+    def all_closed(self) -> bool:
+        return not self.failed_tickets
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts, latency percentiles and failed tickets."""
+        latencies = sorted(outcome.latency_ms for outcome in self.outcomes)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        counts = {CLOSED: 0, ALREADY_CLOSED: 0, FAILED: 0}
+        for outcome in self.outcomes:
+            counts[outcome.status] += 1
+        return {
+            'reason': self.reason,
+            'requested': len(self.outcomes),
+            'closed': counts[CLOSED],
+            'already_closed': counts[ALREADY_CLOSED],
+            'failed': counts[FAILED],
+            'retries': sum(max(0, outcome.attempts - 1) for outcome in self.outcomes),
+            'elapsed_ms': round(self.elapsed_ms, 1),
+            'latency_ms': {'p50': percentile(0.50), 'p95': percentile(0.95), 'max': latencies[-1] if latencies else 0.0},
+            'failed_tickets': self.failed_tickets,
+        }
+
+    def format(self) -> str:
+        """One log line."""
+        s = self.summary()
+        return (f"[MASS_CLOSE] {s['reason']} | requested={s['requested']} closed={s['closed']} "
+                f"already_closed={s['already_closed']} failed={s['failed']} retries={s['retries']} | "
+                f"elapsed={s['elapsed_ms']:.0f}ms latency_p50={s['latency_ms']['p50']:.0f}ms "
+                f"p95={s['latency_ms']['p95']:.0f}ms max={s['latency_ms']['max']:.0f}ms"
+                + (f" | failed_tickets={s['failed_tickets']}" if s['failed_tickets'] else ""))
+
+
+class MassCloseEngine:
+    """Parallel position closer with per-ticket retry and backoff."""
+
+    def __init__(self, close_fn: Callable[[int, str], bool],
+                 is_open_fn: Optional[Callable[[int], Optional[bool]]] = None,
+                 max_workers: int = 8, max_attempts: int = 3, backoff_seconds: float = 0.25,
+                 backoff_multiplier: float = 2.0, deadline_seconds: float = 30.0):
+        """
+        Initialize the engine.
+
+        Args:
+            close_fn: Closes one ticket: close_fn(ticket, comment) -> success
+            is_open_fn: Whether a ticket is still open, checked after a failed attempt: True/False,
+                or None if unknown (failed read - treated as open). None = assume open
+            max_workers: Closes in flight at once
+            max_attempts: Attempts per ticket
+            backoff_seconds: Delay before the first retry (jittered +-20%)
+            backoff_multiplier: Delay growth per retry
+            deadline_seconds: No retries are started after this much time (every ticket gets one attempt)
+        """
+        self.close_fn = close_fn
+        self.is_open_fn = is_open_fn
+        self.max_workers = max(1, max_workers)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.backoff_multiplier = backoff_multiplier
+        self.deadline_seconds = deadline_seconds
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], close_fn: Callable[[int, str], bool],
+                    is_open_fn: Optional[Callable[[int], Optional[bool]]] = None) -> 'MassCloseEngine':
+        """Engine configured by execution.mass_close."""
+        mass_close_config = config.get('execution', {}).get('mass_close', {})
+        return cls(
+            close_fn,
+            is_open_fn=is_open_fn,
+            max_workers=mass_close_config.get('max_workers', 8),
+            max_attempts=mass_close_config.get('max_attempts', 3),
+            backoff_seconds=mass_close_config.get('backoff_seconds', 0.25),
+            backoff_multiplier=mass_close_config.get('backoff_multiplier', 2.0),
+            deadline_seconds=mass_close_config.get('deadline_seconds', 30.0),
+        )
+
+    def close_all(self, tickets: Iterable[int], comment: str, reason: Optional[str] = None) -> MassCloseReport:
+        """
+        Close every ticket and wait for the outcome of all of them.
+
+        Args:
+            tickets: Position tickets (duplicates are closed once)
+            comment: Close comment passed to close_fn
+            reason: Label for the report (comment if None)
+
+        Returns:
+            MassCloseReport with one outcome per ticket
+        """
+        tickets = list(dict.fromkeys(tickets))
+        reason = reason or comment
+        start = time.perf_counter()
+        deadline = start + self.deadline_seconds
+        if not tickets:
+            return MassCloseReport([], 0.0, reason)
+
+        workers = min(self.max_workers, len(tickets))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="MassClose") as pool:
+            futures = [pool.submit(self._close_one, ticket, comment, start, deadline) for ticket in tickets]
+            outcomes = []
+            for ticket, future in zip(tickets, futures):
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    outcomes.append(CloseOutcome(ticket, FAILED, 0, (time.perf_counter() - start) * 1000, str(e)))
+
+        report = MassCloseReport(outcomes, (time.perf_counter() - start) * 1000, reason)
+        if report.all_closed:
+            logger.info(report.format())
+        else:
+            logger.error(report.format())
+        return report
+
+    def _close_one(self, ticket: int, comment: str, start: float, deadline: float) -> CloseOutcome:
+        delay = self.backoff_seconds
+        error = None
+        attempts = 0
+        while attempts < self.max_attempts:
+            attempts += 1
+            try:
+                if self.close_fn(ticket, comment):
+                    return CloseOutcome(ticket, CLOSED, attempts, (time.perf_counter() - start) * 1000)
+                error = "close rejected"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+            # The position may be gone already (SL/TP hit or closed elsewhere).
+            # Only a successful read without the ticket counts - None (read failed) is "still open"
+            if self.is_open_fn is not None:
+                try:
+                    if self.is_open_fn(ticket) is False:
+                        return CloseOutcome(ticket, ALREADY_CLOSED, attempts, (time.perf_counter() - start) * 1000)
+                except Exception as e:
+                    logger.debug(f"[MASS_CLOSE] Open check failed for ticket {ticket}: {e}")
+
+            if attempts >= self.max_attempts:
+                break
+            wait = delay * random.uniform(0.8, 1.2)
+            if time.perf_counter() + wait >= deadline:
+                error = f"{error} (deadline reached)"
+                break
+            logger.warning(f"[MASS_CLOSE] Ticket {ticket} attempt {attempts} failed ({error}) - "
+                           f"retrying in {wait*1000:.0f}ms")
+            time.sleep(wait)
+            delay *= self.backoff_multiplier
+
+        return CloseOutcome(ticket, FAILED, attempts, (time.perf_counter() - start) * 1000, error)
@@ -3,15 +3,22 @@ MT5 Connection and Reconnection Manager
 Handles connection to MetaTrader 5 with automatic reconnection logic.
 """
 
-import MetaTrader5 as mt5
+import MetaTrader5
 import time
 import threading
 from typing import Optional, Dict, Any, Tuple, List
 import json
+from execution.candle_store import CandleStore, DEFAULT_CAPACITY, DEFAULT_INITIAL_BARS, DEFAULT_MIN_REFRESH_SECONDS
+from execution.mt5_io import MT5IOExecutor, MT5Priority, MT5RequestTimeout, DEFAULT_TIMEOUT_SECONDS
+from execution.mt5_metrics import get_mt5_metrics, instrument_mt5
+from utils import system_health
 from utils.logger_factory import get_logger
 
 logger = get_logger("mt5_connection", "logs/live/system/mt5_connection.log")
 
+# Every MT5 call made here is timed per function and calling thread (see mt5_metrics)
+mt5 = instrument_mt5(MetaTrader5)
+
 
 class MT5Connector:
     """Manages MT5 connection with auto-reconnect functionality."""
@@ -23,20 +30,26 @@ class MT5Connector:
         self.reconnect_attempts = self.mt5_config.get('reconnect_attempts', 5)
         self.reconnect_delay = self.mt5_config.get('reconnect_delay', 5)
         
-        # Symbol info caching (TTL: 5 seconds)
-        self._symbol_info_cache = {}
+        # Three-tier symbol info cache:
+        # - specs: session-static fields of mt5.symbol_info (contract size, digits, volume
+        #   step, filling/swap mode, stops level), kept until reconnect or invalidate_symbol_info()
+        # - rates: tick value, margin and swaps from mt5.symbol_info (converted at the current
+        #   rate on cross-currency symbols), refreshed on their own slower cadence
+        # - quotes: bid/ask/spread from mt5.symbol_info_tick (TTL: 5 seconds)
+        self._symbol_specs = {}  # {symbol: (spec, loaded_time)}
+        self._symbol_spec_max_age = self.mt5_config.get('symbol_spec_max_age_seconds', 900.0)  # <= 0: session lifetime
+        self._symbol_rates = {}  # {symbol: (rates, loaded_time)}
+        self._symbol_rate_max_age = self.mt5_config.get('symbol_rate_max_age_seconds', 60.0)
+        self._symbol_info_cache = {}  # {symbol: (quote, fetched_time)}
         self._symbol_cache_ttl = 5.0  # seconds
         self._cache_lock = threading.Lock()
+        self._symbol_cache_stats = {'spec_loads': 0, 'rate_loads': 0, 'quote_fetches': 0, 'hits': 0}
         
         # P1-7 FIX: Price Staleness Tightening - Reduced to 2 seconds for order placement
         # Price staleness check (reject prices older than 2 seconds for orders, 5 seconds for scanning)
         self._price_max_age_seconds = 2.0  # Reduced from 5.0 for order placement
         self._price_max_age_seconds_scanning = 5.0  # Keep 5 seconds for scanning
         
-        # P2-13 FIX: Symbol Info Cache Invalidation - Track last prices for movement detection
-        self._last_symbol_prices = {}  # {symbol: {'bid': float, 'ask': float, 'timestamp': float}}
-        self._price_movement_threshold_pct = 0.1  # 0.1% price movement invalidates cache
-        
         # P0-1 FIX: MT5 Connection Loss Protection - Track reconnection attempts
         self._reconnection_failure_count = 0
         self._max_reconnection_failures = 3  # Circuit breaker threshold
@@ -48,6 +61,80 @@ class MT5Connector:
         self._total_reconnect_attempts = 0
         self._reconnect_backoff_cap_seconds = 60.0  # Max backoff delay (60 seconds)
         
+        # Global cap on concurrent MT5 data calls (parallel symbol scans, monitors and
+        # workers share one terminal connection) - used when the I/O executor is disabled
+        self.max_concurrent_calls = max(1, int(self.mt5_config.get('max_concurrent_calls', 4)))
+        self._call_slots = threading.BoundedSemaphore(self.max_concurrent_calls)
+        
+        # Dedicated MT5 I/O thread: requests are served by priority (emergency SL >
+        # closes > SL trailing > orders > market data > monitoring)
+        io_config = self.mt5_config.get('io_executor', {})
+        self.mt5_io = MT5IOExecutor(
+            enabled=io_config.get('enabled', config.get('mode') not in ('backtest', 'SIM_LIVE')),
+            default_timeout=io_config.get('default_timeout_seconds', DEFAULT_TIMEOUT_SECONDS)
+        )
+        
+        # MT5 RPC latency histograms and I/O queue stats in system_health.get_health_snapshot()
+        rpc_metrics = get_mt5_metrics()
+        system_health.register_metrics_source("mt5_rpc", rpc_metrics.get_snapshot, rpc_metrics.format_summary)
+        system_health.register_metrics_source("mt5_io", self.mt5_io.get_stats)
+        system_health.register_metrics_source("symbol_cache", self.get_symbol_cache_stats)
+        
+        # Shared candle store: one ring buffer per (symbol, timeframe), fetched incrementally
+        # and read by TrendFilter, RiskManager and VolumeFilter
+        candle_config = config.get('trading', {}).get('candle_store', {})
+        self.candle_store = CandleStore(
+            rates_fn=self._copy_rates_for_store,
+            capacity=candle_config.get('capacity', DEFAULT_CAPACITY),
+            initial_bars=candle_config.get('initial_bars', DEFAULT_INITIAL_BARS),
+            min_refresh_seconds=candle_config.get('min_refresh_seconds', DEFAULT_MIN_REFRESH_SECONDS)
+        )
+        
+    def _call_mt5(self, fn, *args, priority: Optional[MT5Priority] = None,
+                  timeout: Optional[float] = None, **kwargs):
+        """
+        Run an MT5 call on the I/O executor (or inline within the concurrency limit).
+        
+        Args:
+            fn: MT5 function
+            priority: Request priority (default: the calling thread's priority scope)
+            timeout: Seconds the request may wait in the queue
+        
+        Returns:
+            fn's result, or None if the request expired in the queue
+        """
+        if not self.mt5_io.enabled:
+            with self._call_slots:
+                return fn(*args, **kwargs)
+        try:
+            return self.mt5_io.call(fn, *args, priority=priority, timeout=timeout, **kwargs)
+        except MT5RequestTimeout as e:
+            logger.warning(f"[MT5_IO] {e}")
+            return None
+    
+    def _copy_rates_for_store(self, symbol: str, timeframe: int, start_pos: int, count: int):
+        """Broker bar read used by the candle store."""
+        if not self.ensure_connected():
+            return None
+        return self._call_mt5(mt5.copy_rates_from_pos, symbol, timeframe, start_pos, count,
+                              priority=MT5Priority.MARKET_DATA)
+    
+    def get_candles(self, symbol: str, timeframe: int, count: int,
+                    max_age_seconds: Optional[float] = None):
+        """
+        Newest bars for a symbol from the shared candle store.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: MT5 timeframe constant
+            count: Number of bars (oldest first)
+            max_age_seconds: Staleness the caller accepts (default: store refresh interval)
+        
+        Returns:
+            Read-only NumPy structured array (copy_rates_from_pos layout) or None
+        """
+        return self.candle_store.get(symbol, timeframe, count, max_age_seconds=max_age_seconds)
+    
     def connect(self) -> bool:
         """Connect to MT5 terminal."""
         if self.connected and mt5.terminal_info() is not None:
@@ -190,6 +277,8 @@ class MT5Connector:
             return False
         
         self.connected = True
+        # New session: symbol specifications may have changed (e.g. account or server switch)
+        self.invalidate_symbol_info()
         success_msg = f"[OK] MT5 connected successfully. Account: {account_info.login}, Balance: {account_info.balance}"
         logger.info(success_msg)
         print(success_msg)
@@ -243,7 +332,7 @@ class MT5Connector:
             return self.connect()
         
         # Check if still connected
-        terminal_info = mt5.terminal_info()
+        terminal_info = self._call_mt5(mt5.terminal_info)
         if terminal_info is None:
             logger.warning("MT5 connection lost, attempting reconnect...")
             # P0-1 FIX: Check circuit breaker before reconnecting
@@ -265,7 +354,7 @@ class MT5Connector:
             if not self.connected:
                 return None
             
-            positions = mt5.positions_get()
+            positions = self._call_mt5(mt5.positions_get, priority=MT5Priority.MONITORING)
             if positions is None:
                 return None
             
@@ -359,7 +448,7 @@ class MT5Connector:
         if not self.ensure_connected():
             return None
         
-        account_info = mt5.account_info()
+        account_info = self._call_mt5(mt5.account_info)
         if account_info is None:
             return None
         
@@ -389,121 +478,159 @@ class MT5Connector:
             'swap_mode': swap_mode
         }
     
-    def get_symbol_info(self, symbol: str, check_price_staleness: bool = False) -> Optional[Dict[str, Any]]:
-        """
-        Get symbol information with caching.
-        
-        Args:
-            symbol: Trading symbol
-            check_price_staleness: If True, reject stale prices (>5s old). 
-                                  Default False - only check when placing orders, not during scanning.
-        """
-        if not self.ensure_connected():
-            return None
-        
-        now = time.time()
-        
-        # P2-13 FIX: Check cache with price movement detection
-        with self._cache_lock:
-            if symbol in self._symbol_info_cache:
-                cached_data, cached_time = self._symbol_info_cache[symbol]
-                
-                # P2-13 FIX: Check if price moved significantly (invalidate cache)
-                if symbol in self._last_symbol_prices:
-                    last_price_data = self._last_symbol_prices[symbol]
-                    cached_bid = cached_data.get('bid', 0)
-                    cached_ask = cached_data.get('ask', 0)
-                    last_bid = last_price_data.get('bid', 0)
-                    last_ask = last_price_data.get('ask', 0)
-                    
-                    if cached_bid > 0 and last_bid > 0:
-                        bid_movement_pct = abs(cached_bid - last_bid) / last_bid * 100
-                        ask_movement_pct = abs(cached_ask - last_ask) / last_ask * 100 if cached_ask > 0 and last_ask > 0 else 0
-                        
-                        if bid_movement_pct > self._price_movement_threshold_pct or ask_movement_pct > self._price_movement_threshold_pct:
-                            logger.debug(f"{symbol}: Price movement detected ({bid_movement_pct:.2f}% bid, {ask_movement_pct:.2f}% ask) - invalidating cache")
-                            del self._symbol_info_cache[symbol]
-                            # Continue to fetch fresh data
-                        elif now - cached_time < self._symbol_cache_ttl:
-                            # Return cached data if not stale and no significant movement
-                            if not check_price_staleness:
-                                return cached_data
-                            # If checking staleness, verify even cached data
-                            price_age = now - cached_time
-                            staleness_threshold = self._price_max_age_seconds if check_price_staleness else self._price_max_age_seconds_scanning
-                            if price_age > staleness_threshold:
-                                logger.debug(f"{symbol}: Cached price is stale ({price_age:.2f}s > {staleness_threshold}s), fetching fresh data")
-                            else:
-                                return cached_data
-                elif now - cached_time < self._symbol_cache_ttl:
-                    # No previous price data - use TTL check
-                    if not check_price_staleness:
-                        return cached_data
-                    price_age = now - cached_time
-                    staleness_threshold = self._price_max_age_seconds if check_price_staleness else self._price_max_age_seconds_scanning
-                    if price_age > staleness_threshold:
-                        logger.debug(f"{symbol}: Cached price is stale ({price_age:.2f}s > {staleness_threshold}s), fetching fresh data")
-                    else:
-                        return cached_data
-        
-        # Fetch fresh data
-        symbol_info = mt5.symbol_info(symbol)
-        if symbol_info is None:
-            logger.error(f"Symbol {symbol} not found")
-            return None
-        
-        # Get current tick time to check price staleness (only if requested)
-        tick_time = 0
-        if check_price_staleness:
-            tick = mt5.symbol_info_tick(symbol)
-            if tick:
-                tick_time = tick.time if hasattr(tick, 'time') else now
-        
-        result = {
+    @staticmethod
+    def _symbol_spec_from_info(symbol_info) -> Dict[str, Any]:
+        """Session-static fields of an mt5.symbol_info record."""
+        return {
             'name': symbol_info.name,
-            'bid': symbol_info.bid,
-            'ask': symbol_info.ask,
-            'spread': symbol_info.spread,
             'point': symbol_info.point,
             'digits': symbol_info.digits,
             'trade_mode': symbol_info.trade_mode,
             'trade_stops_level': symbol_info.trade_stops_level,
             'trade_freeze_level': symbol_info.trade_freeze_level,
             'contract_size': symbol_info.trade_contract_size,
-            'trade_tick_value': getattr(symbol_info, 'trade_tick_value', None),  # For indices/crypto
             'trade_tick_size': getattr(symbol_info, 'trade_tick_size', None),  # For indices/crypto
-            'margin_initial': symbol_info.margin_initial,
             'swap_mode': symbol_info.swap_mode,
-            'swap_long': symbol_info.swap_long,
-            'swap_short': symbol_info.swap_short,
             'volume_min': symbol_info.volume_min,
             'volume_max': symbol_info.volume_max,
             'volume_step': symbol_info.volume_step,
             'filling_mode': symbol_info.filling_mode,
-            '_fetched_time': now,  # Internal timestamp for staleness checks
-            '_tick_time': tick_time  # MT5 tick time (0 if not checked)
         }
+    
+    @staticmethod
+    def _symbol_rates_from_info(symbol_info) -> Dict[str, Any]:
+        """
+        Rate-dependent fields of an mt5.symbol_info record.
         
-        # P1-7 FIX: Check price staleness if requested (only when placing orders)
-        # Use tighter threshold (2s) for order placement, looser (5s) for scanning
-        if check_price_staleness and tick_time > 0:
-            price_age = now - tick_time
-            staleness_threshold = self._price_max_age_seconds if check_price_staleness else self._price_max_age_seconds_scanning
-            if price_age > staleness_threshold:
-                logger.warning(f"{symbol}: Price is stale ({price_age:.2f}s > {staleness_threshold}s), rejecting")
-                return None
+        Tick value, margin and swaps are converted into the account currency at the
+        current rate, so on cross-currency symbols they drift with the market.
+        """
+        return {
+            'trade_tick_value': getattr(symbol_info, 'trade_tick_value', None),  # For indices/crypto
+            'margin_initial': symbol_info.margin_initial,
+            'swap_long': symbol_info.swap_long,
+            'swap_short': symbol_info.swap_short,
+        }
+    
+    @staticmethod
+    def _symbol_quote_from_tick(tick, point: float) -> Dict[str, Any]:
+        """Quote fields of an mt5.symbol_info_tick record (spread in points, like symbol_info)."""
+        return {
+            'bid': tick.bid,
+            'ask': tick.ask,
+            'spread': int(round((tick.ask - tick.bid) / point)) if point else 0,
+            'tick_time': getattr(tick, 'time', 0) or 0,
+        }
+    
+    @staticmethod
+    def _assemble_symbol_info(spec: Dict[str, Any], rates: Dict[str, Any], quote: Dict[str, Any],
+                              fetched_time: float) -> Dict[str, Any]:
+        result = {
+            'name': spec['name'],
+            'bid': quote['bid'],
+            'ask': quote['ask'],
+            'spread': quote['spread'],
+        }
+        result.update(spec)
+        result.update(rates)
+        result['_fetched_time'] = fetched_time  # Internal timestamp for staleness checks
+        result['_tick_time'] = quote['tick_time']  # MT5 quote time (0 if unknown)
+        return result
+    
+    def get_symbol_info(self, symbol: str, check_price_staleness: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get symbol information with caching.
+        
+        Prices come from the quote cache (one mt5.symbol_info_tick read per refresh).
+        mt5.symbol_info is only read when the specification is missing or expired, or
+        when tick value, margin and swaps are older than symbol_rate_max_age_seconds.
+        
+        Args:
+            symbol: Trading symbol
+            check_price_staleness: If True, reject stale prices (>2s old).
+                                  Default False - only check when placing orders, not during scanning.
+        """
+        if not self.ensure_connected():
+            return None
+        
+        now = time.time()
+        quote_max_age = min(self._symbol_cache_ttl, self._price_max_age_seconds) if check_price_staleness else self._symbol_cache_ttl
         
-        # P2-13 FIX: Update cache and track price for movement detection
         with self._cache_lock:
-            self._symbol_info_cache[symbol] = (result, now)
-            # Track current prices for movement detection
-            self._last_symbol_prices[symbol] = {
-                'bid': result.get('bid', 0),
-                'ask': result.get('ask', 0),
-                'timestamp': now
-            }
+            spec_entry = self._symbol_specs.get(symbol)
+            rates_entry = self._symbol_rates.get(symbol)
+            quote_entry = self._symbol_info_cache.get(symbol)
+            spec = rates = quote = None
+            if spec_entry is not None and (self._symbol_spec_max_age <= 0 or now - spec_entry[1] < self._symbol_spec_max_age):
+                spec = spec_entry[0]
+            if rates_entry is not None and now - rates_entry[1] < self._symbol_rate_max_age:
+                rates = rates_entry[0]
+            if quote_entry is not None and now - quote_entry[1] < quote_max_age:
+                quote = quote_entry[0]
+            if spec is not None and rates is not None and quote is not None:
+                self._symbol_cache_stats['hits'] += 1
+                return self._assemble_symbol_info(spec, rates, quote, quote_entry[1])
+        
+        if spec is None or rates is None:
+            symbol_info = self._call_mt5(mt5.symbol_info, symbol)
+            if symbol_info is None:
+                logger.error(f"Symbol {symbol} not found")
+                return None
+            rates = self._symbol_rates_from_info(symbol_info)
+            with self._cache_lock:
+                if spec is None:
+                    # First use or expired spec
+                    spec = self._symbol_spec_from_info(symbol_info)
+                    self._symbol_specs[symbol] = (spec, now)
+                    self._symbol_cache_stats['spec_loads'] += 1
+                self._symbol_rates[symbol] = (rates, now)
+                self._symbol_cache_stats['rate_loads'] += 1
+        
+        quote_time = quote_entry[1] if quote is not None else now
+        if quote is None:
+            tick = self._call_mt5(mt5.symbol_info_tick, symbol)
+            if tick is None:
+                logger.error(f"Tick data not available for {symbol}")
+                return None
+            quote = self._symbol_quote_from_tick(tick, spec['point'])
+            
+            # P1-7 FIX: Check price staleness if requested (only when placing orders)
+            tick_time = quote['tick_time']
+            if check_price_staleness and tick_time > 0:
+                price_age = now - tick_time
+                if price_age > self._price_max_age_seconds:
+                    logger.warning(f"{symbol}: Price is stale ({price_age:.2f}s > {self._price_max_age_seconds}s), rejecting")
+                    return None
+            
+            with self._cache_lock:
+                self._symbol_info_cache[symbol] = (quote, now)
+                self._symbol_cache_stats['quote_fetches'] += 1
         
-        return result
+        return self._assemble_symbol_info(spec, rates, quote, quote_time)
+    
+    def invalidate_symbol_info(self, symbol: Optional[str] = None):
+        """
+        Drop cached symbol specifications, rates and quotes.
+        
+        Args:
+            symbol: Symbol to drop, or None for all symbols (done on every (re)connect)
+        """
+        with self._cache_lock:
+            if symbol is None:
+                self._symbol_specs.clear()
+                self._symbol_rates.clear()
+                self._symbol_info_cache.clear()
+            else:
+                self._symbol_specs.pop(symbol, None)
+                self._symbol_rates.pop(symbol, None)
+                self._symbol_info_cache.pop(symbol, None)
+    
+    def get_symbol_cache_stats(self) -> Dict[str, Any]:
+        """Symbol spec/rate/quote cache counters for monitoring."""
+        with self._cache_lock:
+            stats = dict(self._symbol_cache_stats)
+            stats['specs'] = len(self._symbol_specs)
+        return stats
     
     def is_symbol_tradeable_now(self, symbol: str, check_trade_allowed: bool = True) -> Tuple[bool, str]:
         """
@@ -531,22 +658,22 @@ class MT5Connector:
                     return False, "Expert advisor trading disabled - enable in MT5 terminal"
         
         # Get symbol info
-        symbol_info_obj = mt5.symbol_info(symbol)
+        symbol_info_obj = self._call_mt5(mt5.symbol_info, symbol)
         if symbol_info_obj is None:
             # Try to add symbol to Market Watch if not found
-            if not mt5.symbol_select(symbol, True):
+            if not self._call_mt5(mt5.symbol_select, symbol, True):
                 return False, f"Symbol {symbol} not found and cannot be added to Market Watch"
             # Retry getting symbol info after adding to Market Watch
-            symbol_info_obj = mt5.symbol_info(symbol)
+            symbol_info_obj = self._call_mt5(mt5.symbol_info, symbol)
             if symbol_info_obj is None:
                 return False, f"Symbol {symbol} not found even after adding to Market Watch"
         
         # Ensure symbol is in Market Watch (required for trading)
-        if not mt5.symbol_select(symbol, True):
+        if not self._call_mt5(mt5.symbol_select, symbol, True):
             return False, f"Symbol {symbol} cannot be added to Market Watch"
         
         # Refresh symbol data after adding to Market Watch
-        symbol_info_obj = mt5.symbol_info(symbol)
+        symbol_info_obj = self._call_mt5(mt5.symbol_info, symbol)
         if symbol_info_obj is None:
             return False, f"Symbol {symbol} info unavailable after Market Watch addition"
         
@@ -573,7 +700,7 @@ class MT5Connector:
             return False, f"Invalid volume step ({symbol_info_obj.volume_step})"
         
         # Get current tick to check if market is open
-        tick = mt5.symbol_info_tick(symbol)
+        tick = self._call_mt5(mt5.symbol_info_tick, symbol)
         if tick is None:
             return False, "Cannot get tick data - market may be closed"
         
@@ -618,7 +745,7 @@ class MT5Connector:
         if not self.ensure_connected():
             return None
         
-        tick = mt5.symbol_info_tick(symbol)
+        tick = self._call_mt5(mt5.symbol_info_tick, symbol)
         if tick is None:
             logger.debug(f"Tick data not available for {symbol}")
             return None
@@ -632,6 +759,12 @@ class MT5Connector:
             logger.warning(f"Invalid spread for {symbol}: bid={tick.bid} >= ask={tick.ask}")
             return None
         
+        # Feed the quote cache so the next get_symbol_info() needs no broker call
+        with self._cache_lock:
+            spec_entry = self._symbol_specs.get(symbol)
+            if spec_entry is not None:
+                self._symbol_info_cache[symbol] = (self._symbol_quote_from_tick(tick, spec_entry[0]['point']), time.time())
+        
         return tick
     
     def is_swap_free(self, symbol: str) -> bool:
@@ -646,6 +779,7 @@ class MT5Connector:
     
     def shutdown(self):
         """Shutdown MT5 connection."""
+        self.mt5_io.stop()
         mt5.shutdown()
         self.connected = False
         logger.info("MT5 connection closed")
@@ -0,0 +1,287 @@
+"""
+MT5 I/O Executor
+Dedicated thread that owns all MetaTrader5 calls, served in priority order.
+
+The MetaTrader5 Python API is a process-global, effectively serial channel:
+calls issued from many threads (SL worker, trailing monitors, scanners,
+watchdogs) simply queue up inside the library with no notion of urgency. The
+executor makes that queue explicit. Callers submit requests with a priority and
+an optional deadline and wait on a future; the I/O thread always serves the most
+urgent request first, so an emergency SL modify is never stuck behind a burst of
+market-data or monitoring reads.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import wraps
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from utils.logger_factory import get_logger
+
+logger = get_logger("mt5_io", "logs/live/system/mt5_connection.log")
+
+
+class MT5Priority(IntEnum):
+    """Request priority (lower value is served first)."""
+    EMERGENCY_SL = 0
+    CLOSE = 1
+    SL_TRAIL = 2
+    ORDER = 3
+    MARKET_DATA = 4
+    MONITORING = 5
+
+
+class MT5RequestTimeout(Exception):
+    """Request was not served before its deadline."""
+
+
+DEFAULT_TIMEOUT_SECONDS = 10.0
+
+# Priority inherited by calls that do not pass one explicitly (e.g. ensure_connected()
+# inside an emergency SL path runs at EMERGENCY_SL, not at the market-data default)
+_context = threading.local()
+
+
+@contextmanager
+def priority_scope(priority: MT5Priority) -> Iterator[None]:
+    """Run MT5 calls made by this thread inside the block at `priority` (nested scopes keep the most urgent)."""
+    previous = getattr(_context, 'priority', None)
+    _context.priority = priority if previous is None else min(previous, priority)
+    try:
+        yield
+    finally:
+        _context.priority = previous
+
+
+def with_priority(priority: MT5Priority):
+    """Decorator: run the function inside priority_scope(priority)."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with priority_scope(priority):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_priority(default: MT5Priority = MT5Priority.MARKET_DATA) -> MT5Priority:
+    """Priority of the innermost priority_scope() on this thread, or `default`."""
+    priority = getattr(_context, 'priority', None)
+    return default if priority is None else priority
+
+
+def calling_thread_name() -> str:
+    """Name of the thread an MT5 call is made for (the submitter, when running on the I/O thread)."""
+    caller = getattr(_context, 'caller', None)
+    return caller if caller is not None else threading.current_thread().name
+
+
+class _Request:
+    __slots__ = ('fn', 'args', 'kwargs', 'priority', 'deadline', 'future', 'submitted_at', 'caller')
+
+    def __init__(self, fn, args, kwargs, priority, deadline):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.deadline = deadline
+        self.future = Future()
+        self.submitted_at = time.time()
+        self.caller = threading.current_thread().name
+
+
+class MT5IOExecutor:
+    """
+    Single I/O thread serving MT5 requests from a priority queue.
+
+    Requests with equal priority are served in submission order. A request whose
+    deadline passes while it is still queued is dropped and its future fails with
+    MT5RequestTimeout. When the executor is disabled or stopped, or when called
+    from the I/O thread itself, requests run inline in the calling thread.
+    """
+
+    def __init__(self, enabled: bool = True, default_timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 name: str = "MT5-IO"):
+        """
+        Initialize the executor (the thread starts on the first request).
+
+        Args:
+            enabled: Route requests through the I/O thread (False = inline calls)
+            default_timeout: Deadline in seconds for requests that do not set one
+            name: I/O thread name
+        """
+        self.enabled = enabled
+        self.default_timeout = default_timeout
+        self.name = name
+
+        self._queue = []  # heap of (priority, sequence, request)
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'expired': 0,
+            'inline': 0,
+            'max_queue_depth': 0,
+        }
+        self._wait_ms_max = {p.name: 0.0 for p in MT5Priority}
+
+    def _ensure_started(self) -> bool:
+        """Start the I/O thread if needed. Caller holds self._cond."""
+        if not self.enabled or self._stopping:
+            return False
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return True
+
+    def _run_inline(self, fn: Callable, args, kwargs) -> Any:
+        with self._cond:
+            self._stats['inline'] += 1
+        return fn(*args, **kwargs)
+
+    def submit(self, fn: Callable, *args, priority: Optional[MT5Priority] = None,
+               timeout: Optional[float] = None, **kwargs) -> Future:
+        """
+        Queue an MT5 call.
+
+        Args:
+            fn: MT5 function (or a small closure of MT5 calls that must run back to back)
+            *args, **kwargs: Arguments for fn
+            priority: Request priority (default: current_priority())
+            timeout: Seconds the request may wait in the queue (default: default_timeout)
+
+        Returns:
+            Future resolving to fn's return value (or its exception)
+        """
+        priority = current_priority() if priority is None else MT5Priority(priority)
+        if threading.current_thread() is self._thread:
+            # Nested call from the I/O thread - run it now (queueing would deadlock)
+            future = Future()
+            try:
+                future.set_result(self._run_inline(fn, args, kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        wait = self.default_timeout if timeout is None else timeout
+        request = _Request(fn, args, kwargs, priority, time.time() + wait)
+        with self._cond:
+            if not self._ensure_started():
+                inline = True
+            else:
+                inline = False
+                heapq.heappush(self._queue, (int(priority), next(self._sequence), request))
+                self._stats['submitted'] += 1
+                self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], len(self._queue))
+                self._cond.notify()
+        if inline:
+            try:
+                request.future.set_result(self._run_inline(fn, args, kwargs))
+            except Exception as e:
+                request.future.set_exception(e)
+        return request.future
+
+    def call(self, fn: Callable, *args, priority: Optional[MT5Priority] = None,
+             timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run an MT5 call through the queue and wait for its result.
+
+        Raises:
+            MT5RequestTimeout: The request was not served before its deadline
+        """
+        future = self.submit(fn, *args, priority=priority, timeout=timeout, **kwargs)
+        return future.result()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return  # Stopping and drained
+                _, _, request = heapq.heappop(self._queue)
+
+            now = time.time()
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            if now > request.deadline:
+                with self._cond:
+                    self._stats['expired'] += 1
+                request.future.set_exception(MT5RequestTimeout(
+                    f"{getattr(request.fn, '__name__', request.fn)} ({request.priority.name}) "
+                    f"expired after {(now - request.submitted_at) * 1000:.0f}ms in queue"))
+                continue
+
+            wait_ms = (now - request.submitted_at) * 1000
+            _context.caller = request.caller
+            try:
+                result = request.fn(*request.args, **request.kwargs)
+            except BaseException as e:
+                with self._cond:
+                    self._stats['failed'] += 1
+                request.future.set_exception(e)
+            else:
+                with self._cond:
+                    self._stats['completed'] += 1
+                request.future.set_result(result)
+            finally:
+                _context.caller = None
+            with self._cond:
+                name = request.priority.name
+                if wait_ms > self._wait_ms_max[name]:
+                    self._wait_ms_max[name] = wait_ms
+
+    def stop(self, timeout: float = 5.0):
+        """Serve the queued requests, then stop the I/O thread (later requests run inline)."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def restart(self):
+        """Allow the I/O thread to start again after stop()."""
+        with self._cond:
+            self._stopping = False
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue counters and worst queue wait per priority (ms)."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['queue_depth'] = len(self._queue)
+            stats['max_wait_ms'] = dict(self._wait_ms_max)
+        stats['running'] = self.is_running()
+        return stats
+
+
+def mt5_call(connector, fn: Callable, *args, priority: Optional[MT5Priority] = None,
+             timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Run an MT5 call through the connector's I/O executor.
+
+    Connectors without an executor (mocks, backtest and SIM_LIVE connectors) call
+    fn directly. A request that misses its deadline returns None, like a failed
+    MT5 call.
+    """
+    executor = getattr(connector, 'mt5_io', None)
+    if not isinstance(executor, MT5IOExecutor):
+        return fn(*args, **kwargs)
+    try:
+        return executor.call(fn, *args, priority=priority, timeout=timeout, **kwargs)
+    except MT5RequestTimeout as e:
+        logger.warning(f"[MT5_IO] {e}")
+        return None
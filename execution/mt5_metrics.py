@@ -0,0 +1,197 @@
+"""
+MT5 RPC Metrics
+Call counts, error counts and latency histograms for MetaTrader5 API calls.
+
+instrument_mt5() wraps an MT5 module (the real MetaTrader5 package or the
+SIM_LIVE SyntheticMT5Wrapper) in a transparent proxy. Constants pass through
+unchanged; every function call is timed and recorded per function and per
+calling thread. Calls served by the MT5 I/O executor are attributed to the
+thread that submitted them, not to the I/O thread.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from execution.mt5_io import calling_thread_name
+from utils.latency_histogram import StreamingHistogram
+from utils.logger_factory import get_logger
+
+logger = get_logger("mt5_metrics", "logs/live/system/mt5_connection.log")
+
+# Bucket upper bounds of the reported latency breakdown in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0
+)
+
+# Functions whose None return value is not a failure
+_NONE_IS_SUCCESS = frozenset({'shutdown'})
+
+
+class LatencyHistogram:
+    """Latency distribution and error count of one MT5 function (lifetime StreamingHistogram)."""
+
+    __slots__ = ('latency', 'errors')
+
+    def __init__(self):
+        self.latency = StreamingHistogram(windows=())
+        self.errors = 0  # Updated under the registry lock
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+    def record(self, elapsed_ms: float, error: bool):
+        self.latency.record(elapsed_ms)
+        if error:
+            self.errors += 1
+
+    def percentile(self, pct: float) -> float:
+        """Latency at the pct-th call (capped at the observed max)."""
+        return self.latency.snapshot().percentile(pct)
+
+    def to_dict(self, include_buckets: bool = True) -> Dict[str, Any]:
+        snapshot = self.latency.snapshot()
+        p50, p95, p99 = snapshot.percentiles(50, 95, 99)
+        data = {
+            'count': snapshot.count,
+            'errors': self.errors,
+            'avg_ms': round(snapshot.total_ms / snapshot.count, 3) if snapshot.count else 0.0,
+            'p50_ms': round(p50, 3),
+            'p95_ms': round(p95, 3),
+            'p99_ms': round(p99, 3),
+            'max_ms': round(snapshot.max_ms, 3),
+        }
+        if include_buckets:
+            labels = [f"le_{bound:g}ms" for bound in LATENCY_BUCKETS_MS] + ['gt_5000ms']
+            data['buckets'] = {label: n for label, n in zip(labels, snapshot.bucket_counts(LATENCY_BUCKETS_MS)) if n}
+        return data
+
+
+class MT5CallMetrics:
+    """Registry of MT5 call histograms keyed by function and by (function, thread)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_function: Dict[str, LatencyHistogram] = {}
+        self._by_thread: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._started_at = time.time()
+
+    def record(self, function: str, elapsed_ms: float, error: bool, thread_name: Optional[str] = None):
+        """Record one MT5 call."""
+        thread_name = thread_name or calling_thread_name()
+        with self._lock:
+            histogram = self._by_function.get(function)
+            if histogram is None:
+                histogram = self._by_function[function] = LatencyHistogram()
+            histogram.record(elapsed_ms, error)
+            key = (function, thread_name)
+            histogram = self._by_thread.get(key)
+            if histogram is None:
+                histogram = self._by_thread[key] = LatencyHistogram()
+            histogram.record(elapsed_ms, error)
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Per-function histograms and per-thread summaries."""
+        with self._lock:
+            functions = {name: h.to_dict() for name, h in self._by_function.items()}
+            threads: Dict[str, Dict[str, Any]] = {}
+            for (function, thread_name), h in self._by_thread.items():
+                threads.setdefault(thread_name, {})[function] = h.to_dict(include_buckets=False)
+            started_at = self._started_at
+        return {
+            'since': started_at,
+            'total_calls': sum(f['count'] for f in functions.values()),
+            'total_errors': sum(f['errors'] for f in functions.values()),
+            'functions': functions,
+            'threads': threads,
+        }
+
+    def format_summary(self, top: int = 10) -> List[str]:
+        """One log line per function (busiest first), for periodic dumps."""
+        snapshot = self.get_snapshot()
+        lines = []
+        ranked = sorted(snapshot['functions'].items(), key=lambda item: item[1]['count'], reverse=True)
+        for name, stats in ranked[:top]:
+            callers = sorted(
+                ((thread_name, calls[name]['count']) for thread_name, calls in snapshot['threads'].items()
+                 if name in calls),
+                key=lambda item: item[1], reverse=True
+            )[:3]
+            lines.append(
+                f"[MT5_RPC_STATS] {name} calls={stats['count']} errors={stats['errors']} "
+                f"avg={stats['avg_ms']}ms p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms "
+                f"p99={stats['p99_ms']}ms max={stats['max_ms']}ms "
+                f"top_threads={','.join(f'{t}:{n}' for t, n in callers)}"
+            )
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._by_function.clear()
+            self._by_thread.clear()
+            self._started_at = time.time()
+
+
+_metrics = MT5CallMetrics()
+
+
+def get_mt5_metrics() -> MT5CallMetrics:
+    """Process-wide MT5 call metrics."""
+    return _metrics
+
+
+class InstrumentedMT5:
+    """
+    Transparent proxy over an MT5 module that times every function call.
+
+    Attributes are resolved on the wrapped module at call time, so patching the
+    underlying module (tests, SIM_LIVE injection) keeps working.
+    """
+
+    def __init__(self, module: Any, metrics: Optional[MT5CallMetrics] = None):
+        object.__setattr__(self, '_module', module)
+        object.__setattr__(self, '_metrics', metrics or _metrics)
+        object.__setattr__(self, '_wrappers', {})
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._module, name)
+        if not callable(value) or isinstance(value, type) or name.startswith('_'):
+            return value
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            wrapper = self._make_wrapper(name)
+            self._wrappers[name] = wrapper
+        return wrapper
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._module, name, value)
+
+    def _make_wrapper(self, name: str):
+        module = self._module
+        metrics = self._metrics
+        none_is_success = name in _NONE_IS_SUCCESS
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            error = True
+            try:
+                result = getattr(module, name)(*args, **kwargs)
+                error = result is None and not none_is_success
+                return result
+            finally:
+                metrics.record(name, (time.perf_counter() - start) * 1000, error)
+
+        call.__name__ = name
+        call.__qualname__ = name
+        return call
+
+    def __repr__(self) -> str:
+        return f"<InstrumentedMT5 {self._module!r}>"
+
+
+def instrument_mt5(module: Any) -> Any:
+    """Wrap an MT5 module for call metrics (already-instrumented modules are returned as-is)."""
+    if isinstance(module, InstrumentedMT5):
+        return module
+    return InstrumentedMT5(module)
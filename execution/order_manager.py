@@ -3,20 +3,29 @@ Order Management System
 Handles order placement, modification, and tracking.
 """
 
-import MetaTrader5 as mt5
+import MetaTrader5
 import logging
 import time
 import random
 import threading
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
 from enum import Enum
 
 # Use logger factory for proper logging
 from utils.logger_factory import get_logger
+from execution.position_snapshot import DEFAULT_STALE_FALLBACK_FACTOR, PositionSnapshotBus, read_open_positions
+from execution.position_table import PositionTable
+from execution.deal_journal import DealJournal
+from execution.mass_close import MassCloseEngine, MassCloseReport
+from execution.order_template import DEFAULT_DEVIATION, DEFAULT_MAGIC, OrderTemplate, OrderTemplateCache
+from execution.mt5_io import MT5Priority, mt5_call, with_priority
+from execution.mt5_metrics import instrument_mt5
 
 logger = get_logger("order_manager", "logs/live/system/order_manager.log")
 
+# Timed per function and calling thread (see mt5_metrics); SIM_LIVE re-wraps the synthetic module
+mt5 = instrument_mt5(MetaTrader5)
+
 
 class OrderType(Enum):
     BUY = mt5.ORDER_TYPE_BUY
@@ -40,6 +49,33 @@ class OrderManager:
         
         # Reference to trading_bot for governance checks (set after initialization)
         self._trading_bot = None
+        
+        # Shared position snapshot bus: one producer calls mt5.positions_get() and every
+        # monitoring thread reads the published snapshot within its staleness budget
+        connector_config = getattr(mt5_connector, 'config', None)
+        connector_config = connector_config if isinstance(connector_config, dict) else {}
+        snapshot_config = connector_config.get('execution', {}).get('position_snapshot', {})
+        self.position_bus = PositionSnapshotBus(
+            fetch_fn=self._fetch_position_snapshot,
+            interval_seconds=snapshot_config.get('interval_ms', 100) / 1000.0,
+            max_staleness_ms=snapshot_config.get('max_staleness_ms'),
+            enabled=snapshot_config.get('enabled', connector_config.get('mode') != 'backtest'),
+            stale_fallback_factor=snapshot_config.get('stale_fallback_factor', DEFAULT_STALE_FALLBACK_FACTOR),
+        )
+        
+        # Deal journal: closure lookups served from incrementally synced deal history
+        self.deal_journal = DealJournal.from_config(mt5_connector, connector_config, mt5_provider=lambda: mt5)
+        
+        # Per-symbol order templates: filling mode, rounding and volume grid derived once per spec
+        template_config = connector_config.get('execution', {}).get('order_template', {})
+        self._order_deviation = template_config.get('deviation', DEFAULT_DEVIATION)
+        self._order_magic = template_config.get('magic', DEFAULT_MAGIC)
+        self._order_templates = OrderTemplateCache(self._build_order_template)
+        
+        # Parallel closer for kill switch / emergency flattening
+        self.mass_close_engine = MassCloseEngine.from_config(
+            connector_config, self.close_position,
+            is_open_fn=self._is_position_open)
     
     def set_sl_manager(self, sl_manager):
         """
@@ -56,6 +92,26 @@ class OrderManager:
         if sl_manager is None:
             logger.warning("[ORDER_MANAGER] WARNING: SLManager is None - atomic SL will not work!")
     
+    def _order_send(self, request: Dict[str, Any], timeout: Optional[float] = None):
+        """
+        order_send through the MT5 I/O executor.
+        
+        order_send and last_error run as one request so no other call can reset
+        the error in between. Priority comes from the caller's scope (ORDER for
+        place_order, SL_TRAIL for modify_order, CLOSE for closes).
+        
+        Returns:
+            (result, last_error) - last_error is None unless result is None
+        """
+        def send():
+            result = mt5.order_send(request)
+            return result, (mt5.last_error() if result is None else None)
+        
+        sent = mt5_call(self.mt5_connector, send, timeout=timeout)
+        if sent is None:
+            return None, (-1, "MT5 I/O request expired before it was sent")
+        return sent
+    
     def _get_position_by_ticket(self, ticket: int, use_cache: bool = True):
         """
         Helper method to get position by ticket, handling both SIM_LIVE and live MT5.
@@ -94,7 +150,7 @@ class OrderManager:
         # Try position_get first (works for SIM_LIVE)
         if hasattr(mt5, 'position_get'):
             try:
-                position = mt5.position_get(ticket)
+                position = mt5_call(self.mt5_connector, mt5.position_get, ticket)
                 if position is not None:
                     # CRITICAL FIX: mt5.position_get() may return a tuple, extract first element if needed
                     if isinstance(position, (tuple, list)) and len(position) > 0:
@@ -122,7 +178,7 @@ class OrderManager:
         
         # If position_get didn't work, try positions_get(ticket=ticket) for live MT5
         try:
-            position_list = mt5.positions_get(ticket=ticket)
+            position_list = mt5_call(self.mt5_connector, mt5.positions_get, ticket=ticket)
             if position_list is not None and len(position_list) > 0:
                 position = position_list[0]
                 
@@ -145,7 +201,7 @@ class OrderManager:
             # positions_get doesn't accept ticket parameter (SIM_LIVE case)
             # Fallback: get all positions and filter by ticket
             try:
-                all_positions = mt5.positions_get()
+                all_positions = mt5_call(self.mt5_connector, mt5.positions_get)
                 if all_positions:
                     for pos in all_positions:
                         if hasattr(pos, 'ticket') and pos.ticket == ticket:
@@ -194,6 +250,42 @@ class OrderManager:
         
         return False
     
+    def _build_order_template(self, symbol_info: Dict[str, Any]) -> OrderTemplate:
+        """Build the order template of a symbol (OrderTemplateCache build function)."""
+        symbol = symbol_info['name']
+        filling_modes = symbol_info.get('filling_mode')
+        if filling_modes is None:
+            # Connectors without filling_mode in their symbol info: one mt5.symbol_info() read per spec
+            symbol_info_obj = mt5_call(self.mt5_connector, mt5.symbol_info, symbol)
+            if symbol_info_obj is not None:
+                filling_modes = getattr(symbol_info_obj, 'filling_mode', None)
+        
+        # Default to RETURN for SIM_LIVE (most common for forex) when the bitmask allows no mode
+        is_sim_live = hasattr(self.mt5_connector, '_market_engine') or hasattr(self.mt5_connector, 'get_symbol_info')
+        template = OrderTemplate(symbol_info, filling_modes, mt5, deviation=self._order_deviation,
+                                 magic=self._order_magic,
+                                 default_filling=mt5.ORDER_FILLING_RETURN if is_sim_live else None)
+        logger.debug(f"{symbol}: Order template built | filling_mode bitmask: {filling_modes} | {template}")
+        return template
+    
+    def get_order_template(self, symbol: str) -> Optional[OrderTemplate]:
+        """Order template of a symbol (built from the cached symbol info if needed)."""
+        symbol_info = self.mt5_connector.get_symbol_info(symbol)
+        if symbol_info is None:
+            return None
+        return self._order_templates.get(symbol_info)
+    
+    def invalidate_order_templates(self, symbol: Optional[str] = None):
+        """
+        Drop order templates and the connector's cached specifications; None drops all.
+        
+        Called when the broker rejects a request built from a template (invalid volume,
+        unsupported filling): the rebuild must read a fresh specification, not the cached one.
+        """
+        self._order_templates.invalidate(symbol)
+        if hasattr(self.mt5_connector, 'invalidate_symbol_info'):
+            self.mt5_connector.invalidate_symbol_info(symbol)
+    
     def _perform_trade_gating_checks(self, symbol: str, order_type: OrderType, lot_size: float) -> Dict[str, Any]:
         """
         CRITICAL SAFETY FIX #9: Trade gating - final safety checks before opening trade.
@@ -315,7 +407,9 @@ class OrderManager:
         return checks
     
     def calculate_initial_sl_price(self, symbol: str, order_type: OrderType, lot_size: float, 
-                                    entry_price: float, max_risk_usd: float) -> Optional[float]:
+                                    entry_price: float, max_risk_usd: float,
+                                    symbol_info: Optional[Dict[str, Any]] = None,
+                                    tick: Any = None) -> Optional[float]:
         """
         Calculate initial SL price for order placement using SLManager logic.
         
@@ -328,6 +422,8 @@ class OrderManager:
             lot_size: Lot size
             entry_price: Entry price (ASK for BUY, BID for SELL)
             max_risk_usd: Maximum risk in USD (negative value, e.g., -3.0)
+            symbol_info: Symbol info already read by the caller (fetched if None)
+            tick: Tick already read by the caller (fetched if None)
         
         Returns:
             SL price if calculation succeeds, None if calculation fails
@@ -337,7 +433,8 @@ class OrderManager:
             return None
         
         try:
-            symbol_info = self.mt5_connector.get_symbol_info(symbol)
+            if symbol_info is None:
+                symbol_info = self.mt5_connector.get_symbol_info(symbol)
             if not symbol_info:
                 logger.error(f"[ATOMIC_SL] Cannot get symbol info for {symbol}")
                 return None
@@ -358,11 +455,12 @@ class OrderManager:
             point = symbol_info.get('point', 0.00001)
             stops_level = symbol_info.get('trade_stops_level', 0)
             
-            # Get current market prices for validation
-            if hasattr(self.mt5_connector, 'get_symbol_info_tick'):
-                tick = self.mt5_connector.get_symbol_info_tick(symbol)
-            else:
-                tick = mt5.symbol_info_tick(symbol)
+            # Get current market prices for validation (place_order passes the tick it priced the order with)
+            if tick is None:
+                if hasattr(self.mt5_connector, 'get_symbol_info_tick'):
+                    tick = self.mt5_connector.get_symbol_info_tick(symbol)
+                else:
+                    tick = mt5_call(self.mt5_connector, mt5.symbol_info_tick, symbol)
             
             if not tick:
                 logger.error(f"[ATOMIC_SL] Cannot get tick data for {symbol}")
@@ -457,6 +555,7 @@ class OrderManager:
             logger.error(f"[ATOMIC_SL] Exception calculating SL for {symbol}: {e}", exc_info=True)
             return None
     
+    @with_priority(MT5Priority.ORDER)
     def place_order(
         self,
         symbol: str,
@@ -501,13 +600,16 @@ class OrderManager:
         # Normalize symbol
         symbol = symbol_info['name']
         
+        # Precompiled order fields (rebuilt only when the symbol's specification changed)
+        template = self._order_templates.get(symbol_info)
+        
         # Get fresh tick data for most current prices (MT5 requirement for accurate order placement)
         # Use connector method to support both live and SIM_LIVE modes
         if hasattr(self.mt5_connector, 'get_symbol_info_tick'):
             tick = self.mt5_connector.get_symbol_info_tick(symbol)
         else:
             # Fallback to direct MT5 call for live mode
-            tick = mt5.symbol_info_tick(symbol)
+            tick = mt5_call(self.mt5_connector, mt5.symbol_info_tick, symbol)
         if tick is None:
             logger.error(f"Cannot get tick data for {symbol}")
             return None
@@ -532,8 +634,8 @@ class OrderManager:
             return None
         
         # Convert stop_loss from pips to price
-        point = symbol_info['point']
-        pip_value = point * 10 if symbol_info['digits'] == 5 or symbol_info['digits'] == 3 else point
+        point = template.point
+        pip_value = template.pip_value
         
         # Check price staleness (if timestamp available)
         fetched_time = symbol_info.get('_fetched_time', 0)
@@ -552,6 +654,17 @@ class OrderManager:
                     logger.warning(f"{symbol}: Symbol info is stale ({price_age:.2f}s old), rejecting order")
                     return None
         
+        # Snap the volume to the symbol's volume grid (down, never up) before any risk math
+        normalized_lot = template.normalize_volume(lot_size)
+        if normalized_lot is None:
+            logger.error(f"[ORDER_REJECTED] {symbol} | Volume {lot_size} outside volume limits | "
+                        f"min={template.volume_min}, max={template.volume_max}, step={template.volume_step}")
+            return {'error': -1, 'error_type': 'invalid_volume',
+                   'mt5_comment': f"Volume {lot_size} outside symbol volume limits"}
+        if normalized_lot != lot_size:
+            logger.debug(f"{symbol}: Lot size {lot_size} normalized to {normalized_lot} (step {template.volume_step})")
+            lot_size = normalized_lot
+        
         # CRITICAL SAFETY FIX #9: TRADE GATING - Final safety checks before opening trade
         # These checks are the last line of defense before placing an order
         gate_checks = self._perform_trade_gating_checks(symbol, order_type, lot_size)
@@ -563,13 +676,12 @@ class OrderManager:
         
         # CRITICAL SAFETY FIX #1: Calculate SL BEFORE order placement
         # Priority: strategy_sl_price > max_risk_usd > stop_loss
-        digits = symbol_info.get('digits', 5)
+        digits = template.digits
+        stops_level = template.stops_level
+        min_distance = template.min_stop_distance
         if strategy_sl_price is not None and strategy_sl_price > 0:
-            # Use strategy-based SL price directly
-            sl_price = strategy_sl_price
-            # Normalize to symbol's tick size
-            sl_price = round(sl_price / point) * point
-            sl_price = round(sl_price, digits)
+            # Use strategy-based SL price directly, normalized to symbol's tick size
+            sl_price = template.round_price(strategy_sl_price)
             
             # Validate strategy SL is in correct direction
             if order_type == OrderType.BUY:
@@ -592,8 +704,7 @@ class OrderManager:
             
             # Normalize TP to symbol's tick size
             if tp_price > 0:
-                tp_price = round(tp_price / point) * point
-                tp_price = round(tp_price, digits)
+                tp_price = template.round_price(tp_price)
             
             # Validation price for constraint checking
             validation_price = ask_price if order_type == OrderType.SELL else price
@@ -601,7 +712,8 @@ class OrderManager:
             logger.info(f"[ATOMIC_SL] {symbol} {order_type.name}: Using strategy SL={sl_price:.5f}")
         elif max_risk_usd is not None and max_risk_usd < 0:
             # Calculate SL using SLManager logic (fallback to USD-based)
-            sl_price = self.calculate_initial_sl_price(symbol, order_type, lot_size, price, max_risk_usd)
+            sl_price = self.calculate_initial_sl_price(symbol, order_type, lot_size, price, max_risk_usd,
+                                                       symbol_info=symbol_info, tick=tick)
             if sl_price is None:
                 logger.error(f"[ATOMIC_SL_FAILED] Cannot calculate valid SL for {symbol} - REJECTING ORDER")
                 return {'error': -6, 'error_type': 'sl_calculation_failed', 'mt5_comment': 'SL calculation failed - order rejected for safety'}
@@ -617,8 +729,7 @@ class OrderManager:
             
             # Normalize TP to symbol's tick size
             if tp_price > 0:
-                tp_price = round(tp_price / point) * point
-                tp_price = round(tp_price, digits)
+                tp_price = template.round_price(tp_price)
             
             # Validation price for constraint checking
             validation_price = ask_price if order_type == OrderType.SELL else price
@@ -662,25 +773,17 @@ class OrderManager:
                 else:
                     tp_price = 0
             
-            # Normalize prices to symbol's tick size (MT5 requirement)
-            # Normalize SL and TP to point precision
-            digits = symbol_info.get('digits', 5)
+            # Normalize SL and TP to the symbol's tick size (MT5 requirement)
             if sl_price > 0:
-                sl_price = round(sl_price / point) * point
-                # Round to correct decimal places
-                sl_price = round(sl_price, digits)
+                sl_price = template.round_price(sl_price)
             
             if tp_price > 0:
-                tp_price = round(tp_price / point) * point
-                tp_price = round(tp_price, digits)
+                tp_price = template.round_price(tp_price)
             
             # Validate stop loss distance against broker's minimum stops level
-            stops_level = symbol_info.get('trade_stops_level', 0)
-            min_distance = 0.0
             actual_distance = abs(validation_price - sl_price)
             
             if stops_level > 0:
-                min_distance = stops_level * point
                 # Use validation_price (ASK for SELL, ASK for BUY) to check distance
                 
                 if actual_distance < min_distance:
@@ -702,76 +805,17 @@ class OrderManager:
                 logger.error(f"Invalid stop loss for SELL order: SL {sl_price:.5f} <= validation price {validation_price:.5f} (ASK) for {symbol}")
                 return None
         
-        # Determine filling type based on symbol
-        # CRITICAL: Must use the EXACT filling mode the symbol supports
-        # In SIM_LIVE mode, use connector's get_symbol_info() which returns a dict
-        # In live mode, use mt5.symbol_info() which returns an object
-        filling_type = None
-        filling_modes = None
-        
-        # Try to get filling_mode from connector's symbol_info dict first (works for SIM_LIVE)
-        if hasattr(self.mt5_connector, 'get_symbol_info'):
-            symbol_info_dict = self.mt5_connector.get_symbol_info(symbol, check_price_staleness=False)
-            if symbol_info_dict and isinstance(symbol_info_dict, dict):
-                filling_modes = symbol_info_dict.get('filling_mode')
-                if filling_modes is not None:
-                    logger.debug(f"{symbol}: Got filling_mode from connector: {filling_modes}")
-        
-        # Fallback to mt5.symbol_info() for live mode (returns object with attributes)
-        if filling_modes is None:
-            symbol_info_obj = mt5.symbol_info(symbol)
-            if symbol_info_obj is not None:
-                filling_modes = symbol_info_obj.filling_mode if hasattr(symbol_info_obj, 'filling_mode') else None
-        
-        # Determine filling type from bitmask
-        if filling_modes is not None:
-            # Priority order: IOC (works for crypto 24/7), then RETURN (forex), then FOK
-            # IOC (bit 1 = 2) - works for crypto and many symbols, try first
-            if filling_modes & 2:
-                filling_type = mt5.ORDER_FILLING_IOC
-            # RETURN (bit 2 = 4) - most common for forex and indices
-            elif filling_modes & 4:
-                filling_type = mt5.ORDER_FILLING_RETURN
-            # FOK (bit 0 = 1) - often required for crypto
-            elif filling_modes & 1:
-                filling_type = mt5.ORDER_FILLING_FOK
-            
-            logger.debug(f"{symbol}: Filling modes available: {filling_modes} (bitmask), using: {filling_type}")
-        
-        # If still None, use default for SIM_LIVE or error for live
+        # CRITICAL: Must use the EXACT filling mode the symbol supports (resolved when the template was built)
+        filling_type = template.filling_type
         if filling_type is None:
-            # Check if we're in SIM_LIVE mode
-            is_sim_live = hasattr(self.mt5_connector, '_market_engine') or hasattr(self.mt5_connector, 'get_symbol_info')
-            if is_sim_live:
-                # Default to RETURN for SIM_LIVE (most common for forex)
-                filling_type = mt5.ORDER_FILLING_RETURN
-                logger.info(f"{symbol}: Using default filling mode ORDER_FILLING_RETURN for SIM_LIVE mode")
-            else:
-                logger.error(f"{symbol}: No supported filling mode found! Symbol filling_mode: {filling_modes if filling_modes is not None else 'N/A'}")
-                return None
-        
-        # Prepare order request
-        # For MT5, SL and TP must be omitted if not set (MT5 rejects sl=0 or tp=0)
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": symbol,
-            "volume": lot_size,
-            "type": order_type.value,
-            "price": price,
-            "deviation": 20,
-            "magic": 234000,
-            "comment": comment,
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": filling_type,
-        }
-        
-        # Only include SL if it's > 0 (MT5 rejects sl=0)
-        if sl_price > 0:
-            request["sl"] = sl_price
+            logger.error(f"{symbol}: No supported filling mode found! Symbol filling_mode: "
+                        f"{symbol_info.get('filling_mode', 'N/A')}")
+            self.invalidate_order_templates(symbol)
+            return None
         
-        # Only include TP if it's > 0 (some brokers don't accept TP=0)
-        if tp_price > 0:
-            request["tp"] = tp_price
+        # Prepare order request (SL/TP omitted when not set - MT5 rejects sl=0 or tp=0)
+        request = template.request(order_type.value, lot_size, price, comment, sl=sl_price, tp=tp_price,
+                                   filling_type=filling_type)
         
         # Get mode from config if available
         mode = "UNKNOWN"
@@ -783,10 +827,10 @@ class OrderManager:
                    f"Type: {order_type.name} | Volume: {lot_size} | Price: {price:.5f} | SL: {sl_display}")
         
         # Send order
-        result = mt5.order_send(request)
+        result, send_error = self._order_send(request)
         
         if result is None:
-            error = mt5.last_error()
+            error = send_error
             # Extract error code and description
             error_code = None
             error_description = str(error)
@@ -815,6 +859,10 @@ class OrderManager:
             is_partial_fill = result.retcode == 10008
         
         if not (is_full_fill or is_partial_fill):
+            if result.retcode in (10014, 10030):
+                # Invalid volume / unsupported filling: the specification the template was built from is outdated
+                self.invalidate_order_templates(symbol)
+            
             # CRITICAL: Log detailed error information
             logger.error(f"mode={mode} | symbol={symbol} | [ORDER_REJECTED] Order rejected | "
                         f"MT5 Error Code: {result.retcode} | Comment: {result.comment}")
@@ -843,11 +891,9 @@ class OrderManager:
                 # Return error dict for market closed (non-retryable)
                 return {'error': -4, 'mt5_retcode': result.retcode, 'mt5_comment': result.comment, 'error_type': 'market_closed'}
             elif result.retcode == 10014:  # Invalid volume
-                # Get symbol info for detailed logging
-                symbol_info_detail = self.mt5_connector.get_symbol_info(symbol)
-                volume_min = symbol_info_detail.get('volume_min', 'N/A') if symbol_info_detail else 'N/A'
-                volume_max = symbol_info_detail.get('volume_max', 'N/A') if symbol_info_detail else 'N/A'
-                volume_step = symbol_info_detail.get('volume_step', 'N/A') if symbol_info_detail else 'N/A'
+                volume_min = template.volume_min or 'N/A'
+                volume_max = template.volume_max or 'N/A'
+                volume_step = template.volume_step or 'N/A'
                 
                 logger.error(f"[ERROR] {error_msg} - Volume {lot_size} is invalid for {symbol}")
                 logger.error(f"   Attempted lot size: {lot_size:.4f}")
@@ -901,7 +947,7 @@ class OrderManager:
         
         if result.order and result.order > 0:
             # Get deal for this order to get actual fill price and volume
-            deals = mt5.history_deals_get(ticket=result.order)
+            deals = mt5_call(self.mt5_connector, mt5.history_deals_get, ticket=result.order)
             if deals and len(deals) > 0:
                 # Get the entry deal (DEAL_ENTRY_IN) - this has the actual filled volume and price
                 for deal in deals:
@@ -1006,6 +1052,7 @@ class OrderManager:
             'slippage': slippage
         }
     
+    @with_priority(MT5Priority.SL_TRAIL)
     def modify_order(
         self,
         ticket: int,
@@ -1102,7 +1149,7 @@ class OrderManager:
             tick = self.mt5_connector.get_symbol_info_tick(symbol)
         else:
             # Fallback to direct MT5 call for live mode
-            tick = mt5.symbol_info_tick(symbol)
+            tick = mt5_call(self.mt5_connector, mt5.symbol_info_tick, symbol)
         if tick is None:
             logger.warning(f"Cannot get tick data for {symbol} - skipping modification")
             return False
@@ -1248,7 +1295,7 @@ class OrderManager:
         # If MT5 is unresponsive, skip immediately to prevent blocking
         try:
             # Quick health check: try to get terminal info (non-blocking check)
-            terminal_info = mt5.terminal_info()
+            terminal_info = mt5_call(self.mt5_connector, mt5.terminal_info, timeout=modify_timeout_seconds)
             if terminal_info is None:
                 logger.warning(f"[MT5_UNRESPONSIVE] Ticket {ticket} | MT5 terminal_info() returned None - skipping modify")
                 return False
@@ -1278,7 +1325,7 @@ class OrderManager:
             
             # Make MT5 API call with timeout tracking
             call_start = time.time()
-            result = mt5.order_send(request)
+            result, send_error = self._order_send(request, timeout=modify_timeout_seconds)
             call_duration = time.time() - call_start
             
             # PHASE 1 FIX 1.2: Check if call took too long (even if it succeeded)
@@ -1299,7 +1346,7 @@ class OrderManager:
                         return False
             
             if result is None:
-                error = mt5.last_error()
+                error = send_error
                 if attempt < max_retries - 1:
                     logger.warning(f"Modify order send returned None for ticket {ticket} (attempt {attempt + 1}/{max_retries}). MT5 error: {error}. Retrying...")
                     time.sleep(0.1 * (attempt + 1))  # Increasing backoff
@@ -1486,7 +1533,7 @@ class OrderManager:
                         "sl": new_sl,
                         "tp": new_tp,
                     }
-                    direct_result = mt5.order_send(direct_request)
+                    direct_result, _ = self._order_send(direct_request)
                     if direct_result and direct_result.retcode == mt5.TRADE_RETCODE_DONE:
                         logger.info(f"[FALLBACK SUCCESS] Direct MT5 API call succeeded for ticket {ticket}")
                         # Invalidate cache
@@ -1509,7 +1556,7 @@ class OrderManager:
                 "sl": new_sl,
                 "tp": new_tp,
             }
-            direct_result = mt5.order_send(direct_request)
+            direct_result, _ = self._order_send(direct_request)
             if direct_result and direct_result.retcode == mt5.TRADE_RETCODE_DONE:
                 logger.info(f"[FINAL FALLBACK SUCCESS] Direct MT5 API call succeeded for ticket {ticket}")
                 # Invalidate cache
@@ -1523,6 +1570,7 @@ class OrderManager:
         
         return False
     
+    @with_priority(MT5Priority.CLOSE)
     def close_position(self, ticket: int, comment: str = "Close by bot") -> bool:
         """Close an open position."""
         from utils.execution_tracer import get_tracer
@@ -1643,7 +1691,7 @@ class OrderManager:
         
         # Fallback to mt5.symbol_info() for live mode
         if filling_modes is None:
-            symbol_info_obj = mt5.symbol_info(symbol)
+            symbol_info_obj = mt5_call(self.mt5_connector, mt5.symbol_info, symbol)
             if symbol_info_obj is not None:
                 filling_modes = symbol_info_obj.filling_mode if hasattr(symbol_info_obj, 'filling_mode') else None
         
@@ -1684,11 +1732,11 @@ class OrderManager:
         
         # Track execution time for slow execution detection
         execution_start = time.time()
-        result = mt5.order_send(request)
+        result, send_error = self._order_send(request)
         execution_time_ms = (time.time() - execution_start) * 1000
         
         if result is None:
-            error = mt5.last_error()
+            error = send_error
             logger.error(f"Close position send returned None. MT5 error: {error}")
             tracer.trace(
                 function_name="OrderManager.close_position",
@@ -1768,6 +1816,38 @@ class OrderManager:
         
         return True
     
+    def close_positions(self, tickets: List[int], comment: str = "Close by bot",
+                        reason: Optional[str] = None) -> MassCloseReport:
+        """
+        Close many positions concurrently (kill switch, emergency flattening).
+        
+        Each ticket goes through close_position() on the mass-close worker pool,
+        with per-ticket retries and backoff (execution.mass_close).
+        
+        Args:
+            tickets: Position tickets to close
+            comment: Close comment
+            reason: Label for the completion summary (comment if None)
+        
+        Returns:
+            MassCloseReport with per-ticket outcome, attempts and latency
+        """
+        return self.mass_close_engine.close_all(tickets, comment, reason=reason)
+    
+    def _is_position_open(self, ticket: int) -> Optional[bool]:
+        """
+        Whether a ticket is still open at the broker.
+        
+        Returns:
+            True/False from a successful positions read, None if the read failed
+            (disconnected or positions_get() error) - the position may still be open
+        """
+        table = self._read_broker_table()
+        if table is None:
+            return None
+        return table.get(ticket) is not None
+    
+    @with_priority(MT5Priority.CLOSE)
     def close_position_partial(self, ticket: int, close_percent: float = 0.5) -> bool:
         """
         Close partial position (Phase 5 feature).
@@ -1836,6 +1916,47 @@ class OrderManager:
         """Set trading bot reference for governance checks."""
         self._trading_bot = trading_bot
     
+    def _read_broker_table(self) -> Optional[PositionTable]:
+        """
+        Read all open positions from MT5 in one call into a columnar table.
+        
+        Returns:
+            PositionTable (its exclusions map ticket -> reason for positions that
+            get_open_positions(exclude_dec8=True) hides), or None if MT5 is unavailable
+        """
+        if not self.mt5_connector.ensure_connected():
+            return None
+        
+        positions = mt5_call(self.mt5_connector, mt5.positions_get)
+        if positions is None:
+            return None
+        
+        # Positions from Dec 8, 2025 (locked positions - markets closed) and positions
+        # older than 12 hours (likely from previous trading day) are flagged for exclusion
+        return PositionTable.from_mt5(positions, buy_type=mt5.ORDER_TYPE_BUY)
+    
+    def _read_broker_positions(self) -> Optional[Tuple[List[Dict[str, Any]], Dict[int, str]]]:
+        """
+        Read all open positions from MT5 in one call.
+        
+        Returns:
+            (positions, exclusions) where exclusions maps ticket -> reason for positions that
+            get_open_positions(exclude_dec8=True) hides, or None if MT5 is unavailable
+        """
+        table = self._read_broker_table()
+        if table is None:
+            return None
+        return table.as_dicts(exclude_dec8=False), table.exclusions
+    
+    def get_position_table(self) -> Optional[PositionTable]:
+        """
+        Get all open positions as a read-only columnar table (no per-position dicts).
+        
+        Use table.rows() for dict-like row views without the excluded positions,
+        table.array(name) for NumPy columns. Returns None if MT5 is unavailable.
+        """
+        return self._read_broker_table()
+    
     def get_open_positions(self, exclude_dec8: bool = True) -> List[Dict[str, Any]]:
         """
         Get all open positions from MT5.
@@ -1846,82 +1967,66 @@ class OrderManager:
         Returns:
             List of position dictionaries
         """
-        if not self.mt5_connector.ensure_connected():
+        broker_read = self._read_broker_positions()
+        if broker_read is None:
             return []
         
-        positions = mt5.positions_get()
-        if positions is None:
-            return []
+        positions, exclusions = broker_read
+        if not exclude_dec8 or not exclusions:
+            return positions
         
-        from datetime import datetime, timedelta
+        for reason in exclusions.values():
+            logger.info(f"🚫 EXCLUDING {reason}")
+        result = [pos for pos in positions if pos['ticket'] not in exclusions]
+        logger.info(f"[OK] Excluded {len(exclusions)} locked/old position(s) (Dec 8 or >12h old). Showing {len(result)} active position(s).")
+        return result
+    
+    @with_priority(MT5Priority.SL_TRAIL)
+    def _fetch_position_snapshot(self):
+        """
+        Fetch function for the shared position bus: (positions, excluded_tickets) or None.
         
-        result = []
-        dec8_date = datetime(2025, 12, 8).date()  # Dec 8, 2025 date
-        today_date = datetime.now().date()  # Today's date
+        Runs at SL_TRAIL priority: the snapshot is the SL worker's input.
+        """
+        table = self._read_broker_table()
+        if table is None:
+            return None
+        # Row views are already read-only - the snapshot keeps them without copying
+        return table.rows(exclude_dec8=False), set(table.exclusions)
+    
+    def start_position_snapshot_bus(self):
+        """Start the shared position snapshot producer (no-op when disabled)."""
+        if self.position_bus.enabled:
+            self.position_bus.start()
+    
+    def stop_position_snapshot_bus(self):
+        """Stop the shared position snapshot producer."""
+        self.position_bus.stop()
+    
+    def start_deal_journal(self):
+        """Start the deal journal sync thread (no-op when disabled)."""
+        self.deal_journal.start()
+    
+    def stop_deal_journal(self):
+        """Stop the deal journal sync thread and persist its high-water mark."""
+        self.deal_journal.stop()
+    
+    def get_shared_positions(self, consumer: str, exclude_dec8: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get open positions from the shared snapshot bus.
         
-        # Exclude positions older than 12 hours (locked positions from previous day)
-        max_age_hours = 12
-        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
+        Same shape as get_open_positions(), but served from a snapshot no older than the
+        consumer's staleness budget so concurrent threads share one broker call.
         
-        excluded_count = 0
-        for pos in positions:
-            # Get position open time
-            time_open = datetime.fromtimestamp(pos.time)
-            time_open_date = time_open.date()
-            
-            # Skip positions from Dec 8, 2025 if exclude_dec8 is True (locked positions - markets closed)
-            # Also skip positions older than 12 hours (likely from previous trading day)
-            should_exclude = False
-            exclusion_reason = ""
-            
-            if exclude_dec8:
-                if time_open_date == dec8_date:
-                    should_exclude = True
-                    exclusion_reason = f"Dec 8, 2025 locked position (market closed)"
-                elif time_open < cutoff_time:
-                    should_exclude = True
-                    exclusion_reason = f"Position older than {max_age_hours} hours (locked from previous day)"
-                elif time_open_date < today_date:
-                    should_exclude = True
-                    exclusion_reason = f"Position from previous day ({time_open_date})"
-            
-            if should_exclude:
-                excluded_count += 1
-                logger.info(f"🚫 EXCLUDING {exclusion_reason}: Ticket {pos.ticket}, Symbol {pos.symbol}, Opened: {time_open} (Date: {time_open_date}, Age: {(datetime.now() - time_open).total_seconds()/3600:.2f}h)")
-                continue
-            
-            # CRITICAL FIX: Handle both string type ('BUY'/'SELL') from SIM_LIVE and integer type (0/1) from live MT5
-            pos_type = pos.type
-            if isinstance(pos_type, str):
-                # Already a string (SIM_LIVE)
-                type_str = pos_type
-            elif isinstance(pos_type, int):
-                # Integer type (live MT5) - convert to string
-                type_str = 'BUY' if pos_type == mt5.ORDER_TYPE_BUY else 'SELL'
-            else:
-                # Fallback: try to get string representation
-                type_str = 'BUY' if pos_type == mt5.ORDER_TYPE_BUY else 'SELL'
-            
-            result.append({
-                'ticket': pos.ticket,
-                'symbol': pos.symbol,
-                'type': type_str,
-                'volume': pos.volume,
-                'price_open': pos.price_open,
-                'price_current': pos.price_current,
-                'sl': pos.sl,
-                'tp': pos.tp,
-                'profit': pos.profit,
-                'swap': getattr(pos, 'swap', 0.0),  # Handle missing swap attribute (SIM_LIVE compatibility)
-                'time_open': time_open,
-                'comment': pos.comment
-            })
-        
-        if excluded_count > 0:
-            logger.info(f"[OK] Excluded {excluded_count} locked/old position(s) (Dec 8 or >{max_age_hours}h old). Showing {len(result)} active position(s).")
+        Args:
+            consumer: Consumer name (see position_snapshot.DEFAULT_MAX_STALENESS_MS)
+            exclude_dec8: If True, exclude positions opened on Dec 8, 2025 (locked positions)
         
-        return result
-            
+        Returns:
+            List of position dictionaries, or None if no snapshot within the consumer's
+            stale fallback limit could be obtained
+        """
+        return read_open_positions(self, consumer, exclude_dec8=exclude_dec8)
     
     def get_position_count(self, exclude_dec8: bool = True) -> int:
         """
@@ -1941,70 +2046,27 @@ class OrderManager:
             ticket: Position ticket number
             exclude_dec8: If True, exclude positions opened on Dec 8, 2025 (locked positions)
         """
-        positions = self.get_open_positions(exclude_dec8=exclude_dec8)
-        for pos in positions:
-            if pos['ticket'] == ticket:
-                return pos
-        return None
+        table = self._read_broker_table()
+        if table is None:
+            return None
+        if exclude_dec8 and ticket in table.exclusions:
+            return None
+        row = table.get(ticket)
+        return row.copy() if row is not None else None
     
     def get_deal_history(self, ticket: int) -> Optional[Dict[str, Any]]:
         """
         Get deal history for a position ticket.
         
-        Returns dict with entry and exit deal information.
+        Returns dict with entry and exit deal information. Served from the deal
+        journal; a closed position whose exit deal is not indexed yet triggers one
+        journal sync shared by every closure detected at the same time.
         """
         if not self.mt5_connector.ensure_connected():
             return None
         
         try:
-            deals = mt5.history_deals_get(position=ticket)
-            if not deals:
-                return None
-            
-            entry_deal = None
-            exit_deal = None
-            total_profit = 0.0
-            commission = 0.0
-            swap = 0.0
-            
-            for deal in deals:
-                if deal.entry == mt5.DEAL_ENTRY_IN:
-                    entry_deal = {
-                        'ticket': deal.ticket,
-                        'time': datetime.fromtimestamp(deal.time),
-                        'price': deal.price,
-                        'volume': deal.volume,
-                        'symbol': deal.symbol,
-                        'type': deal.type,
-                        'profit': deal.profit,
-                        'commission': deal.commission,
-                        'swap': deal.swap
-                    }
-                elif deal.entry == mt5.DEAL_ENTRY_OUT:
-                    exit_deal = {
-                        'ticket': deal.ticket,
-                        'time': datetime.fromtimestamp(deal.time),
-                        'price': deal.price,
-                        'volume': deal.volume,
-                        'symbol': deal.symbol,
-                        'type': deal.type,
-                        'profit': deal.profit,
-                        'commission': deal.commission,
-                        'swap': deal.swap
-                    }
-                
-                total_profit += deal.profit
-                commission += deal.commission
-                swap += deal.swap
-            
-            return {
-                'entry_deal': entry_deal,
-                'exit_deal': exit_deal,
-                'total_profit': total_profit,
-                'commission': commission,
-                'swap': swap,
-                'status': 'CLOSED' if exit_deal else 'OPEN'
-            }
+            return self.deal_journal.get_position_summary(ticket, require_exit=True)
         
         except Exception as e:
             logger.error(f"Error getting deal history for position {ticket}: {e}", exc_info=True)
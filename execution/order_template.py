@@ -0,0 +1,193 @@
+"""
+Per-Symbol Order Templates
+Order request fields derived once per symbol specification.
+
+OrderManager.place_order() re-derived the filling mode (a second
+get_symbol_info() plus, in live mode, an mt5.symbol_info() read), pip value,
+stops distance and price rounding from the symbol info on every order and on
+every retry. An OrderTemplate holds all of it for one symbol:
+
+- price rounding to the symbol's point and digits
+- the volume grid (min, max, step; volumes are snapped down, never up)
+- allowed filling modes in preference order (IOC, RETURN, FOK)
+- deviation, magic and the static request fields
+
+Templates are keyed by symbol and rebuilt when the specification fields of the
+fresh symbol info differ from the ones they were built from (SPEC_FIELDS), so
+placing an order is a template fill plus one order_send.
+"""
+
+import math
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# Symbol info fields a template is derived from (a change rebuilds the template)
+SPEC_FIELDS = ('point', 'digits', 'trade_stops_level', 'volume_min', 'volume_max', 'volume_step', 'filling_mode')
+
+# MT5 SYMBOL_FILLING_* bits, in preference order: IOC (works for crypto 24/7),
+# RETURN (most common for forex and indices), FOK (often required for crypto)
+FILLING_PREFERENCE = ((2, 'ORDER_FILLING_IOC'), (4, 'ORDER_FILLING_RETURN'), (1, 'ORDER_FILLING_FOK'))
+
+DEFAULT_DEVIATION = 20
+DEFAULT_MAGIC = 234000
+
+
+def spec_key(symbol_info: Mapping[str, Any]) -> Tuple[Any, ...]:
+    """Values of SPEC_FIELDS in a symbol info dict."""
+    return tuple(symbol_info.get(field) for field in SPEC_FIELDS)
+
+
+class OrderTemplate:
+    """Precompiled order request fields of one symbol (immutable once built)."""
+
+    __slots__ = ('symbol', 'spec', 'point', 'digits', 'pip_value', 'stops_level', 'min_stop_distance',
+                 'volume_min', 'volume_max', 'volume_step', '_volume_decimals', 'filling_types', 'deviation',
+                 'magic', '_base_request', 'built_at')
+
+    def __init__(self, symbol_info: Mapping[str, Any], filling_modes: Optional[int], mt5_module,
+                 deviation: int = DEFAULT_DEVIATION, magic: int = DEFAULT_MAGIC, default_filling: Optional[int] = None):
+        """
+        Build the template.
+
+        Args:
+            symbol_info: Connector symbol info dict
+            filling_modes: SYMBOL_FILLING_* bitmask (None if unknown)
+            mt5_module: MT5 module supplying the ORDER_* constants
+            deviation: Maximum price deviation in points
+            magic: Expert magic number
+            default_filling: Filling type when the bitmask allows none (None = no supported mode)
+        """
+        self.symbol = symbol_info['name']
+        self.spec = spec_key(symbol_info)
+        self.point = symbol_info['point']
+        self.digits = symbol_info.get('digits', 5)
+        self.pip_value = self.point * 10 if self.digits in (3, 5) else self.point
+        self.stops_level = symbol_info.get('trade_stops_level', 0) or 0
+        self.min_stop_distance = self.stops_level * self.point
+        self.volume_min = symbol_info.get('volume_min') or 0.0
+        self.volume_max = symbol_info.get('volume_max') or 0.0
+        self.volume_step = symbol_info.get('volume_step') or 0.0
+        # Decimal places of the step itself (0.25 -> 2), so rounding never leaves the grid
+        self._volume_decimals = (max(0, -Decimal(str(self.volume_step)).normalize().as_tuple().exponent)
+                                 if self.volume_step > 0 else 8)
+
+        filling_types = []
+        if filling_modes is not None:
+            filling_types = [getattr(mt5_module, name) for bit, name in FILLING_PREFERENCE if filling_modes & bit]
+        if not filling_types and default_filling is not None:
+            filling_types = [default_filling]
+        self.filling_types = tuple(filling_types)
+
+        self.deviation = deviation
+        self.magic = magic
+        self._base_request = {
+            "action": mt5_module.TRADE_ACTION_DEAL,
+            "symbol": self.symbol,
+            "deviation": deviation,
+            "magic": magic,
+            "type_time": mt5_module.ORDER_TIME_GTC,
+        }
+        self.built_at = time.time()
+
+    @property
+    def filling_type(self) -> Optional[int]:
+        """Preferred filling type (None if the symbol supports none)."""
+        return self.filling_types[0] if self.filling_types else None
+
+    def round_price(self, price: float) -> float:
+        """Price snapped to the symbol's point and digits."""
+        return round(round(price / self.point) * self.point, self.digits)
+
+    def normalize_volume(self, volume: float) -> Optional[float]:
+        """
+        Volume snapped down to the volume grid.
+
+        Returns:
+            Normalized volume, or None if it falls outside [volume_min, volume_max]
+        """
+        if self.volume_step > 0:
+            # Small epsilon so 0.03 / 0.01 = 2.9999999999999996 stays 3 steps
+            volume = round(math.floor(volume / self.volume_step + 1e-9) * self.volume_step, self._volume_decimals)
+        if volume <= 0 or (self.volume_min and volume < self.volume_min - 1e-12) or \
+                (self.volume_max and volume > self.volume_max + 1e-12):
+            return None
+        return volume
+
+    def request(self, order_type: int, volume: float, price: float, comment: str, sl: float = 0.0,
+                tp: float = 0.0, filling_type: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Fill the template into an order_send() request.
+
+        SL and TP are omitted when not set (MT5 rejects sl=0 or tp=0).
+        """
+        request = dict(self._base_request)
+        request["volume"] = volume
+        request["type"] = order_type
+        request["price"] = price
+        request["comment"] = comment
+        request["type_filling"] = filling_type if filling_type is not None else self.filling_type
+        if sl > 0:
+            request["sl"] = sl
+        if tp > 0:
+            request["tp"] = tp
+        return request
+
+    def __repr__(self) -> str:
+        return (f"OrderTemplate({self.symbol} point={self.point} digits={self.digits} "
+                f"stops_level={self.stops_level} volume={self.volume_min}..{self.volume_max}/{self.volume_step} "
+                f"filling={self.filling_types})")
+
+
+class OrderTemplateCache:
+    """Session cache of OrderTemplates, rebuilt on specification change (thread-safe)."""
+
+    def __init__(self, build_fn: Callable[[Mapping[str, Any]], OrderTemplate]):
+        """
+        Initialize the cache.
+
+        Args:
+            build_fn: Builds the template of a symbol from its symbol info dict
+        """
+        self._build_fn = build_fn
+        self._lock = threading.Lock()
+        self._templates: Dict[str, OrderTemplate] = {}
+        self._stats = {'hits': 0, 'builds': 0, 'spec_changes': 0, 'invalidations': 0}
+
+    def get(self, symbol_info: Mapping[str, Any]) -> OrderTemplate:
+        """Template of symbol_info['name'], rebuilt if its specification changed."""
+        symbol = symbol_info['name']
+        with self._lock:
+            template = self._templates.get(symbol)
+            if template is not None:
+                if template.spec == spec_key(symbol_info):
+                    self._stats['hits'] += 1
+                    return template
+                self._stats['spec_changes'] += 1
+        # Built outside the lock: a live-mode build may read mt5.symbol_info()
+        template = self._build_fn(symbol_info)
+        with self._lock:
+            self._templates[symbol] = template
+            self._stats['builds'] += 1
+        return template
+
+    def peek(self, symbol: str) -> Optional[OrderTemplate]:
+        """Cached template of a symbol without validation (None if not built)."""
+        with self._lock:
+            return self._templates.get(symbol)
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop the template of a symbol (all symbols if None)."""
+        with self._lock:
+            if symbol is None:
+                self._templates.clear()
+            else:
+                self._templates.pop(symbol, None)
+            self._stats['invalidations'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['templates'] = len(self._templates)
+        return stats
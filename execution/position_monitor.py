@@ -10,18 +10,27 @@ import os
 import json
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Set
+from typing import Callable, Dict, List, Any, Optional, Set
 from execution.mt5_connector import MT5Connector
+from execution.mt5_io import MT5Priority, mt5_call
+from execution.deal_journal import DealJournal
 from trade_logging.trade_logger import TradeLogger
 
 
 class PositionMonitor:
     """Monitors positions and logs closures detected from MT5."""
     
-    def __init__(self, config: Dict[str, Any], trade_logger: TradeLogger):
+    MAX_CLOSURE_ATTEMPTS = 3  # Detection passes before a closure without exit deal is dropped
+    
+    def __init__(self, config: Dict[str, Any], trade_logger: TradeLogger,
+                 deal_journal: Optional[DealJournal] = None):
         self.config = config
         self.trade_logger = trade_logger
         self.mt5_connector = MT5Connector(config)
+        # Shared with OrderManager so closure lookups hit one in-memory deal index
+        self.deal_journal = deal_journal
+        self.closure_callback: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+        self._unresolved_closures: Dict[int, int] = {}  # {ticket: detection passes without exit deal}
         self.tracked_positions: Set[int] = set()  # Track positions we've seen
         self._ensure_system_directories()
     
@@ -42,11 +51,20 @@ class PositionMonitor:
         if not self.mt5_connector.ensure_connected():
             return None
         
+        if self.deal_journal is not None:
+            try:
+                return self.deal_journal.get_position_summary(ticket, require_exit=True)
+            except Exception as e:
+                import logging
+                error_logger = logging.getLogger('system_errors')
+                error_logger.error(f"Error getting deal history for position {ticket}: {e}")
+                return None
+        
         import MetaTrader5 as mt5
         
         try:
             # Get all deals for this position
-            deals = mt5.history_deals_get(position=ticket)
+            deals = mt5_call(self.mt5_connector, mt5.history_deals_get, position=ticket, priority=MT5Priority.MONITORING)
             if not deals:
                 return None
             
@@ -97,12 +115,29 @@ class PositionMonitor:
             error_logger.error(f"Error getting deal history for position {ticket}: {e}")
             return None
     
-    def detect_and_log_closures(self, tracked_tickets: Set[int]) -> List[Dict[str, Any]]:
+    def set_closure_callback(self, callback: Callable[[List[Dict[str, Any]]], None]):
         """
-        Detect closed positions and log them.
+        Set callback receiving each batch of logged closures.
+        
+        Args:
+            callback: Function that accepts the list returned by detect_and_log_closures()
+        """
+        self.closure_callback = callback
+    
+    def detect_and_log_closures(self, tracked_tickets: Set[int],
+                                current_tickets: Optional[Set[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Detect closed positions and log them as one batch.
+        
+        Closed tickets are the difference between the tracked and the current
+        ticket sets. Their deals are resolved with one deal journal sync, then
+        every closure is logged and handed to the closure callback together.
+        Closures whose exit deal is not in the history yet are retried on the
+        next call (up to MAX_CLOSURE_ATTEMPTS).
         
         Args:
             tracked_tickets: Set of tickets we know should be open
+            current_tickets: Tickets open now (read from MT5 if None)
         
         Returns:
             List of closed positions that were logged
@@ -112,96 +147,136 @@ class PositionMonitor:
         
         import MetaTrader5 as mt5
         
-        logged_closures = []
-        current_positions = mt5.positions_get()
-        current_tickets = {pos.ticket for pos in current_positions} if current_positions else set()
+        if current_tickets is None:
+            current_positions = mt5_call(self.mt5_connector, mt5.positions_get, priority=MT5Priority.MONITORING)
+            current_tickets = {pos.ticket for pos in current_positions} if current_positions else set()
         
-        # Find positions that were tracked but are no longer open
-        closed_tickets = tracked_tickets - current_tickets
+        # Find positions that were tracked but are no longer open (plus unresolved ones from earlier calls)
+        closed_tickets = (set(tracked_tickets) - set(current_tickets)) | set(self._unresolved_closures)
+        if not closed_tickets:
+            return []
         
-        for ticket in closed_tickets:
+        # One bulk deal read for the whole batch instead of one per ticket
+        if self.deal_journal is not None:
             try:
-                # Get deal history to get closure details
-                deal_info = self.get_deal_history_for_position(ticket)
-                
-                if deal_info and deal_info['exit_deal']:
-                    entry_deal = deal_info['entry_deal']
-                    exit_deal = deal_info['exit_deal']
-                    
-                    # Determine symbol from position history
-                    # Try to get from a recent position query
-                    symbol = None
-                    # CRITICAL FIX: Use helper method if available, otherwise handle both SIM_LIVE and live MT5
-                    try:
-                        # Try position_get first (SIM_LIVE)
-                        if hasattr(mt5, 'position_get'):
-                            position = mt5.position_get(ticket)
-                            if position:
-                                symbol = position.symbol
-                        else:
-                            # Try positions_get(ticket=ticket) for live MT5
-                            position_list = mt5.positions_get(ticket=ticket)
-                            if position_list and len(position_list) > 0:
-                                symbol = position_list[0].symbol
-                    except (TypeError, AttributeError):
-                        # Fallback: get all positions and filter
-                        all_positions = mt5.positions_get()
-                        if all_positions:
-                            for pos in all_positions:
-                                if hasattr(pos, 'ticket') and pos.ticket == ticket:
-                                    symbol = pos.symbol
-                                    break
-                    else:
-                        # Try to get from deal
-                        if entry_deal:
-                            # Get deal details to find symbol
-                            deals = mt5.history_deals_get(position=ticket)
-                            if deals and len(deals) > 0:
-                                symbol = deals[0].symbol
-                    
-                    if not symbol:
-                        continue
-                    
-                    # Calculate duration
-                    duration_minutes = 0.0
-                    if entry_deal and exit_deal:
-                        duration = exit_deal['time'] - entry_deal['time']
-                        duration_minutes = duration.total_seconds() / 60.0
-                    
-                    # Determine close reason
-                    close_reason = self._determine_close_reason(ticket, deal_info)
-                    
-                    # Log closure
-                    self.trade_logger.log_position_closure(
-                        symbol=symbol,
-                        ticket=ticket,
-                        entry_price=entry_deal['price'] if entry_deal else 0.0,
-                        close_price=exit_deal['price'],
-                        profit=deal_info['total_profit'],
-                        duration_minutes=duration_minutes,
-                        close_reason=close_reason,
-                        entry_time=entry_deal['time'] if entry_deal else None,
-                        close_time=exit_deal['time'],
-                        commission=deal_info['commission'],
-                        swap=deal_info['swap']
-                    )
-                    
-                    logged_closures.append({
-                        'ticket': ticket,
-                        'symbol': symbol,
-                        'profit': deal_info['total_profit'],
-                        'close_time': exit_deal['time']
-                    })
-                    
-                    self.tracked_positions.discard(ticket)
-            
+                self.deal_journal.prefetch(closed_tickets)
             except Exception as e:
+                import logging
+                error_logger = logging.getLogger('system_errors')
+                error_logger.error(f"Error prefetching deals for {len(closed_tickets)} closed positions: {e}")
+        
+        logged_closures = []
+        for ticket in sorted(closed_tickets):
+            try:
+                closure = self._resolve_closure(ticket, mt5)
+            except Exception as e:
+                closure = None
                 import logging
                 error_logger = logging.getLogger('system_errors')
                 error_logger.error(f"Error detecting closure for position {ticket}: {e}")
+            
+            if closure is None:
+                attempts = self._unresolved_closures.get(ticket, 0) + 1
+                if attempts < self.MAX_CLOSURE_ATTEMPTS:
+                    self._unresolved_closures[ticket] = attempts
+                else:
+                    self._unresolved_closures.pop(ticket, None)
+                continue
+            
+            self._unresolved_closures.pop(ticket, None)
+            logged_closures.append(closure)
+        
+        logged_closures.sort(key=lambda closure: closure['close_time'])
+        for closure in logged_closures:
+            self.trade_logger.log_position_closure(
+                symbol=closure['symbol'],
+                ticket=closure['ticket'],
+                entry_price=closure['entry_price'],
+                close_price=closure['close_price'],
+                profit=closure['profit'],
+                duration_minutes=closure['duration_minutes'],
+                close_reason=closure['close_reason'],
+                entry_time=closure['entry_time'],
+                close_time=closure['close_time'],
+                commission=closure['commission'],
+                swap=closure['swap']
+            )
+            self.tracked_positions.discard(closure['ticket'])
+        
+        if logged_closures and self.closure_callback is not None:
+            try:
+                self.closure_callback(logged_closures)
+            except Exception as e:
+                import logging
+                error_logger = logging.getLogger('system_errors')
+                error_logger.error(f"Error in closure callback for {len(logged_closures)} closures: {e}")
         
         return logged_closures
     
+    def _resolve_closure(self, ticket: int, mt5) -> Optional[Dict[str, Any]]:
+        """Closure details of a ticket from its deal history (None until the exit deal exists)."""
+        deal_info = self.get_deal_history_for_position(ticket)
+        if not deal_info or not deal_info['exit_deal']:
+            return None
+        
+        entry_deal = deal_info['entry_deal']
+        exit_deal = deal_info['exit_deal']
+        symbol = (entry_deal or {}).get('symbol') or exit_deal.get('symbol') or self._lookup_symbol(ticket, entry_deal, mt5)
+        if not symbol:
+            return None
+        
+        # Calculate duration
+        duration_minutes = 0.0
+        if entry_deal and exit_deal:
+            duration = exit_deal['time'] - entry_deal['time']
+            duration_minutes = duration.total_seconds() / 60.0
+        
+        return {
+            'ticket': ticket,
+            'symbol': symbol,
+            'profit': deal_info['total_profit'],
+            'close_time': exit_deal['time'],
+            'entry_time': entry_deal['time'] if entry_deal else None,
+            'entry_price': entry_deal['price'] if entry_deal else 0.0,
+            'close_price': exit_deal['price'],
+            'duration_minutes': duration_minutes,
+            'close_reason': self._determine_close_reason(ticket, deal_info),
+            'commission': deal_info['commission'],
+            'swap': deal_info['swap']
+        }
+    
+    def _lookup_symbol(self, ticket: int, entry_deal: Optional[Dict[str, Any]], mt5) -> Optional[str]:
+        """Symbol of a closed ticket when its deals do not carry one."""
+        symbol = None
+        # CRITICAL FIX: Use helper method if available, otherwise handle both SIM_LIVE and live MT5
+        try:
+            # Try position_get first (SIM_LIVE)
+            if hasattr(mt5, 'position_get'):
+                position = mt5_call(self.mt5_connector, mt5.position_get, ticket, priority=MT5Priority.MONITORING)
+                if position:
+                    symbol = position.symbol
+            else:
+                # Try positions_get(ticket=ticket) for live MT5
+                position_list = mt5_call(self.mt5_connector, mt5.positions_get, ticket=ticket, priority=MT5Priority.MONITORING)
+                if position_list and len(position_list) > 0:
+                    symbol = position_list[0].symbol
+        except (TypeError, AttributeError):
+            # Fallback: get all positions and filter
+            all_positions = mt5_call(self.mt5_connector, mt5.positions_get, priority=MT5Priority.MONITORING)
+            if all_positions:
+                for pos in all_positions:
+                    if hasattr(pos, 'ticket') and pos.ticket == ticket:
+                        symbol = pos.symbol
+                        break
+        else:
+            # Try to get from deal
+            if not symbol and entry_deal:
+                # Get deal details to find symbol
+                deals = mt5_call(self.mt5_connector, mt5.history_deals_get, position=ticket, priority=MT5Priority.MONITORING)
+                if deals and len(deals) > 0:
+                    symbol = deals[0].symbol
+        return symbol
+    
     def _determine_close_reason(self, ticket: int, deal_info: Dict[str, Any]) -> str:
         """Determine the reason a position was closed."""
         if not deal_info or not deal_info.get('exit_deal'):
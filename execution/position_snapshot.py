@@ -0,0 +1,382 @@
+"""
+Shared Position Snapshot Bus
+Single producer for open-position snapshots shared by every monitoring thread.
+
+Instead of each thread (SL worker, trailing monitors, position monitor, soft TP,
+safety guard, realtime logger, SL dashboard) calling mt5.positions_get() on its own
+cadence, one producer thread captures the broker positions and publishes an
+immutable, versioned snapshot. Consumers read the latest snapshot and declare the
+maximum staleness they tolerate; if the snapshot is older than that, the reader
+triggers a single-flight refresh (only one thread hits the broker, the others wait
+for its result).
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+from execution.position_table import PositionRow
+from utils.logger_factory import get_logger
+
+logger = get_logger("position_snapshot", "logs/live/system/order_manager.log")
+
+# Default per-consumer staleness budgets (milliseconds).
+# Overridable via config['execution']['position_snapshot']['max_staleness_ms'].
+DEFAULT_MAX_STALENESS_MS = {
+    'sl_worker': 50,
+    'fast_trailing': 250,
+    'trailing': 500,
+    'position_monitor': 1000,
+    'soft_tp': 200,
+    'sl_safety_guard': 200,
+    'sl_realtime_monitor': 500,
+    'realtime_logger': 1000,
+}
+DEFAULT_CONSUMER_STALENESS_MS = 250
+# When an on-demand refresh fails, the last snapshot is still served up to this many
+# times the consumer's budget; older than that, get() returns None (broker outage).
+# Overridable via config['execution']['position_snapshot']['stale_fallback_factor'].
+DEFAULT_STALE_FALLBACK_FACTOR = 10.0
+
+# Fetch function contract: returns (positions, excluded_tickets) or None on failure.
+# excluded_tickets are positions that get_open_positions(exclude_dec8=True) would hide.
+FetchResult = Optional[Tuple[List[Dict[str, Any]], Set[int]]]
+
+
+@dataclass(frozen=True)
+class PositionSnapshot:
+    """Immutable view of all open positions at a single point in time."""
+    sequence: int
+    captured_at: float
+    positions: Tuple[Mapping[str, Any], ...]
+    excluded_tickets: FrozenSet[int] = frozenset()
+    fetch_duration_ms: float = 0.0
+    _by_ticket: Mapping[int, Mapping[str, Any]] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def build(cls, sequence: int, positions: List[Mapping[str, Any]], excluded_tickets: Set[int],
+              fetch_duration_ms: float = 0.0, captured_at: Optional[float] = None) -> 'PositionSnapshot':
+        """
+        Freeze a list of positions into a snapshot.
+
+        Dicts are copied, not shared; PositionTable rows are already read-only and kept as-is.
+        """
+        frozen = tuple(pos if isinstance(pos, PositionRow) else MappingProxyType(dict(pos)) for pos in positions)
+        by_ticket = MappingProxyType({pos.get('ticket'): pos for pos in frozen})
+        return cls(
+            sequence=sequence,
+            captured_at=captured_at if captured_at is not None else time.time(),
+            positions=frozen,
+            excluded_tickets=frozenset(excluded_tickets),
+            fetch_duration_ms=fetch_duration_ms,
+            _by_ticket=by_ticket,
+        )
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds since the snapshot was captured."""
+        return (now if now is not None else time.time()) - self.captured_at
+
+    def tickets(self, exclude_dec8: bool = True) -> FrozenSet[int]:
+        """Set of open position tickets."""
+        all_tickets = frozenset(self._by_ticket.keys())
+        return all_tickets - self.excluded_tickets if exclude_dec8 else all_tickets
+
+    def by_ticket(self, ticket: int) -> Optional[Mapping[str, Any]]:
+        """Read-only position mapping for a ticket, or None if not open."""
+        return self._by_ticket.get(ticket)
+
+    def as_dicts(self, exclude_dec8: bool = True) -> List[Dict[str, Any]]:
+        """
+        Mutable copies in the same shape as OrderManager.get_open_positions().
+
+        Args:
+            exclude_dec8: If True, drop positions that get_open_positions() excludes by default
+        """
+        if exclude_dec8 and self.excluded_tickets:
+            return [pos.copy() for pos in self.positions if pos.get('ticket') not in self.excluded_tickets]
+        return [pos.copy() for pos in self.positions]
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+
+class PositionSnapshotBus:
+    """
+    Publishes position snapshots from a single producer and serves them to consumers.
+
+    Consumers either poll with get(consumer=...) (respecting their staleness budget)
+    or subscribe(callback) to be notified on the producer thread after each publish.
+    """
+
+    def __init__(self, fetch_fn: Callable[[], FetchResult], interval_seconds: float = 0.1,
+                 max_staleness_ms: Optional[Dict[str, float]] = None, enabled: bool = True,
+                 name: str = "PositionSnapshotBus",
+                 stale_fallback_factor: float = DEFAULT_STALE_FALLBACK_FACTOR):
+        """
+        Initialize the bus.
+
+        Args:
+            fetch_fn: Broker read returning (positions, excluded_tickets), or None on failure
+            interval_seconds: Producer cadence
+            max_staleness_ms: Per-consumer staleness overrides (merged over defaults)
+            enabled: If False, get() always performs a direct fetch (legacy behaviour)
+            name: Producer thread name
+            stale_fallback_factor: Multiple of a consumer's budget up to which the last
+                snapshot is served when a refresh fails
+        """
+        self._fetch_fn = fetch_fn
+        self.interval_seconds = max(0.005, interval_seconds)
+        self.enabled = enabled
+        self.name = name
+        self.stale_fallback_factor = max(1.0, stale_fallback_factor)
+
+        self._max_staleness_ms = dict(DEFAULT_MAX_STALENESS_MS)
+        if max_staleness_ms:
+            self._max_staleness_ms.update(max_staleness_ms)
+
+        self._latest: Optional[PositionSnapshot] = None
+        self._sequence = 0
+        self._publish_cond = threading.Condition(threading.Lock())
+        # Single-flight guard: only one thread talks to the broker at a time
+        self._fetch_lock = threading.Lock()
+
+        self._subscribers: List[Callable[[PositionSnapshot], None]] = []
+        self._subscribers_lock = threading.Lock()
+
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown_event = threading.Event()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'fetches': 0,
+            'fetch_failures': 0,
+            'cache_hits': 0,
+            'on_demand_refreshes': 0,
+            'coalesced_refreshes': 0,
+            'stale_rejections': 0,
+            'last_fetch_ms': 0.0,
+            'max_fetch_ms': 0.0,
+        }
+
+    # ------------------------------------------------------------------ producer
+
+    def start(self):
+        """Start the producer thread (idempotent)."""
+        if self._running and self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._shutdown_event.clear()
+        self._thread = threading.Thread(target=self._producer_loop, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f"[THREAD_START] {self.name} interval={self.interval_seconds*1000:.0f}ms")
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the producer thread."""
+        if not self._running:
+            return
+        self._running = False
+        self._shutdown_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        logger.info(f"[THREAD_STOP] {self.name} reason=shutdown_requested")
+
+    def is_running(self) -> bool:
+        return bool(self._running and self._thread and self._thread.is_alive())
+
+    def _producer_loop(self):
+        while self._running and not self._shutdown_event.is_set():
+            cycle_start = time.time()
+            try:
+                # Skip the broker call if a consumer refreshed on demand within this interval
+                latest = self._latest
+                if latest is None or latest.age(cycle_start) >= self.interval_seconds:
+                    self.refresh()
+            except Exception as e:
+                logger.error(f"[{self.name}] Producer error: {e}", exc_info=True)
+            elapsed = time.time() - cycle_start
+            self._shutdown_event.wait(max(0.0, self.interval_seconds - elapsed))
+
+    def refresh(self) -> Optional[PositionSnapshot]:
+        """
+        Fetch from the broker and publish a new snapshot.
+
+        Concurrent callers are coalesced: a thread that waited for an in-flight fetch
+        returns that fetch's result instead of issuing another broker call.
+        """
+        seq_before = self._sequence
+        with self._fetch_lock:
+            if self._sequence != seq_before and self._latest is not None:
+                with self._stats_lock:
+                    self._stats['coalesced_refreshes'] += 1
+                return self._latest
+
+            fetch_start = time.time()
+            try:
+                result = self._fetch_fn()
+            except Exception as e:
+                result = None
+                logger.warning(f"[{self.name}] Position fetch raised: {e}")
+            fetch_ms = (time.time() - fetch_start) * 1000
+
+            with self._stats_lock:
+                self._stats['fetches'] += 1
+                self._stats['last_fetch_ms'] = fetch_ms
+                self._stats['max_fetch_ms'] = max(self._stats['max_fetch_ms'], fetch_ms)
+                if result is None:
+                    self._stats['fetch_failures'] += 1
+
+            if result is None:
+                # Keep serving the last good snapshot; consumers see its age grow
+                return None
+
+            positions, excluded = result
+            snapshot = PositionSnapshot.build(
+                sequence=self._sequence + 1,
+                positions=positions or [],
+                excluded_tickets=excluded or set(),
+                fetch_duration_ms=fetch_ms,
+                captured_at=fetch_start,
+            )
+            self._publish(snapshot)
+            return snapshot
+
+    def _publish(self, snapshot: PositionSnapshot):
+        with self._publish_cond:
+            self._sequence = snapshot.sequence
+            self._latest = snapshot
+            self._publish_cond.notify_all()
+
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.warning(f"[{self.name}] Subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
+    # ------------------------------------------------------------------ consumers
+
+    def max_staleness_seconds(self, consumer: Optional[str]) -> float:
+        """Staleness budget for a consumer, in seconds."""
+        return self._max_staleness_ms.get(consumer, DEFAULT_CONSUMER_STALENESS_MS) / 1000.0
+
+    def latest(self) -> Optional[PositionSnapshot]:
+        """Latest published snapshot regardless of age (never touches the broker)."""
+        return self._latest
+
+    def get(self, consumer: Optional[str] = None, max_age_seconds: Optional[float] = None) -> Optional[PositionSnapshot]:
+        """
+        Snapshot no older than the consumer's staleness budget.
+
+        Args:
+            consumer: Consumer name used to look up its budget
+            max_age_seconds: Explicit budget (overrides the consumer lookup)
+
+        Returns:
+            PositionSnapshot, or None if no snapshot could be obtained. When the refresh
+            fails, the last snapshot is returned only while it is within
+            stale_fallback_factor times the budget - callers must treat None as
+            "positions unknown", never as "no positions"
+        """
+        if not self.enabled:
+            return self.refresh()
+
+        budget = max_age_seconds if max_age_seconds is not None else self.max_staleness_seconds(consumer)
+        latest = self._latest
+        if latest is not None and latest.age() <= budget:
+            with self._stats_lock:
+                self._stats['cache_hits'] += 1
+            return latest
+
+        with self._stats_lock:
+            self._stats['on_demand_refreshes'] += 1
+        refreshed = self.refresh()
+        if refreshed is not None:
+            return refreshed
+        latest = self._latest
+        if latest is not None and latest.age() <= budget * self.stale_fallback_factor:
+            return latest
+        with self._stats_lock:
+            self._stats['stale_rejections'] += 1
+        if latest is not None:
+            logger.warning(f"[{self.name}] Refresh failed and last snapshot is {latest.age()*1000:.0f}ms old "
+                           f"(limit {budget*self.stale_fallback_factor*1000:.0f}ms for {consumer or 'caller'})")
+        return None
+
+    def wait_for_next(self, after_sequence: int, timeout: float) -> Optional[PositionSnapshot]:
+        """Block until a snapshot newer than after_sequence is published (or timeout)."""
+        deadline = time.time() + timeout
+        with self._publish_cond:
+            while self._sequence <= after_sequence:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._publish_cond.wait(remaining)
+            return self._latest
+
+    def subscribe(self, callback: Callable[[PositionSnapshot], None]) -> Callable[[], None]:
+        """
+        Register a callback invoked on the producer thread after every publish.
+
+        Callbacks must be fast and must not call back into the broker.
+
+        Returns:
+            Function that removes the subscription
+        """
+        with self._subscribers_lock:
+            self._subscribers.append(callback)
+
+        def _unsubscribe():
+            with self._subscribers_lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return _unsubscribe
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Producer/consumer counters for monitoring."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        latest = self._latest
+        stats.update({
+            'enabled': self.enabled,
+            'running': self.is_running(),
+            'sequence': self._sequence,
+            'position_count': len(latest) if latest else 0,
+            'snapshot_age_ms': latest.age() * 1000 if latest else None,
+            'subscribers': len(self._subscribers),
+        })
+        return stats
+
+
+def uses_position_bus(order_manager) -> bool:
+    """True if reads for this order manager are served from an enabled snapshot bus."""
+    bus = getattr(order_manager, 'position_bus', None)
+    return isinstance(bus, PositionSnapshotBus) and bus.enabled
+
+
+def read_open_positions(order_manager, consumer: str, exclude_dec8: bool = True) -> Optional[List[Dict[str, Any]]]:
+    """
+    Open positions for a consumer, served from the shared bus when available.
+
+    Falls back to order_manager.get_open_positions() when the order manager has no
+    bus (mocks, backtest providers). Returns None if the bus could not serve a
+    snapshot within the consumer's stale fallback limit (broker outage) - a direct
+    read would fail the same way and look like "no positions".
+    """
+    if uses_position_bus(order_manager):
+        snapshot = order_manager.position_bus.get(consumer=consumer)
+        return snapshot.as_dicts(exclude_dec8=exclude_dec8) if snapshot is not None else None
+    if exclude_dec8:
+        # Default call signature - keeps lightweight providers without the kwarg working
+        return order_manager.get_open_positions()
+    return order_manager.get_open_positions(exclude_dec8=False)
+
+
+def read_position_snapshot(order_manager, consumer: str) -> Optional[PositionSnapshot]:
+    """Shared snapshot for a consumer, or None if the order manager has no bus or it failed."""
+    if uses_position_bus(order_manager):
+        return order_manager.position_bus.get(consumer=consumer)
+    return None
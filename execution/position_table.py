@@ -0,0 +1,202 @@
+"""
+Columnar Position Table
+One-pass, read-only snapshot of mt5.positions_get() results.
+
+OrderManager._read_broker_positions() turned every MT5 position into a fresh
+dict, called datetime.fromtimestamp() for it, recomputed the datetime.now()
+exclusion cutoffs and string-mapped the order type on every call. Position
+snapshots are taken many times per second, so PositionTable keeps the fields
+as per-column tuples instead:
+
+- the exclusion rules (Dec 8 locked positions, older than 12 hours, opened on
+  a previous day) are evaluated on the raw epoch seconds against cutoffs
+  computed once per table; datetimes are only built for excluded rows (log
+  text) and when a row's 'time_open' is read
+- PositionRow is a read-only Mapping view of one row (no per-row dict); it
+  works wherever a position dict is only read (.get(), [], dict(row))
+- numeric columns are available as NumPy arrays on demand (array())
+
+as_dicts() returns the legacy get_open_positions() shape for callers that
+mutate their positions.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Keys of a position dict, in get_open_positions() order
+POSITION_KEYS = ('ticket', 'symbol', 'type', 'volume', 'price_open', 'price_current', 'sl', 'tp', 'profit',
+                 'swap', 'time_open', 'comment')
+# Column holding each key ('time_open' is derived from the epoch 'time' column)
+_COLUMN_OF = {key: key for key in POSITION_KEYS}
+_COLUMN_OF['time_open'] = 'time'
+NUMERIC_COLUMNS = ('ticket', 'volume', 'price_open', 'price_current', 'sl', 'tp', 'profit', 'swap', 'time')
+
+LOCKED_DATE = datetime(2025, 12, 8).date()  # Dec 8, 2025 (markets closed, positions locked)
+MAX_AGE_HOURS = 12
+
+
+def _exclusion_cutoffs(now: datetime) -> Tuple[float, float, float, float]:
+    """(locked_day_start, locked_day_end, age_cutoff, today_start) as epoch seconds."""
+    locked_start = datetime.combine(LOCKED_DATE, datetime.min.time())
+    today_start = datetime.combine(now.date(), datetime.min.time())
+    return (locked_start.timestamp(), (locked_start + timedelta(days=1)).timestamp(),
+            (now - timedelta(hours=MAX_AGE_HOURS)).timestamp(), today_start.timestamp())
+
+
+class PositionTable:
+    """Read-only columnar snapshot of open positions (row i belongs to position i)."""
+
+    __slots__ = ('ticket', 'symbol', 'type', 'volume', 'price_open', 'price_current', 'sl', 'tp', 'profit',
+                 'swap', 'time', 'comment', 'exclusions', '_index', '_arrays')
+
+    def __init__(self, columns: Mapping[str, Sequence[Any]], exclusions: Optional[Dict[int, str]] = None):
+        """
+        Initialize the table.
+
+        Args:
+            columns: One sequence per name in __slots__ up to 'comment' (equal lengths);
+                'time' holds the open time in epoch seconds
+            exclusions: {ticket: reason} of positions get_open_positions() hides by default
+        """
+        for name in ('ticket', 'symbol', 'type', 'volume', 'price_open', 'price_current', 'sl', 'tp',
+                     'profit', 'swap', 'time', 'comment'):
+            setattr(self, name, tuple(columns[name]))
+        self.exclusions = dict(exclusions or {})
+        self._index = {ticket: i for i, ticket in enumerate(self.ticket)}
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_mt5(cls, positions: Sequence[Any], buy_type: int = 0, now: Optional[datetime] = None) -> 'PositionTable':
+        """
+        Build a table from mt5.positions_get() results in one pass.
+
+        Args:
+            positions: MT5 position records (SIM_LIVE records may carry 'BUY'/'SELL' strings as type)
+            buy_type: mt5.ORDER_TYPE_BUY
+            now: Reference time for the exclusion rules (datetime.now() if None)
+        """
+        now = now or datetime.now()
+        locked_start, locked_end, age_cutoff, today_start = _exclusion_cutoffs(now)
+        columns: Dict[str, List[Any]] = {name: [] for name in
+                                         ('ticket', 'symbol', 'type', 'volume', 'price_open', 'price_current',
+                                          'sl', 'tp', 'profit', 'swap', 'time', 'comment')}
+        (tickets, symbols, types, volumes, opens, currents, sls, tps, profits, swaps, times,
+         comments) = columns.values()
+        exclusions: Dict[int, str] = {}
+
+        for pos in positions:
+            opened = pos.time
+            pos_type = pos.type
+            tickets.append(pos.ticket)
+            symbols.append(pos.symbol)
+            # Handle both string type ('BUY'/'SELL') from SIM_LIVE and integer type (0/1) from live MT5
+            types.append(pos_type if isinstance(pos_type, str) else ('BUY' if pos_type == buy_type else 'SELL'))
+            volumes.append(pos.volume)
+            opens.append(pos.price_open)
+            currents.append(pos.price_current)
+            sls.append(pos.sl)
+            tps.append(pos.tp)
+            profits.append(pos.profit)
+            swaps.append(getattr(pos, 'swap', 0.0))  # Missing swap attribute (SIM_LIVE compatibility)
+            times.append(opened)
+            comments.append(pos.comment)
+
+            if locked_start <= opened < locked_end:
+                reason = "Dec 8, 2025 locked position (market closed)"
+            elif opened < age_cutoff:
+                reason = f"Position older than {MAX_AGE_HOURS} hours (locked from previous day)"
+            elif opened < today_start:
+                reason = f"Position from previous day ({datetime.fromtimestamp(opened).date()})"
+            else:
+                continue
+            time_open = datetime.fromtimestamp(opened)
+            exclusions[pos.ticket] = (f"{reason}: Ticket {pos.ticket}, Symbol {pos.symbol}, Opened: {time_open} "
+                                      f"(Date: {time_open.date()}, Age: {(now - time_open).total_seconds()/3600:.2f}h)")
+
+        return cls(columns, exclusions)
+
+    def __len__(self) -> int:
+        return len(self.ticket)
+
+    def __iter__(self) -> Iterator['PositionRow']:
+        return (PositionRow(self, i) for i in range(len(self.ticket)))
+
+    def rows(self, exclude_dec8: bool = True) -> List['PositionRow']:
+        """Row views, without the excluded positions by default."""
+        exclusions = self.exclusions if exclude_dec8 else None
+        return [PositionRow(self, i) for i, ticket in enumerate(self.ticket)
+                if not exclusions or ticket not in exclusions]
+
+    def get(self, ticket: int) -> Optional['PositionRow']:
+        """Row view of a ticket, or None if not in the table."""
+        i = self._index.get(ticket)
+        return PositionRow(self, i) if i is not None else None
+
+    def array(self, name: str) -> np.ndarray:
+        """Read-only float64 array of a numeric column (built on first use)."""
+        array = self._arrays.get(name)
+        if array is None:
+            if name not in NUMERIC_COLUMNS:
+                raise KeyError(name)
+            array = np.asarray(getattr(self, name), dtype=np.float64)
+            array.flags.writeable = False
+            self._arrays[name] = array
+        return array
+
+    def row_dict(self, i: int) -> Dict[str, Any]:
+        """Position dict of row i (get_open_positions() shape)."""
+        return {
+            'ticket': self.ticket[i],
+            'symbol': self.symbol[i],
+            'type': self.type[i],
+            'volume': self.volume[i],
+            'price_open': self.price_open[i],
+            'price_current': self.price_current[i],
+            'sl': self.sl[i],
+            'tp': self.tp[i],
+            'profit': self.profit[i],
+            'swap': self.swap[i],
+            'time_open': datetime.fromtimestamp(self.time[i]),
+            'comment': self.comment[i],
+        }
+
+    def as_dicts(self, exclude_dec8: bool = True) -> List[Dict[str, Any]]:
+        """Mutable position dicts in the get_open_positions() shape."""
+        exclusions = self.exclusions if exclude_dec8 else None
+        return [self.row_dict(i) for i, ticket in enumerate(self.ticket)
+                if not exclusions or ticket not in exclusions]
+
+
+class PositionRow(Mapping):
+    """Read-only dict view of one PositionTable row."""
+
+    __slots__ = ('_table', '_i')
+
+    def __init__(self, table: PositionTable, i: int):
+        self._table = table
+        self._i = i
+
+    def __getitem__(self, key: str) -> Any:
+        column = _COLUMN_OF.get(key)
+        if column is None:
+            raise KeyError(key)
+        value = getattr(self._table, column)[self._i]
+        return datetime.fromtimestamp(value) if key == 'time_open' else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(POSITION_KEYS)
+
+    def __len__(self) -> int:
+        return len(POSITION_KEYS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _COLUMN_OF
+
+    def copy(self) -> Dict[str, Any]:
+        """Mutable dict copy (same as dict(row), cheaper)."""
+        return self._table.row_dict(self._i)
+
+    def __repr__(self) -> str:
+        return f"PositionRow({self.copy()!r})"
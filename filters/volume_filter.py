@@ -9,6 +9,8 @@ import os
 import logging
 from typing import Dict, Any, Optional, Tuple
 from execution.mt5_connector import MT5Connector
+from execution.candle_store import get_candle_store
+from execution.mt5_io import MT5Priority, mt5_call
 
 logger = logging.getLogger(__name__)
 
@@ -120,6 +122,22 @@ class VolumeFilter:
             # Fail-safe: allow trading if volume check fails
             return True, None, None
     
+    def _get_recent_rates(self, symbol: str, timeframe: int):
+        """
+        Get the last check_period_minutes bars, from the shared candle store when available.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: MT5 timeframe constant
+        """
+        candle_store = get_candle_store(self.mt5_connector)
+        if candle_store is not None:
+            return candle_store.get(symbol, timeframe, self.check_period_minutes)
+        
+        import MetaTrader5 as mt5
+        return mt5_call(self.mt5_connector, mt5.copy_rates_from_pos, symbol, timeframe, 0, self.check_period_minutes,
+                        priority=MT5Priority.MARKET_DATA)
+    
     def _get_recent_tick_volume(self, symbol: str) -> Optional[int]:
         """
         Get recent tick volume from MT5.
@@ -131,16 +149,13 @@ class VolumeFilter:
             
             # Get recent tick data
             timeframe = mt5.TIMEFRAME_M1  # 1-minute timeframe
-            rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, self.check_period_minutes)
+            rates = self._get_recent_rates(symbol, timeframe)
             
             if rates is None or len(rates) == 0:
                 return None
             
-            # Sum tick volume over the period
-            total_volume = sum(rate['tick_volume'] for rate in rates)
-            
-            # Average per minute
-            avg_volume = total_volume / len(rates) if len(rates) > 0 else 0
+            # Average tick volume per minute over the period
+            avg_volume = float(rates['tick_volume'].sum()) / len(rates)
             
             return int(avg_volume)
         
@@ -159,16 +174,14 @@ class VolumeFilter:
             
             # Get recent tick data
             timeframe = mt5.TIMEFRAME_M1
-            rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, self.check_period_minutes)
+            rates = self._get_recent_rates(symbol, timeframe)
             
             if rates is None or len(rates) == 0:
                 return None
             
             # Real volume is in 'real_volume' field (if available)
             if 'real_volume' in rates.dtype.names:
-                total_volume = sum(rate['real_volume'] for rate in rates)
-                avg_volume = total_volume / len(rates) if len(rates) > 0 else 0
-                return float(avg_volume)
+                return float(rates['real_volume'].sum()) / len(rates)
             
             return None
         
@@ -188,11 +201,14 @@ class VolumeFilter:
             # Get tick history (if available)
             from datetime import datetime, timedelta
             
-            ticks = mt5.copy_ticks_from(
+            ticks = mt5_call(
+                self.mt5_connector,
+                mt5.copy_ticks_from,
                 symbol,
                 datetime.now() - timedelta(minutes=self.check_period_minutes),
                 self.check_period_minutes * 60,  # Number of ticks to request
-                mt5.COPY_TICKS_ALL
+                mt5.COPY_TICKS_ALL,
+                priority=MT5Priority.MARKET_DATA
             )
             
             if ticks is None:
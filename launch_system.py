@@ -300,7 +300,8 @@ class TradingSystemLauncher:
                 bot_state_getter=get_bot_state,
                 shutdown_event=self.shutdown_event,
                 sl_manager=sl_manager,
-                console_output=False  # Disable console output
+                console_output=False,  # Disable console output
+                order_manager=self.bot.order_manager if self.bot else None
             )
             logger.info("[OK] Lightweight Real-Time Logger started (file logging only)")
             
@@ -19,10 +19,12 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 import MetaTrader5 as mt5
+from execution.position_snapshot import read_position_snapshot
 from utils.logger_factory import get_logger
 
 
-def start_realtime_logger(mt5_connector, bot_state_getter, shutdown_event: threading.Event, sl_manager=None, console_output=True):
+def start_realtime_logger(mt5_connector, bot_state_getter, shutdown_event: threading.Event, sl_manager=None, console_output=True,
+                          order_manager=None):
     """
     Start lightweight real-time logger in a separate daemon thread.
     
@@ -32,6 +34,7 @@ def start_realtime_logger(mt5_connector, bot_state_getter, shutdown_event: threa
         shutdown_event: Event to signal shutdown
         sl_manager: Optional SLManager instance for metrics tracking
         console_output: If False, disable all console output (default: True)
+        order_manager: Optional OrderManager - positions are read from its shared snapshot bus when available
     """
     # File logging disabled to save storage space
     # Runtime logs are no longer written to files
@@ -77,9 +80,12 @@ def start_realtime_logger(mt5_connector, bot_state_getter, shutdown_event: threa
                     last_action = bot_state.get('last_action', 'N/A')
                     last_action_time = bot_state.get('last_action_time', None)
                     
-                    # Get open positions
+                    # Get open positions (shared snapshot bus first, direct MT5 read as fallback)
                     positions = []
-                    if mt5_connector and mt5_connector.ensure_connected():
+                    snapshot = read_position_snapshot(order_manager, 'realtime_logger') if order_manager else None
+                    if snapshot is not None:
+                        positions = snapshot.as_dicts(exclude_dec8=False)
+                    elif mt5_connector and mt5_connector.ensure_connected():
                         positions_raw = mt5.positions_get()
                         if positions_raw:
                             for pos in positions_raw:
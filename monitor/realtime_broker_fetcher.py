@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from execution.mt5_connector import MT5Connector
+from execution.mt5_io import MT5Priority, mt5_call
 from utils.logger_factory import get_logger
 
 logger = get_logger("broker_fetcher", "logs/live/system/broker_fetcher.log")
@@ -63,9 +64,12 @@ class RealtimeBrokerFetcher:
                 start_time = now - timedelta(hours=hours_back)
             
             # Get deals in time range
-            deals = mt5.history_deals_get(
+            deals = mt5_call(
+                self.mt5_connector,
+                mt5.history_deals_get,
                 start_time,
-                now
+                now,
+                priority=MT5Priority.MONITORING
             )
             
             if deals is None:
@@ -203,7 +207,7 @@ class RealtimeBrokerFetcher:
         try:
             import MetaTrader5 as mt5
             
-            positions = mt5.positions_get()
+            positions = mt5_call(self.mt5_connector, mt5.positions_get, priority=MT5Priority.MONITORING)
             if positions is None:
                 return []
             
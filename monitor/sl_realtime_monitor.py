@@ -29,6 +29,7 @@ except ImportError:
     print("[WARNING]  Warning: 'rich' library not found. Install with: pip install rich")
     print("   Falling back to basic console output")
 
+from execution.position_snapshot import read_open_positions
 from utils.logger_factory import get_logger
 
 logger = get_logger("sl_monitor", "logs/live/monitor/sl_monitor.log")
@@ -163,7 +164,7 @@ class SLRealtimeMonitor:
         """Get all open positions."""
         try:
             if self.bot and hasattr(self.bot, 'order_manager'):
-                return self.bot.order_manager.get_open_positions(exclude_dec8=True)
+                return read_open_positions(self.bot.order_manager, 'sl_realtime_monitor', exclude_dec8=True) or []
         except Exception as e:
             logger.error(f"Error getting positions: {e}")
         return []
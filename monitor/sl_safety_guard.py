@@ -17,6 +17,7 @@ import logging
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+from execution.position_snapshot import read_open_positions
 from utils.logger_factory import get_logger
 from utils.system_health import mark_system_unsafe
 
@@ -81,8 +82,11 @@ class SLSafetyGuard:
             try:
                 start_time = time.time()
                 
-                # Get all open positions
-                positions = self.order_manager.get_open_positions()
+                # Get all open positions (shared snapshot bus - no extra broker round-trip)
+                # None: broker outage with no snapshot within the stale fallback limit - nothing to check
+                positions = read_open_positions(self.order_manager, 'sl_safety_guard')
+                if positions is None:
+                    logger.debug("[SL_SAFETY_GUARD] No position snapshot within staleness limit - skipping check")
                 
                 if positions:
                     violations = []
@@ -101,6 +105,11 @@ class SLSafetyGuard:
                                 'position': position
                             })
                     
+                    # Snapshot may predate an SL that was just applied - confirm against the broker
+                    # before closing anything
+                    if violations:
+                        violations = self._confirm_violations(violations)
+                    
                     # If violations detected, handle them immediately
                     if violations:
                         self._handle_violations(violations)
@@ -120,6 +129,51 @@ class SLSafetyGuard:
                 logger.error(f"[SL_SAFETY_GUARD_ERROR] Exception in monitor loop: {e}", exc_info=True)
                 time.sleep(self._check_interval)
     
+    def _confirm_violations(self, violations: list) -> list:
+        """
+        Re-check snapshot violations against a fresh broker read.
+        
+        Args:
+            violations: Violations detected from the shared position snapshot
+        
+        Returns:
+            Violations that are still present on the broker
+        """
+        # A failed read must never look like "every position closed" - get_open_positions()
+        # returns [] on failure, get_position_table() returns None
+        try:
+            if hasattr(self.order_manager, 'get_position_table'):
+                table = self.order_manager.get_position_table()
+                if table is None:
+                    logger.warning("[SL_SAFETY_GUARD] Fresh position read failed - using snapshot violations")
+                    return violations
+                fresh_by_ticket = {}
+                for violation in violations:
+                    row = table.get(violation['ticket'])
+                    if row is not None:
+                        fresh_by_ticket[violation['ticket']] = row.copy()
+            else:
+                fresh_positions = self.order_manager.get_open_positions(exclude_dec8=False)  # Backtest providers
+                fresh_by_ticket = {pos.get('ticket', 0): pos for pos in fresh_positions}
+        except Exception as e:
+            logger.error(f"[SL_SAFETY_GUARD] Fresh position read failed - using snapshot violations: {e}")
+            return violations
+        
+        confirmed = []
+        for violation in violations:
+            fresh = fresh_by_ticket.get(violation['ticket'])
+            if fresh is None:
+                continue  # Closed - absent from a successful read (excluded positions included)
+            sl = fresh.get('sl', 0.0)
+            if sl == 0.0 or sl is None:
+                violation['sl'] = sl
+                violation['position'] = fresh
+                confirmed.append(violation)
+            else:
+                logger.info(f"[SL_SAFETY_GUARD] Ticket {violation['ticket']} | Stale snapshot showed SL=0.0, "
+                           f"broker has SL={sl} - no action")
+        return confirmed
+    
     def _handle_violations(self, violations: list):
         """
         Handle SL=0.0 violations - close positions and activate kill switch.
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List, Tuple
 from collections import deque
 
+from risk.sl_verifier import DeferredSLVerifier
 from utils.logger_factory import get_logger
 
 watchdog_logger = get_logger("watchdog", "logs/live/monitor/watchdog.log")
@@ -21,7 +22,8 @@ class SLWatchdog:
     Monitors:
     - SL updates/sec (should be > 5 over 10s window)
     - Per-ticket staleness (no update for 1s for active tickets)
-    - Worker thread health
+    - Worker thread health (each SL worker shard when sharded)
+    - Deferred SL verifications never confirmed by a position snapshot
     """
     
     def __init__(self, sl_manager):
@@ -67,9 +69,12 @@ class SLWatchdog:
         # FIX 6: Read watchdog restart threshold from config
         risk_config = sl_manager.risk_config if hasattr(sl_manager, 'risk_config') else {}
         self.watchdog_restart_threshold = risk_config.get('watchdog_restart_threshold', 2.0)  # Default 2.0 seconds
+        # Sharded SL worker: a shard whose loop has not started an iteration for this long is stalled
+        self.shard_stall_threshold_seconds = watchdog_config.get('shard_stall_threshold_seconds', 10.0)
         
         # Tracking
         self._update_timestamps = deque()  # Sliding window of update timestamps
+        self.sl_verification_timeouts_total = 0  # Deferred SL verifications that timed out
         self._restart_timestamps = deque()  # Track restart times
         self._restart_lock = threading.Lock()
         
@@ -137,6 +142,9 @@ class SLWatchdog:
                     self.shutdown_event.wait(self.check_interval)
                     continue
                 
+                # Check each SL worker shard (dead shards are restarted individually)
+                self._check_worker_shards(worker_status.get('worker_shards', []))
+                
                 # Check SL update rate
                 timing_stats = self.sl_manager.get_timing_stats()
                 last_update_time = timing_stats.get('last_update_time')
@@ -274,6 +282,9 @@ class SLWatchdog:
                                 # Log warning but don't halt for 2 stale tickets (was causing false positives)
                                 watchdog_logger.warning(f"[WARNING] {len(stale_tickets)} stale tickets detected but below threshold ({len(positions)*stale_threshold_pct:.0%} or {min_stale_tickets}) - monitoring")
                 
+                # Check SL modifies that no position snapshot confirmed in time
+                self._check_sl_verification_timeouts()
+                
                 # Sleep until next check
                 self.shutdown_event.wait(self.check_interval)
             
@@ -358,6 +369,70 @@ class SLWatchdog:
         
         return in_flight_tickets, has_profit_locking
     
+    def _check_worker_shards(self, shards: List[Dict[str, Any]]):
+        """
+        Monitor SL worker shards (SLManager.get_worker_status()['worker_shards']).
+        
+        A dead shard is restarted on its own so the other partitions keep their SL
+        cadence; restarts share the max_restarts_per_10min budget. A live shard that
+        stopped starting iterations is reported as stalled.
+        """
+        now = time.time()
+        for shard in shards:
+            name = shard.get('name', 'SLWorker')
+            if not shard.get('thread_alive', False):
+                watchdog_logger.critical(f"[CRITICAL] SL worker shard {name} not alive "
+                                         f"({shard.get('positions', 0)} positions unmanaged)")
+                with self._restart_lock:
+                    while self._restart_timestamps and (datetime.now() - self._restart_timestamps[0]).total_seconds() > 600:
+                        self._restart_timestamps.popleft()
+                    if len(self._restart_timestamps) >= self.max_restarts_per_10min:
+                        watchdog_logger.critical(f"[CRITICAL] Restart limit reached ({self.max_restarts_per_10min}/10min) - "
+                                                 f"not restarting {name}")
+                        continue
+                    self._restart_timestamps.append(datetime.now())
+                restart = getattr(self.sl_manager, 'restart_sl_worker_shard', None)
+                if restart is not None and restart(shard.get('index', 0)):
+                    watchdog_logger.warning(f"[WATCHDOG] Restarted SL worker shard {name}")
+                continue
+            
+            last_loop_time = shard.get('last_loop_time')
+            if last_loop_time and now - last_loop_time > self.shard_stall_threshold_seconds:
+                watchdog_logger.critical(f"[CRITICAL] SL worker shard {name} stalled: no iteration for "
+                                         f"{now - last_loop_time:.1f}s (threshold: {self.shard_stall_threshold_seconds:.1f}s, "
+                                         f"positions: {shard.get('positions', 0)})")
+    
+    def _check_sl_verification_timeouts(self):
+        """
+        Surface deferred SL verification timeouts (DeferredSLVerifier).
+        
+        A timed-out ticket had a modify reported as successful that no later position
+        snapshot confirmed. Orphaned locks on those tickets are recovered and the tickets
+        are marked dirty so the next SL pass re-evaluates them.
+        """
+        verifier = getattr(self.sl_manager, '_sl_verifier', None)
+        if not isinstance(verifier, DeferredSLVerifier):
+            return
+        
+        verifier.expire()
+        timeouts = verifier.pop_timeouts()
+        if not timeouts:
+            return
+        
+        self.sl_verification_timeouts_total += len(timeouts)
+        watchdog_logger.warning(f"[WARNING] SL verification timeouts: {len(timeouts)} modify(s) not confirmed "
+                                f"within {verifier.timeout_seconds:.1f}s (total: {self.sl_verification_timeouts_total})")
+        for entry in timeouts[:5]:  # Log first 5
+            watchdog_logger.warning(f"   Ticket {entry['ticket']} ({entry['symbol']}): expected SL {entry['expected_sl']:.5f} "
+                                    f"{time.time() - entry['submitted_at']:.1f}s ago")
+        
+        dirty_tracker = getattr(self.sl_manager, '_sl_dirty_tracker', None)
+        for ticket in {entry['ticket'] for entry in timeouts}:
+            if self._is_orphaned_lock(ticket):
+                self._force_lock_recovery(ticket)
+            if dirty_tracker is not None:
+                dirty_tracker.forget(ticket)
+    
     def track_sl_update(self, ticket: int):
         """Track an SL update for rate monitoring."""
         self._update_timestamps.append(datetime.now())
@@ -0,0 +1,180 @@
+"""
+Background Task Scheduler
+Keyed, rate-limited task queue for SLManager's background worker.
+
+The SL worker queued ('fail_safe_check', None) and ('check_stale_locks', None)
+into a bounded queue.Queue on nearly every iteration and relied on queue.Full
+to drop the excess, so the background worker ran the same scan back-to-back.
+BackgroundTaskScheduler keeps at most one pending task per (task type, key):
+
+- submitting a task that is already pending collapses into it (the newer data
+  replaces the older)
+- each task type has a minimum interval between runs of the same key; a task
+  submitted earlier is held until it is due
+- execution times are recorded per task type in streaming histograms
+
+Due tasks run in order of due time, then submission order.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Tuple
+
+from utils.latency_histogram import StreamingHistogram
+
+TaskKey = Tuple[str, Hashable]
+
+
+class BackgroundTask:
+    """One pending task."""
+
+    __slots__ = ('task_type', 'key', 'data', 'submitted_at', 'due_at', 'collapsed')
+
+    def __init__(self, task_type: str, key: Hashable, data: Any, submitted_at: float, due_at: float):
+        self.task_type = task_type
+        self.key = key
+        self.data = data
+        self.submitted_at = submitted_at
+        self.due_at = due_at
+        self.collapsed = 0  # Submissions merged into this task while pending
+
+
+class _TaskTypeStats:
+    """Counters and execution times of one task type."""
+
+    __slots__ = ('submitted', 'collapsed', 'rejected', 'executed', 'execution')
+
+    def __init__(self):
+        self.submitted = 0
+        self.collapsed = 0
+        self.rejected = 0
+        self.executed = 0
+        self.execution = StreamingHistogram()
+
+
+class BackgroundTaskScheduler:
+    """Deduplicating task queue with per-type minimum intervals (thread-safe)."""
+
+    def __init__(self, min_intervals: Optional[Mapping[str, float]] = None, max_pending: int = 100):
+        """
+        Initialize the scheduler.
+
+        Args:
+            min_intervals: {task_type: seconds} between runs of the same (type, key); 0 if absent
+            max_pending: Maximum pending tasks (new keys are rejected beyond it)
+        """
+        self.min_intervals: Dict[str, float] = dict(min_intervals or {})
+        self.max_pending = max_pending
+        self._condition = threading.Condition()
+        self._pending: Dict[TaskKey, BackgroundTask] = {}
+        self._heap: List[Tuple[float, int, TaskKey]] = []
+        self._sequence = itertools.count()
+        self._last_run: Dict[TaskKey, float] = {}
+        self._running: Dict[TaskKey, BackgroundTask] = {}
+        self._stats: Dict[str, _TaskTypeStats] = {}
+
+    def _type_stats(self, task_type: str) -> _TaskTypeStats:
+        stats = self._stats.get(task_type)
+        if stats is None:
+            stats = self._stats[task_type] = _TaskTypeStats()
+        return stats
+
+    def submit(self, task_type: str, data: Any = None, key: Hashable = None, now: Optional[float] = None) -> bool:
+        """
+        Queue a task (key defaults to one task per type).
+
+        Returns:
+            True if a new task was queued, False if it collapsed into a pending one
+            or the scheduler is full
+        """
+        now = now if now is not None else time.time()
+        task_key = (task_type, key)
+        with self._condition:
+            stats = self._type_stats(task_type)
+            stats.submitted += 1
+            pending = self._pending.get(task_key)
+            if pending is not None:
+                pending.data = data
+                pending.collapsed += 1
+                stats.collapsed += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                stats.rejected += 1
+                return False
+            last_run = self._last_run.get(task_key)
+            interval = self.min_intervals.get(task_type, 0.0)
+            due_at = max(now, last_run + interval) if last_run is not None else now
+            self._pending[task_key] = BackgroundTask(task_type, key, data, now, due_at)
+            heapq.heappush(self._heap, (due_at, next(self._sequence), task_key))
+            self._condition.notify()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[BackgroundTask]:
+        """Next due task, waiting up to timeout seconds (None if nothing became due)."""
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._condition:
+            while True:
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    _, _, task_key = heapq.heappop(self._heap)
+                    task = self._pending.pop(task_key)
+                    if self.min_intervals.get(task_key[0], 0.0) > 0:
+                        self._last_run[task_key] = now
+                        if len(self._last_run) > self.max_pending:
+                            self._prune_last_run(now)
+                    self._running[task_key] = task
+                    return task
+                wait = None if deadline is None else deadline - now
+                if self._heap:
+                    until_due = self._heap[0][0] - now
+                    wait = until_due if wait is None else min(wait, until_due)
+                if wait is not None and wait <= 0:
+                    return None
+                self._condition.wait(wait)
+
+    def _prune_last_run(self, now: float):
+        """Drop run timestamps whose minimum interval has already elapsed."""
+        self._last_run = {task_key: last_run for task_key, last_run in self._last_run.items()
+                          if now - last_run < self.min_intervals.get(task_key[0], 0.0)}
+
+    def task_done(self, task: BackgroundTask, duration_ms: float):
+        """Record the execution time of a task returned by get()."""
+        with self._condition:
+            self._running.pop((task.task_type, task.key), None)
+            stats = self._type_stats(task.task_type)
+            stats.executed += 1
+        stats.execution.record(duration_ms)
+
+    def forget(self, task_type: str, key: Hashable = None):
+        """Drop the pending task and interval state of a key (e.g. a closed ticket)."""
+        task_key = (task_type, key)
+        with self._condition:
+            if self._pending.pop(task_key, None) is not None:
+                self._heap = [entry for entry in self._heap if entry[2] != task_key]
+                heapq.heapify(self._heap)
+            self._last_run.pop(task_key, None)
+
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """{'pending', 'running', 'tasks': {task_type: counters + 'execution' histogram summary}}"""
+        with self._condition:
+            pending = len(self._pending)
+            running = len(self._running)
+            rows = [(task_type, stats.submitted, stats.collapsed, stats.rejected, stats.executed, stats.execution)
+                    for task_type, stats in self._stats.items()]
+        tasks = {}
+        for task_type, submitted, collapsed, rejected, executed, execution in rows:
+            tasks[task_type] = {
+                'submitted': submitted,
+                'collapsed': collapsed,
+                'rejected': rejected,
+                'executed': executed,
+                'min_interval_seconds': self.min_intervals.get(task_type, 0.0),
+                'execution': execution.get_stats(),
+            }
+        return {'pending': pending, 'running': running, 'tasks': tasks}
@@ -0,0 +1,427 @@
+"""
+Contract Size Calibration Store
+Disk-persisted contract size corrections shared by SLManager and RiskManager.
+
+SLManager and RiskManager both correct broker-reported contract sizes for
+indices, crypto and commodities (multiplier search, reverse engineering from a
+live position's profit) and kept the results only in memory, so every restart
+re-derived them with extra symbol_info calls before the first SL could be
+placed. ContractCalibrationStore keeps one record per (broker server, symbol,
+kind):
+
+- `kind` separates the two managers' heuristics ('sl_manager', 'risk_manager'),
+  which do not always agree and must not overwrite each other
+- every record carries the symbol spec it was derived from (trade_tick_value,
+  trade_tick_size, contract_size, point) and its validity window
+- records are loaded at construction and written back (tmp file + os.replace)
+  by a background thread, never from the calibration hot path
+- the same thread compares the stored spec with the connector's current one;
+  when the tick value or contract size moved by more than the tolerance, or the
+  record is about to expire, the record is recalibrated by the refresher
+  registered for its kind (or dropped when the refresher returns None)
+
+Persistence is off without a broker server (no stable key) and in backtest
+mode; the store then behaves like the old in-memory caches.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# Shares the SLManager logger (configured with the live/backtest log path by SLManager)
+logger = logging.getLogger("sl_manager")
+
+FILE_VERSION = 1
+DEFAULT_PATH = Path(__file__).parent.parent / 'data' / 'contract_calibration.json'
+
+# Spec fields stored with a record and compared by the refresher
+SPEC_FIELDS = ('trade_tick_value', 'trade_tick_size', 'contract_size', 'point')
+
+# (symbol, record) -> (value, source) or None to drop the record
+Refresher = Callable[[str, 'CalibrationRecord'], Optional[Tuple[float, str]]]
+# symbol -> symbol_info dict or None (MT5Connector.get_symbol_info)
+SpecProvider = Callable[[str], Optional[Mapping[str, Any]]]
+
+
+def spec_from_symbol_info(symbol_info: Optional[Mapping[str, Any]]) -> Dict[str, Optional[float]]:
+    """SPEC_FIELDS of a symbol_info dict (None for missing / non-numeric values)."""
+    spec: Dict[str, Optional[float]] = {}
+    for field in SPEC_FIELDS:
+        value = symbol_info.get(field) if symbol_info else None
+        try:
+            spec[field] = float(value) if value is not None else None
+        except (TypeError, ValueError):
+            spec[field] = None
+    return spec
+
+
+def spec_changed(old: Mapping[str, Optional[float]], new: Mapping[str, Optional[float]],
+                 tolerance_pct: float) -> bool:
+    """True if any spec field appeared, disappeared or moved by more than tolerance_pct."""
+    for field in SPEC_FIELDS:
+        a, b = old.get(field), new.get(field)
+        if a is None or b is None:
+            if (a is None) != (b is None):
+                return True
+            continue
+        if abs(a - b) > max(abs(a), abs(b)) * tolerance_pct / 100.0:
+            return True
+    return False
+
+
+class CalibrationRecord:
+    """One calibrated contract size."""
+
+    __slots__ = ('value', 'source', 'spec', 'inputs', 'calibrated_at', 'valid_until')
+
+    def __init__(self, value: float, source: str, spec: Dict[str, Optional[float]],
+                 inputs: Dict[str, float], calibrated_at: float, valid_until: float):
+        """
+        Initialize the record.
+
+        Args:
+            value: Corrected contract size
+            source: How it was derived ('reported', 'multiplier', 'reverse_engineered', ...)
+            spec: SPEC_FIELDS of the symbol_info used for the calibration
+            inputs: Calculation inputs needed to recalibrate (entry_price, lot_size, target_loss_usd)
+            calibrated_at: Unix timestamp of the calibration
+            valid_until: Unix timestamp after which the record is ignored
+        """
+        self.value = value
+        self.source = source
+        self.spec = spec
+        self.inputs = inputs
+        self.calibrated_at = calibrated_at
+        self.valid_until = valid_until
+
+    @property
+    def usd_per_point(self) -> Optional[float]:
+        """USD value of a one-point move for 1.0 lot (from the stored tick value), if known."""
+        tick_value = self.spec.get('trade_tick_value')
+        tick_size = self.spec.get('trade_tick_size')
+        point = self.spec.get('point')
+        if not tick_value or not point:
+            return None
+        return tick_value * point / tick_size if tick_size else tick_value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'value': self.value,
+            'source': self.source,
+            'spec': dict(self.spec),
+            'inputs': dict(self.inputs),
+            'calibrated_at': self.calibrated_at,
+            'valid_until': self.valid_until,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'CalibrationRecord':
+        spec = data.get('spec') or {}
+        return cls(float(data['value']), str(data.get('source', 'unknown')),
+                   {field: (float(spec[field]) if spec.get(field) is not None else None) for field in SPEC_FIELDS},
+                   {key: float(value) for key, value in (data.get('inputs') or {}).items()},
+                   float(data.get('calibrated_at', 0.0)), float(data['valid_until']))
+
+
+class ContractCalibrationStore:
+    """Thread-safe calibration records for one broker server, persisted to a JSON file."""
+
+    def __init__(self, server: str = '', path: Optional[Path] = None, ttl_seconds: float = 6 * 3600,
+                 refresh_interval_seconds: float = 60.0, flush_interval_seconds: float = 5.0,
+                 tick_value_tolerance_pct: float = 0.5, refresh_ahead_seconds: float = 300.0,
+                 spec_provider: Optional[SpecProvider] = None):
+        """
+        Initialize the store and load persisted records.
+
+        Args:
+            server: Broker server name (records of other servers are kept in the file but not used)
+            path: JSON file, None for an in-memory store
+            ttl_seconds: Validity of a new record
+            refresh_interval_seconds: Interval of the background spec comparison
+            flush_interval_seconds: Interval of the background write-back
+            tick_value_tolerance_pct: Spec change (percent) that triggers a recalibration
+            refresh_ahead_seconds: Recalibrate records this long before they expire
+            spec_provider: Current symbol_info per symbol (background refresh is off without it)
+        """
+        self.server = server
+        self.path = Path(path) if path is not None else None
+        self.ttl_seconds = ttl_seconds
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.flush_interval_seconds = flush_interval_seconds
+        self.tick_value_tolerance_pct = tick_value_tolerance_pct
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.spec_provider = spec_provider
+
+        self._lock = threading.Lock()
+        self._records: Dict[Tuple[str, str], CalibrationRecord] = {}  # {(symbol, kind): record}
+        self._other_servers: Dict[str, Any] = {}  # Raw file sections of other servers, written back untouched
+        self._refreshers: Dict[str, Refresher] = {}
+        self._dirty = False
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'loaded': 0, 'refreshed': 0, 'dropped': 0,
+                       'flushes': 0, 'flush_errors': 0}
+
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown_event = threading.Event()
+
+        if self.path is not None:
+            self.load()
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], spec_provider: Optional[SpecProvider] = None
+                    ) -> 'ContractCalibrationStore':
+        """Store configured by risk.contract_calibration (persistent only with mt5.server outside backtest)."""
+        calibration_config = config.get('risk', {}).get('contract_calibration', {})
+        server = str(config.get('mt5', {}).get('server', '') or '')
+        persist = calibration_config.get('persist', True) and bool(server) and config.get('mode') != 'backtest'
+        path = calibration_config.get('path') or DEFAULT_PATH
+        return cls(
+            server=server,
+            path=Path(path) if persist else None,
+            ttl_seconds=calibration_config.get('ttl_seconds', 6 * 3600),
+            refresh_interval_seconds=calibration_config.get('refresh_interval_seconds', 60.0),
+            flush_interval_seconds=calibration_config.get('flush_interval_seconds', 5.0),
+            tick_value_tolerance_pct=calibration_config.get('tick_value_tolerance_pct', 0.5),
+            refresh_ahead_seconds=calibration_config.get('refresh_ahead_seconds', 300.0),
+            spec_provider=spec_provider,
+        )
+
+    @property
+    def persistent(self) -> bool:
+        return self.path is not None
+
+    def register_refresher(self, kind: str, refresher: Refresher):
+        """Recalibration callback for records of one kind (called from the background thread)."""
+        with self._lock:
+            self._refreshers[kind] = refresher
+
+    def get(self, symbol: str, kind: str, now: Optional[float] = None) -> Optional[float]:
+        """Calibrated contract size, or None if unknown or expired."""
+        record = self.get_record(symbol, kind, now)
+        return record.value if record is not None else None
+
+    def get_record(self, symbol: str, kind: str, now: Optional[float] = None) -> Optional[CalibrationRecord]:
+        now = now if now is not None else time.time()
+        key = (symbol, kind)
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                self._stats['misses'] += 1
+                return None
+            if now >= record.valid_until:
+                del self._records[key]
+                self._dirty = True
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._stats['hits'] += 1
+            return record
+
+    def put(self, symbol: str, kind: str, value: float, source: str,
+            symbol_info: Optional[Mapping[str, Any]] = None, inputs: Optional[Mapping[str, float]] = None,
+            now: Optional[float] = None) -> CalibrationRecord:
+        """Store a calibration derived from symbol_info (write-back happens in the background)."""
+        now = now if now is not None else time.time()
+        record = CalibrationRecord(float(value), source, spec_from_symbol_info(symbol_info),
+                                   {key: float(v) for key, v in (inputs or {}).items()},
+                                   now, now + self.ttl_seconds)
+        with self._lock:
+            self._records[(symbol, kind)] = record
+            self._dirty = True
+        self._ensure_thread()
+        return record
+
+    def invalidate(self, symbol: Optional[str] = None, kind: Optional[str] = None) -> int:
+        """Drop records matching symbol and/or kind (all records without arguments)."""
+        with self._lock:
+            keys = [key for key in self._records
+                    if (symbol is None or key[0] == symbol) and (kind is None or key[1] == kind)]
+            for key in keys:
+                del self._records[key]
+            if keys:
+                self._dirty = True
+        return len(keys)
+
+    def records(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """{symbol: {kind: record dict}} of this server."""
+        with self._lock:
+            items = list(self._records.items())
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (symbol, kind), record in items:
+            result.setdefault(symbol, {})[kind] = record.to_dict()
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['records'] = len(self._records)
+            stats['dirty'] = self._dirty
+        stats['server'] = self.server
+        stats['path'] = str(self.path) if self.path is not None else None
+        return stats
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> int:
+        """Load this server's unexpired records from the file (missing or corrupt file: empty store)."""
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            servers = data.get('servers', {}) if data.get('version') == FILE_VERSION else {}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"[CONTRACT_CALIBRATION] Could not read {self.path}: {e} - starting empty")
+            return 0
+
+        now = time.time()
+        loaded: Dict[Tuple[str, str], CalibrationRecord] = {}
+        for symbol, kinds in (servers.get(self.server) or {}).items():
+            for kind, raw in (kinds or {}).items():
+                try:
+                    record = CalibrationRecord.from_dict(raw)
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if record.valid_until > now:
+                    loaded[(symbol, kind)] = record
+        with self._lock:
+            self._other_servers = {server: section for server, section in servers.items() if server != self.server}
+            self._records.update(loaded)
+            self._stats['loaded'] += len(loaded)
+        if loaded:
+            logger.info(f"[CONTRACT_CALIBRATION] Loaded {len(loaded)} calibrations for {self.server} from {self.path}")
+        return len(loaded)
+
+    def flush(self, force: bool = False) -> bool:
+        """Write the records to the file if they changed (atomic replace). Returns True if written."""
+        if self.path is None:
+            return False
+        with self._lock:
+            if not self._dirty and not force:
+                return False
+            section: Dict[str, Dict[str, Any]] = {}
+            for (symbol, kind), record in self._records.items():
+                section.setdefault(symbol, {})[kind] = record.to_dict()
+            servers = dict(self._other_servers)
+            servers[self.server] = section
+            self._dirty = False
+
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': FILE_VERSION, 'servers': servers}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            with self._lock:
+                self._dirty = True
+                self._stats['flush_errors'] += 1
+            logger.warning(f"[CONTRACT_CALIBRATION] Could not write {self.path}: {e}")
+            return False
+        with self._lock:
+            self._stats['flushes'] += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Recalibrate records whose spec changed or that are about to expire.
+
+        Returns:
+            {'checked', 'refreshed', 'dropped'} counts
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            items = list(self._records.items())
+            refreshers = dict(self._refreshers)
+
+        specs: Dict[str, Optional[Dict[str, Optional[float]]]] = {}
+        counts = {'checked': 0, 'refreshed': 0, 'dropped': 0}
+        for (symbol, kind), record in items:
+            refresher = refreshers.get(kind)
+            if refresher is None:
+                continue
+            counts['checked'] += 1
+            if symbol not in specs:
+                symbol_info = None
+                if self.spec_provider is not None:
+                    try:
+                        symbol_info = self.spec_provider(symbol)
+                    except Exception as e:
+                        logger.debug(f"[CONTRACT_CALIBRATION] Spec lookup failed for {symbol}: {e}")
+                specs[symbol] = spec_from_symbol_info(symbol_info) if symbol_info else None
+            spec = specs[symbol]
+            if spec is None:
+                continue  # Spec unavailable: keep the record until it expires
+            expiring = record.valid_until - now <= self.refresh_ahead_seconds
+            if not expiring and not spec_changed(record.spec, spec, self.tick_value_tolerance_pct):
+                continue
+
+            try:
+                result = refresher(symbol, record)
+            except Exception as e:
+                logger.warning(f"[CONTRACT_CALIBRATION] Refresh failed for {symbol} ({kind}): {e}")
+                continue
+            with self._lock:
+                if self._records.get((symbol, kind)) is not record:
+                    continue  # Recalibrated on the hot path meanwhile
+                if result is None:
+                    del self._records[(symbol, kind)]
+                    self._stats['dropped'] += 1
+                    counts['dropped'] += 1
+                else:
+                    value, source = result
+                    self._records[(symbol, kind)] = CalibrationRecord(
+                        float(value), source, spec, dict(record.inputs), now, now + self.ttl_seconds)
+                    self._stats['refreshed'] += 1
+                    counts['refreshed'] += 1
+                self._dirty = True
+            if result is None or result[0] != record.value:
+                logger.info(f"[CONTRACT_CALIBRATION] {symbol} ({kind}) spec changed "
+                            f"tick_value={record.spec.get('trade_tick_value')}->{spec.get('trade_tick_value')} | "
+                            f"contract_size {record.value} -> {result[0] if result else 'dropped'}")
+        return counts
+
+    def _ensure_thread(self):
+        """Start the background refresh / write-back thread on first use."""
+        if self._thread is not None or self._shutdown_event.is_set():
+            return
+        if self.path is None and self.spec_provider is None:
+            return  # Nothing to persist or refresh
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="ContractCalibration", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        last_refresh = time.time()
+        while not self._shutdown_event.wait(self.flush_interval_seconds):
+            try:
+                now = time.time()
+                if self.spec_provider is not None and now - last_refresh >= self.refresh_interval_seconds:
+                    last_refresh = now
+                    self.refresh(now)
+                self.flush()
+            except Exception as e:
+                logger.error(f"[CONTRACT_CALIBRATION] Background refresh error: {e}", exc_info=True)
+
+    def start(self):
+        """Start the background thread now (otherwise started by the first put())."""
+        self._ensure_thread()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the background thread and write pending records."""
+        self._shutdown_event.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=timeout)
+        self.flush()
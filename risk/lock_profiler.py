@@ -0,0 +1,297 @@
+"""
+Lock Contention Profiler
+Wait and hold time distributions for SLManager locks, per lock class and thread.
+
+SLManager's lock bookkeeping (_lock_holders, lock_diagnostics.jsonl) only
+produces log lines. ProfiledLock wraps a threading.Lock / RLock and reports
+every acquisition to a LockContentionProfiler:
+
+- wait time (acquire call to acquisition) and hold time (outermost acquire to
+  final release) go into streaming histograms per lock class ('ticket',
+  'tracking', 'timing', 'global_rpc') and per (lock class, thread)
+- the acquiring code site (first frame outside the lock helpers) is kept per
+  hold, aggregated into a top-N report of the sites holding locks longest
+- a failed blocking acquire counts as a timeout for its lock class, its own
+  site and the site holding the lock at that moment (the likely cause)
+
+Reentrant acquisitions by the owning thread are counted once.
+"""
+
+import sys
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from utils.latency_histogram import StreamingHistogram
+
+# Frames in these functions are lock plumbing, not the site that wanted the lock
+DEFAULT_SKIP_FUNCTIONS: FrozenSet[str] = frozenset({
+    '_acquire_ticket_lock_with_timeout', '__enter__', '__exit__', 'acquire', 'release',
+})
+
+
+class _SiteStats:
+    """Hold statistics of one (lock class, code site)."""
+
+    __slots__ = ('count', 'total_ms', 'max_ms', 'timeouts', 'blocked_others')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.timeouts = 0  # Acquire attempts from this site that timed out
+        self.blocked_others = 0  # Timeouts of other threads while this site held the lock
+
+
+class _LockClassStats:
+    """Histograms and counters of one lock class."""
+
+    __slots__ = ('wait', 'hold', 'acquisitions', 'timeouts')
+
+    def __init__(self):
+        self.wait = StreamingHistogram()
+        self.hold = StreamingHistogram()
+        self.acquisitions = 0
+        self.timeouts = 0
+
+
+class LockContentionProfiler:
+    """Collects lock wait/hold distributions (thread-safe)."""
+
+    def __init__(self, enabled: bool = True, capture_sites: bool = False,
+                 skip_functions: Iterable[str] = DEFAULT_SKIP_FUNCTIONS):
+        """
+        Initialize the profiler.
+
+        Args:
+            enabled: False makes wrap() return the lock unchanged
+            capture_sites: Record the acquiring code site (one frame walk per acquire)
+            skip_functions: Function names skipped when resolving the code site
+        """
+        self.enabled = enabled
+        self.capture_sites = capture_sites
+        self._skip_functions = frozenset(skip_functions)
+        self._lock = threading.Lock()
+        self._classes: Dict[str, _LockClassStats] = {}
+        self._threads: Dict[Tuple[str, str], Tuple[StreamingHistogram, StreamingHistogram]] = {}
+        self._sites: Dict[Tuple[str, str], _SiteStats] = {}
+
+    def wrap(self, lock: Any, lock_class: str) -> Any:
+        """ProfiledLock around lock (lock itself if profiling is disabled)."""
+        if not self.enabled or isinstance(lock, ProfiledLock):
+            return lock
+        return ProfiledLock(lock, lock_class, self)
+
+    def call_site(self) -> Optional[str]:
+        """'file.py:line function' of the first caller outside this module and the lock helpers."""
+        if not self.capture_sites:
+            return None
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename != __file__ and code.co_name not in self._skip_functions:
+                filename = code.co_filename.replace('\\', '/').rsplit('/', 1)[-1]
+                return f"{filename}:{frame.f_lineno} {code.co_name}"
+            frame = frame.f_back
+        return None
+
+    def _class_stats(self, lock_class: str) -> _LockClassStats:
+        stats = self._classes.get(lock_class)
+        if stats is None:
+            with self._lock:
+                stats = self._classes.setdefault(lock_class, _LockClassStats())
+        return stats
+
+    def _thread_histograms(self, lock_class: str) -> Tuple[StreamingHistogram, StreamingHistogram]:
+        key = (lock_class, threading.current_thread().name)
+        histograms = self._threads.get(key)
+        if histograms is None:
+            with self._lock:
+                histograms = self._threads.get(key)
+                if histograms is None:
+                    # Lifetime-only: one pair per thread and lock class
+                    histograms = self._threads[key] = (StreamingHistogram(windows=()), StreamingHistogram(windows=()))
+        return histograms
+
+    def _site_stats(self, lock_class: str, site: Optional[str]) -> _SiteStats:
+        key = (lock_class, site or 'unknown')
+        stats = self._sites.get(key)
+        if stats is None:
+            stats = self._sites[key] = _SiteStats()
+        return stats
+
+    def record_wait(self, lock_class: str, wait_ms: float):
+        stats = self._class_stats(lock_class)
+        stats.wait.record(wait_ms)
+        self._thread_histograms(lock_class)[0].record(wait_ms)
+        with self._lock:
+            stats.acquisitions += 1
+
+    def record_hold(self, lock_class: str, hold_ms: float, site: Optional[str]):
+        self._class_stats(lock_class).hold.record(hold_ms)
+        self._thread_histograms(lock_class)[1].record(hold_ms)
+        with self._lock:
+            site_stats = self._site_stats(lock_class, site)
+            site_stats.count += 1
+            site_stats.total_ms += hold_ms
+            if hold_ms > site_stats.max_ms:
+                site_stats.max_ms = hold_ms
+
+    def record_timeout(self, lock_class: str, wait_ms: float, site: Optional[str], holder_site: Optional[str]):
+        """A blocking acquire gave up after wait_ms while holder_site held the lock."""
+        stats = self._class_stats(lock_class)
+        with self._lock:
+            stats.timeouts += 1
+            self._site_stats(lock_class, site).timeouts += 1
+            if holder_site is not None:
+                self._site_stats(lock_class, holder_site).blocked_others += 1
+
+    def get_report(self, top_n: int = 10) -> Dict[str, Any]:
+        """
+        Contention report.
+
+        Returns:
+            Dict with:
+                - classes: {lock_class: {'acquisitions', 'timeouts', 'wait', 'hold'}}
+                - threads: {thread_name: {lock_class: {'wait', 'hold'}}} (lifetime summaries)
+                - top_hold_sites: top_n sites by total hold time
+                - top_blocking_sites: top_n holder sites by timeouts they caused
+        """
+        with self._lock:
+            classes = dict(self._classes)
+            counters = {name: (stats.acquisitions, stats.timeouts) for name, stats in classes.items()}
+            threads = dict(self._threads)
+            sites = [(lock_class, site, stats.count, stats.total_ms, stats.max_ms, stats.timeouts,
+                      stats.blocked_others) for (lock_class, site), stats in self._sites.items()]
+
+        report_classes = {}
+        for name, stats in classes.items():
+            acquisitions, timeouts = counters[name]
+            report_classes[name] = {
+                'acquisitions': acquisitions,
+                'timeouts': timeouts,
+                'wait': stats.wait.get_stats(),
+                'hold': stats.hold.get_stats(),
+            }
+
+        report_threads: Dict[str, Dict[str, Any]] = {}
+        for (lock_class, thread_name), (wait, hold) in threads.items():
+            report_threads.setdefault(thread_name, {})[lock_class] = {
+                'wait': wait.summary(),
+                'hold': hold.summary(),
+            }
+
+        def site_entry(row):
+            lock_class, site, count, total_ms, max_ms, timeouts, blocked_others = row
+            return {
+                'lock_class': lock_class,
+                'site': site,
+                'holds': count,
+                'total_hold_ms': round(total_ms, 3),
+                'avg_hold_ms': round(total_ms / count, 3) if count else 0.0,
+                'max_hold_ms': round(max_ms, 3),
+                'timeouts': timeouts,
+                'blocked_others': blocked_others,
+            }
+
+        by_hold = sorted((row for row in sites if row[2]), key=lambda row: row[3], reverse=True)
+        by_blocking = sorted((row for row in sites if row[6]), key=lambda row: row[6], reverse=True)
+        return {
+            'classes': report_classes,
+            'threads': report_threads,
+            'top_hold_sites': [site_entry(row) for row in by_hold[:top_n]],
+            'top_blocking_sites': [site_entry(row) for row in by_blocking[:top_n]],
+        }
+
+    def format_report(self, top_n: int = 5) -> List[str]:
+        """Log lines for periodic dumps."""
+        report = self.get_report(top_n)
+        lines = []
+        for name, stats in sorted(report['classes'].items()):
+            wait, hold = stats['wait'], stats['hold']
+            lines.append(
+                f"[LOCK_PROFILE] {name} acquisitions={stats['acquisitions']} timeouts={stats['timeouts']} "
+                f"wait_p95={wait['p95']}ms wait_max={wait['max']}ms "
+                f"hold_p95={hold['p95']}ms hold_max={hold['max']}ms"
+            )
+        for entry in report['top_hold_sites']:
+            lines.append(
+                f"[LOCK_PROFILE_SITE] {entry['lock_class']} {entry['site']} holds={entry['holds']} "
+                f"total={entry['total_hold_ms']}ms max={entry['max_hold_ms']}ms "
+                f"blocked_others={entry['blocked_others']}"
+            )
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._classes.clear()
+            self._threads.clear()
+            self._sites.clear()
+
+
+class ProfiledLock:
+    """Drop-in threading.Lock / RLock wrapper reporting to a LockContentionProfiler."""
+
+    __slots__ = ('_lock', 'lock_class', '_profiler', '_owner', '_depth', '_hold_start', '_hold_site')
+
+    def __init__(self, lock: Any, lock_class: str, profiler: LockContentionProfiler):
+        self._lock = lock
+        self.lock_class = lock_class
+        self._profiler = profiler
+        self._owner: Optional[int] = None
+        self._depth = 0
+        self._hold_start = 0.0
+        self._hold_site: Optional[str] = None
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        me = threading.get_ident()
+        if self._owner == me:
+            # Reentrant acquisition (RLock) - already counted
+            acquired = self._lock.acquire(blocking, timeout)
+            if acquired:
+                self._depth += 1
+            return acquired
+        site = self._profiler.call_site()
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        now = time.perf_counter()
+        if acquired:
+            self._owner = me
+            self._depth = 1
+            self._hold_start = now
+            self._hold_site = site
+            self._profiler.record_wait(self.lock_class, (now - start) * 1000)
+        elif blocking:
+            self._profiler.record_timeout(self.lock_class, (now - start) * 1000, site, self._hold_site)
+        return acquired
+
+    def release(self):
+        if self._owner != threading.get_ident():
+            # Not held by this thread: RLock raises RuntimeError, a plain Lock is released
+            self._lock.release()
+            return
+        if self._depth > 1:
+            self._depth -= 1
+            self._lock.release()
+            return
+        hold_ms = (time.perf_counter() - self._hold_start) * 1000
+        site = self._hold_site
+        self._owner = None
+        self._depth = 0
+        self._hold_site = None
+        self._lock.release()
+        self._profiler.record_hold(self.lock_class, hold_ms, site)
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
+
+    def locked(self) -> bool:
+        locked = getattr(self._lock, 'locked', None)
+        return locked() if locked is not None else self._owner is not None
+
+    def __repr__(self) -> str:
+        return f"<ProfiledLock {self.lock_class} {self._lock!r}>"
@@ -7,12 +7,19 @@ import threading
 import time
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Tuple, List
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Iterable, Tuple, List
 from execution.mt5_connector import MT5Connector
 from execution.order_manager import OrderManager
+from execution.candle_store import get_candle_store
+from execution.mt5_io import MT5Priority, mt5_call
+from risk.contract_calibration import CalibrationRecord, ContractCalibrationStore
 from utils.logger_factory import get_logger
 import MetaTrader5 as mt5
 
+# Calibration store kind of _get_corrected_contract_size() results
+CALIBRATION_KIND = 'risk_manager'
+
 # Module-level logger - will be reinitialized in __init__ based on mode
 logger = None
 
@@ -119,8 +126,9 @@ class RiskManager:
         self._staged_lock = threading.Lock()
         
         # Cache for corrected contract_size to avoid repeated calculations
-        self._contract_size_cache = {}  # {symbol: corrected_contract_size}
-        self._contract_size_cache_lock = threading.Lock()
+        # Contract size calibrations, persisted per broker server and shared with SLManager
+        self._calibration_store = ContractCalibrationStore.from_config(config, spec_provider=mt5_connector.get_symbol_info)
+        self._calibration_store.register_refresher(CALIBRATION_KIND, self._refresh_contract_size_calibration)
         
         # Throttling for SL calculation logging to reduce log bloat
         self._sl_log_throttle = {}  # {ticket: {'last_log_time': float, 'last_sl_price': float}}
@@ -142,7 +150,8 @@ class RiskManager:
         try:
             from risk.sl_manager import SLManager
             logger.info("Initializing SLManager...")
-            self.sl_manager = SLManager(config, mt5_connector, order_manager)
+            self.sl_manager = SLManager(config, mt5_connector, order_manager,
+                                        calibration_store=self._calibration_store)
             # CRITICAL FIX: Connect SLManager to RiskManager for ProfitLockingEngine/MicroProfitEngine access
             self.sl_manager._risk_manager = self
             # CRITICAL FIX: Connect SLManager to OrderManager for synchronous SL application when stop_loss=0.0
@@ -185,6 +194,9 @@ class RiskManager:
         self._circuit_breaker_lock = threading.Lock()
         self._consecutive_losses = 0
         self._closed_trades_pnl = []  # List of last 50 closed trade PnLs
+        # Tickets already recorded: RiskManager and PositionMonitor both detect closures
+        self._recorded_closures: "OrderedDict[int, None]" = OrderedDict()
+        self._recorded_closures_max = 1000
         self._daily_pnl = 0.0
         self._daily_pnl_date = datetime.now().date()
         self._circuit_breaker_paused_until = None  # datetime when pause expires
@@ -247,6 +259,12 @@ class RiskManager:
         self._symbol_cooldown = {}
         self._cooldown_lock = threading.Lock()
     
+    def shutdown(self):
+        """Stop the SLManager and the shared calibration store."""
+        if self.sl_manager:
+            self.sl_manager.shutdown()
+        self._calibration_store.stop()
+    
     def set_micro_profit_engine(self, micro_profit_engine):
         """
         Set the Micro-HFT Profit Engine instance.
@@ -271,6 +289,10 @@ class RiskManager:
             profit_locking_engine: ProfitLockingEngine instance
         """
         self._profit_locking_engine = profit_locking_engine
+        # Share the SL modify queue so engine modifies coalesce with SLManager modifies
+        sl_modify_queue = getattr(getattr(self, 'sl_manager', None), '_sl_modify_queue', None)
+        if sl_modify_queue is not None and hasattr(profit_locking_engine, 'sl_modify_queue'):
+            profit_locking_engine.sl_modify_queue = sl_modify_queue
         logger.info("Profit-Locking Engine registered with RiskManager")
     
     def set_pnl_callback(self, callback):
@@ -283,13 +305,30 @@ class RiskManager:
         self.bot_pnl_callback = callback
         logger.debug("P/L update callback registered with RiskManager")
     
-    def record_closed_trade(self, profit_usd: float):
+    def record_closed_trade(self, profit_usd: float, ticket: Optional[int] = None) -> bool:
         """
         Record a closed trade for circuit breaker tracking.
         
         Args:
             profit_usd: Profit/loss in USD for the closed trade
+            ticket: Position ticket (a ticket is recorded only once)
+        
+        Returns:
+            True if the trade was recorded, False if the ticket was already recorded
+        """
+        return bool(self.record_closed_trades([(ticket, profit_usd)]))
+    
+    def record_closed_trades(self, closures: Iterable[Tuple[Optional[int], float]]) -> List[Optional[int]]:
+        """
+        Record a batch of closed trades under one circuit breaker lock acquisition.
+        
+        Args:
+            closures: (ticket, profit_usd) pairs in close order; ticket None is always recorded
+        
+        Returns:
+            Tickets recorded by this call (already recorded tickets are skipped)
         """
+        recorded = []
         with self._circuit_breaker_lock:
             # Reset daily PnL if date changed
             current_date = datetime.now().date()
@@ -297,19 +336,30 @@ class RiskManager:
                 self._daily_pnl = 0.0
                 self._daily_pnl_date = current_date
             
-            # Update daily PnL
-            self._daily_pnl += profit_usd
-            
-            # Update consecutive losses
-            if profit_usd < 0:
-                self._consecutive_losses += 1
-            else:
-                self._consecutive_losses = 0
+            for ticket, profit_usd in closures:
+                if ticket is not None:
+                    if ticket in self._recorded_closures:
+                        continue
+                    self._recorded_closures[ticket] = None
+                    if len(self._recorded_closures) > self._recorded_closures_max:
+                        self._recorded_closures.popitem(last=False)
+                
+                # Update daily PnL
+                self._daily_pnl += profit_usd
+                
+                # Update consecutive losses
+                if profit_usd < 0:
+                    self._consecutive_losses += 1
+                else:
+                    self._consecutive_losses = 0
+                
+                # Update rolling PnL (last 50 trades)
+                self._closed_trades_pnl.append(profit_usd)
+                recorded.append(ticket)
             
-            # Update rolling PnL (last 50 trades)
-            self._closed_trades_pnl.append(profit_usd)
             if len(self._closed_trades_pnl) > 50:
-                self._closed_trades_pnl.pop(0)
+                del self._closed_trades_pnl[:-50]
+        return recorded
     
     def _get_candle_data(self, symbol: str, count: int = 21) -> Optional[List[Dict[str, float]]]:
         """
@@ -335,9 +385,14 @@ class RiskManager:
                 if now - cached_time < self._candle_cache_ttl:
                     return cached_data.copy()
         
-        # Fetch fresh data
+        # Fetch fresh data (shared candle store fetches only new bars)
         try:
-            rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, count)
+            candle_store = get_candle_store(self.mt5_connector)
+            if candle_store is not None:
+                rates = candle_store.get(symbol, mt5.TIMEFRAME_M1, count, max_age_seconds=self._candle_cache_ttl)
+            else:
+                rates = mt5_call(self.mt5_connector, mt5.copy_rates_from_pos, symbol, mt5.TIMEFRAME_M1, 0, count,
+                                 priority=MT5Priority.MARKET_DATA)
             if rates is None or len(rates) == 0:
                 return None
             
@@ -1363,7 +1418,8 @@ class RiskManager:
         This method detects when MT5 reports an incorrect contract_size (e.g., 1.0 for BTCXAUm
         when it should be 100.0) and corrects it by testing common values.
         
-        CRITICAL: Results are cached to avoid repeated calculations for the same symbol.
+        CRITICAL: Results are kept in the calibration store (persisted across restarts)
+        to avoid repeated calculations for the same symbol.
         
         Args:
             symbol: Trading symbol
@@ -1374,15 +1430,41 @@ class RiskManager:
         Returns:
             Corrected contract_size value
         """
-        # Check cache first to avoid repeated calculations
-        with self._contract_size_cache_lock:
-            if symbol in self._contract_size_cache:
-                return self._contract_size_cache[symbol]
+        # Check the calibration store first to avoid repeated calculations
+        cached_size = self._calibration_store.get(symbol, CALIBRATION_KIND)
+        if cached_size is not None:
+            return cached_size
         
         symbol_info = self.mt5_connector.get_symbol_info(symbol)
         if symbol_info is None:
             return 1.0  # Default fallback
         
+        contract_size, source = self._calibrate_contract_size(symbol, symbol_info, entry_price, lot_size, target_loss_usd)
+        
+        # Store the result (whether corrected or original)
+        self._calibration_store.put(symbol, CALIBRATION_KIND, contract_size, source, symbol_info,
+                                    {'entry_price': entry_price, 'lot_size': lot_size,
+                                     'target_loss_usd': target_loss_usd})
+        
+        return contract_size
+    
+    def _refresh_contract_size_calibration(self, symbol: str, record: CalibrationRecord) -> Optional[Tuple[float, str]]:
+        """Calibration store refresher: recalibrate from the current symbol spec."""
+        symbol_info = self.mt5_connector.get_symbol_info(symbol)
+        if symbol_info is None or not record.inputs.get('entry_price'):
+            return None
+        return self._calibrate_contract_size(symbol, symbol_info, record.inputs['entry_price'],
+                                             record.inputs.get('lot_size', 0.01),
+                                             record.inputs.get('target_loss_usd', self.max_risk_usd))
+    
+    def _calibrate_contract_size(self, symbol: str, symbol_info: Dict[str, Any], entry_price: float,
+                                 lot_size: float, target_loss_usd: float) -> Tuple[float, str]:
+        """
+        Contract size for a known symbol_info.
+        
+        Returns:
+            (contract_size, source) - source is 'reported' or 'corrected'
+        """
         contract_size = symbol_info.get('contract_size', 1.0)
         original_contract_size = contract_size
         
@@ -1399,17 +1481,12 @@ class RiskManager:
                 test_price_diff = abs(target_loss_usd) / (lot_size * test_contract)
                 # Check if this would result in a reasonable SL (within 20% of entry)
                 if test_price_diff < entry_price * 0.2:
-                    contract_size = test_contract
                     logger.info(f"🛑 CONTRACT_SIZE AUTO-CORRECTED: {symbol} | "
-                               f"Using {contract_size} instead of {original_contract_size} | "
+                               f"Using {test_contract} instead of {original_contract_size} | "
                                f"Price_diff: {price_diff:.5f} -> {test_price_diff:.5f}")
-                    break
+                    return test_contract, 'corrected'
         
-        # Cache the result (whether corrected or original)
-        with self._contract_size_cache_lock:
-            self._contract_size_cache[symbol] = contract_size
-        
-        return contract_size
+        return contract_size, 'reported'
     
     def calculate_effective_sl_in_profit_terms(self, position: Dict[str, Any], check_pending: bool = True) -> Tuple[float, bool]:
         """
@@ -2611,7 +2688,8 @@ class RiskManager:
                         if self.mt5_connector.ensure_connected():
                             # Get deal history for this ticket (position identifier)
                             # Note: ticket is position ID, we need to get deals by position
-                            deals = mt5.history_deals_get(position=ticket)
+                            deals = mt5_call(self.mt5_connector, mt5.history_deals_get, position=ticket,
+                                             priority=MT5Priority.MONITORING)
                             if deals and len(deals) > 0:
                                 # Sort deals by time
                                 deals_sorted = sorted(deals, key=lambda d: d.time)
@@ -2711,15 +2789,15 @@ class RiskManager:
                                         except Exception as outcome_log_error:
                                             logger.debug(f"Error logging trade outcome for ticket {ticket}: {outcome_log_error}")
                                     
-                                    # Update realized P/L in trading bot via callback
-                                    if self.bot_pnl_callback and callable(self.bot_pnl_callback):
-                                        try:
-                                            self.bot_pnl_callback(total_profit, close_time)
-                                        except Exception as e:
-                                            logger.debug(f"Error updating realized P/L via callback: {e}")
-                                    
-                                    # Record closed trade for circuit breaker tracking
-                                    self.record_closed_trade(total_profit)
+                                    # Record closed trade for circuit breaker tracking (skipped if
+                                    # PositionMonitor's batch already recorded this ticket)
+                                    if self.record_closed_trade(total_profit, ticket=ticket):
+                                        # Update realized P/L in trading bot via callback
+                                        if self.bot_pnl_callback and callable(self.bot_pnl_callback):
+                                            try:
+                                                self.bot_pnl_callback(total_profit, close_time)
+                                            except Exception as e:
+                                                logger.debug(f"Error updating realized P/L via callback: {e}")
                                     
                                     # Record loss for cooldown tracking (per-symbol)
                                     if total_profit < 0:
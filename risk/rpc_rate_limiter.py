@@ -0,0 +1,272 @@
+"""
+Global SL RPC Rate Limiter
+Token-bucket admission for SL modify RPCs with a coalescing priority queue.
+
+Replaces the sliding-window list in SLManager._check_global_rpc_rate_limit,
+which rebuilt a timestamp list and scanned it on every call, and queued
+deferred tickets into lists that nothing drained.
+
+- A global bucket refills at max_per_second (capacity = one second of budget).
+- Critical classes (EMERGENCY, PROFIT_LOCK, TRAILING) are always admitted. Each
+  has its own burst bucket; when a class exceeds its burst the caller gets a
+  short exponential backoff instead of a rejection, so a trailing storm never
+  delays emergency SLs.
+- NORMAL updates are admitted only while global tokens remain and nothing is
+  queued ahead of them. Otherwise they are queued, one entry per ticket
+  (a newer update replaces the pending one).
+- drain() hands queued tickets back in priority order as tokens become
+  available; the dispatched update is then admitted without charging again.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class RPCClass(IntEnum):
+    """SL update classes (lower value = higher priority)."""
+
+    EMERGENCY = 0
+    PROFIT_LOCK = 1
+    TRAILING = 2
+    NORMAL = 3
+
+
+CRITICAL_CLASSES = frozenset({RPCClass.EMERGENCY, RPCClass.PROFIT_LOCK, RPCClass.TRAILING})
+
+
+class TokenBucket:
+    """Lazily refilled token bucket (not thread-safe; owned by GlobalRPCLimiter)."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated_at')
+
+    def __init__(self, rate: float, capacity: float, now: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now if now is not None else time.monotonic()
+
+    def refill(self, now: float):
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    def try_take(self, now: float) -> bool:
+        self.refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def take(self, now: float, floor: float) -> float:
+        """Take a token even if the bucket is empty (down to floor); returns tokens left."""
+        self.refill(now)
+        self.tokens = max(floor, self.tokens - 1.0)
+        return self.tokens
+
+
+class _PendingUpdate:
+    """Latest queued SL update for one ticket."""
+
+    __slots__ = ('ticket', 'rpc_class', 'position', 'symbol', 'queued_at', 'seq')
+
+    def __init__(self, ticket: int, rpc_class: RPCClass, position: Optional[Dict[str, Any]],
+                 symbol: Optional[str], queued_at: float, seq: int):
+        self.ticket = ticket
+        self.rpc_class = rpc_class
+        self.position = position
+        self.symbol = symbol
+        self.queued_at = queued_at
+        self.seq = seq
+
+
+class GlobalRPCLimiter:
+    """Global SL RPC admission control (thread-safe)."""
+
+    def __init__(self, max_per_second: float = 50, critical_burst: int = 5,
+                 backoff_base_seconds: float = 0.05, max_queue: int = 500, lock: Optional[Any] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_per_second: Sustained SL RPCs per second system-wide
+            critical_burst: Critical updates per class allowed back-to-back before backoff
+            backoff_base_seconds: Base of the exponential critical backoff
+            max_queue: Maximum queued tickets (oldest lowest-priority entry dropped)
+            lock: Lock guarding the limiter state (e.g. a ProfiledLock); a new Lock by default
+        """
+        self.max_per_second = max(1.0, float(max_per_second))
+        self.backoff_base = backoff_base_seconds
+        self.max_queue = max_queue
+        self._lock = lock if lock is not None else threading.Lock()
+        self._global = TokenBucket(self.max_per_second, self.max_per_second)
+        # Burst buckets refill at critical_burst per 100ms (the old "5 critical in 100ms" rule)
+        self._critical = {cls: TokenBucket(critical_burst * 10.0, float(critical_burst))
+                          for cls in CRITICAL_CLASSES}
+        self._pending: Dict[int, _PendingUpdate] = {}
+        self._heap: List[Tuple[int, int, int]] = []  # (class, seq, ticket) - stale items skipped lazily
+        self._granted: Dict[int, float] = {}  # {ticket: granted_at} - admitted by drain()
+        self._seq = itertools.count()
+        self._stats = {cls.name: {'admitted': 0, 'queued': 0, 'backoff': 0} for cls in RPCClass}
+        self._stats_totals = {'coalesced': 0, 'dispatched': 0, 'dropped': 0}
+
+    @staticmethod
+    def classify(is_emergency: bool = False, consecutive_failures: int = 0, is_profit_locking: bool = False,
+                 is_trailing: bool = False, is_first_eligible: bool = False) -> RPCClass:
+        """Map SLManager update flags to an RPC class."""
+        if is_emergency or consecutive_failures >= 2:
+            return RPCClass.EMERGENCY
+        if is_profit_locking or is_first_eligible:
+            return RPCClass.PROFIT_LOCK
+        if is_trailing:
+            return RPCClass.TRAILING
+        return RPCClass.NORMAL
+
+    def admit(self, rpc_class: RPCClass, ticket: Optional[int] = None,
+              position: Optional[Dict[str, Any]] = None, symbol: Optional[str] = None) -> Tuple[bool, float]:
+        """
+        Admit one SL RPC.
+
+        Returns:
+            (allowed, backoff_delay) - a rejected update has been queued for drain()
+        """
+        now = time.monotonic()
+        with self._lock:
+            if ticket is not None and self._granted.pop(ticket, None) is not None:
+                self._stats[rpc_class.name]['admitted'] += 1
+                return True, 0.0  # Token already charged by drain()
+
+            if rpc_class in CRITICAL_CLASSES:
+                self._global.take(now, -self._global.capacity)
+                self._discard_pending(ticket)
+                self._stats[rpc_class.name]['admitted'] += 1
+                burst = self._critical[rpc_class]
+                if burst.try_take(now):
+                    return True, 0.0
+                overflow = int(min(3, -burst.take(now, -3.0)))
+                self._stats[rpc_class.name]['backoff'] += 1
+                return True, self.backoff_base * (2 ** overflow)  # Max 8x base
+
+            if not self._heap_has_live_entries() and self._global.try_take(now):
+                self._discard_pending(ticket)
+                self._stats[rpc_class.name]['admitted'] += 1
+                return True, 0.0
+
+            if ticket is not None:
+                self._enqueue(ticket, rpc_class, position, symbol, now)
+            return False, 0.0
+
+    def _enqueue(self, ticket: int, rpc_class: RPCClass, position: Optional[Dict[str, Any]],
+                 symbol: Optional[str], now: float):
+        entry = self._pending.get(ticket)
+        if entry is not None:
+            # Coalesce: keep the latest position, the highest class and the original queue slot
+            self._stats_totals['coalesced'] += 1
+            entry.position = position
+            entry.symbol = symbol or entry.symbol
+            if rpc_class < entry.rpc_class:
+                entry.rpc_class = rpc_class
+                entry.seq = next(self._seq)
+                heapq.heappush(self._heap, (int(rpc_class), entry.seq, ticket))
+            return
+        if len(self._pending) >= self.max_queue:
+            self._drop_lowest()
+        entry = _PendingUpdate(ticket, rpc_class, position, symbol, now, next(self._seq))
+        self._pending[ticket] = entry
+        heapq.heappush(self._heap, (int(rpc_class), entry.seq, ticket))
+        self._stats[rpc_class.name]['queued'] += 1
+
+    def _drop_lowest(self):
+        victim = max(self._pending.values(), key=lambda e: (e.rpc_class, -e.seq))
+        del self._pending[victim.ticket]
+        self._stats_totals['dropped'] += 1
+
+    def _discard_pending(self, ticket: Optional[int]):
+        if ticket is not None:
+            self._pending.pop(ticket, None)
+
+    def _heap_has_live_entries(self) -> bool:
+        while self._heap:
+            _, seq, ticket = self._heap[0]
+            entry = self._pending.get(ticket)
+            if entry is not None and entry.seq == seq:
+                return True
+            heapq.heappop(self._heap)
+        return False
+
+    def drain(self, max_items: Optional[int] = None,
+              symbol_filter: Optional[Callable[[str], bool]] = None
+              ) -> List[Tuple[int, RPCClass, Optional[Dict[str, Any]]]]:
+        """
+        Pop queued updates in priority order while global tokens are available.
+
+        Each returned ticket holds a grant: its next admit() is allowed without
+        charging a token again.
+
+        Args:
+            max_items: Maximum number of updates to dispatch
+            symbol_filter: Only dispatch updates whose symbol it accepts (SL worker
+                shards); the others stay queued in their slot
+
+        Returns:
+            [(ticket, rpc_class, latest position)] to dispatch now
+        """
+        now = time.monotonic()
+        dispatched = []
+        skipped = []
+        with self._lock:
+            while self._heap_has_live_entries():
+                if max_items is not None and len(dispatched) >= max_items:
+                    break
+                if symbol_filter is not None:
+                    entry = self._pending[self._heap[0][2]]
+                    if not symbol_filter(self._entry_symbol(entry)):
+                        skipped.append(heapq.heappop(self._heap))
+                        continue
+                if not self._global.try_take(now):
+                    break
+                _, _, ticket = heapq.heappop(self._heap)
+                entry = self._pending.pop(ticket)
+                self._granted[ticket] = now
+                dispatched.append((ticket, entry.rpc_class, entry.position))
+            for item in skipped:
+                heapq.heappush(self._heap, item)
+            self._stats_totals['dispatched'] += len(dispatched)
+        return dispatched
+
+    @staticmethod
+    def _entry_symbol(entry: _PendingUpdate) -> str:
+        if entry.symbol:
+            return entry.symbol
+        return (entry.position or {}).get('symbol', '')
+
+    def release_grant(self, ticket: int):
+        """Drop an unused grant (dispatch skipped, e.g. position closed)."""
+        with self._lock:
+            self._granted.pop(ticket, None)
+
+    def forget(self, ticket: int):
+        """Drop queued updates and grants for a closed position."""
+        with self._lock:
+            self._pending.pop(ticket, None)
+            self._granted.pop(ticket, None)
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            self._global.refill(now)
+            return {
+                'max_per_second': self.max_per_second,
+                'tokens': round(self._global.tokens, 2),
+                'queue_depth': len(self._pending),
+                'granted': len(self._granted),
+                'classes': {name: dict(counts) for name, counts in self._stats.items()},
+                **self._stats_totals,
+            }
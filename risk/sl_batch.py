@@ -0,0 +1,247 @@
+"""
+Batched Authoritative SL
+Computes SLManager.compute_authoritative_sl() targets for many positions in one NumPy pass.
+
+compute_authoritative_sl() is pure arithmetic for positions with an SL ladder
+(risk/sl_ladder.py): trailing rung lookup, the SL for a fixed profit, broker
+constraint adjustment and the monotonic guard. Run per position it spends most
+of its time on dict access and Python branching. PositionColumns holds those
+inputs as arrays and compute_sl_targets() evaluates the same priority rules
+(TRAILING > PROFIT_LOCK > HARD, VIOLATION past the loss limit) for every row:
+
+- rows without a ladder, with a profit past the top rung, or whose SL for a
+  fixed profit falls outside the ladder's validity range are flagged `scalar`
+  (the caller runs the full per-position calculation for them)
+- sweet-spot rows are flagged `scalar` when a ProfitLockingEngine is attached,
+  because the engine is called (and may modify the SL) on that path
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from risk.sl_ladder import MAX_SL_DISTANCE_PCT
+
+AUTHORITY_NONE = 0
+AUTHORITY_TRAILING = 1
+AUTHORITY_PROFIT_LOCK = 2
+AUTHORITY_HARD = 3
+AUTHORITY_VIOLATION = 4
+
+# authority_source strings of compute_authoritative_sl(), indexed by authority code
+AUTHORITY_NAMES = (None, 'TRAILING', 'PROFIT_LOCK', 'HARD', 'VIOLATION')
+
+
+def rung_table(increment: float, max_rungs: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trailing rung thresholds and locks shared by every SLLadder with this increment.
+
+    Returns:
+        (thresholds, locks) - same values as SLLadder.thresholds / SLLadder.locks
+        before the per-position distance cut-off
+    """
+    j = np.arange(max(0, max_rungs), dtype=np.float64)
+    locks = np.round((j + 1.0) * increment, 8)
+    thresholds = np.round((j + 2.0) * increment, 8)
+    if len(thresholds):
+        thresholds[0] = increment
+    return thresholds, locks
+
+
+class PositionColumns:
+    """Columnar snapshot of the SL inputs of open positions."""
+
+    __slots__ = ('tickets', 'signs', 'entries', 'volumes', 'current_sls', 'profits', 'bids', 'asks',
+                 'points', 'digits', 'stops_levels', 'usd_per_price', 'rungs', 'supported')
+
+    def __init__(self, tickets: Sequence[int], signs: Sequence[float], entries: Sequence[float],
+                 volumes: Sequence[float], current_sls: Sequence[float], profits: Sequence[float],
+                 bids: Sequence[float], asks: Sequence[float], points: Sequence[float],
+                 digits: Sequence[int], stops_levels: Sequence[float], usd_per_price: Sequence[float],
+                 rungs: Sequence[int], supported: Sequence[bool]):
+        """
+        Initialize the columns (one entry per position).
+
+        Args:
+            signs: +1.0 for BUY, -1.0 for SELL
+            usd_per_price: Profit in USD per 1.0 price move for the position volume
+            rungs: Number of trailing rungs in the position's SL ladder
+            supported: False for rows the batch must not decide (no ladder, no quotes)
+        """
+        self.tickets = np.asarray(tickets, dtype=np.int64)
+        self.signs = np.asarray(signs, dtype=np.float64)
+        self.entries = np.asarray(entries, dtype=np.float64)
+        self.volumes = np.asarray(volumes, dtype=np.float64)
+        self.current_sls = np.asarray(current_sls, dtype=np.float64)
+        self.profits = np.asarray(profits, dtype=np.float64)
+        self.bids = np.asarray(bids, dtype=np.float64)
+        self.asks = np.asarray(asks, dtype=np.float64)
+        self.points = np.asarray(points, dtype=np.float64)
+        self.digits = np.asarray(digits, dtype=np.int64)
+        self.stops_levels = np.asarray(stops_levels, dtype=np.float64)
+        self.supported = np.asarray(supported, dtype=bool)
+        # Unsupported rows get a neutral divisor so the vector math stays finite
+        usd_per_price = np.asarray(usd_per_price, dtype=np.float64)
+        self.usd_per_price = np.where(self.supported & (usd_per_price > 0), usd_per_price, 1.0)
+        self.rungs = np.asarray(rungs, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.tickets)
+
+
+class SLTargets:
+    """Result arrays of compute_sl_targets() (row i belongs to position i)."""
+
+    __slots__ = ('target_sl', 'target_profit', 'authority', 'must_close', 'regression', 'scalar')
+
+    def __init__(self, n: int):
+        self.target_sl = np.full(n, np.nan)  # NaN = no SL update
+        self.target_profit = np.zeros(n)
+        self.authority = np.zeros(n, dtype=np.int8)  # AUTHORITY_* code
+        self.must_close = np.zeros(n, dtype=bool)  # Loss limit already exceeded
+        self.regression = np.zeros(n, dtype=bool)  # Target blocked by the monotonic guard
+        self.scalar = np.zeros(n, dtype=bool)  # Needs the per-position calculation
+
+
+def normalize_sl_prices(prices: np.ndarray, points: np.ndarray, digits: np.ndarray) -> np.ndarray:
+    """Vector form of sl_ladder.normalize_sl_price()."""
+    snap = (digits == 5) | (digits == 3)
+    safe_points = np.where(points > 0, points, 1.0)
+    scale = 10.0 ** np.where(snap, 0, digits)
+    return np.where(snap, np.round(prices / safe_points) * safe_points, np.round(prices * scale) / scale)
+
+
+def effective_entry_prices(cols: PositionColumns) -> np.ndarray:
+    """Vector form of sl_ladder.effective_entry_price()."""
+    bid_side = (cols.signs > 0) & (np.abs(cols.entries - cols.bids) < np.abs(cols.entries - cols.asks)) \
+        & (cols.asks > cols.bids)
+    return np.where(bid_side, cols.entries + (cols.asks - cols.bids), cols.entries)
+
+
+def sl_for_profit(cols: PositionColumns, entries: np.ndarray, target_profit: np.ndarray
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vector form of SLLadder.sl_for_profit().
+
+    Returns:
+        (SL prices, valid mask) - invalid rows need the full calculation
+    """
+    diff = target_profit / cols.usd_per_price
+    sl = normalize_sl_prices(entries + cols.signs * diff, cols.points, cols.digits)
+    valid = (entries > 0) & (np.abs(diff) < entries * MAX_SL_DISTANCE_PCT) & (sl > 0)
+    valid &= ~((target_profit <= 0) & ((sl - entries) * cols.signs >= 0))
+    return sl, valid
+
+
+def adjust_for_broker_constraints(cols: PositionColumns, target_sl: np.ndarray) -> np.ndarray:
+    """Vector form of SLManager._adjust_sl_for_broker_constraints() (entry price always known)."""
+    buy = cols.signs > 0
+    has_stops = cols.stops_levels > 0
+    min_distance = cols.stops_levels * cols.points
+    # StopLevel: never closer to the market than min_distance
+    target = np.where(buy & has_stops, np.minimum(target_sl, cols.bids - min_distance), target_sl)
+    target = np.where(~buy & has_stops, np.maximum(target, cols.asks + min_distance), target)
+    # SL on the wrong side of the market
+    fallback_distance = np.where(has_stops, min_distance, cols.points * 10)
+    target = np.where(buy & (target >= cols.bids), cols.bids - fallback_distance, target)
+    target = np.where(~buy & (target <= cols.asks), cols.asks + fallback_distance, target)
+    # Never loosen the current SL, except when moving it from the loss zone into profit
+    current = cols.current_sls
+    has_current = (current > 0) & (cols.entries > 0)
+    to_profit = np.where(buy, (current < cols.entries) & (target > cols.entries),
+                         (current > cols.entries) & (target < cols.entries))
+    looser = np.where(buy, target < current, target > current)
+    return np.where(has_current & ~to_profit & looser, current, target)
+
+
+def compute_sl_targets(cols: PositionColumns, increment: float, thresholds: np.ndarray, locks: np.ndarray,
+                       sweet_spot_min: float, sweet_spot_max: float, max_risk_usd: float,
+                       profit_zone_enabled: bool = True, profit_lock_scalar: bool = False) -> SLTargets:
+    """
+    Authoritative SL for every row (TRAILING > PROFIT_LOCK > HARD).
+
+    Args:
+        cols: Position inputs
+        increment: Trailing increment in USD
+        thresholds: Rung thresholds from rung_table()
+        locks: Rung locks from rung_table()
+        sweet_spot_min: Lower sweet-spot profit bound (USD)
+        sweet_spot_max: Upper sweet-spot profit bound (USD)
+        max_risk_usd: Hard loss limit (USD)
+        profit_zone_enabled: False disables trailing and sweet-spot locking
+        profit_lock_scalar: Hand sweet-spot rows to the per-position path
+            (ProfitLockingEngine attached)
+
+    Returns:
+        SLTargets
+    """
+    n = len(cols)
+    out = SLTargets(n)
+    if n == 0:
+        return out
+
+    profits = cols.profits
+    entries = effective_entry_prices(cols)
+    out.scalar |= ~cols.supported
+    pending = cols.supported.copy()
+
+    # STEP 1: TRAILING_SL - bisect over the shared rung thresholds, capped at the row's rung count
+    if profit_zone_enabled and len(thresholds):
+        trailing = pending & (profits > increment)
+        no_rungs = trailing & (cols.rungs <= 0)
+        top = np.maximum(cols.rungs - 1, 0)
+        rung = np.minimum(np.searchsorted(thresholds, profits, side='right') - 1, top)
+        rung = np.maximum(rung, 0)
+        beyond = (rung >= top) & (profits >= thresholds[np.minimum(top, len(thresholds) - 1)] + increment)
+        full_calculation = trailing & (no_rungs | beyond)
+        out.scalar |= full_calculation
+        pending &= ~full_calculation
+        trailing &= ~full_calculation
+
+        lock = locks[np.minimum(rung, len(locks) - 1)]
+        price = normalize_sl_prices(entries + cols.signs * (lock / cols.usd_per_price), cols.points, cols.digits)
+        adjusted = adjust_for_broker_constraints(cols, price)
+        applied = trailing & (price != 0) & (adjusted != 0)
+        out.target_sl[applied] = adjusted[applied]
+        out.target_profit[applied] = lock[applied]
+        out.authority[applied] = AUTHORITY_TRAILING
+
+    # STEP 2: PROFIT_LOCK_SL (sweet spot, only without a trailing SL)
+    if profit_zone_enabled:
+        sweet = pending & (out.authority == AUTHORITY_NONE) & (profits >= sweet_spot_min) & (profits <= sweet_spot_max)
+        if profit_lock_scalar:
+            out.scalar |= sweet
+            pending &= ~sweet
+        elif sweet.any():
+            profit_to_lock = np.minimum(profits, sweet_spot_max)
+            price, valid = sl_for_profit(cols, entries, profit_to_lock)
+            out.scalar |= sweet & ~valid
+            pending &= ~(sweet & ~valid)
+            adjusted = adjust_for_broker_constraints(cols, price)
+            applied = sweet & valid & (adjusted != 0)
+            out.target_sl[applied] = adjusted[applied]
+            out.target_profit[applied] = profit_to_lock[applied]
+            out.authority[applied] = AUTHORITY_PROFIT_LOCK
+
+    # STEP 3: HARD_SL (losing positions), VIOLATION once the loss limit is already exceeded
+    losing = pending & (out.authority == AUTHORITY_NONE) & (profits < 0)
+    violation = losing & (profits < -max_risk_usd)
+    out.authority[violation] = AUTHORITY_VIOLATION
+    out.target_profit[violation] = profits[violation]
+    out.must_close[violation] = True
+    hard = losing & ~violation
+    if hard.any():
+        price, valid = sl_for_profit(cols, entries, np.full(n, -max_risk_usd))
+        out.scalar |= hard & ~valid
+        adjusted = adjust_for_broker_constraints(cols, price)
+        applied = hard & valid & (adjusted != 0)
+        out.target_sl[applied] = adjusted[applied]
+        out.target_profit[applied] = -max_risk_usd
+        out.authority[applied] = AUTHORITY_HARD
+
+    # STEP 5: MONOTONIC SL GUARD - a target may never loosen the current SL
+    has_target = ~np.isnan(out.target_sl) & (cols.current_sls > 0)
+    with np.errstate(invalid='ignore'):
+        looser = np.where(cols.signs > 0, out.target_sl < cols.current_sls, out.target_sl > cols.current_sls)
+    out.regression = has_target & looser & ~out.scalar
+    return out
@@ -0,0 +1,145 @@
+"""
+SL Dirty-Set Tracker
+Decides which open positions the SL worker needs to re-evaluate.
+
+The SL worker used to run the full update_sl_atomic() path (lock, SL
+computation, verification) for every open position on every iteration, even
+when nothing about the position had changed. The tracker remembers the inputs
+of the last evaluation per ticket and marks a position dirty only when they
+change in a way that can move the target SL:
+
+- price moved by more than price_delta_points (in symbol points)
+- the trailing rung of the position's SL ladder changed
+- the profit crossed a decision boundary (hard SL, break-even, sweet-spot,
+  trailing start)
+- the broker SL or volume changed (manual modify, partial close)
+- the last evaluation failed
+
+A full sweep every full_sweep_interval_seconds re-evaluates every position
+regardless, so time-based rules (first-eligible, staleness) keep running.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from risk.sl_ladder import SLLadder
+
+
+class _EvaluatedState:
+    """Inputs of the last SL evaluation for one ticket."""
+
+    __slots__ = ('price', 'sl', 'volume', 'rung', 'zone', 'evaluated_at', 'ok')
+
+    def __init__(self, price: float, sl: float, volume: float, rung: int, zone: int,
+                 evaluated_at: float, ok: bool):
+        self.price = price
+        self.sl = sl
+        self.volume = volume
+        self.rung = rung
+        self.zone = zone
+        self.evaluated_at = evaluated_at
+        self.ok = ok
+
+
+class SLDirtyTracker:
+    """Per-ticket dirty detection for the SL worker (thread-safe)."""
+
+    def __init__(self, price_delta_points: float = 0.0, full_sweep_interval_seconds: float = 1.0,
+                 zone_boundaries: Sequence[float] = ()):
+        """
+        Initialize the tracker.
+
+        Args:
+            price_delta_points: Minimum price move (in symbol points) that marks a
+                position dirty; 0 means any move
+            full_sweep_interval_seconds: Maximum time a position may go without
+                re-evaluation
+            zone_boundaries: Profit levels (USD) at which SL rules change
+        """
+        self.price_delta_points = max(0.0, price_delta_points)
+        self.full_sweep_interval = full_sweep_interval_seconds
+        self.zone_boundaries = sorted(set(zone_boundaries))
+        self._states: Dict[int, _EvaluatedState] = {}
+        self._lock = threading.Lock()
+        self._evaluated = 0
+        self._skipped = 0
+
+    def _zone(self, profit: float) -> int:
+        return bisect.bisect_right(self.zone_boundaries, profit)
+
+    @staticmethod
+    def _rung(ladder: Optional[SLLadder], profit: float) -> int:
+        if ladder is None:
+            return -1
+        rung = ladder.trailing_lock(profit)
+        return rung[0] if rung is not None else -1
+
+    def is_dirty(self, position: Dict[str, Any], ladder: Optional[SLLadder] = None,
+                 now: Optional[float] = None) -> bool:
+        """
+        True if the position must be re-evaluated this iteration.
+
+        Args:
+            position: Position dict from get_open_positions()
+            ladder: The position's SL ladder, if one exists
+            now: Current time (defaults to time.time())
+        """
+        ticket = position.get('ticket', 0)
+        with self._lock:
+            state = self._states.get(ticket)
+        dirty = self._is_dirty(state, position, ladder, now if now is not None else time.time())
+        with self._lock:
+            if dirty:
+                self._evaluated += 1
+            else:
+                self._skipped += 1
+        return dirty
+
+    def _is_dirty(self, state: Optional[_EvaluatedState], position: Dict[str, Any],
+                  ladder: Optional[SLLadder], now: float) -> bool:
+        if state is None or not state.ok:
+            return True
+        if now - state.evaluated_at >= self.full_sweep_interval:
+            return True
+        if position.get('sl', 0.0) != state.sl or position.get('volume', 0.0) != state.volume:
+            return True
+        profit = position.get('profit', 0.0)
+        if self._zone(profit) != state.zone or self._rung(ladder, profit) != state.rung:
+            return True
+        price_move = abs(position.get('price_current', 0.0) - state.price)
+        if ladder is None or self.price_delta_points <= 0:
+            return price_move > 0
+        return price_move > self.price_delta_points * ladder.point
+
+    def mark_evaluated(self, position: Dict[str, Any], success: bool, ladder: Optional[SLLadder] = None,
+                       now: Optional[float] = None):
+        """Record the inputs of an SL evaluation (failed evaluations stay dirty)."""
+        profit = position.get('profit', 0.0)
+        state = _EvaluatedState(
+            price=position.get('price_current', 0.0),
+            sl=position.get('sl', 0.0),
+            volume=position.get('volume', 0.0),
+            rung=self._rung(ladder, profit),
+            zone=self._zone(profit),
+            evaluated_at=now if now is not None else time.time(),
+            ok=success,
+        )
+        with self._lock:
+            self._states[position.get('ticket', 0)] = state
+
+    def forget(self, ticket: int):
+        """Drop state for a closed position."""
+        with self._lock:
+            self._states.pop(ticket, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._evaluated + self._skipped
+            return {
+                'tracked': len(self._states),
+                'evaluated': self._evaluated,
+                'skipped': self._skipped,
+                'skip_rate': round(self._skipped / total, 3) if total else 0.0,
+            }
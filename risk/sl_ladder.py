@@ -0,0 +1,161 @@
+"""
+Per-Position SL Ladder
+Precomputed profit-threshold -> SL price table for one open position.
+
+SLManager used to re-derive contract size, USD-per-point and the target SL price
+for every trailing, sweet-spot and hard-SL decision on every worker iteration.
+For a position whose USD value per price unit is fixed (broker trade_tick_value,
+or a forex contract size), the SL for any profit target is a linear function of
+the entry price. The ladder precomputes the trailing rungs once per position
+(rebuilt only when the entry, volume or symbol specification changes) so that a
+trailing decision is a bisect over the rung thresholds.
+"""
+
+import bisect
+from typing import Any, Dict, List, Optional, Tuple
+
+# Maximum SL distance from entry accepted without the full recalculation
+# (matches the suspicious-SL guard in SLManager._calculate_target_sl_price)
+MAX_SL_DISTANCE_PCT = 0.10
+
+
+def normalize_sl_price(price: float, point: float, digits: int) -> float:
+    """Round an SL price to broker precision (same rule as SLManager._calculate_target_sl_price)."""
+    if digits in [5, 3]:
+        return round(price / point) * point
+    return round(price, digits)
+
+
+def effective_entry_price(entry_price: float, order_type: str, bid: float, ask: float) -> float:
+    """
+    Entry price used for SL targets.
+
+    MT5 may report a BUY's price_open on the BID side; in that case the current
+    spread is added so the SL is measured from what was actually paid (ASK).
+    """
+    if order_type == 'BUY' and abs(entry_price - bid) < abs(entry_price - ask) and ask > bid:
+        return entry_price + (ask - bid)
+    return entry_price
+
+
+class SLLadder:
+    """
+    Trailing SL rungs for one position.
+
+    Rung j locks locks[j] USD and applies once profit reaches thresholds[j].
+    Rung 0 starts strictly above the trailing increment; rung j >= 1 starts at
+    (j + 2) increments, i.e. the locked profit trails one increment behind.
+    """
+
+    __slots__ = ('ticket', 'symbol', 'order_type', 'entry_price', 'volume', 'point', 'digits',
+                 'spec_key', 'usd_per_price', 'increment', 'thresholds', 'locks', 'diffs', 'prices', '_sign')
+
+    def __init__(self, ticket: int, symbol: str, order_type: str, entry_price: float, volume: float,
+                 point: float, digits: int, spec_key: Tuple, usd_per_price: float,
+                 increment: float, max_rungs: int):
+        """
+        Build the ladder.
+
+        Args:
+            ticket: Position ticket
+            symbol: Trading symbol
+            order_type: 'BUY' or 'SELL'
+            entry_price: Position open price
+            volume: Position volume (lots)
+            point: Symbol point size
+            digits: Symbol digits
+            spec_key: Symbol specification values the ladder was built from
+            usd_per_price: Profit in USD per 1.0 price move for this volume
+            increment: Trailing increment in USD
+            max_rungs: Maximum number of trailing rungs
+        """
+        self.ticket = ticket
+        self.symbol = symbol
+        self.order_type = order_type
+        self.entry_price = entry_price
+        self.volume = volume
+        self.point = point
+        self.digits = digits
+        self.spec_key = spec_key
+        self.usd_per_price = usd_per_price
+        self.increment = increment
+        self._sign = 1.0 if order_type == 'BUY' else -1.0
+
+        # Rungs stop where the SL would move further than MAX_SL_DISTANCE_PCT from entry
+        max_diff = entry_price * MAX_SL_DISTANCE_PCT
+        self.thresholds: List[float] = []
+        self.locks: List[float] = []
+        self.diffs: List[float] = []
+        self.prices: List[float] = []
+        for j in range(max_rungs):
+            lock = round((j + 1) * increment, 8)
+            diff = lock / usd_per_price
+            if diff >= max_diff:
+                break
+            self.thresholds.append(increment if j == 0 else round((j + 2) * increment, 8))
+            self.locks.append(lock)
+            self.diffs.append(diff)
+            self.prices.append(normalize_sl_price(entry_price + self._sign * diff, point, digits))
+
+    def matches(self, position: Dict[str, Any], spec_key: Tuple) -> bool:
+        """True if the ladder was built for this entry, volume, direction and symbol specification."""
+        return (self.entry_price == position.get('price_open', 0.0)
+                and self.volume == position.get('volume', 0.01)
+                and self.order_type == position.get('type', '')
+                and self.spec_key == spec_key)
+
+    def trailing_lock(self, current_profit: float) -> Optional[Tuple[int, float]]:
+        """
+        Rung for the current profit.
+
+        Returns:
+            (rung index, locked profit USD), or None if trailing is not active or
+            the profit is beyond the top rung
+        """
+        if current_profit <= self.increment or not self.thresholds:
+            return None
+        j = bisect.bisect_right(self.thresholds, current_profit) - 1
+        if j >= len(self.thresholds) - 1 and current_profit >= self.thresholds[-1] + self.increment:
+            return None  # Past the ladder - caller uses the full calculation
+        return j, self.locks[j]
+
+    def trailing_sl(self, current_profit: float, bid: float, ask: float) -> Optional[Tuple[float, float]]:
+        """
+        Trailing SL for the current profit.
+
+        Returns:
+            (locked profit USD, normalized SL price), or None (see trailing_lock)
+        """
+        rung = self.trailing_lock(current_profit)
+        if rung is None:
+            return None
+        j, lock = rung
+        entry = effective_entry_price(self.entry_price, self.order_type, bid, ask)
+        if entry == self.entry_price:
+            return lock, self.prices[j]
+        return lock, normalize_sl_price(entry + self._sign * self.diffs[j], self.point, self.digits)
+
+    def sl_for_profit(self, target_profit_usd: float, bid: float, ask: float) -> Optional[float]:
+        """
+        SL price locking target_profit_usd (negative for a loss), or None if the SL
+        would be invalid or further than MAX_SL_DISTANCE_PCT from entry.
+        """
+        entry = effective_entry_price(self.entry_price, self.order_type, bid, ask)
+        diff = target_profit_usd / self.usd_per_price
+        if entry <= 0 or abs(diff) >= entry * MAX_SL_DISTANCE_PCT:
+            return None
+        sl = normalize_sl_price(entry + self._sign * diff, self.point, self.digits)
+        if sl <= 0:
+            return None
+        if target_profit_usd <= 0 and (sl - entry) * self._sign >= 0:
+            return None  # Loss SL must stay on the loss side of entry
+        return sl
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'ticket': self.ticket,
+            'symbol': self.symbol,
+            'rungs': len(self.locks),
+            'max_lock_usd': self.locks[-1] if self.locks else 0.0,
+            'usd_per_price': self.usd_per_price,
+        }
@@ -19,18 +19,43 @@ import csv
 import queue
 import math
 import traceback
+from contextlib import contextmanager
 from decimal import Decimal, ROUND_DOWN
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, Tuple, Callable, List
 from collections import defaultdict
 from pathlib import Path
 
+import numpy as np
+
 from execution.mt5_connector import MT5Connector
 from execution.order_manager import OrderManager
+from execution.position_snapshot import PositionSnapshotBus, read_open_positions
+from execution.mt5_io import MT5Priority, priority_scope
+from risk.sl_ladder import SLLadder
+from risk.sl_batch import (AUTHORITY_NAMES, AUTHORITY_NONE, AUTHORITY_PROFIT_LOCK, AUTHORITY_TRAILING,
+                           AUTHORITY_HARD, PositionColumns, SLTargets, compute_sl_targets, rung_table)
+from risk.sl_dirty_tracker import SLDirtyTracker
+from risk.ticket_state import TicketStateTable
+from risk.rpc_rate_limiter import GlobalRPCLimiter
+from risk.sl_modify_queue import SLModifyQueue
+from risk.sl_verifier import DeferredSLVerifier
+from risk.sl_worker_shards import SLWorkerShard
+from risk.lock_profiler import LockContentionProfiler
+from risk.background_tasks import BackgroundTaskScheduler
+from risk.contract_calibration import CalibrationRecord, ContractCalibrationStore
 from utils.logger_factory import get_logger, get_system_event_logger
 from utils.execution_tracer import get_tracer
+from utils.latency_histogram import StreamingHistogram
 from utils import system_health
 
+# Position fields compute_authoritative_sl() depends on (precomputed results are
+# reused by update_sl_atomic() only while these are unchanged)
+_SL_INPUT_KEYS = ('profit', 'sl', 'price_open', 'price_current', 'volume', 'type', 'symbol')
+
+# Calibration store kind of _get_corrected_contract_size() results
+CALIBRATION_KIND = 'sl_manager'
+
 # Module-level logger - will be reinitialized in __init__ based on mode
 logger = None
 system_event_logger = get_system_event_logger()
@@ -48,7 +73,8 @@ class SLManager:
     NOTE: No break-even logic - lock profit immediately at sweet spot or above per Step 2c requirement
     """
     
-    def __init__(self, config: Dict[str, Any], mt5_connector: MT5Connector, order_manager: OrderManager, tp_manager=None):
+    def __init__(self, config: Dict[str, Any], mt5_connector: MT5Connector, order_manager: OrderManager, tp_manager=None,
+                 calibration_store: Optional[ContractCalibrationStore] = None):
         """
         Initialize SL Manager.
         
@@ -98,9 +124,15 @@ class SLManager:
         self.verification_effective_profit_tolerance_usd = verification_config.get('effective_profit_tolerance_usd', 1.5)  # Default 1.5 (increased from 1.0)
         self.verification_price_tolerance_multiplier = verification_config.get('price_tolerance_multiplier', 1.0)  # Multiplier for price tolerance
         
+        # Per-ticket state: one TicketState record per ticket; the per-ticket attributes
+        # below are dict-style views over its fields (removed together on close)
+        self._ticket_states = TicketStateTable(
+            tombstone_limit=self.risk_config.get('ticket_state_tombstone_limit', 256)
+        )
+        
         # CRITICAL: Emergency safety - disable SL updates for problematic symbols until fix validated
         self._disabled_symbols = set()  # Symbols with SL updates disabled
-        self._sl_update_rate_limit = {}  # {ticket: last_update_time} for rate limiting
+        self._sl_update_rate_limit = self._ticket_states.field('sl_update_rate_limit')  # {ticket: last_update_time} for rate limiting
         # NOTE: _sl_update_min_interval is initialized from config on line 185-186
         # Do NOT hardcode here - always use config value
         
@@ -130,6 +162,15 @@ class SLManager:
         # Post-cycle SL verification configuration
         self.post_cycle_verification_enabled = self.risk_config.get('post_cycle_verification_enabled', True)
         
+        # Lock contention profiler (opt-in, every acquire pays for it): wait/hold distributions
+        # for ticket, tracking, timing and global RPC locks, per thread, and optionally the
+        # code sites holding them longest (one frame walk per acquire)
+        lock_profiler_config = execution_config.get('lock_profiler', {})
+        self._lock_profiler = LockContentionProfiler(
+            enabled=lock_profiler_config.get('enabled', False),
+            capture_sites=lock_profiler_config.get('capture_sites', False)
+        )
+        
         # Thread safety - OPTIMIZED: Use defaultdict for lock-free ticket lock access
         # Only acquire global lock when creating new ticket lock
         self._ticket_locks = {}  # {ticket: Lock}
@@ -139,7 +180,7 @@ class SLManager:
         # CRITICAL FIX: Track orphaned tickets that cannot be updated due to lock issues
         # This prevents infinite retry loops hammering the same orphaned lock
         self._orphaned_tickets = set()  # Tickets with orphaned locks (quarantine)
-        self._orphaned_ticket_timestamps = {}  # {ticket: timestamp} - when orphaned
+        self._orphaned_ticket_timestamps = self._ticket_states.field('orphaned_ticket_timestamps')  # {ticket: timestamp} - when orphaned
         orphaned_timeout_config = self.risk_config.get('orphaned_lock_timeout_seconds', 5.0)
         self._orphaned_ticket_timeout = orphaned_timeout_config  # Quarantine tickets (default 5 seconds, configurable)
         # STEP 5 FIX: Increased lock timeouts to handle contention scenarios
@@ -156,8 +197,9 @@ class SLManager:
         
         # Log timeout values for monitoring
         logger.info(f"[LIVE_RELIABILITY] Lock timeouts: standard={self._lock_acquisition_timeout}s, profit-locking={self._profit_locking_lock_timeout}s")
-        self._lock_hold_times = {}  # {ticket: acquisition_time} for watchdog
-        self._lock_holders = {}  # {ticket: {'thread_id': int, 'thread_name': str, 'acquired_at': float, 'is_profit_locking': bool, 'is_trailing': bool, 'lock_object': RLock}}
+        self._lock_hold_times = self._ticket_states.field('lock_hold_times')  # {ticket: acquisition_time} for watchdog
+        self._lock_holders = self._ticket_states.field('lock_holders')  # {ticket: {'thread_id': int, 'thread_name': str, 'acquired_at': float, 'is_profit_locking': bool, 'is_trailing': bool, 'lock_object': RLock}}
+        self._lock_holder_stack_traces = self._ticket_states.field('lock_holder_stack_traces')  # {ticket: stack_trace}
         # FIX 2: LIVE RELIABILITY - Increased stale lock threshold to 2000ms (from 500ms)
         # Locks held 200-2000ms are normal during MT5 operations, 50ms threshold was causing false positives
         # MT5 operations take 200-500ms, so 2000ms threshold prevents false stale lock detections
@@ -177,14 +219,37 @@ class SLManager:
         logger.info(f"[LOCK_RETRY_CONFIG] Max attempts: {self._lock_retry_max_attempts} | "
                    f"Backoff: {self._lock_retry_backoff_seconds}")
         # CRITICAL FIX: Track fail-safe violation cooldown to prevent infinite loops
-        self._fail_safe_cooldown = {}  # {ticket: cooldown_until_timestamp}
+        self._fail_safe_cooldown = self._ticket_states.field('fail_safe_cooldown')  # {ticket: cooldown_until_timestamp}
         self._fail_safe_cooldown_duration = 1.0  # 1 second cooldown after fail-safe correction
         self._fail_safe_tolerance = 0.01  # $0.01 tolerance - don't trigger if within tolerance
         
-        # Contract size cache (for auto-correction) with TTL
-        self._contract_size_cache = {}  # {symbol: {'size': corrected_size, 'timestamp': time.time()}}
-        self._contract_size_cache_ttl = 6 * 3600  # 6 hours TTL
-        self._contract_size_lock = threading.Lock()
+        # Contract size calibrations (for auto-correction): persisted per broker server with TTL,
+        # shared with RiskManager when it passes its store, recalibrated in the background on spec changes
+        # An injected store belongs to its creator; only a store created here is stopped by shutdown()
+        self._owns_calibration_store = calibration_store is None
+        if calibration_store is None:
+            calibration_store = ContractCalibrationStore.from_config(config, spec_provider=mt5_connector.get_symbol_info)
+        self._calibration_store = calibration_store
+        self._calibration_store.register_refresher(CALIBRATION_KIND, self._refresh_contract_size_calibration)
+        
+        # Per-ticket SL ladders (profit threshold -> SL price), built on first use and
+        # rebuilt only when entry, volume or symbol specification change
+        ladder_config = self.risk_config.get('sl_ladder', {})
+        self._sl_ladder_enabled = ladder_config.get('enabled', True)
+        self._sl_ladder_max_rungs = ladder_config.get('max_rungs', 500)
+        self._sl_rung_table = None  # ((increment, max_rungs), (thresholds, locks)) for compute_sl_targets()
+        self._sl_ladders = self._ticket_states.field('sl_ladder')  # {ticket: SLLadder} - ladders are immutable, replaced whole
+        
+        # Dirty-set tracking: the SL worker only re-evaluates positions whose price,
+        # ladder rung, profit zone, SL or volume changed since the last evaluation
+        dirty_config = self.risk_config.get('sl_dirty_set', {})
+        self._sl_dirty_set_enabled = dirty_config.get('enabled', True)
+        self._sl_dirty_tracker = SLDirtyTracker(
+            price_delta_points=dirty_config.get('price_delta_points', 0.0),
+            full_sweep_interval_seconds=dirty_config.get('full_sweep_interval_seconds', 1.0),
+            zone_boundaries=(-self.max_risk_usd, 0.0, self.sweet_spot_min, self.sweet_spot_max,
+                             self.trailing_increment_usd)
+        )
         
         # Load symbol overrides
         self._symbol_overrides = {}
@@ -199,41 +264,41 @@ class SLManager:
             logger.warning(f"Could not load symbol overrides: {e}")
         
         # Position tracking
-        self._position_tracking = {}  # {ticket: {profit_history, break_even_start_time, etc.}}
-        self._tracking_lock = threading.Lock()
+        self._position_tracking = self._ticket_states.field('position_tracking')  # {ticket: {profit_history, break_even_start_time, etc.}}
+        self._tracking_lock = self._lock_profiler.wrap(threading.Lock(), 'tracking')
         
         # Profit zone entry tracking - CRITICAL for monitoring SL updates
-        self._profit_zone_entry = {}  # {ticket: {'entry_time': datetime, 'entry_profit': float, 'sl_updated': bool, 'update_attempts': int, 'last_update_time': datetime, 'last_update_reason': str}}
+        self._profit_zone_entry = self._ticket_states.field('profit_zone_entry')  # {ticket: {'entry_time': datetime, 'entry_profit': float, 'sl_updated': bool, 'update_attempts': int, 'last_update_time': datetime, 'last_update_reason': str}}
         
         # SL update tracking
-        self._last_sl_update = {}  # {ticket: datetime}
-        self._last_sl_price = {}  # {ticket: float}
-        self._last_sl_reason = {}  # {ticket: str}
-        self._last_sl_attempt = {}  # {ticket: datetime} - tracks last attempt (success or failure)
-        self._last_sl_success = {}  # {ticket: datetime} - tracks last successful update only
-        self._consecutive_failures = defaultdict(int)  # {ticket: count} - tracks consecutive failures
+        self._last_sl_update = self._ticket_states.field('last_sl_update')  # {ticket: datetime}
+        self._last_sl_price = self._ticket_states.field('last_sl_price')  # {ticket: float}
+        self._last_sl_reason = self._ticket_states.field('last_sl_reason')  # {ticket: str}
+        self._last_sl_attempt = self._ticket_states.field('last_sl_attempt')  # {ticket: datetime} - tracks last attempt (success or failure)
+        self._last_sl_success = self._ticket_states.field('last_sl_success')  # {ticket: datetime} - tracks last successful update only
+        self._consecutive_failures = self._ticket_states.field('consecutive_failures', int)  # {ticket: count} - tracks consecutive failures
         
         # CRITICAL: Track first-time eligibility per ticket to bypass blocking mechanisms
-        self._first_eligible_update = {}  # {ticket: {'state': str, 'authority': str, 'first_seen_time': float}}
+        self._first_eligible_update = self._ticket_states.field('first_eligible_update')  # {ticket: {'state': str, 'authority': str, 'first_seen_time': float}}
         # States: 'NONE' (no eligible update yet), 'PENDING' (eligible but not applied), 'APPLIED' (first update applied)
         
         # CRITICAL FIX: Alerting and monitoring for profit-lock failures
-        self._profit_lock_failures = defaultdict(int)  # {ticket: failure_count}
-        self._profit_lock_failure_timestamps = {}  # {ticket: [timestamp1, timestamp2, ...]}
+        self._profit_lock_failures = self._ticket_states.field('profit_lock_failures', int)  # {ticket: failure_count}
+        self._profit_lock_failure_timestamps = self._ticket_states.field('profit_lock_failure_timestamps')  # {ticket: [timestamp1, timestamp2, ...]}
         self._profit_lock_alert_threshold = self.risk_config.get('profit_locking', {}).get('alert_failure_threshold', 3)  # Alert after 3 failures
-        self._profit_lock_alert_cooldown = {}  # {ticket: last_alert_time} - prevent alert spam
+        self._profit_lock_alert_cooldown = self._ticket_states.field('profit_lock_alert_cooldown')  # {ticket: last_alert_time} - prevent alert spam
         self._profit_lock_alert_cooldown_seconds = 60.0  # Alert at most once per minute per ticket
         
         # SL oscillation prevention
-        self._sl_update_cooldown = {}  # {ticket: cooldown_until_timestamp}
+        self._sl_update_cooldown = self._ticket_states.field('sl_update_cooldown')  # {ticket: cooldown_until_timestamp}
         self._sl_update_cooldown_seconds = 0.5  # 500ms cooldown between updates for same ticket
         # FIX 5: Reduced delta threshold from 0.01% (1%) to 0.005% (0.5%) to allow small valid SL changes
         self._min_sl_delta_pct = self.risk_config.get('delta_min_percent', 0.005)  # 0.5% minimum change (configurable, default 0.5%)
         
         # Emergency enforcement tracking - prevent infinite loops
-        self._emergency_enforcement_count = {}  # {ticket: count} - track emergency enforcements per ticket
+        self._emergency_enforcement_count = self._ticket_states.field('emergency_enforcement_count')  # {ticket: count} - track emergency enforcements per ticket
         self._emergency_enforcement_max = 3  # Max emergency enforcements per ticket per violation
-        self._ticket_circuit_breaker = {}  # {ticket: disabled_until_time} - circuit breaker for failing tickets
+        self._ticket_circuit_breaker = self._ticket_states.field('ticket_circuit_breaker')  # {ticket: disabled_until_time} - circuit breaker for failing tickets
         # PHASE 1 FIX 1.2: Circuit breaker - skip position if 3 consecutive failures
         self._circuit_breaker_threshold = 3  # 3 consecutive failures before activating (PHASE 1 FIX 1.2)
         self._circuit_breaker_cooldown_base = 60.0  # Base cooldown 60 seconds (PHASE 1 FIX 1.2)
@@ -241,8 +306,8 @@ class SLManager:
         
         # P3-17 FIX: Circuit Breaker Tuning - Add cooldown and auto-reset
         self._circuit_breaker_cooldown_seconds = 300.0  # 5 minutes cooldown before auto-reset
-        self._circuit_breaker_activation_times = {}  # {ticket: activation_time} - track when circuit breaker activated
-        self._circuit_breaker_failure_types = {}  # {ticket: 'permanent'|'temporary'} - distinguish failure types
+        self._circuit_breaker_activation_times = self._ticket_states.field('circuit_breaker_activation_times')  # {ticket: activation_time} - track when circuit breaker activated
+        self._circuit_breaker_failure_types = self._ticket_states.field('circuit_breaker_failure_types')  # {ticket: 'permanent'|'temporary'} - distinguish failure types
         
         # PHASE 1 FIX 1.2: SL update timeout - abort if takes >5 seconds (increased from 2s for slow broker responses)
         execution_config = config.get('execution', {})
@@ -274,6 +339,10 @@ class SLManager:
         # Cached metrics for timer-based heartbeat (no MT5 calls from heartbeat thread)
         self._sl_worker_last_position_count: int = 0
         self._sl_worker_last_active_tickets: int = 0
+        # Sharded SL worker: N threads, each owning a deterministic partition of symbols
+        self._sl_worker_shard_count = max(1, int(execution_config.get('sl_worker', {}).get('shards', 1)))
+        self._sl_worker_shards: List[SLWorkerShard] = []
+        self._sl_worker_shard_lock = threading.Lock()  # Serialises shard (re)starts
         
         # OPTIMIZATION: Background task queue for heavy operations
         # This allows the main worker loop to stay under 50ms by offloading:
@@ -281,7 +350,19 @@ class SLManager:
         # - CSV writing (file I/O)
         # - Heavy logging operations
         # - Stale lock checks (when many locks exist)
-        self._background_task_queue = queue.Queue(maxsize=100)  # Limit queue size to prevent memory growth
+        # Identical pending tasks collapse into one and each task type has a minimum interval
+        # between runs (fail_safe_check / check_stale_locks were queued on every loop iteration)
+        background_config = execution_config.get('background_tasks', {})
+        background_intervals = {
+            'fail_safe_check': 0.5,
+            'check_stale_locks': self._lock_watchdog_interval,
+            'micro_profit_check': 0.0,  # Keyed by ticket
+        }
+        background_intervals.update(background_config.get('min_interval_seconds', {}))
+        self._background_tasks = BackgroundTaskScheduler(
+            min_intervals=background_intervals,
+            max_pending=background_config.get('max_pending', 100)  # Limit pending tasks to prevent memory growth
+        )
         self._background_worker_thread: Optional[threading.Thread] = None
         self._background_worker_running = False
         self._background_worker_shutdown_event = threading.Event()
@@ -293,14 +374,43 @@ class SLManager:
         
         # P2-15 FIX: SL Update Rate Limiting Adjustment - Add priority queue for emergency updates
         # Global rate limiting: max 50 SL updates per second system-wide (configurable, increased for reliability)
-        self._global_rpc_lock = threading.Lock()
-        self._global_rpc_timestamps = []  # List of timestamps for last 50 updates
+        # Token bucket with per-class burst buckets; deferred updates are coalesced per ticket
+        # and dispatched in priority order by _drain_rpc_queue()
         execution_config = self.config.get('execution', {})
         self._global_rpc_max_per_second = execution_config.get('global_rpc_max_per_second', 50)  # Configurable, default 50
-        self._global_rpc_queue = []  # Queue for non-emergency updates (FIFO)
-        # P2-15 FIX: Priority queue for emergency updates (strict loss, profit locking)
-        self._global_rpc_priority_queue = []  # Priority queue for emergency updates
         self._emergency_backoff_base = 0.05  # Short exponential backoff for emergency (50ms base)
+        rpc_limiter_config = execution_config.get('rpc_limiter', {})
+        self._rpc_limiter = GlobalRPCLimiter(
+            max_per_second=self._global_rpc_max_per_second,
+            critical_burst=rpc_limiter_config.get('critical_burst', 5),
+            backoff_base_seconds=self._emergency_backoff_base,
+            max_queue=rpc_limiter_config.get('max_queue', 500),
+            lock=self._lock_profiler.wrap(threading.Lock(), 'global_rpc')
+        )
+        self._rpc_drain_max_per_cycle = rpc_limiter_config.get('drain_max_per_cycle', 20)
+        
+        # Last-writer-wins SL modify coalescing: at most one in-flight and one pending target per ticket
+        self._sl_modify_queue = SLModifyQueue(
+            wait_timeout_seconds=execution_config.get('sl_modify_wait_timeout_seconds', 5.0)
+        )
+        self._last_sl_modify = self._ticket_states.field('last_sl_modify')  # {ticket: {'target', 'success', 'time'}}
+        self._sl_modify_queue.add_listener(self._on_sl_modify_complete)
+        
+        # Deferred SL verification: a successful modify records the expected SL and the next
+        # position snapshot confirms it (no post-modify sleep + broker re-read per position)
+        verification_config = execution_config.get('verification', {})
+        self._async_sl_verification = verification_config.get('async_enabled', True)
+        self._sl_verifier = DeferredSLVerifier(
+            settle_seconds=self.sl_update_verification_delay,
+            timeout_seconds=verification_config.get('async_timeout_seconds', 5.0),
+            on_mismatch=self._on_sl_verify_mismatch
+        )
+        self._sl_verifier_bus = None  # Bus whose published snapshots feed the verifier
+        if self._async_sl_verification:
+            position_bus = getattr(self.order_manager, 'position_bus', None)
+            if isinstance(position_bus, PositionSnapshotBus):
+                position_bus.subscribe(self._sl_verifier.on_snapshot)
+                self._sl_verifier_bus = position_bus
         
         # Per-ticket rate limiting: Load from config or use default 100ms
         sl_update_min_interval_ms = self.risk_config.get('sl_update_min_interval_ms', 100)
@@ -308,13 +418,16 @@ class SLManager:
         
         # Timing instrumentation
         self._timing_stats = {
-            'loop_durations': [],  # Per-loop durations
-            'ticket_update_times': {},  # {ticket: [latencies]}
             'update_counts': defaultdict(int),  # {ticket: count}
             'last_loop_time': None,
             'last_update_time': None
         }
-        self._timing_lock = threading.Lock()
+        self._timing_lock = self._lock_profiler.wrap(threading.Lock(), 'timing')
+        # Streaming latency histograms (ms) - fixed memory, lifetime + 1m/5m/1h views
+        self._loop_duration_histogram = StreamingHistogram()  # SL worker loop iterations
+        self._ticket_update_histogram = StreamingHistogram()  # update_sl_atomic() per ticket
+        self._lock_wait_histogram = StreamingHistogram()  # Ticket lock acquisition
+        self._broker_modify_histogram = StreamingHistogram()  # order_manager.modify_order()
         
         # Manual review tracking (for emergency failures)
         self._manual_review_tickets = set()  # Tickets requiring manual review
@@ -542,7 +655,7 @@ class SLManager:
                 # CRITICAL FIX: Use RLock (reentrant lock) to prevent deadlocks in backtest mode
                 # In backtest, both run_cycle and sl_worker run on the same thread (MainThread)
                 # Without reentrant locks, this causes deadlocks when both try to update the same position
-                self._ticket_locks[ticket] = threading.RLock()
+                self._ticket_locks[ticket] = self._lock_profiler.wrap(threading.RLock(), 'ticket')
             return self._ticket_locks[ticket]
     
     class _AtomicTrackedLock:
@@ -642,6 +755,7 @@ class SLManager:
                               f"Cleanup error occurred but lock was released")
             
             return False  # Don't suppress exceptions
+
     
     def _track_profit_lock_failure(self, ticket: int, symbol: str, reason: str):
         """
@@ -823,6 +937,7 @@ class SLManager:
         
         total_wait_time = 0.0
         last_error = None
+        wait_start = time.time()
         
         for attempt in range(retries):
             attempt_start = time.time()
@@ -852,6 +967,8 @@ class SLManager:
             acquisition_time = (time.time() - attempt_start) * 1000  # Convert to ms
             
             if acquired:
+                self._lock_wait_histogram.record((time.time() - wait_start) * 1000)
+                
                 # CRITICAL FIX: Use atomic tracked lock wrapper to guarantee tracking
                 # Lock is already acquired, now wrap it for atomic tracking
                 thread_id = threading.current_thread().ident
@@ -1394,7 +1511,7 @@ class SLManager:
         
         Strategy:
         1. Check symbol overrides first
-        2. Check cache (with TTL validation)
+        2. Check the calibration store (persisted, with TTL validation)
         3. Prefer broker-reported contract_size if it produces reasonable SL (<10% of entry)
         4. Only use reverse engineering when contract_size leads to absurd result AND current_profit available
         5. Limit multipliers to [10, 100, 1000, 10000] (no 100k default)
@@ -1416,32 +1533,46 @@ class SLManager:
                 logger.info(f"🔧 Using manual contract_size override for {symbol}: {override['contract_size']}")
                 return float(override['contract_size'])
         
-        # Step 2: Check cache (with TTL validation)
-        current_time = time.time()
-        with self._contract_size_lock:
-            if symbol in self._contract_size_cache:
-                cached_entry = self._contract_size_cache[symbol]
-                if isinstance(cached_entry, dict):
-                    cached_size = cached_entry.get('size')
-                    cached_timestamp = cached_entry.get('timestamp', 0)
-                    if current_time - cached_timestamp < self._contract_size_cache_ttl:
-                        return cached_size
-                    # TTL expired, remove from cache
-                    del self._contract_size_cache[symbol]
-                else:
-                    # Legacy format (direct value), convert to new format
-                    cached_size = cached_entry
-                    self._contract_size_cache[symbol] = {'size': cached_size, 'timestamp': current_time}
-                    return cached_size
+        # Step 2: Check the calibration store (persisted across restarts, TTL-validated)
+        cached_size = self._calibration_store.get(symbol, CALIBRATION_KIND)
+        if cached_size is not None:
+            return cached_size
         
         # Step 3: Get broker-reported contract_size
         symbol_info = self.mt5_connector.get_symbol_info(symbol)
         if symbol_info is None:
             return 1.0  # Default fallback
         
+        contract_size, source = self._calibrate_contract_size(symbol, symbol_info, entry_price, lot_size,
+                                                              target_loss_usd, position)
+        self._calibration_store.put(symbol, CALIBRATION_KIND, contract_size, source, symbol_info,
+                                    {'entry_price': entry_price, 'lot_size': lot_size,
+                                     'target_loss_usd': target_loss_usd})
+        return contract_size
+    
+    def _refresh_contract_size_calibration(self, symbol: str, record: CalibrationRecord) -> Optional[Tuple[float, str]]:
+        """Calibration store refresher: recalibrate from the current spec (reverse-engineered sizes are dropped)."""
+        if record.source == 'reverse_engineered':
+            return None  # Derived from a position's profit - re-derive on next use
+        symbol_info = self.mt5_connector.get_symbol_info(symbol)
+        if symbol_info is None or not record.inputs.get('entry_price'):
+            return None
+        return self._calibrate_contract_size(symbol, symbol_info, record.inputs['entry_price'],
+                                             record.inputs.get('lot_size', 0.01),
+                                             record.inputs.get('target_loss_usd', self.max_risk_usd))
+    
+    def _calibrate_contract_size(self, symbol: str, symbol_info: Dict[str, Any], entry_price: float,
+                                 lot_size: float, target_loss_usd: float,
+                                 position: Optional[Dict[str, Any]] = None) -> Tuple[float, str]:
+        """
+        Steps 3-7 of _get_corrected_contract_size() for a known symbol_info.
+        
+        Returns:
+            (contract_size, source) - source is 'reported', 'reverse_engineered',
+            'multiplier' or 'fallback'
+        """
         reported_contract_size = symbol_info.get('contract_size', 1.0)
-        point = symbol_info.get('point', 0.00001)
-        point_value = symbol_info.get('trade_tick_value', None)
+        price_diff_reported = 0.0
         
         # Step 4: Test if reported size produces reasonable SL (<10% of entry)
         if reported_contract_size > 0 and lot_size > 0:
@@ -1449,9 +1580,7 @@ class SLManager:
             
             # If price difference is reasonable (<10% of entry), use reported size
             if price_diff_reported < entry_price * 0.10:
-                with self._contract_size_lock:
-                    self._contract_size_cache[symbol] = {'size': reported_contract_size, 'timestamp': current_time}
-                return reported_contract_size
+                return reported_contract_size, 'reported'
         
         # Step 5: Reported size produces absurd result (>10% of entry)
         # Try reverse engineering ONLY if current_profit is available
@@ -1477,12 +1606,10 @@ class SLManager:
                         # Verify this size produces reasonable SL
                         price_diff_test = abs(target_loss_usd) / (lot_size * effective_contract_size)
                         if price_diff_test < entry_price * 0.10:
-                            with self._contract_size_lock:
-                                self._contract_size_cache[symbol] = {'size': effective_contract_size, 'timestamp': current_time}
                             logger.info(f"🔧 CONTRACT_SIZE REVERSE-ENGINEERED: {symbol} | "
                                       f"Reported: {reported_contract_size} → Reverse: {effective_contract_size:.2f} | "
                                       f"From current profit: ${current_profit:.2f}")
-                            return effective_contract_size
+                            return effective_contract_size, 'reverse_engineered'
         
         # Step 6: Try limited multipliers [10, 100, 1000, 10000] (no 100k)
         multipliers = [10.0, 100.0, 1000.0, 10000.0]
@@ -1493,19 +1620,71 @@ class SLManager:
                 
                 # If corrected size gives reasonable price difference (<10% of entry), use it
                 if price_diff_corrected < entry_price * 0.10:
-                    with self._contract_size_lock:
-                        self._contract_size_cache[symbol] = {'size': corrected_size, 'timestamp': current_time}
                     logger.info(f"🔧 CONTRACT_SIZE AUTO-CORRECTED: {symbol} | "
                               f"{reported_contract_size} → {corrected_size} (multiplier: {multiplier}x) | "
                               f"Price_diff: {price_diff_reported:.5f} → {price_diff_corrected:.5f}")
-                    return corrected_size
+                    return corrected_size, 'multiplier'
         
         # Step 7: Fallback to reported size (even if it seems wrong)
         logger.warning(f"CONTRACT_SIZE: Could not correct {symbol} | "
                       f"Reported: {reported_contract_size} | Price_diff: {price_diff_reported:.5f} ({price_diff_reported/entry_price*100:.1f}% of entry)")
-        with self._contract_size_lock:
-            self._contract_size_cache[symbol] = {'size': reported_contract_size, 'timestamp': current_time}
-        return reported_contract_size
+        return reported_contract_size, 'fallback'
+    
+    def _get_sl_ladder(self, position: Dict[str, Any], symbol_info: Dict[str, Any]) -> Optional[SLLadder]:
+        """
+        SL ladder for a position, or None if its SL targets need the full calculation.
+        
+        Ladders are used when the USD value of a price move is fixed: the broker's
+        trade_tick_value, or the (corrected) contract size of a forex symbol. Crypto,
+        index and commodity symbols without trade_tick_value keep the reverse-engineered
+        path in _calculate_target_sl_price().
+        """
+        if not self._sl_ladder_enabled:
+            return None
+        ticket = position.get('ticket', 0)
+        if not ticket:
+            return None
+        
+        try:
+            point = float(symbol_info.get('point', 0.00001))
+            digits = int(symbol_info.get('digits', 5))
+            point_value = symbol_info.get('trade_tick_value', None)
+            reported_contract_size = symbol_info.get('contract_size', 1.0)
+            spec_key = (point, digits, point_value, reported_contract_size)
+        except (TypeError, ValueError):
+            return None
+        
+        ladder = self._sl_ladders.get(ticket)
+        if ladder is not None and ladder.matches(position, spec_key):
+            return ladder
+        
+        symbol = position.get('symbol', '')
+        entry_price = position.get('price_open', 0.0)
+        order_type = position.get('type', '')
+        lot_size = position.get('volume', 0.01)
+        if entry_price <= 0 or lot_size <= 0 or point <= 0 or order_type not in ('BUY', 'SELL'):
+            return None
+        
+        if point_value and point_value > 0:
+            usd_per_price = lot_size * point_value / point
+        else:
+            # Same symbol classification as _calculate_target_sl_price()
+            is_crypto_or_index = (point >= 0.01) or (point < 0.0001 and entry_price > 100)
+            is_crypto_by_name = any(crypto in symbol.upper() for crypto in ['BTC', 'ETH', 'LTC', 'XRP', 'ADA', 'DOGE', 'XAU', 'XAG'])
+            if is_crypto_or_index or is_crypto_by_name:
+                self._sl_ladders.pop(ticket, None)
+                return None
+            contract_size = self._get_corrected_contract_size(symbol, entry_price, lot_size, self.max_risk_usd, position=position)
+            usd_per_price = lot_size * contract_size
+        if usd_per_price <= 0:
+            return None
+        
+        ladder = SLLadder(ticket, symbol, order_type, entry_price, lot_size, point, digits, spec_key,
+                          usd_per_price, self.trailing_increment_usd, self._sl_ladder_max_rungs)
+        self._sl_ladders[ticket] = ladder
+        logger.debug(f"[SL_LADDER] {symbol} Ticket {ticket} | Built {len(ladder.locks)} rungs | "
+                     f"USD per price unit: {usd_per_price:.4f} | Top lock: ${ladder.locks[-1] if ladder.locks else 0.0:.2f}")
+        return ladder
     
     def _calculate_target_sl_price(self, entry_price: float, target_profit_usd: float,
                                    order_type: str, lot_size: float, symbol_info: Dict[str, Any],
@@ -1991,9 +2170,10 @@ class SLManager:
                               f"Emergency logic only applies when no better SL exists")
                 return False, "Emergency SL would worsen current SL - blocked", None
         
-        # DIRECT MT5 modification - NO LOCKS
+        # DIRECT MT5 modification - NO LOCKS (served ahead of every other MT5 request)
         try:
-            success = self.order_manager.modify_order(ticket, stop_loss_price=target_sl)
+            with priority_scope(MT5Priority.EMERGENCY_SL):
+                success = self.order_manager.modify_order(ticket, stop_loss_price=target_sl)
             
             if success:
                 logger.critical(f"[EMERGENCY LOCK-FREE] HARD SL ENFORCED: mode={mode} | "
@@ -2307,9 +2487,10 @@ class SLManager:
                     entry_price, -self.max_risk_usd, order_type, lot_size, symbol_info, position=position
                 )
 
-                emergency_success = self.order_manager.modify_order(
-                    ticket, stop_loss_price=emergency_sl
-                )
+                with priority_scope(MT5Priority.EMERGENCY_SL):
+                    emergency_success = self.order_manager.modify_order(
+                        ticket, stop_loss_price=emergency_sl
+                    )
 
                 if emergency_success:
                     logger.critical(
@@ -2696,16 +2877,21 @@ class SLManager:
         
         # Calculate how much profit to lock in
         # Lock in profit in $0.10 increments, trailing $0.10 behind
-        # Example: If profit is $0.25, lock in $0.15 (trailing $0.10 behind)
-        profit_to_lock = current_profit - self.trailing_increment_usd
-        # Round down to nearest $0.10 increment
-        profit_to_lock = (profit_to_lock // self.trailing_increment_usd) * self.trailing_increment_usd
-        profit_to_lock = max(profit_to_lock, self.trailing_increment_usd)  # At least $0.10
-        
-        # Calculate target SL price
-        target_sl = self._calculate_target_sl_price(
-            entry_price, profit_to_lock, order_type, lot_size, symbol_info
-        )
+        # Example: If profit is $0.25, lock in $0.10 (trailing $0.10 behind)
+        ladder = self._get_sl_ladder(position, symbol_info)
+        rung = ladder.trailing_sl(current_profit, tick.bid, tick.ask) if ladder else None
+        if rung:
+            profit_to_lock, target_sl = rung
+        else:
+            profit_to_lock = current_profit - self.trailing_increment_usd
+            # Round down to nearest $0.10 increment
+            profit_to_lock = (profit_to_lock // self.trailing_increment_usd) * self.trailing_increment_usd
+            profit_to_lock = max(profit_to_lock, self.trailing_increment_usd)  # At least $0.10
+            
+            # Calculate target SL price
+            target_sl = self._calculate_target_sl_price(
+                entry_price, profit_to_lock, order_type, lot_size, symbol_info
+            )
         
         # Adjust for broker constraints (pass entry_price to allow loss->profit zone transitions)
         target_sl = self._adjust_sl_for_broker_constraints(
@@ -2846,7 +3032,9 @@ class SLManager:
                 return False
             
             # ONLY call modify_order - no validation, no verification, no delays
+            modify_start_time = time.time()
             success = self.order_manager.modify_order(ticket, stop_loss_price=target_sl_price)
+            self._broker_modify_histogram.record((time.time() - modify_start_time) * 1000)
             lock_hold_time = (time.time() - lock_start_time) * 1000  # ms
             max_hold_time_ms = self._lock_max_hold_time * 1000  # Convert to ms
             
@@ -2861,7 +3049,8 @@ class SLManager:
             
             # FIX 2: CRITICAL - Immediate verification after modify_order to catch MT5 "success but SL=0" bugs
             # This is a minimal check that doesn't significantly increase lock hold time
-            if success:
+            # With deferred verification the next position snapshot catches the same bug without the sleep
+            if success and not self._async_sl_verification:
                 # Brief delay for broker to process (minimal - 50ms)
                 time.sleep(0.05)
                 fresh_position = self.order_manager.get_position_by_ticket(ticket)
@@ -2886,6 +3075,162 @@ class SLManager:
                         f"Exception in _execute_sl_modify_only: {e}", exc_info=True)
             return False
     
+    def _on_sl_modify_complete(self, ticket: int, target_sl: float, success: bool):
+        """SLModifyQueue completion callback - records the last modify sent for a ticket."""
+        self._last_sl_modify[ticket] = {'target': target_sl, 'success': success, 'time': time.time()}
+    
+    def _on_sl_verify_mismatch(self, ticket: int, symbol: str, expected_sl: float, applied_sl: float):
+        """
+        DeferredSLVerifier callback - the broker SL differs from a modify reported as successful.
+        
+        May run on the snapshot producer thread: no broker calls and no _tracking_lock (a
+        consumer refreshing the bus could already hold it). The ticket is counted as failed
+        and marked dirty so the next SL pass re-sends the SL.
+        """
+        self._consecutive_failures[ticket] += 1
+        self._last_sl_reason[ticket] = (f"SL verification mismatch "
+                                        f"(expected {expected_sl:.5f}, applied {applied_sl:.5f})")
+        self._sl_dirty_tracker.forget(ticket)
+    
+    def _expect_sl_applied(self, ticket: int, symbol: str, order_type: str, sl_price: float):
+        """
+        Verify a successful modify: deferred to the next position snapshot, or blocking when
+        execution.verification.async_enabled is off (mismatches are logged only).
+        """
+        symbol_info = self.mt5_connector.get_symbol_info(symbol)
+        point = symbol_info.get('point', 0.00001) if symbol_info else 0.00001
+        tolerance = point * 10  # 1 pip tolerance
+        
+        if self._async_sl_verification:
+            self._sl_verifier.expect(ticket, symbol, sl_price, tolerance, order_type=order_type)
+            logger.debug(f"[SL_VERIFY_DEFERRED] Ticket={ticket} Symbol={symbol} | "
+                         f"Expected SL {sl_price:.5f} recorded for the next position snapshot")
+            return
+        
+        # PHASE 1 FIX 1.2: Fixed verification delay (500ms) - no symbol-specific logic
+        # Fixed delay prevents cascading delays and ensures consistent behavior
+        verification_delay = self.sl_update_verification_delay  # 500ms (fixed, no exponential backoff)
+        logger.debug(f"[VERIFY_DELAY] Ticket={ticket} Symbol={symbol} | "
+                     f"Using fixed {verification_delay*1000:.0f}ms delay (PHASE 1 FIX 1.2)")
+        time.sleep(verification_delay)
+        fresh_position = self.order_manager.get_position_by_ticket(ticket)
+        if fresh_position:
+            applied_sl = fresh_position.get('sl', 0.0)
+            sl_diff = abs(applied_sl - sl_price)
+            if sl_diff < tolerance:
+                logger.info(f"[OK] SL VERIFIED: {symbol} Ticket {ticket} | "
+                            f"Applied: {applied_sl:.5f} | Target: {sl_price:.5f} | "
+                            f"Diff: {sl_diff:.5f}")
+            else:
+                logger.warning(f"[WARNING] SL VERIFICATION MISMATCH: {symbol} Ticket {ticket} | "
+                               f"Applied: {applied_sl:.5f} | Target: {sl_price:.5f} | "
+                               f"Diff: {sl_diff:.5f} (tolerance: {tolerance:.5f})")
+        else:
+            # FIX #3: Position closed during verification - this is not a verification failure
+            logger.info(f"[POSITION_CLOSED_DURING_VERIFY] Ticket {ticket} Symbol {symbol} | "
+                        f"Position closed during SL verification | "
+                        f"SL was applied successfully but position closed before verification could complete | "
+                        f"This is normal if position was closed by broker (SL hit, TP hit, or manual close)")
+    
+    def _check_sl_verifications(self, positions: List[Dict[str, Any]], captured_at: float):
+        """
+        Resolve deferred SL verifications against positions read directly from the broker.
+        
+        Skipped while the position bus is publishing: its snapshots carry their own capture
+        time and already reach the verifier, whereas a cached snapshot passed here could
+        predate the modify it would be judged against.
+        
+        A ticket only counts as closed if a read including Dec 8 / old positions
+        (exclude_dec8=False) does not list it either; an empty read (failed fetch)
+        resolves nothing.
+        
+        Args:
+            positions: Open positions (may exclude Dec 8 / old positions)
+            captured_at: Time the read started
+        """
+        if self._sl_verifier_bus is not None and self._sl_verifier_bus.enabled:
+            self._sl_verifier.expire()
+            return
+        if not positions:
+            self._sl_verifier.expire()
+            return
+        listed = {p.get('ticket') for p in positions}
+        open_tickets = None
+        if any(ticket not in listed for ticket in self._sl_verifier.pending_tickets()):
+            all_positions = self.order_manager.get_open_positions(exclude_dec8=False)
+            if not all_positions:
+                self._sl_verifier.expire()
+                return
+            open_tickets = listed | {p.get('ticket') for p in all_positions}
+        self._sl_verifier.check_positions(positions, captured_at, open_tickets=open_tickets)
+    
+    @contextmanager
+    def _track_lock_holder(self, ticket: int, is_trailing: bool = False):
+        """Record the calling thread as the ticket lock holder (caller already holds the lock)."""
+        lock = self._get_ticket_lock(ticket)
+        hold_start = time.time()
+        current = threading.current_thread()
+        with self._locks_lock:
+            self._lock_hold_times[ticket] = hold_start
+            self._lock_holders[ticket] = {
+                'thread_id': current.ident,
+                'thread_name': current.name,
+                'acquired_at': hold_start,
+                'is_profit_locking': False,
+                'is_trailing': is_trailing,
+                'lock_object': lock,
+                'stack': '',
+            }
+        try:
+            yield
+        finally:
+            with self._locks_lock:
+                holder = self._lock_holders.get(ticket)
+                if holder is not None and holder.get('thread_id') == current.ident:
+                    del self._lock_holders[ticket]
+                    self._lock_hold_times.pop(ticket, None)
+    
+    def _modify_sl_under_lock(self, ticket: int, symbol: str, sl_price: float, is_trailing: bool = False) -> bool:
+        """
+        Send one SL modify while holding the ticket lock (dispatched by SLModifyQueue).
+        
+        The lock is taken here, on whichever thread SLModifyQueue uses to send the
+        modify, so callers coalescing in the queue never hold or wait on it.
+        
+        Args:
+            ticket: Position ticket number
+            symbol: Trading symbol
+            sl_price: SL price to send (already validated)
+            is_trailing: Recorded in the lock holder info for stale-lock preemption
+        
+        Returns:
+            True if the modify succeeded
+        """
+        lock = self._get_ticket_lock(ticket)
+        lock_acquire_start = time.time()
+        with lock, self._track_lock_holder(ticket, is_trailing):
+            lock_acquire_time = (time.time() - lock_acquire_start) * 1000
+            self._lock_wait_histogram.record(lock_acquire_time)
+            if lock_acquire_time > 10:
+                logger.warning(f"[LOCK_ACQUIRE_TIME] Ticket={ticket} | Lock acquisition took {lock_acquire_time:.1f}ms")
+            
+            # ONLY call the minimal modify method - no validation, no verification, no delays
+            modify_start = time.time()
+            success = self._execute_sl_modify_only(ticket, symbol, sl_price)
+            modify_time = (time.time() - modify_start) * 1000
+            
+            # Log lock hold time
+            lock_hold_time = (time.time() - lock_acquire_start) * 1000
+            max_hold_time_ms = self._lock_max_hold_time * 1000
+            if lock_hold_time > max_hold_time_ms:
+                logger.warning(f"[LOCK_HOLD_TIME] Ticket={ticket} Symbol={symbol} | "
+                             f"Lock held for {lock_hold_time:.1f}ms (target: <{max_hold_time_ms:.0f}ms) | "
+                             f"Modify took {modify_time:.1f}ms")
+            else:
+                logger.debug(f"[LOCK_HOLD_TIME] Ticket={ticket} Symbol={symbol} | "
+                           f"Lock held for {lock_hold_time:.1f}ms (OK, target: <{max_hold_time_ms:.0f}ms)")
+        return success
+    
     def _retry_sl_update_with_backoff(self, ticket: int, symbol: str, target_sl: float, max_retries: int = 3) -> bool:
         """
         FIX 2: Fallback retry mechanism for MT5 failures.
@@ -4035,9 +4380,10 @@ class SLManager:
                             # Apply-and-Verify flow: modify -> sleep -> verify -> confirm
                             try:
                                 # Step 1: Apply SL modification
-                                emergency_success = self.order_manager.modify_order(
-                                    ticket, stop_loss_price=emergency_sl
-                                )
+                                with priority_scope(MT5Priority.EMERGENCY_SL):
+                                    emergency_success = self.order_manager.modify_order(
+                                        ticket, stop_loss_price=emergency_sl
+                                    )
                                 
                                 if emergency_success:
                                     # Step 2: Sleep for verification delay
@@ -4125,9 +4471,10 @@ class SLManager:
                                                         logger.info(f"🔄 EMERGENCY SL RETRY: {symbol} Ticket {ticket} | "
                                                                    f"Retrying with adjusted SL: {retry_sl:.5f} (was {applied_sl:.5f})")
                                                         
-                                                        retry_success = self.order_manager.modify_order(
-                                                            ticket, stop_loss_price=retry_sl
-                                                        )
+                                                        with priority_scope(MT5Priority.EMERGENCY_SL):
+                                                            retry_success = self.order_manager.modify_order(
+                                                                ticket, stop_loss_price=retry_sl
+                                                            )
                                                         
                                                         if retry_success:
                                                             time.sleep(self.sl_update_verification_delay)
@@ -4226,6 +4573,161 @@ class SLManager:
         """
         SINGLE SL AUTHORITY - Computes the authoritative SL with strict priority.
         
+        Thin wrapper around compute_authoritative_sl_batch() for one position; see
+        _compute_authoritative_sl_scalar() for the rules and the returned keys.
+        """
+        return self.compute_authoritative_sl_batch([position])[0]
+    
+    def compute_authoritative_sl_batch(self, positions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Authoritative SL for many positions in one NumPy pass (risk/sl_batch.py).
+        
+        Positions with an SL ladder are decided by compute_sl_targets(); the others
+        (no ladder, profit past the top rung, ProfitLockingEngine in the sweet spot,
+        missing symbol info or prices) go through _compute_authoritative_sl_scalar().
+        
+        Args:
+            positions: Position dictionaries (must be fresh from order_manager)
+        
+        Returns:
+            One compute_authoritative_sl() result dict per position, in order
+        """
+        if not positions:
+            return []
+        
+        targets = self._compute_sl_targets(positions)
+        results = []
+        for i, position in enumerate(positions):
+            if targets.scalar[i]:
+                results.append(self._compute_authoritative_sl_scalar(position))
+            else:
+                results.append(self._authoritative_result_from_batch(position, targets, i))
+        return results
+    
+    def _compute_sl_targets(self, positions: List[Dict[str, Any]]) -> SLTargets:
+        """compute_sl_targets() for a list of positions (row i belongs to positions[i])."""
+        columns = self._build_position_columns(positions)
+        thresholds, locks = self._get_sl_rung_table()
+        profit_locking_engine = getattr(getattr(self, '_risk_manager', None), '_profit_locking_engine', None)
+        return compute_sl_targets(
+            columns, self.trailing_increment_usd, thresholds, locks,
+            self.sweet_spot_min, self.sweet_spot_max, self.max_risk_usd,
+            profit_zone_enabled=self.profit_zone_updates_enabled,
+            profit_lock_scalar=profit_locking_engine is not None
+        )
+    
+    def _get_sl_rung_table(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Shared trailing rung thresholds/locks for compute_sl_targets() (rebuilt if the increment changes)."""
+        key = (self.trailing_increment_usd, self._sl_ladder_max_rungs)
+        if self._sl_rung_table is None or self._sl_rung_table[0] != key:
+            self._sl_rung_table = (key, rung_table(*key))
+        return self._sl_rung_table[1]
+    
+    def _build_position_columns(self, positions: List[Dict[str, Any]]) -> PositionColumns:
+        """
+        Columnar SL inputs for compute_sl_targets().
+        
+        Symbol info and prices are read once per symbol. A row is supported only if the
+        position has an SL ladder built with the current trailing increment.
+        """
+        market = {}  # {symbol: (symbol_info, tick)}
+        rows = []
+        for position in positions:
+            symbol = position.get('symbol', '')
+            if symbol not in market:
+                symbol_info = self.mt5_connector.get_symbol_info(symbol)
+                tick = self.mt5_connector.get_symbol_info_tick(symbol) if symbol_info is not None else None
+                market[symbol] = (symbol_info, tick)
+            symbol_info, tick = market[symbol]
+            
+            ladder = None
+            try:
+                bid, ask = float(tick.bid), float(tick.ask)
+            except (AttributeError, TypeError, ValueError):
+                bid = ask = None  # No usable quote - full calculation
+            if symbol_info is not None and bid is not None:
+                try:
+                    ladder = self._get_sl_ladder(position, symbol_info)
+                except Exception as e:
+                    logger.debug(f"[SL_BATCH] Ladder unavailable for Ticket {position.get('ticket', 0)}: {e}")
+            if ladder is not None and ladder.increment == self.trailing_increment_usd:
+                rows.append((position.get('ticket', 0), 1.0 if ladder.order_type == 'BUY' else -1.0,
+                             ladder.entry_price, ladder.volume, position.get('sl', 0.0) or 0.0,
+                             position.get('profit', 0.0), bid, ask, ladder.point, ladder.digits,
+                             symbol_info.get('trade_stops_level', 0) or 0, ladder.usd_per_price,
+                             len(ladder.locks), True))
+            else:
+                rows.append((position.get('ticket', 0), 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 5, 0.0, 0.0, 0, False))
+        return PositionColumns(*zip(*rows))
+    
+    def _authoritative_result_from_batch(self, position: Dict[str, Any], targets: SLTargets, i: int) -> Dict[str, Any]:
+        """compute_authoritative_sl() result dict for row i of compute_sl_targets()."""
+        symbol = position.get('symbol', '')
+        ticket = position.get('ticket', 0)
+        current_profit = position.get('profit', 0.0)
+        current_sl = position.get('sl', 0.0)
+        
+        result = {
+            'target_sl_price': None,
+            'target_profit_usd': 0.0,
+            'authority_source': None,
+            'reason': None,
+            'state': 'MANAGING',
+            'is_trailing': False,
+            'is_profit_lock': False,
+            'violations': []
+        }
+        
+        authority = int(targets.authority[i])
+        if authority == AUTHORITY_NONE:
+            result['reason'] = "No SL update needed"
+            return result
+        
+        target_profit = float(targets.target_profit[i])
+        target_sl = None if np.isnan(targets.target_sl[i]) else float(targets.target_sl[i])
+        result['target_sl_price'] = target_sl
+        result['target_profit_usd'] = target_profit
+        result['authority_source'] = AUTHORITY_NAMES[authority]
+        if authority == AUTHORITY_TRAILING:
+            result['reason'] = f"Trailing stop (profit: ${current_profit:.2f}, locking: ${target_profit:.2f})"
+            result['state'] = 'TRAILING_ACTIVE'
+            result['is_trailing'] = True
+        elif authority == AUTHORITY_PROFIT_LOCK:
+            result['reason'] = (f"Sweet-spot profit locking (${current_profit:.2f} in range "
+                                f"${self.sweet_spot_min:.2f}-${self.sweet_spot_max:.2f})")
+            result['state'] = 'SWEET_SPOT'
+            result['is_profit_lock'] = True
+        elif authority == AUTHORITY_HARD:
+            result['reason'] = f"Strict loss enforcement (-${self.max_risk_usd:.2f})"
+        else:
+            violation_msg = (
+                f"[CRITICAL][SL_VIOLATION_DETECTED] Ticket {ticket} Symbol {symbol} | "
+                f"Current profit: ${current_profit:.2f} exceeds -${self.max_risk_usd:.2f} limit | "
+                f"Position must be closed immediately"
+            )
+            logger.critical(violation_msg)
+            result['reason'] = f"SL violation detected: profit ${current_profit:.2f} exceeds -${self.max_risk_usd:.2f} limit"
+            result['state'] = 'VIOLATION'
+            result['violation'] = True
+            result['must_close'] = True
+            result['violations'].append(violation_msg)
+        
+        # MONOTONIC SL GUARD - target would move the SL backwards
+        if targets.regression[i]:
+            violation_msg = (f"[CRITICAL][SL_VIOLATION] SL regression attempt: {symbol} Ticket {ticket} | "
+                             f"Current SL: {current_sl:.5f} | Target SL: {target_sl:.5f} | "
+                             f"Authority: {result['authority_source']} | Profit: ${current_profit:.2f}")
+            result['violations'].append(violation_msg)
+            logger.critical(violation_msg)
+            result['target_sl_price'] = None
+            result['reason'] = f"SL regression blocked (current: {current_sl:.5f}, target: {target_sl:.5f})"
+            result['authority_source'] = None
+        return result
+    
+    def _compute_authoritative_sl_scalar(self, position: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        SINGLE SL AUTHORITY - Computes the authoritative SL with strict priority.
+        
         Priority (STRICT - NEVER VIOLATED):
             TRAILING_SL > PROFIT_LOCK_SL > HARD_SL
         
@@ -4286,14 +4788,19 @@ class SLManager:
                 logger.debug(f"[PROFIT_ZONE_DISABLED] {symbol} Ticket {ticket} | Trailing stop disabled - skipping (profit: ${current_profit:.2f})")
             else:
                 try:
-                    # Calculate trailing stop
-                    profit_to_lock = current_profit - self.trailing_increment_usd
-                    profit_to_lock = (profit_to_lock // self.trailing_increment_usd) * self.trailing_increment_usd
-                    profit_to_lock = max(profit_to_lock, self.trailing_increment_usd)
-                    
-                    trailing_sl = self._calculate_target_sl_price(
-                        entry_price, profit_to_lock, order_type, lot_size, symbol_info, position=position
-                    )
+                    # Calculate trailing stop (ladder bisect, full calculation beyond the ladder)
+                    ladder = self._get_sl_ladder(position, symbol_info)
+                    rung = ladder.trailing_sl(current_profit, tick.bid, tick.ask) if ladder else None
+                    if rung:
+                        profit_to_lock, trailing_sl = rung
+                    else:
+                        profit_to_lock = current_profit - self.trailing_increment_usd
+                        profit_to_lock = (profit_to_lock // self.trailing_increment_usd) * self.trailing_increment_usd
+                        profit_to_lock = max(profit_to_lock, self.trailing_increment_usd)
+                        
+                        trailing_sl = self._calculate_target_sl_price(
+                            entry_price, profit_to_lock, order_type, lot_size, symbol_info, position=position
+                        )
                     
                     if trailing_sl:
                         # Adjust for broker constraints
@@ -4416,9 +4923,12 @@ class SLManager:
                     try:
                         profit_to_lock = min(current_profit, self.sweet_spot_max)
                         
-                        profit_lock_sl = self._calculate_target_sl_price(
-                            entry_price, profit_to_lock, order_type, lot_size, symbol_info, position=position
-                        )
+                        ladder = self._get_sl_ladder(position, symbol_info)
+                        profit_lock_sl = ladder.sl_for_profit(profit_to_lock, tick.bid, tick.ask) if ladder else None
+                        if profit_lock_sl is None:
+                            profit_lock_sl = self._calculate_target_sl_price(
+                                entry_price, profit_to_lock, order_type, lot_size, symbol_info, position=position
+                            )
                         
                         if profit_lock_sl:
                             # Adjust for broker constraints
@@ -4467,9 +4977,12 @@ class SLManager:
                     result['violations'].append(violation_msg)
                 else:
                     # Profit is within limit - calculate HARD_SL normally
-                    hard_sl = self._calculate_target_sl_price(
-                        entry_price, -self.max_risk_usd, order_type, lot_size, symbol_info, position=position
-                    )
+                    ladder = self._get_sl_ladder(position, symbol_info)
+                    hard_sl = ladder.sl_for_profit(-self.max_risk_usd, tick.bid, tick.ask) if ladder else None
+                    if hard_sl is None:
+                        hard_sl = self._calculate_target_sl_price(
+                            entry_price, -self.max_risk_usd, order_type, lot_size, symbol_info, position=position
+                        )
                     
                     if hard_sl:
                         # Adjust for broker constraints
@@ -4787,7 +5300,8 @@ class SLManager:
             logger.error(f"[IMMEDIATE_SL_EXCEPTION] Ticket={ticket} Symbol={symbol} | "
                         f"Exception in _apply_immediate_sl: {e}", exc_info=True)
     
-    def update_sl_atomic(self, ticket: int, position: Dict[str, Any]) -> Tuple[bool, str]:
+    def update_sl_atomic(self, ticket: int, position: Dict[str, Any],
+                         authoritative_result: Optional[Dict[str, Any]] = None) -> Tuple[bool, str]:
         """
         Atomic SL update - applies authoritative SL with guaranteed execution.
         
@@ -4802,6 +5316,9 @@ class SLManager:
         Args:
             ticket: Position ticket number
             position: Position dictionary (must be fresh from order_manager)
+            authoritative_result: compute_authoritative_sl() result already computed for
+                this position (e.g. by compute_authoritative_sl_batch()); recomputed if the
+                refreshed position's SL inputs differ
         
         Returns:
             (success, reason) tuple
@@ -4965,7 +5482,8 @@ class SLManager:
             is_trailing=is_trailing_preliminary,  # Use preliminary trailing check
             is_first_eligible=is_first_eligible,
             ticket=ticket,
-            symbol=symbol
+            symbol=symbol,
+            position=position
         )
         
         if not allowed:
@@ -4986,6 +5504,7 @@ class SLManager:
         # ============================================================================
         # STEP 1: Compute authoritative SL WITHOUT locks (lock-free decision path)
         # This ensures SL calculation is never blocked by lock contention
+        batch_inputs = tuple(position.get(key) for key in _SL_INPUT_KEYS)
         fresh_position_for_auth = self.order_manager.get_position_by_ticket(ticket)
         if fresh_position_for_auth:
             position.update(fresh_position_for_auth)
@@ -4993,7 +5512,8 @@ class SLManager:
         # Get initial profit for lock timeout determination
         initial_profit = position.get('profit', 0.0)
         
-        authoritative_result = self.compute_authoritative_sl(position)
+        if authoritative_result is None or tuple(position.get(key) for key in _SL_INPUT_KEYS) != batch_inputs:
+            authoritative_result = self.compute_authoritative_sl(position)
         
         # STEP 2: Detect violations
         violations = self._detect_sl_violations(position, authoritative_result)
@@ -5129,46 +5649,23 @@ class SLManager:
                                 lock.release()
                                 logger.info(f"[FIRST_ELIGIBLE] Ticket={ticket} | Stale lock force-released successfully")
             
-            # Acquire lock ONLY for MT5 modification (lock-free decision path)
-            # CRITICAL: For first eligible updates and trailing stops, use non-blocking first attempt (immediate)
-            lock_acquired, lock, lock_reason = self._acquire_ticket_lock_with_timeout(
-                ticket, is_profit_locking=is_profit_locking, force_non_blocking_first=(is_first_eligible or is_trailing), is_trailing=is_trailing
-            )
-            
-            if not lock_acquired:
-                # Lock failed - check if we need guaranteed execution OR if this is first eligible
-                if needs_guaranteed_execution or is_first_eligible:
-                    # CRITICAL: For trailing/profit lock OR first eligible, we MUST retry immediately
-                    logger.warning(f"[WARNING] Lock failed for {'guaranteed execution' if needs_guaranteed_execution else 'first eligible update'}: "
-                                 f"{symbol} Ticket {ticket} | Retrying immediately...")
-                    # Retry once more with immediate retry
-                    # CRITICAL: For trailing stops, pass is_trailing flag to retry
-                    lock_acquired, lock, lock_reason = self._acquire_ticket_lock_with_timeout(
-                        ticket, is_profit_locking=is_profit_locking, force_non_blocking_first=(is_first_eligible or is_trailing), is_trailing=is_trailing
-                    )
-                
-                if not lock_acquired:
-                    timeout_ms = (self._profit_locking_lock_timeout * 1000) if is_profit_locking else (self._lock_acquisition_timeout * 1000)
-                    reason = f"Lock acquisition timeout ({timeout_ms:.0f}ms) - authoritative SL: {authority_source}"
-                    logger.warning(f"[DELAY] LOCK TIMEOUT: {symbol} Ticket {ticket} | {reason}")
-                    with self._tracking_lock:
-                        self._last_sl_reason[ticket] = reason
-                    return False, reason
-            
+            # No ticket lock is held here: concurrent callers for this ticket coalesce in
+            # SLModifyQueue, and the thread that sends a modify takes the ticket lock only
+            # around that MT5 call (_modify_sl_under_lock)
             # Apply authoritative SL with guaranteed execution loop if needed
             target_sl_price = authoritative_result['target_sl_price']
             target_profit_usd = authoritative_result['target_profit_usd']
             reason_str = authoritative_result['reason']
             old_sl = position.get('sl', 0.0)
             current_profit = position.get('profit', 0.0)
-            
+        
             # Explicit state logging
             logger.info(f"[STATE={state}] {symbol} Ticket {ticket} | "
                        f"Authority: {authority_source} | "
                        f"OldSL: {old_sl:.5f} | NewSL: {target_sl_price:.5f} | "
                        f"Profit: ${current_profit:.2f} | "
                        f"Reason: {reason_str}")
-            
+        
             # CRITICAL FIX #1: Lock scope reduction - ALL preparation happens OUTSIDE the lock
             # Prepare SL update (validation, calculation, adjustment) - NO LOCKS HELD
             prepare_start_time = time.time()
@@ -5176,7 +5673,7 @@ class SLManager:
                 ticket, symbol, target_sl_price, target_profit_usd, reason_str
             )
             prepare_time = (time.time() - prepare_start_time) * 1000  # ms
-            
+        
             if not should_proceed:
                 if error_reason == "POSITION_NOT_FOUND" or error_reason == "POSITION_NOT_FOUND_VALIDATION":
                     logger.warning(f"[POSITION_NOT_FOUND] {symbol} Ticket {ticket} | Position not found - may have been closed")
@@ -5184,96 +5681,48 @@ class SLManager:
                 # Other blocking reasons (cooldown, delta, etc.)
                 logger.info(f"[SL_BLOCKED] {symbol} Ticket {ticket} | Reason: {error_reason}")
                 return False, error_reason
-            
+        
             # Use adjusted SL price from preparation
             final_sl_price = adjusted_sl_price if adjusted_sl_price is not None else target_sl_price
-            
+        
             # GUARANTEED EXECUTION LOOP: If trailing=true OR sweet_spot=true, SL MUST move within MAX 250ms
             # CRITICAL FIX: Lock scope reduction - lock ONLY during MT5.modify_order() call (<50ms target)
             # All validation, calculation, and verification happen OUTSIDE the lock
             if needs_guaranteed_execution:
                 execution_start_time = time.time()
                 max_execution_time = 0.25  # 250ms max
-                
+            
                 # CRITICAL FIX: Lock scope reduction - only lock during MT5 modification
                 # All preparation (validation, calculation) already done OUTSIDE lock
                 # Lock is acquired ONLY for the MT5.modify_order() call
                 # Lock is released IMMEDIATELY after modify_order() returns
-                with self._locks_lock:
-                    if ticket in self._lock_holders:
-                            self._lock_holders[ticket]['is_trailing'] = True
-                    
-                    logger.info(f"[TRAILING_LOCK_ACQUIRE] Ticket={ticket} Symbol={symbol} | "
-                              f"Acquiring lock for trailing stop update | TargetSL={final_sl_price:.5f} | "
-                              f"CurrentSL={old_sl:.5f} Profit=${current_profit:.2f} | "
-                              f"Preparation took {prepare_time:.1f}ms (outside lock)")
-                
+                logger.info(f"[TRAILING_LOCK_ACQUIRE] Ticket={ticket} Symbol={symbol} | "
+                          f"Acquiring lock for trailing stop update | TargetSL={final_sl_price:.5f} | "
+                          f"CurrentSL={old_sl:.5f} Profit=${current_profit:.2f} | "
+                          f"Preparation took {prepare_time:.1f}ms (outside lock)")
+            
                 # CRITICAL: Lock ONLY for the MT5 call - target: <lock_max_hold_time_seconds (default: 300ms)
-                lock_acquire_start = time.time()
-                with lock:
-                    lock_acquire_time = (time.time() - lock_acquire_start) * 1000
-                    if lock_acquire_time > 10:
-                        logger.warning(f"[LOCK_ACQUIRE_TIME] Ticket={ticket} | Lock acquisition took {lock_acquire_time:.1f}ms")
-                    
-                    # ONLY call the minimal modify method - no validation, no verification, no delays
-                    modify_start = time.time()
-                    success = self._execute_sl_modify_only(ticket, symbol, final_sl_price)
-                    modify_time = (time.time() - modify_start) * 1000
-                    
-                    # Log lock hold time
-                    lock_hold_time = (time.time() - lock_acquire_start) * 1000
-                    max_hold_time_ms = self._lock_max_hold_time * 1000
-                    if lock_hold_time > max_hold_time_ms:
-                        logger.warning(f"[LOCK_HOLD_TIME] Ticket={ticket} Symbol={symbol} | "
-                                     f"Lock held for {lock_hold_time:.1f}ms (target: <{max_hold_time_ms:.0f}ms) | "
-                                     f"Modify took {modify_time:.1f}ms")
-                    else:
-                        logger.debug(f"[LOCK_HOLD_TIME] Ticket={ticket} Symbol={symbol} | "
-                                   f"Lock held for {lock_hold_time:.1f}ms (OK, target: <{max_hold_time_ms:.0f}ms)")
-                
-                # CRITICAL FIX: Lock wrapper handles tracking cleanup automatically in __exit__
-                
+                # Coalesced per ticket: joins an identical in-flight modify or replaces the pending
+                # target (SLModifyQueue); final_sl_price becomes the SL that was actually sent
+                success, final_sl_price = self._sl_modify_queue.submit(
+                    ticket, position.get('type', ''), final_sl_price,
+                    lambda sl_price: self._modify_sl_under_lock(ticket, symbol, sl_price, is_trailing)
+                )
+            
                 execution_time = time.time() - execution_start_time
-                
+            
                 # CRITICAL: Verification happens OUTSIDE the lock (non-blocking)
                 if success:
-                    # PHASE 1 FIX 1.2: Fixed verification delay (500ms) - no symbol-specific logic
-                    # Fixed delay prevents cascading delays and ensures consistent behavior
-                    verification_delay = self.sl_update_verification_delay  # 500ms (fixed, no exponential backoff)
-                    logger.debug(f"[VERIFY_DELAY] Ticket={ticket} Symbol={symbol} | "
-                               f"Using fixed {verification_delay*1000:.0f}ms delay (PHASE 1 FIX 1.2)")
-                    time.sleep(verification_delay)
-                    # Verify SL was applied
-                    fresh_position = self.order_manager.get_position_by_ticket(ticket)
-                    if fresh_position:
-                        applied_sl = fresh_position.get('sl', 0.0)
-                        sl_diff = abs(applied_sl - final_sl_price)
-                        symbol_info = self.mt5_connector.get_symbol_info(symbol)
-                        point = symbol_info.get('point', 0.00001) if symbol_info else 0.00001
-                        tolerance = point * 10  # 1 pip tolerance
-                        if sl_diff < tolerance:
-                            logger.info(f"[OK] SL VERIFIED: {symbol} Ticket {ticket} | "
-                                      f"Applied: {applied_sl:.5f} | Target: {final_sl_price:.5f} | "
-                                      f"Diff: {sl_diff:.5f}")
-                        else:
-                            logger.warning(f"[WARNING] SL VERIFICATION MISMATCH: {symbol} Ticket {ticket} | "
-                                         f"Applied: {applied_sl:.5f} | Target: {final_sl_price:.5f} | "
-                                         f"Diff: {sl_diff:.5f} (tolerance: {tolerance:.5f})")
-                    else:
-                        # FIX #3: Position closed during verification - this is not a verification failure
-                        # Log as informational rather than warning to distinguish from actual verification failures
-                        logger.info(f"[POSITION_CLOSED_DURING_VERIFY] Ticket {ticket} Symbol {symbol} | "
-                                   f"Position closed during SL verification | "
-                                   f"SL was applied successfully but position closed before verification could complete | "
-                                   f"This is normal if position was closed by broker (SL hit, TP hit, or manual close)")
-                    
+                    # Deferred to the next position snapshot (DeferredSLVerifier) unless async is disabled
+                    self._expect_sl_applied(ticket, symbol, position.get('type', ''), final_sl_price)
+                
                     # Update tracking
                     with self._tracking_lock:
                         self._last_sl_update[ticket] = datetime.now()
                         self._last_sl_price[ticket] = final_sl_price
                         self._last_sl_reason[ticket] = reason_str
                         self._last_sl_success[ticket] = datetime.now()
-                        
+                    
                         # Mark first eligible update as applied
                         if ticket in self._first_eligible_update:
                             self._first_eligible_update[ticket]['state'] = 'APPLIED'
@@ -5281,14 +5730,14 @@ class SLManager:
                             logger.info(f"[FIRST_ELIGIBLE] Ticket={ticket} Symbol={symbol} | "
                                       f"First eligible SL update APPLIED successfully | "
                                       f"Time from first seen: {(time.time() - self._first_eligible_update[ticket].get('first_seen_time', time.time()))*1000:.1f}ms")
-                    
+                
                     # CRITICAL: Log trailing stop success with timing
                     if is_trailing:
                         logger.info(f"[TRAILING_SUCCESS] Ticket={ticket} Symbol={symbol} | "
                                   f"Trailing stop APPLIED | ExecutionTime={execution_time*1000:.1f}ms | "
                                   f"OldSL={old_sl:.5f} NewSL={final_sl_price:.5f} | "
                                   f"Profit=${current_profit:.2f} Locked=${target_profit_usd:.2f}")
-                        
+                    
                         system_event_logger.systemEvent("TRAILING_EXECUTED", {
                             "ticket": ticket,
                             "symbol": symbol,
@@ -5316,7 +5765,7 @@ class SLManager:
                         logger.info(f"[OK] LOCK_APPLIED: {symbol} Ticket {ticket} | "
                                   f"OldSL: {old_sl:.5f} | NewSL: {final_sl_price:.5f} | "
                                   f"Profit: ${current_profit:.2f} | Execution: {execution_time*1000:.1f}ms")
-                    
+                
                     return True, reason_str
                 else:
                     # SL update failed - check if we exceeded execution time
@@ -5325,7 +5774,7 @@ class SLManager:
                                       f"Trailing/profit lock not applied within 250ms | "
                                       f"Execution time: {execution_time*1000:.1f}ms | "
                                       f"Authority: {authority_source} | State: {state}")
-                    
+                
                     # Log failure
                     if is_profit_lock:
                         system_event_logger.systemEvent("LOCK_FAILED", {
@@ -5339,7 +5788,7 @@ class SLManager:
                         })
                         logger.error(f"[ERROR] LOCK_FAILED: {symbol} Ticket {ticket} | "
                                    f"TargetSL: {final_sl_price:.5f} | Authority: {authority_source}")
-                    
+                
                     with self._tracking_lock:
                         self._last_sl_reason[ticket] = f"SL update failed: {reason_str}"
                     return False, f"SL update failed: {reason_str}"
@@ -5347,71 +5796,26 @@ class SLManager:
                 # Non-trailing: standard lock scope
                 # CRITICAL FIX: Lock scope reduction - same as trailing path
                 execution_start_time = time.time()
-                
+            
                 # CRITICAL: Lock ONLY for the MT5 call - target: <lock_max_hold_time_seconds (default: 300ms)
-                lock_acquire_start = time.time()
-                with lock:
-                    lock_acquire_time = (time.time() - lock_acquire_start) * 1000
-                    if lock_acquire_time > 10:
-                        logger.warning(f"[LOCK_ACQUIRE_TIME] Ticket={ticket} | Lock acquisition took {lock_acquire_time:.1f}ms")
-                    
-                    # ONLY call the minimal modify method - no validation, no verification, no delays
-                    modify_start = time.time()
-                    success = self._execute_sl_modify_only(ticket, symbol, final_sl_price)
-                    modify_time = (time.time() - modify_start) * 1000
-                    
-                    # Log lock hold time
-                    lock_hold_time = (time.time() - lock_acquire_start) * 1000
-                    max_hold_time_ms = self._lock_max_hold_time * 1000
-                    if lock_hold_time > max_hold_time_ms:
-                        logger.warning(f"[LOCK_HOLD_TIME] Ticket={ticket} Symbol={symbol} | "
-                                     f"Lock held for {lock_hold_time:.1f}ms (target: <{max_hold_time_ms:.0f}ms) | "
-                                     f"Modify took {modify_time:.1f}ms")
-                    else:
-                        logger.debug(f"[LOCK_HOLD_TIME] Ticket={ticket} Symbol={symbol} | "
-                                   f"Lock held for {lock_hold_time:.1f}ms (OK, target: <{max_hold_time_ms:.0f}ms)")
-                
-                # CRITICAL FIX: Lock wrapper handles tracking cleanup automatically in __exit__
-                
+                # Coalesced per ticket: joins an identical in-flight modify or replaces the pending
+                # target (SLModifyQueue); final_sl_price becomes the SL that was actually sent
+                success, final_sl_price = self._sl_modify_queue.submit(
+                    ticket, position.get('type', ''), final_sl_price,
+                    lambda sl_price: self._modify_sl_under_lock(ticket, symbol, sl_price)
+                )
+            
                 execution_time = time.time() - execution_start_time
-                
+            
                 # CRITICAL: Verification happens OUTSIDE the lock (non-blocking)
                 if success:
-                    # PHASE 1 FIX 1.2: Fixed verification delay (500ms) - no symbol-specific logic
-                    # Fixed delay prevents cascading delays and ensures consistent behavior
-                    verification_delay = self.sl_update_verification_delay  # 500ms (fixed, no exponential backoff)
-                    logger.debug(f"[VERIFY_DELAY] Ticket={ticket} Symbol={symbol} | "
-                               f"Using fixed {verification_delay*1000:.0f}ms delay (PHASE 1 FIX 1.2)")
-                    time.sleep(verification_delay)
-                    # Verify SL was applied
-                    fresh_position = self.order_manager.get_position_by_ticket(ticket)
-                    if fresh_position:
-                        applied_sl = fresh_position.get('sl', 0.0)
-                        sl_diff = abs(applied_sl - final_sl_price)
-                        symbol_info = self.mt5_connector.get_symbol_info(symbol)
-                        point = symbol_info.get('point', 0.00001) if symbol_info else 0.00001
-                        tolerance = point * 10  # 1 pip tolerance
-                        if sl_diff < tolerance:
-                            logger.info(f"[OK] SL VERIFIED: {symbol} Ticket {ticket} | "
-                                      f"Applied: {applied_sl:.5f} | Target: {final_sl_price:.5f} | "
-                                      f"Diff: {sl_diff:.5f}")
-                        else:
-                            logger.warning(f"[WARNING] SL VERIFICATION MISMATCH: {symbol} Ticket {ticket} | "
-                                         f"Applied: {applied_sl:.5f} | Target: {final_sl_price:.5f} | "
-                                         f"Diff: {sl_diff:.5f} (tolerance: {tolerance:.5f})")
-                    else:
-                        # FIX #3: Position closed during verification - this is not a verification failure
-                        # Log as informational rather than warning to distinguish from actual verification failures
-                        logger.info(f"[POSITION_CLOSED_DURING_VERIFY] Ticket {ticket} Symbol {symbol} | "
-                                   f"Position closed during SL verification | "
-                                   f"SL was applied successfully but position closed before verification could complete | "
-                                   f"This is normal if position was closed by broker (SL hit, TP hit, or manual close)")
+                    # Deferred to the next position snapshot (DeferredSLVerifier) unless async is disabled
+                    self._expect_sl_applied(ticket, symbol, position.get('type', ''), final_sl_price)
                 
-                if success:
                     # Update tracking
                     with self._tracking_lock:
                         self._last_sl_update[ticket] = datetime.now()
-                        self._last_sl_price[ticket] = target_sl_price
+                        self._last_sl_price[ticket] = final_sl_price
                         self._last_sl_reason[ticket] = reason_str
                         self._last_sl_success[ticket] = datetime.now()
                     return True, reason_str
@@ -6289,17 +6693,36 @@ class SLManager:
             - success: True if all positions updated successfully, False otherwise
             - stats: Dictionary with 'failed_tickets' (list) and 'failure_count' (int)
         """
+        positions_read_at = time.time()
         positions = self.order_manager.get_open_positions()
         failed_tickets = []
         failure_count = 0
         
+        # Confirm SL modifies from earlier cycles against this read
+        self._check_sl_verifications(positions, positions_read_at)
+        
+        # Dispatch updates deferred by the global rate limit first (highest priority first)
+        drained = self._drain_rpc_queue(positions)
+        
+        # Authoritative SL for all remaining positions in one vectorized pass
+        pending = [p for p in positions if p.get('ticket') and p.get('ticket') not in drained]
+        try:
+            batch_results = {p.get('ticket'): result for p, result in
+                             zip(pending, self.compute_authoritative_sl_batch(pending))}
+        except Exception as e:
+            logger.warning(f"[SL_BATCH] Batched SL computation failed, using per-position path: {e}")
+            batch_results = {}
+        
         for position in positions:
             ticket = position.get('ticket')
             if not ticket:
                 continue
             
             try:
-                success, reason = self.update_sl_atomic(ticket, position)
+                if ticket in drained:
+                    success, reason = drained[ticket]
+                else:
+                    success, reason = self.update_sl_atomic(ticket, position, batch_results.get(ticket))
                 if not success:
                     failed_tickets.append(ticket)
                     failure_count += 1
@@ -6329,16 +6752,21 @@ class SLManager:
             - violations: List of violation dictionaries with 'ticket' and 'type' keys
         """
         violations = []
-        positions = self.order_manager.get_open_positions()
+        positions = [p for p in self.order_manager.get_open_positions() if p.get('ticket')]
         
-        for position in positions:
+        # Compute authoritative SL for all positions at once to check for violations
+        try:
+            authoritative_results = self.compute_authoritative_sl_batch(positions)
+        except Exception as e:
+            logger.warning(f"[SL_BATCH] Batched SL computation failed, using per-position path: {e}")
+            authoritative_results = [None] * len(positions)
+        
+        for position, authoritative_result in zip(positions, authoritative_results):
             ticket = position.get('ticket')
-            if not ticket:
-                continue
             
             try:
-                # Compute authoritative SL to check for violations
-                authoritative_result = self.compute_authoritative_sl(position)
+                if authoritative_result is None:
+                    authoritative_result = self.compute_authoritative_sl(position)
                 
                 # Detect violations for this position
                 violation_strings = self._detect_sl_violations(position, authoritative_result)
@@ -6846,6 +7274,7 @@ class SLManager:
         """
         try:
             # Get current open positions
+            positions_read_at = time.time()
             current_positions = self.order_manager.get_open_positions(exclude_dec8=False)
             current_tickets = {pos.get('ticket', 0) for pos in current_positions if pos.get('ticket', 0) > 0}
             
@@ -6857,20 +7286,23 @@ class SLManager:
                 if closed_ticket_locks:
                     logger.info(f"[PERIODIC_LOCK_CLEANUP] Cleaning up {len(closed_ticket_locks)} locks for closed positions")
                     for ticket in closed_ticket_locks:
-                        # Clean up all lock-related data
+                        # Clean up lock objects (lock holder data goes with the ticket state below)
                         if ticket in self._ticket_locks:
                             del self._ticket_locks[ticket]
-                        if hasattr(self, '_lock_holders') and ticket in self._lock_holders:
-                            del self._lock_holders[ticket]
-                        if hasattr(self, '_lock_hold_times') and ticket in self._lock_hold_times:
-                            del self._lock_hold_times[ticket]
-                        if hasattr(self, '_lock_holder_stack_traces') and ticket in self._lock_holder_stack_traces:
-                            del self._lock_holder_stack_traces[ticket]
                     
                     logger.info(f"[PERIODIC_LOCK_CLEANUP] Cleaned up {len(closed_ticket_locks)} locks | "
                               f"Remaining locks: {len(self._ticket_locks)}")
                 else:
                     logger.debug(f"[PERIODIC_LOCK_CLEANUP] No locks to clean up | Total locks: {len(self._ticket_locks)}")
+            
+            # Drop per-ticket state for positions closed without cleanup_closed_position()
+            # (skipped on an empty snapshot - a failed position fetch must not wipe live state;
+            # state created after the read belongs to a position the read could not see)
+            stale_tickets = self._ticket_states.prune(current_tickets, as_of=positions_read_at) \
+                if current_tickets else []
+            if stale_tickets:
+                logger.info(f"[PERIODIC_LOCK_CLEANUP] Removed state for {len(stale_tickets)} closed ticket(s) | "
+                          f"Remaining: {self._ticket_states.get_stats()['live']}")
         except Exception as e:
             logger.error(f"Error during periodic lock cleanup: {e}", exc_info=True)
     
@@ -6878,58 +7310,34 @@ class SLManager:
         """
         Clean up tracking data for a closed position.
         
+        All per-ticket fields live on one TicketState record, so removing it drops
+        every field for the ticket at once.
+        
         Args:
             ticket: Position ticket number
         """
-        with self._tracking_lock:
-            if ticket in self._position_tracking:
-                del self._position_tracking[ticket]
-            if ticket in self._last_sl_update:
-                del self._last_sl_update[ticket]
-            if ticket in self._last_sl_price:
-                del self._last_sl_price[ticket]
-            if ticket in self._last_sl_reason:
-                del self._last_sl_reason[ticket]
-            # Clean up first eligible update tracking
-            if ticket in self._first_eligible_update:
-                del self._first_eligible_update[ticket]
-            # Clean up fail-safe cooldown
-            if ticket in self._fail_safe_cooldown:
-                del self._fail_safe_cooldown[ticket]
-            # Clean up profit zone entry tracking
-            if ticket in self._profit_zone_entry:
-                entry_data = self._profit_zone_entry[ticket]
-                entry_duration = (datetime.now() - entry_data['entry_time']).total_seconds()
-                duration_str = f"{int(entry_duration // 60)}m {int(entry_duration % 60)}s"
-                logger.info(f"📊 PROFIT ZONE EXIT (Position Closed): {entry_data['symbol']} Ticket {ticket} | "
-                          f"Duration in profit: {duration_str} | "
-                          f"SL Updated: {entry_data['sl_updated']} | "
-                          f"Attempts: {entry_data['update_attempts']} | "
-                          f"Last Reason: {entry_data.get('last_update_reason', 'N/A')}")
-                del self._profit_zone_entry[ticket]
-        
-        # P2-14 FIX: Memory Leak Prevention - Clean up all lock-related data
+        state = self._ticket_states.remove(ticket)
+        self._sl_dirty_tracker.forget(ticket)
+        self._rpc_limiter.forget(ticket)
+        self._sl_verifier.forget(ticket)
+        
+        # Log profit zone exit from the removed record
+        entry_data = state.profit_zone_entry if state is not None else None
+        if isinstance(entry_data, dict) and 'entry_time' in entry_data:
+            entry_duration = (datetime.now() - entry_data['entry_time']).total_seconds()
+            duration_str = f"{int(entry_duration // 60)}m {int(entry_duration % 60)}s"
+            logger.info(f"📊 PROFIT ZONE EXIT (Position Closed): {entry_data.get('symbol', 'N/A')} Ticket {ticket} | "
+                      f"Duration in profit: {duration_str} | "
+                      f"SL Updated: {entry_data.get('sl_updated', False)} | "
+                      f"Attempts: {entry_data.get('update_attempts', 0)} | "
+                      f"Last Reason: {entry_data.get('last_update_reason', 'N/A')}")
+        
+        # P2-14 FIX: Memory Leak Prevention - Clean up lock objects and quarantine
         with self._locks_lock:
             if ticket in self._ticket_locks:
                 del self._ticket_locks[ticket]
-            # Clean up lock holders
-            if hasattr(self, '_lock_holders') and ticket in self._lock_holders:
-                del self._lock_holders[ticket]
-            if hasattr(self, '_lock_hold_times') and ticket in self._lock_hold_times:
-                del self._lock_hold_times[ticket]
-            if hasattr(self, '_lock_holder_stack_traces') and ticket in self._lock_holder_stack_traces:
-                del self._lock_holder_stack_traces[ticket]
-            # Clean up orphaned ticket tracking
             if hasattr(self, '_orphaned_tickets') and ticket in self._orphaned_tickets:
                 self._orphaned_tickets.discard(ticket)
-            if hasattr(self, '_orphaned_ticket_timestamps') and ticket in self._orphaned_ticket_timestamps:
-                del self._orphaned_ticket_timestamps[ticket]
-            # Clean up circuit breaker tracking
-            if hasattr(self, '_ticket_circuit_breaker') and ticket in self._ticket_circuit_breaker:
-                del self._ticket_circuit_breaker[ticket]
-            # Clean up rate limiting
-            if hasattr(self, '_sl_update_rate_limit') and ticket in self._sl_update_rate_limit:
-                del self._sl_update_rate_limit[ticket]
     
     def is_sl_verified(self, position: Dict[str, Any]) -> bool:
         """
@@ -6969,7 +7377,7 @@ class SLManager:
         
         # CRITICAL FIX: Check both flag and thread state to prevent duplicate starts
         if self._sl_worker_running:
-            if self._sl_worker_thread and self._sl_worker_thread.is_alive():
+            if any(shard.is_alive() for shard in self._sl_worker_shards):
                 logger.warning("SL worker already running (thread is alive)")
                 return
             else:
@@ -6980,22 +7388,8 @@ class SLManager:
         self._watchdog = watchdog
         self._sl_worker_running = True
         self._sl_worker_shutdown_event.clear()
-        self._sl_worker_thread = threading.Thread(
-            target=self._sl_worker_loop,
-            name="SLWorker",
-            daemon=True
-        )
-        
-        # Register SLWorker with global system health monitor (for timer-based heartbeat)
-        try:
-            system_health.register_critical_thread(
-                "SLWorker",
-                self._sl_worker_thread,
-                metrics_provider=self._get_sl_worker_metrics,
-            )
-        except Exception:
-            # Health tracking must never prevent the worker from starting
-            pass
+        self._sl_worker_shards = [SLWorkerShard(index, self._sl_worker_shard_count)
+                                  for index in range(self._sl_worker_shard_count)]
         
         # OPTIMIZATION: Start background worker thread for heavy operations
         self._background_worker_running = True
@@ -7014,17 +7408,72 @@ class SLManager:
         
         logger.info("SLManager worker loop starting now...")
         
+        with self._sl_worker_shard_lock:
+            for shard in self._sl_worker_shards:
+                self._start_sl_worker_shard(shard)
+        logger.info(f"[OK][SL_WORKER_STARTED] polling_interval={self._sl_worker_interval*1000:.0f}ms "
+                    f"shards={len(self._sl_worker_shards)}")
+        logger.info("[OK] SLManager worker thread started successfully")
+    
+    def _start_sl_worker_shard(self, shard: SLWorkerShard):
+        """Start the thread of one SL worker shard (caller holds _sl_worker_shard_lock)."""
+        shard.thread = threading.Thread(
+            target=self._sl_worker_loop,
+            args=(shard,),
+            name=shard.name,
+            daemon=True
+        )
+        if shard.is_primary:
+            self._sl_worker_thread = shard.thread  # Legacy single-worker handle
+        
+        # Register the shard with global system health monitor (for timer-based heartbeat)
+        # A single worker keeps the legacy "SLWorker" entry; shards are added as critical threads
+        try:
+            if shard.is_sharded:
+                system_health.add_critical_thread(shard.name)
+            system_health.register_critical_thread(
+                shard.name,
+                shard.thread,
+                metrics_provider=shard.get_metrics if shard.is_sharded else self._get_sl_worker_metrics,
+            )
+        except Exception:
+            # Health tracking must never prevent the worker from starting
+            pass
+        
         # MANDATORY OBSERVABILITY: Log thread start with thread ID and process ID
         import os
         pid = os.getpid()
-        self._sl_worker_thread.start()
-        tid = self._sl_worker_thread.ident if self._sl_worker_thread.ident else 'unknown'
-        logger.info(f"[THREAD_START] SLWorker pid={pid} tid={tid}")
-        logger.info(f"[OK][SL_WORKER_STARTED] polling_interval={self._sl_worker_interval*1000:.0f}ms")
-        logger.info("[OK] SLManager worker thread started successfully")
+        shard.thread.start()
+        tid = shard.thread.ident if shard.thread.ident else 'unknown'
+        logger.info(f"[THREAD_START] {shard.name} pid={pid} tid={tid}")
+    
+    def restart_sl_worker_shard(self, index: int) -> bool:
+        """
+        Restart one dead SL worker shard; the other shards keep running.
+        
+        Called by SLWatchdog and by a shard's own crash handler (its thread is
+        still alive at that point and is replaced).
+        
+        Returns:
+            True if a new thread was started for the shard
+        """
+        with self._sl_worker_shard_lock:
+            if not self._sl_worker_running or not 0 <= index < len(self._sl_worker_shards):
+                return False
+            shard = self._sl_worker_shards[index]
+            if shard.is_alive() and shard.thread is not threading.current_thread():
+                return False
+            shard.restarts += 1
+            self._start_sl_worker_shard(shard)
+        try:
+            system_health.reset_thread_dead_flag(shard.name)
+        except Exception:
+            pass
+        logger.critical(f"[THREAD_RECOVERY] {shard.name} restarted (restart #{shard.restarts})")
+        return True
     
     def stop_sl_worker(self):
-        """Stop the real-time SL worker thread."""
+        """Stop the real-time SL worker thread(s)."""
         # CRITICAL FIX: Ensure attribute exists (defensive check for initialization issues)
         if not hasattr(self, '_sl_worker_running'):
             logger.warning("[WARNING] _sl_worker_running attribute not initialized - SLManager may not be fully initialized")
@@ -7042,26 +7491,39 @@ class SLManager:
         
         # FIX: Clean up locks held by SLWorker thread before joining
         # This prevents orphaned locks that cause "Holder: No holder info" after thread restart
-        if self._sl_worker_thread and self._sl_worker_thread.is_alive():
-            # Note: We can't directly call _cleanup_thread_locks() from here because
-            # it needs to run in the thread's context. Instead, we'll rely on the
-            # cleanup in the exception handler. However, we can still try to clean up
-            # any locks that might be tracked for this thread.
-            logger.debug("[THREAD_SHUTDOWN] Waiting for SLWorker thread to finish and release locks...")
-            self._sl_worker_thread.join(timeout=2.0)
+        # Note: _cleanup_thread_locks() needs to run in the thread's context, so each shard
+        # releases its own locks when its loop exits.
+        import os
+        pid = os.getpid()
+        for shard in self._sl_worker_shards:
+            if shard.is_alive():
+                logger.debug(f"[THREAD_SHUTDOWN] Waiting for {shard.name} thread to finish and release locks...")
+                shard.thread.join(timeout=2.0)
+            if shard.is_sharded:
+                try:
+                    system_health.remove_critical_thread(shard.name)
+                except Exception:
+                    pass
+            tid = shard.thread.ident if shard.thread and shard.thread.ident else 'unknown'
+            logger.info(f"[THREAD_STOP] {shard.name} pid={pid} tid={tid} reason=shutdown_requested")
         
         if self._background_worker_thread and self._background_worker_thread.is_alive():
             self._background_worker_thread.join(timeout=2.0)
         
+        # Write pending contract size calibrations
+        self._calibration_store.flush()
+        
         # Close logging files
         self._close_logging_files()
         
-        import os
-        pid = os.getpid()
-        tid = self._sl_worker_thread.ident if self._sl_worker_thread and self._sl_worker_thread.ident else 'unknown'
-        logger.info(f"[THREAD_STOP] SLWorker pid={pid} tid={tid} reason=shutdown_requested")
         logger.info("SL Worker stopped")
     
+    def shutdown(self):
+        """Stop the SL worker and the calibration store this manager created."""
+        self.stop_sl_worker()
+        if self._owns_calibration_store:
+            self._calibration_store.stop()
+    
     def _close_logging_files(self):
         """Close structured log and CSV summary files."""
         try:
@@ -7107,8 +7569,10 @@ class SLManager:
         while self._background_worker_running and not self._background_worker_shutdown_event.is_set():
             try:
                 # Process background tasks with timeout to allow periodic CSV flushing
-                try:
-                    task_type, task_data = self._background_task_queue.get(timeout=0.1)
+                task = self._background_tasks.get(timeout=0.1)
+                if task is not None:
+                    task_type, task_data = task.task_type, task.data
+                    task_start = time.perf_counter()
                     
                     if task_type == 'fail_safe_check':
                         # FIX 2: SLBackgroundWorker must be read-only - use read-only fail-safe check
@@ -7151,11 +7615,7 @@ class SLManager:
                         except Exception as e:
                             logger.warning(f"[WARNING] MicroProfitEngine error in background: {e}", exc_info=True)
                     
-                    self._background_task_queue.task_done()
-                    
-                except queue.Empty:
-                    # No tasks - continue to CSV batch processing
-                    pass
+                    self._background_tasks.task_done(task, (time.perf_counter() - task_start) * 1000)
                 
                 # OPTIMIZATION: Batch CSV writes to reduce I/O overhead
                 # Collect CSV writes and flush in batches
@@ -7264,10 +7724,13 @@ class SLManager:
             summary_text = "\n".join(summary_lines)
             logger.info(f"\n{summary_text}")
     
-    def _sl_worker_loop(self):
+    def _sl_worker_loop(self, shard: Optional[SLWorkerShard] = None):
         """
         Main SL worker loop - optimized for speed and non-blocking operation.
         
+        Runs once per SL worker shard (execution.sl_worker.shards); each shard only
+        processes positions whose symbol it owns, with its own time budget.
+        
         Interval: Configurable via trailing_cycle_interval_ms (0ms for instant trailing)
         Target Performance: <10ms per iteration (ideal), <50ms (acceptable)
         
@@ -7285,14 +7748,17 @@ class SLManager:
         4. Submits SL update with retry logic (network calls outside locks)
         5. Queues heavy operations to background thread
         """
+        if shard is None:
+            shard = SLWorkerShard(0, 1)
         # MANDATORY OBSERVABILITY: Wrap entire loop in try-except to catch fatal crashes
         try:
-            logger.info(f"SLManager worker loop started (interval: {self._sl_worker_interval*1000:.0f}ms)")
+            logger.info(f"SLManager worker loop started (interval: {self._sl_worker_interval*1000:.0f}ms, "
+                        f"shard: {shard.index + 1}/{shard.count})")
             logger.info("SLManager worker loop starting now")
             tracer = get_tracer()
-            # Notify global health monitor that SLWorker has started
+            # Notify global health monitor that this worker shard has started
             try:
-                system_health.mark_thread_started("SLWorker")
+                system_health.mark_thread_started(shard.name)
             except Exception:
                 pass
             
@@ -7307,23 +7773,25 @@ class SLManager:
             while self._sl_worker_running and not self._sl_worker_shutdown_event.is_set():
                 # CRITICAL FIX: Send heartbeat at start of each loop iteration to prevent false dead detection
                 try:
-                    system_health.mark_thread_heartbeat("SLWorker")
+                    system_health.mark_thread_heartbeat(shard.name)
                 except Exception:
                     pass  # Heartbeat failure must not break the loop
                 
                 iteration += 1
                 loop_start_time = time.time()
                 loop_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+                shard.iterations = iteration
+                shard.last_loop_time = loop_start_time
                 
-                # Log profit zone summary periodically
-                if time.time() - last_summary_time >= summary_interval:
+                # Log profit zone summary periodically (primary shard only)
+                if shard.is_primary and time.time() - last_summary_time >= summary_interval:
                     self._log_profit_zone_summary()
                     # Also log verification metrics for system health monitoring
                     self._log_verification_metrics()
                     last_summary_time = time.time()
                 
                 # P2-14 FIX: Periodic lock cleanup to prevent memory leaks
-                if time.time() - last_lock_cleanup_time >= lock_cleanup_interval:
+                if shard.is_primary and time.time() - last_lock_cleanup_time >= lock_cleanup_interval:
                     self._periodic_lock_cleanup()
                     last_lock_cleanup_time = time.time()
                 
@@ -7341,636 +7809,654 @@ class SLManager:
                     logger.debug(f"mode={mode} | [{loop_timestamp}] [SL_WORKER] Loop iteration {iteration} started")
                     logger.info(f"mode={mode} | [SL_WORKER] Loop start timestamp: {loop_timestamp} | Iteration: {iteration}")
                     
-                    # OPTIMIZATION: Get snapshot of open positions ONCE per loop
-                    # This is the only blocking network call in the main loop
-                    positions_fetch_start = time.time()
-                    positions = self.order_manager.get_open_positions()
-                    positions_fetch_duration = (time.time() - positions_fetch_start) * 1000
-                    # Cache metrics for timer-based heartbeat (no MT5 calls from heartbeat thread)
-                    position_count = len(positions) if positions else 0
+                # OPTIMIZATION: Get snapshot of open positions ONCE per loop
+                # Served from the shared position bus (one producer for all monitoring threads)
+                positions_fetch_start = time.time()
+                all_positions = read_open_positions(self.order_manager, 'sl_worker')
+                positions_fetch_duration = (time.time() - positions_fetch_start) * 1000
+                if all_positions is None:
+                    # Broker read failed and the last snapshot is past the stale fallback limit -
+                    # never modify SLs (or resolve verifications) from positions that old
+                    if should_log_debug:
+                        logger.warning(f"mode={mode} | [SL_WORKER] No position snapshot within staleness limit - "
+                                       f"skipping iteration {iteration}")
+                    time.sleep(max(self._sl_worker_interval, 0.01))
+                    continue
+                # Only the symbols owned by this shard (all positions with a single worker)
+                positions = shard.select(all_positions)
+                # Cache metrics for timer-based heartbeat (no MT5 calls from heartbeat thread)
+                shard.last_position_count = len(positions)
+                shard.last_active_tickets = sum(1 for p in positions if p.get('ticket'))
+                if shard.is_primary:
                     with self._tracking_lock:
-                        self._sl_worker_last_position_count = position_count
+                        self._sl_worker_last_position_count = len(all_positions)
                         self._sl_worker_last_active_tickets = len(self._last_sl_attempt)
                     
-                    # Warn if position fetch is slow (should be <10ms)
-                    if positions_fetch_duration > 10:
-                        logger.warning(f"mode={mode} | [{loop_timestamp}] [SL_WORKER] WARNING: Slow position fetch: {positions_fetch_duration:.1f}ms (target: <10ms)")
+                # Warn if position fetch is slow (should be <10ms)
+                if positions_fetch_duration > 10:
+                    logger.warning(f"mode={mode} | [{loop_timestamp}] [SL_WORKER] WARNING: Slow position fetch: {positions_fetch_duration:.1f}ms (target: <10ms)")
                     
-                    tracer.trace(
-                        function_name="SLManager._sl_worker_loop",
-                        expected=f"Get all open positions for iteration {iteration}",
-                        actual=f"Retrieved {len(positions)} open positions in {positions_fetch_duration:.1f}ms",
-                        status="OK",
-                        iteration=iteration,
-                        position_count=len(positions),
-                        fetch_duration_ms=positions_fetch_duration
-                    )
+                # Confirm SL modifies from earlier iterations against this snapshot
+                # (needs every open ticket - a partition would read as closed positions)
+                if shard.is_primary:
+                    self._check_sl_verifications(all_positions, positions_fetch_start)
                     
-                    if not positions:
-                        # MANDATORY OBSERVABILITY: Log idle state when no positions exist
-                        logger.info(f"[IDLE][SL_WORKER] no_positions=true")
-                        # CRITICAL FIX: Update timing stats even when idle to prevent false backlog detection
-                        # This ensures trade gating checks know the worker is alive and active
-                        with self._timing_lock:
-                            self._timing_stats['last_update_time'] = datetime.now()
-                            self._timing_stats['last_loop_time'] = loop_start_time
-                        # No positions - check if instant trailing (no sleep) or wait
-                        if self._sl_worker_interval > 0:
-                            sleep_start = time.time()
-                            time.sleep(self._sl_worker_interval)
-                            sleep_duration = (time.time() - sleep_start) * 1000
-                            logger.debug(f"mode={mode} | [SL_WORKER] Sleep duration: {sleep_duration:.1f}ms (target: {self._sl_worker_interval*1000:.1f}ms)")
-                        else:
-                            # CRITICAL FIX: Even for instant trailing, sleep 10ms to prevent CPU spinning
-                            # This allows other threads to run and prevents lock contention
-                            min_sleep_ms = 10  # Minimum 10ms sleep even for instant trailing
-                            time.sleep(min_sleep_ms / 1000.0)
-                        continue
+                # OPTIMIZATION: Queue fail-safe and stale lock checks to background thread instead of
+                # blocking main loop (both can scan every position/lock - heavy when many exist)
+                # Primary shard only, based on all open positions: the primary's own partition may be
+                # empty while other shards hold positions, so this must run before the idle short-circuit
+                # Collapses into the pending check; runs at most every min_interval_seconds[task]
+                if shard.is_primary and all_positions:
+                    self._background_tasks.submit('fail_safe_check')
+                    self._background_tasks.submit('check_stale_locks')
                     
-                    if should_log_debug:
-                        logger.debug(f"mode={mode} | [{loop_timestamp}] [SL_WORKER] Found {len(positions)} open position(s)")
+                tracer.trace(
+                    function_name="SLManager._sl_worker_loop",
+                    expected=f"Get all open positions for iteration {iteration}",
+                    actual=f"Retrieved {len(positions)} open positions in {positions_fetch_duration:.1f}ms",
+                    status="OK",
+                    iteration=iteration,
+                    position_count=len(positions),
+                    fetch_duration_ms=positions_fetch_duration
+                )
                     
-                    # OPTIMIZATION: Queue fail-safe check to background thread instead of blocking main loop
-                    # Fail-safe check can scan all positions and perform heavy calculations
-                    # Moving it to background ensures main loop stays under 50ms
-                    try:
-                        self._background_task_queue.put_nowait(('fail_safe_check', None))
-                    except queue.Full:
-                        # Queue full - skip this cycle's fail-safe check (will run next cycle)
-                        logger.debug("Background task queue full, skipping fail-safe check this cycle")
-                    except Exception as e:
-                        logger.debug(f"Error queueing fail-safe check: {e}")
+                if not positions:
+                    # MANDATORY OBSERVABILITY: Log idle state when no positions exist
+                    logger.info(f"[IDLE][SL_WORKER] no_positions=true shard={shard.name}")
+                    # CRITICAL FIX: Update timing stats even when idle to prevent false backlog detection
+                    # This ensures trade gating checks know the worker is alive and active
+                    with self._timing_lock:
+                        self._timing_stats['last_update_time'] = datetime.now()
+                        self._timing_stats['last_loop_time'] = loop_start_time
+                    # No positions - check if instant trailing (no sleep) or wait
+                    if self._sl_worker_interval > 0:
+                        sleep_start = time.time()
+                        time.sleep(self._sl_worker_interval)
+                        sleep_duration = (time.time() - sleep_start) * 1000
+                        logger.debug(f"mode={mode} | [SL_WORKER] Sleep duration: {sleep_duration:.1f}ms (target: {self._sl_worker_interval*1000:.1f}ms)")
+                    else:
+                        # CRITICAL FIX: Even for instant trailing, sleep 10ms to prevent CPU spinning
+                        # This allows other threads to run and prevents lock contention
+                        min_sleep_ms = 10  # Minimum 10ms sleep even for instant trailing
+                        time.sleep(min_sleep_ms / 1000.0)
+                    continue
                     
-                    # FIX 6: Check loop performance before processing positions
-                    # If loop is already slow (>500ms), skip non-critical updates to prevent cascading delays
-                    loop_elapsed_before_positions = (time.time() - loop_start_time) * 1000  # Convert to ms
-                    skip_non_critical = loop_elapsed_before_positions > 500.0  # Skip trailing/profit locks if already >500ms
+                if should_log_debug:
+                    logger.debug(f"mode={mode} | [{loop_timestamp}] [SL_WORKER] Found {len(positions)} open position(s)")
                     
-                    # PHASE 1 FIX 1.2: Maximum time budget per loop iteration (prevent infinite delays)
-                    # If loop has already taken >1 second, skip remaining positions to prevent cascading delays
-                    max_loop_time_budget_ms = 1000.0  # 1 second max per loop iteration
+                # FIX 6: Check loop performance before processing positions
+                # If loop is already slow (>500ms), skip non-critical updates to prevent cascading delays
+                loop_elapsed_before_positions = (time.time() - loop_start_time) * 1000  # Convert to ms
+                skip_non_critical = loop_elapsed_before_positions > 500.0  # Skip trailing/profit locks if already >500ms
                     
-                    # Process each position
-                    for position in positions:
-                        # CRITICAL FIX: Wrap each position processing in try-except to prevent thread crash
-                        try:
-                            if not self._sl_worker_running:
-                                break
-                            
-                            # PHASE 1 FIX 1.2: Check time budget - track remaining positions for next iteration instead of skipping
-                            loop_elapsed_ms = (time.time() - loop_start_time) * 1000
-                            if loop_elapsed_ms > max_loop_time_budget_ms:
-                                # CRITICAL FIX: Don't skip positions - mark them for next iteration instead
-                                # This ensures all positions get processed eventually
-                                remaining_positions = positions[positions.index(position):]
-                                logger.warning(f"[TIME_BUDGET] Loop slow ({loop_elapsed_ms:.1f}ms) - "
-                                             f"Will process remaining {len(remaining_positions)} position(s) in next iteration")
-                                # Track attempt timestamp even when skipped to prevent false staleness
-                                for remaining_pos in remaining_positions:
-                                    remaining_ticket = remaining_pos.get('ticket', 0)
-                                    if remaining_ticket:
-                                        with self._tracking_lock:
-                                            self._last_sl_attempt[remaining_ticket] = datetime.now()
-                                            # Also update _last_sl_update timestamp to prevent false staleness
-                                            if remaining_ticket not in self._last_sl_update:
-                                                self._last_sl_update[remaining_ticket] = datetime.now()
-                                break  # Process remaining positions in next iteration
+                # PHASE 1 FIX 1.2: Maximum time budget per loop iteration (prevent infinite delays)
+                # If loop has already taken >1 second, skip remaining positions to prevent cascading delays
+                max_loop_time_budget_ms = 1000.0  # 1 second max per loop iteration (per shard)
+                
+                # Dispatch updates deferred by the global rate limit first (highest priority first)
+                # A shard only dispatches tickets of its own symbols (no cross-shard ticket locks)
+                drained = self._drain_rpc_queue(positions, shard.owns if shard.is_sharded else None)
+                
+                # Authoritative SL targets of all ladder positions in one vectorized pass
+                # (rows flagged scalar are computed per position inside update_sl_atomic)
+                batch_targets = None
+                try:
+                    if positions:
+                        batch_targets = self._compute_sl_targets(positions)
+                except Exception as batch_error:
+                    logger.warning(f"[SL_BATCH] Batched SL computation failed, using per-position path: {batch_error}")
+                    
+                # Process each position
+                for position_index, position in enumerate(positions):
+                    # CRITICAL FIX: Wrap each position processing in try-except to prevent thread crash
+                    try:
+                        if not self._sl_worker_running:
+                            break
+                        
+                        # PHASE 1 FIX 1.2: Check time budget - track remaining positions for next iteration instead of skipping
+                        loop_elapsed_ms = (time.time() - loop_start_time) * 1000
+                        if loop_elapsed_ms > max_loop_time_budget_ms:
+                            # CRITICAL FIX: Don't skip positions - mark them for next iteration instead
+                            # This ensures all positions get processed eventually
+                            remaining_positions = positions[positions.index(position):]
+                            logger.warning(f"[TIME_BUDGET] Loop slow ({loop_elapsed_ms:.1f}ms) - "
+                                         f"Will process remaining {len(remaining_positions)} position(s) in next iteration")
+                            # Track attempt timestamp even when skipped to prevent false staleness
+                            for remaining_pos in remaining_positions:
+                                remaining_ticket = remaining_pos.get('ticket', 0)
+                                if remaining_ticket:
+                                    with self._tracking_lock:
+                                        self._last_sl_attempt[remaining_ticket] = datetime.now()
+                                        # Also update _last_sl_update timestamp to prevent false staleness
+                                        if remaining_ticket not in self._last_sl_update:
+                                            self._last_sl_update[remaining_ticket] = datetime.now()
+                            break  # Process remaining positions in next iteration
+                        
+                        ticket = position.get('ticket', 0)
+                        if ticket == 0 or ticket in drained:
+                            continue
+                        
+                        # Skip if in manual review
+                        if ticket in self._manual_review_tickets:
+                            continue
+                        
+                        # Dirty-set: skip positions whose SL inputs have not changed since the
+                        # last successful evaluation (attempt timestamp still refreshed for the watchdog)
+                        if self._sl_dirty_set_enabled and not self._sl_dirty_tracker.is_dirty(
+                                position, self._sl_ladders.get(ticket)):
+                            with self._tracking_lock:
+                                self._last_sl_attempt[ticket] = datetime.now()
+                            continue
+                        
+                        # FIX 6: Skip non-critical updates if loop is already slow
+                        # Only process emergency SL (losing trades, first eligible) when loop is slow
+                        if skip_non_critical:
+                            current_profit_check = position.get('profit', 0.0)
+                            is_losing = current_profit_check < -0.01  # Losing trade (emergency)
+                            is_first_eligible_check = ticket in self._first_eligible_update and \
+                                                     self._first_eligible_update[ticket].get('state') == 'PENDING'
                             
-                            ticket = position.get('ticket', 0)
-                            if ticket == 0:
+                            # Skip if not emergency (not losing and not first eligible)
+                            if not is_losing and not is_first_eligible_check:
+                                # Skip trailing stops and profit locks when loop is slow
                                 continue
+                        
+                        # OPTIMIZATION: Reduce debug logging noise - only log for first position or on errors
+                        should_log_position = (ticket == positions[0].get('ticket', 0)) if positions else False
+                        if should_log_position:
+                            position_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                            logger.debug(f"[{position_timestamp}] 🔍 Processing {len(positions)} position(s), starting with Ticket {ticket}")
+                        
+                        # Check circuit breaker (but bypass for profit-locking trades)
+                        # CRITICAL FIX: Circuit breaker should NOT block profit-locking trades
+                        if ticket in self._ticket_circuit_breaker:
+                            disabled_until = self._ticket_circuit_breaker[ticket]
+                            current_profit_check = position.get('profit', 0.0)
+                            is_profit_locking_check = (current_profit_check >= 0.01)
                             
-                            # Skip if in manual review
-                            if ticket in self._manual_review_tickets:
+                            # Bypass circuit breaker for profit-locking trades
+                            if is_profit_locking_check:
+                                logger.debug(f"🔄 Circuit breaker bypassed for profit-locking Ticket {ticket} (profit: ${current_profit_check:.2f})")
+                                del self._ticket_circuit_breaker[ticket]
+                            elif time.time() < disabled_until:
+                                # Still in cooldown for non-profitable trades
                                 continue
+                            else:
+                                # Cooldown expired, allow one trial update
+                                del self._ticket_circuit_breaker[ticket]
+                                logger.info(f"🔄 Circuit breaker expired for Ticket {ticket}, allowing trial update")
+                        
+                        # CRITICAL OPTIMIZATION: Use position data from get_open_positions() instead of calling get_position_by_ticket()
+                        # get_position_by_ticket() calls get_open_positions() again, causing duplicate MT5 API calls
+                        # This eliminates N additional blocking network calls (where N = number of positions)
+                        # The position data from get_open_positions() is already fresh and sufficient
+                        fresh_position = position  # Use position from the list we already fetched
+                        
+                        # CRITICAL FIX: Determine if profitable before acquiring lock to use proper timeout
+                        current_profit = fresh_position.get('profit', 0.0)
+                        is_profit_locking = (current_profit >= 0.01)  # $0.01 threshold for profit locking priority
+                        fresh_profit = current_profit
+                        
+                        # CRITICAL FIX: Don't acquire lock in worker loop - update_sl_atomic handles its own locking
+                        # This prevents worker loop from blocking on lock acquisition
+                        # update_sl_atomic will acquire locks internally only when needed and release them quickly
+                        
+                        # Perform SL update (atomic) with full error handling
+                        # CRITICAL: update_sl_atomic will handle all network calls OUTSIDE locks
+                        update_start = time.time()
+                        # OPTIMIZATION: Only log debug for first position or if logging is enabled
+                        if should_log_position:
+                            update_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+                            logger.debug(f"mode={mode} | [{update_timestamp}] [SL_WORKER] Starting SL update for Ticket {ticket}")
+                        
+                        # Track attempt timestamp
+                        attempt_time = datetime.now()
+                        with self._tracking_lock:
+                            self._last_sl_attempt[ticket] = attempt_time
+                            # CRITICAL FIX: Also update _last_sl_update timestamp to prevent false staleness
+                            # This prevents watchdog from thinking position is stale when it's just queued
+                            if ticket not in self._last_sl_update:
+                                self._last_sl_update[ticket] = attempt_time
+                        
+                        try:
+                            tracer.trace(
+                                function_name="SLManager._sl_worker_loop",
+                                expected=f"Update SL for {fresh_position.get('symbol', 'N/A')} Ticket {ticket}",
+                                actual=f"Calling update_sl_atomic for Ticket {ticket}",
+                                status="OK",
+                                iteration=iteration,
+                                ticket=ticket,
+                                symbol=fresh_position.get('symbol', 'N/A'),
+                                profit=fresh_position.get('profit', 0.0)
+                            )
                             
-                            # FIX 6: Skip non-critical updates if loop is already slow
-                            # Only process emergency SL (losing trades, first eligible) when loop is slow
-                            if skip_non_critical:
-                                current_profit_check = position.get('profit', 0.0)
-                                is_losing = current_profit_check < -0.01  # Losing trade (emergency)
-                                is_first_eligible_check = ticket in self._first_eligible_update and \
-                                                         self._first_eligible_update[ticket].get('state') == 'PENDING'
-                                
-                                # Skip if not emergency (not losing and not first eligible)
-                                if not is_losing and not is_first_eligible_check:
-                                    # Skip trailing stops and profit locks when loop is slow
-                                    continue
-                            
-                            # OPTIMIZATION: Reduce debug logging noise - only log for first position or on errors
-                            should_log_position = (ticket == positions[0].get('ticket', 0)) if positions else False
-                            if should_log_position:
-                                position_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                                logger.debug(f"[{position_timestamp}] 🔍 Processing {len(positions)} position(s), starting with Ticket {ticket}")
+                            # PHASE 1 FIX 1.2: Direct call with aggressive timeout tracking
+                            # Use circuit breaker to skip problematic positions BEFORE attempting update
+                            is_profit_locking = (fresh_position.get('profit', 0.0) >= 0.01)  # Determine before update
+                            timeout_reached = False
                             
-                            # Check circuit breaker (but bypass for profit-locking trades)
-                            # CRITICAL FIX: Circuit breaker should NOT block profit-locking trades
+                            # PHASE 1 FIX 1.2: Check circuit breaker BEFORE attempting update (prevents wasted time)
                             if ticket in self._ticket_circuit_breaker:
                                 disabled_until = self._ticket_circuit_breaker[ticket]
-                                current_profit_check = position.get('profit', 0.0)
-                                is_profit_locking_check = (current_profit_check >= 0.01)
-                                
-                                # Bypass circuit breaker for profit-locking trades
-                                if is_profit_locking_check:
-                                    logger.debug(f"🔄 Circuit breaker bypassed for profit-locking Ticket {ticket} (profit: ${current_profit_check:.2f})")
-                                    del self._ticket_circuit_breaker[ticket]
-                                elif time.time() < disabled_until:
-                                    # Still in cooldown for non-profitable trades
-                                    continue
+                                if time.time() < disabled_until:
+                                    # Still in cooldown - skip this position
+                                    remaining = disabled_until - time.time()
+                                    logger.debug(f"[CIRCUIT_BREAKER_SKIP] {fresh_position.get('symbol', 'N/A')} Ticket {ticket} | "
+                                               f"Skipping SL update (circuit breaker active, {remaining:.1f}s remaining)")
+                                    continue  # Skip to next position
                                 else:
-                                    # Cooldown expired, allow one trial update
+                                    # Cooldown expired - remove from circuit breaker and allow retry
                                     del self._ticket_circuit_breaker[ticket]
-                                    logger.info(f"🔄 Circuit breaker expired for Ticket {ticket}, allowing trial update")
+                                    logger.info(f"[CIRCUIT_BREAKER_RESET] {fresh_position.get('symbol', 'N/A')} Ticket {ticket} | "
+                                              f"Circuit breaker expired, allowing retry")
                             
-                            # OPTIMIZATION: Queue stale lock check to background thread instead of blocking main loop
-                            # Stale lock check can be slow when many locks exist
-                            # Only check on first position to avoid duplicate checks
-                            if len(positions) > 0 and ticket == positions[0].get('ticket', 0):
-                                try:
-                                    self._background_task_queue.put_nowait(('check_stale_locks', None))
-                                except queue.Full:
-                                    pass  # Skip if queue full
-                                except Exception:
-                                    pass  # Ignore errors
+                            # PHASE 1 FIX 1.2: Check position-specific timeout budget
+                            # If this position has already taken too long in previous attempts, skip it
+                            position_timeout_budget_ms = 500.0  # 500ms max per position per iteration
+                            loop_elapsed_so_far = (time.time() - loop_start_time) * 1000
+                            if ticket in self._last_sl_attempt:
+                                last_attempt_time = self._last_sl_attempt[ticket]
+                                time_since_last_attempt = (time.time() - last_attempt_time.timestamp() if hasattr(last_attempt_time, 'timestamp') else (time.time() - last_attempt_time)) * 1000
+                                # If last attempt was recent and failed, skip if we're in a slow loop
+                                if time_since_last_attempt < 1000 and loop_elapsed_so_far > 500:
+                                    logger.debug(f"[POSITION_TIMEOUT_BUDGET] {fresh_position.get('symbol', 'N/A')} Ticket {ticket} | "
+                                               f"Skipping (last attempt {time_since_last_attempt:.0f}ms ago, loop slow: {loop_elapsed_so_far:.0f}ms)")
+                                    continue
                             
-                            # CRITICAL OPTIMIZATION: Use position data from get_open_positions() instead of calling get_position_by_ticket()
-                            # get_position_by_ticket() calls get_open_positions() again, causing duplicate MT5 API calls
-                            # This eliminates N additional blocking network calls (where N = number of positions)
-                            # The position data from get_open_positions() is already fresh and sufficient
-                            fresh_position = position  # Use position from the list we already fetched
+                            # Call update_sl_atomic directly with timeout tracking
+                            # If it takes >1 second, we'll detect it and trigger circuit breaker immediately
+                            try:
+                                batch_result = None
+                                if batch_targets is not None and not batch_targets.scalar[position_index]:
+                                    batch_result = self._authoritative_result_from_batch(
+                                        fresh_position, batch_targets, position_index)
+                                success, reason = self.update_sl_atomic(ticket, fresh_position, batch_result)
+                            except Exception as update_error:
+                                logger.error(f"[ERROR] update_sl_atomic exception for Ticket {ticket}: {update_error}", exc_info=True)
+                                success = False
+                                reason = f"Exception: {str(update_error)}"
                             
-                            # CRITICAL FIX: Determine if profitable before acquiring lock to use proper timeout
-                            current_profit = fresh_position.get('profit', 0.0)
-                            is_profit_locking = (current_profit >= 0.01)  # $0.01 threshold for profit locking priority
-                            fresh_profit = current_profit
+                            # Calculate update duration and check for timeout (aggressive: 1 second instead of 2)
+                            update_duration = (time.time() - update_start) * 1000
+                            aggressive_timeout_ms = 1000.0  # 1 second timeout (more aggressive than 2s)
+                            if update_duration > aggressive_timeout_ms:
+                                timeout_reached = True
+                                logger.warning(f"[TIMEOUT] {fresh_position.get('symbol', 'N/A')} Ticket {ticket} | "
+                                             f"SL update took {update_duration:.1f}ms (exceeded {aggressive_timeout_ms:.0f}ms limit)")
+                                success = False
+                                reason = f"SL update timeout: took {update_duration:.1f}ms"
                             
-                            # CRITICAL FIX: Don't acquire lock in worker loop - update_sl_atomic handles its own locking
-                            # This prevents worker loop from blocking on lock acquisition
-                            # update_sl_atomic will acquire locks internally only when needed and release them quickly
+                            # PHASE 1 FIX 1.2: Also trigger circuit breaker on slow calls (>500ms) even if not timeout
+                            # This prevents positions from repeatedly taking too long
+                            slow_call_threshold_ms = 500.0
+                            if update_duration > slow_call_threshold_ms and not timeout_reached:
+                                logger.warning(f"[SLOW_CALL] {fresh_position.get('symbol', 'N/A')} Ticket {ticket} | "
+                                             f"SL update took {update_duration:.1f}ms (slow, threshold: {slow_call_threshold_ms:.0f}ms)")
+                                # Count as partial failure for circuit breaker (but don't mark as full timeout)
+                                with self._tracking_lock:
+                                    if ticket not in self._consecutive_failures:
+                                        self._consecutive_failures[ticket] = 0
+                                    # Increment failure count for slow calls (but less aggressively)
+                                    if update_duration > slow_call_threshold_ms * 1.5:  # >750ms
+                                        self._consecutive_failures[ticket] += 1
+                                        failures = self._consecutive_failures[ticket]
+                                        if failures >= self._circuit_breaker_threshold and not is_profit_locking:
+                                            disabled_until = time.time() + (self._circuit_breaker_cooldown / 2)  # Shorter cooldown for slow calls
+                                            self._ticket_circuit_breaker[ticket] = disabled_until
+                                            logger.warning(f"[CIRCUIT_BREAKER_SLOW] Ticket {ticket} disabled for {disabled_until - time.time():.0f}s "
+                                                         f"after {failures} slow calls (>750ms)")
+                            if self._sl_dirty_set_enabled:
+                                self._sl_dirty_tracker.mark_evaluated(fresh_position, success, self._sl_ladders.get(ticket))
+                            logger.debug(f"mode={mode} | [SL_WORKER] SL update for Ticket {ticket} completed | "
+                                       f"Duration: {update_duration:.1f}ms | Success: {success} | Reason: {reason}")
+                            tracer.trace(
+                                function_name="SLManager._sl_worker_loop",
+                                expected=f"Update SL for {fresh_position.get('symbol', 'N/A')} Ticket {ticket}",
+                                actual=f"update_sl_atomic returned: success={success}, reason={reason}, duration={update_duration:.1f}ms",
+                                status="OK" if success else "WARNING",
+                                iteration=iteration,
+                                ticket=ticket,
+                                symbol=fresh_position.get('symbol', 'N/A'),
+                                success=success,
+                                reason=reason
+                            )
+                            update_latency = (time.time() - update_start) * 1000  # Convert to ms
                             
-                            # Perform SL update (atomic) with full error handling
-                            # CRITICAL: update_sl_atomic will handle all network calls OUTSIDE locks
-                            update_start = time.time()
-                            # OPTIMIZATION: Only log debug for first position or if logging is enabled
-                            if should_log_position:
-                                update_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                                logger.debug(f"mode={mode} | [{update_timestamp}] [SL_WORKER] Starting SL update for Ticket {ticket}")
+                            # OPTIMIZATION: Only log slow updates (>20ms) or failures
+                            should_log_update = (update_latency > 20) or not success
+                            if should_log_update:
+                                update_end_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                                logger.debug(f"[{update_end_timestamp}] [OK] SL update completed for Ticket {ticket} | Success: {success} | Latency: {update_latency:.1f}ms")
                             
-                            # Track attempt timestamp
-                            attempt_time = datetime.now()
-                            with self._tracking_lock:
-                                self._last_sl_attempt[ticket] = attempt_time
-                                # CRITICAL FIX: Also update _last_sl_update timestamp to prevent false staleness
-                                # This prevents watchdog from thinking position is stale when it's just queued
-                                if ticket not in self._last_sl_update:
-                                    self._last_sl_update[ticket] = attempt_time
+                            # CRITICAL FIX: Check and execute TP partial close after SL update
+                            # This ensures partial closes happen at 50% TP target
+                            if hasattr(self, 'tp_manager') and self.tp_manager:
+                                try:
+                                    # Get fresh position after SL update
+                                    fresh_pos_for_tp = self.order_manager.get_position_by_ticket(ticket)
+                                    if fresh_pos_for_tp:
+                                        # Check if 50% TP target reached and execute partial close
+                                        tp_success, tp_reason = self.tp_manager.check_and_execute_partial_close(fresh_pos_for_tp)
+                                        if tp_success:
+                                            logger.info(f"[TP_PARTIAL_CLOSE] Ticket {ticket} | {tp_reason}")
+                                except Exception as tp_error:
+                                    logger.debug(f"Error checking TP partial close for Ticket {ticket}: {tp_error}")
                             
-                            try:
-                                tracer.trace(
-                                    function_name="SLManager._sl_worker_loop",
-                                    expected=f"Update SL for {fresh_position.get('symbol', 'N/A')} Ticket {ticket}",
-                                    actual=f"Calling update_sl_atomic for Ticket {ticket}",
-                                    status="OK",
-                                    iteration=iteration,
-                                    ticket=ticket,
-                                    symbol=fresh_position.get('symbol', 'N/A'),
-                                    profit=fresh_position.get('profit', 0.0)
-                                )
-                                
-                                # PHASE 1 FIX 1.2: Direct call with aggressive timeout tracking
-                                # Use circuit breaker to skip problematic positions BEFORE attempting update
-                                is_profit_locking = (fresh_position.get('profit', 0.0) >= 0.01)  # Determine before update
-                                timeout_reached = False
-                                
-                                # PHASE 1 FIX 1.2: Check circuit breaker BEFORE attempting update (prevents wasted time)
-                                if ticket in self._ticket_circuit_breaker:
-                                    disabled_until = self._ticket_circuit_breaker[ticket]
-                                    if time.time() < disabled_until:
-                                        # Still in cooldown - skip this position
-                                        remaining = disabled_until - time.time()
-                                        logger.debug(f"[CIRCUIT_BREAKER_SKIP] {fresh_position.get('symbol', 'N/A')} Ticket {ticket} | "
-                                                   f"Skipping SL update (circuit breaker active, {remaining:.1f}s remaining)")
-                                        continue  # Skip to next position
-                                    else:
-                                        # Cooldown expired - remove from circuit breaker and allow retry
-                                        del self._ticket_circuit_breaker[ticket]
-                                        logger.info(f"[CIRCUIT_BREAKER_RESET] {fresh_position.get('symbol', 'N/A')} Ticket {ticket} | "
-                                                  f"Circuit breaker expired, allowing retry")
-                                
-                                # PHASE 1 FIX 1.2: Check position-specific timeout budget
-                                # If this position has already taken too long in previous attempts, skip it
-                                position_timeout_budget_ms = 500.0  # 500ms max per position per iteration
-                                loop_elapsed_so_far = (time.time() - loop_start_time) * 1000
-                                if ticket in self._last_sl_attempt:
-                                    last_attempt_time = self._last_sl_attempt[ticket]
-                                    time_since_last_attempt = (time.time() - last_attempt_time.timestamp() if hasattr(last_attempt_time, 'timestamp') else (time.time() - last_attempt_time)) * 1000
-                                    # If last attempt was recent and failed, skip if we're in a slow loop
-                                    if time_since_last_attempt < 1000 and loop_elapsed_so_far > 500:
-                                        logger.debug(f"[POSITION_TIMEOUT_BUDGET] {fresh_position.get('symbol', 'N/A')} Ticket {ticket} | "
-                                                   f"Skipping (last attempt {time_since_last_attempt:.0f}ms ago, loop slow: {loop_elapsed_so_far:.0f}ms)")
-                                        continue
-                                
-                                # Call update_sl_atomic directly with timeout tracking
-                                # If it takes >1 second, we'll detect it and trigger circuit breaker immediately
+                            # CRITICAL FIX: Auto-correct TP if wrong or not set
+                            # Check TP after every SL update to ensure it's correct
+                            if hasattr(self, 'tp_manager') and self.tp_manager:
                                 try:
-                                    success, reason = self.update_sl_atomic(ticket, fresh_position)
-                                except Exception as update_error:
-                                    logger.error(f"[ERROR] update_sl_atomic exception for Ticket {ticket}: {update_error}", exc_info=True)
-                                    success = False
-                                    reason = f"Exception: {str(update_error)}"
-                                
-                                # Calculate update duration and check for timeout (aggressive: 1 second instead of 2)
-                                update_duration = (time.time() - update_start) * 1000
-                                aggressive_timeout_ms = 1000.0  # 1 second timeout (more aggressive than 2s)
-                                if update_duration > aggressive_timeout_ms:
-                                    timeout_reached = True
-                                    logger.warning(f"[TIMEOUT] {fresh_position.get('symbol', 'N/A')} Ticket {ticket} | "
-                                                 f"SL update took {update_duration:.1f}ms (exceeded {aggressive_timeout_ms:.0f}ms limit)")
-                                    success = False
-                                    reason = f"SL update timeout: took {update_duration:.1f}ms"
-                                
-                                # PHASE 1 FIX 1.2: Also trigger circuit breaker on slow calls (>500ms) even if not timeout
-                                # This prevents positions from repeatedly taking too long
-                                slow_call_threshold_ms = 500.0
-                                if update_duration > slow_call_threshold_ms and not timeout_reached:
-                                    logger.warning(f"[SLOW_CALL] {fresh_position.get('symbol', 'N/A')} Ticket {ticket} | "
-                                                 f"SL update took {update_duration:.1f}ms (slow, threshold: {slow_call_threshold_ms:.0f}ms)")
-                                    # Count as partial failure for circuit breaker (but don't mark as full timeout)
-                                    with self._tracking_lock:
-                                        if ticket not in self._consecutive_failures:
-                                            self._consecutive_failures[ticket] = 0
-                                        # Increment failure count for slow calls (but less aggressively)
-                                        if update_duration > slow_call_threshold_ms * 1.5:  # >750ms
-                                            self._consecutive_failures[ticket] += 1
-                                            failures = self._consecutive_failures[ticket]
-                                            if failures >= self._circuit_breaker_threshold and not is_profit_locking:
-                                                disabled_until = time.time() + (self._circuit_breaker_cooldown / 2)  # Shorter cooldown for slow calls
-                                                self._ticket_circuit_breaker[ticket] = disabled_until
-                                                logger.warning(f"[CIRCUIT_BREAKER_SLOW] Ticket {ticket} disabled for {disabled_until - time.time():.0f}s "
-                                                             f"after {failures} slow calls (>750ms)")
-                                logger.debug(f"mode={mode} | [SL_WORKER] SL update for Ticket {ticket} completed | "
-                                           f"Duration: {update_duration:.1f}ms | Success: {success} | Reason: {reason}")
-                                tracer.trace(
-                                    function_name="SLManager._sl_worker_loop",
-                                    expected=f"Update SL for {fresh_position.get('symbol', 'N/A')} Ticket {ticket}",
-                                    actual=f"update_sl_atomic returned: success={success}, reason={reason}, duration={update_duration:.1f}ms",
-                                    status="OK" if success else "WARNING",
-                                    iteration=iteration,
-                                    ticket=ticket,
-                                    symbol=fresh_position.get('symbol', 'N/A'),
-                                    success=success,
-                                    reason=reason
-                                )
-                                update_latency = (time.time() - update_start) * 1000  # Convert to ms
-                                
-                                # OPTIMIZATION: Only log slow updates (>20ms) or failures
-                                should_log_update = (update_latency > 20) or not success
-                                if should_log_update:
-                                    update_end_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                                    logger.debug(f"[{update_end_timestamp}] [OK] SL update completed for Ticket {ticket} | Success: {success} | Latency: {update_latency:.1f}ms")
-                                
-                                # CRITICAL FIX: Check and execute TP partial close after SL update
-                                # This ensures partial closes happen at 50% TP target
-                                if hasattr(self, 'tp_manager') and self.tp_manager:
-                                    try:
-                                        # Get fresh position after SL update
-                                        fresh_pos_for_tp = self.order_manager.get_position_by_ticket(ticket)
-                                        if fresh_pos_for_tp:
-                                            # Check if 50% TP target reached and execute partial close
-                                            tp_success, tp_reason = self.tp_manager.check_and_execute_partial_close(fresh_pos_for_tp)
-                                            if tp_success:
-                                                logger.info(f"[TP_PARTIAL_CLOSE] Ticket {ticket} | {tp_reason}")
-                                    except Exception as tp_error:
-                                        logger.debug(f"Error checking TP partial close for Ticket {ticket}: {tp_error}")
-                                
-                                # CRITICAL FIX: Auto-correct TP if wrong or not set
-                                # Check TP after every SL update to ensure it's correct
-                                if hasattr(self, 'tp_manager') and self.tp_manager:
-                                    try:
-                                        fresh_pos_for_tp_check = self.order_manager.get_position_by_ticket(ticket)
-                                        if fresh_pos_for_tp_check:
-                                            applied_tp = fresh_pos_for_tp_check.get('tp', 0.0)
-                                            expected_tp = self.tp_manager.calculate_tp_price(fresh_pos_for_tp_check)
-                                            
-                                            if expected_tp is not None:
-                                                symbol_info_tp = self.mt5_connector.get_symbol_info(fresh_pos_for_tp_check.get('symbol', ''))
-                                                if symbol_info_tp:
-                                                    point = symbol_info_tp.get('point', 0.00001)
-                                                    tp_tolerance = point * 10  # 1 pip tolerance
+                                    fresh_pos_for_tp_check = self.order_manager.get_position_by_ticket(ticket)
+                                    if fresh_pos_for_tp_check:
+                                        applied_tp = fresh_pos_for_tp_check.get('tp', 0.0)
+                                        expected_tp = self.tp_manager.calculate_tp_price(fresh_pos_for_tp_check)
+                                        
+                                        if expected_tp is not None:
+                                            symbol_info_tp = self.mt5_connector.get_symbol_info(fresh_pos_for_tp_check.get('symbol', ''))
+                                            if symbol_info_tp:
+                                                point = symbol_info_tp.get('point', 0.00001)
+                                                tp_tolerance = point * 10  # 1 pip tolerance
+                                                
+                                                # Check if TP is wrong (not set, or significantly different from expected)
+                                                if applied_tp == 0.0 or (expected_tp > 0 and abs(applied_tp - expected_tp) > tp_tolerance):
+                                                    logger.warning(f"[TP_AUTO_CORRECT] {fresh_pos_for_tp_check.get('symbol', 'N/A')} Ticket {ticket} | "
+                                                                 f"TP is wrong or not set | Applied: {applied_tp:.5f} | Expected: {expected_tp:.5f} | "
+                                                                 f"Auto-correcting...")
+                                                    tp_correct_success, tp_correct_reason = self.tp_manager.apply_tp_to_position(ticket, max_attempts=3)
+                                                    if tp_correct_success:
+                                                        logger.info(f"[TP_AUTO_CORRECT_SUCCESS] Ticket {ticket} | {tp_correct_reason}")
+                                                    else:
+                                                        logger.warning(f"[TP_AUTO_CORRECT_FAILED] Ticket {ticket} | {tp_correct_reason}")
+                                except Exception as tp_check_error:
+                                    logger.debug(f"Error checking/correcting TP for Ticket {ticket}: {tp_check_error}")
+                            
+                            # CRITICAL FIX: Auto-correct SL for negative positions if SL is wrong
+                            # Check if position is negative and SL doesn't match expected -$3.00
+                            # Get fresh position for SL correction check
+                            fresh_pos_for_sl_check = self.order_manager.get_position_by_ticket(ticket)
+                            if fresh_pos_for_sl_check:
+                                current_profit_check = fresh_pos_for_sl_check.get('profit', 0.0)
+                                if current_profit_check < 0:  # Negative position
+                                    current_sl_check = fresh_pos_for_sl_check.get('sl', 0.0)
+                                    if current_sl_check > 0:  # SL is set
+                                        # Calculate expected SL for -$3.00
+                                        expected_sl_result = self._enforce_strict_loss_limit(fresh_pos_for_sl_check)
+                                        if expected_sl_result[0]:  # Success
+                                            expected_sl_price = expected_sl_result[2]
+                                            if expected_sl_price is not None:
+                                                symbol_info_sl = self.mt5_connector.get_symbol_info(fresh_pos_for_sl_check.get('symbol', ''))
+                                                if symbol_info_sl:
+                                                    point = symbol_info_sl.get('point', 0.00001)
+                                                    sl_tolerance = point * 10  # 1 pip tolerance
                                                     
-                                                    # Check if TP is wrong (not set, or significantly different from expected)
-                                                    if applied_tp == 0.0 or (expected_tp > 0 and abs(applied_tp - expected_tp) > tp_tolerance):
-                                                        logger.warning(f"[TP_AUTO_CORRECT] {fresh_pos_for_tp_check.get('symbol', 'N/A')} Ticket {ticket} | "
-                                                                     f"TP is wrong or not set | Applied: {applied_tp:.5f} | Expected: {expected_tp:.5f} | "
-                                                                     f"Auto-correcting...")
-                                                        tp_correct_success, tp_correct_reason = self.tp_manager.apply_tp_to_position(ticket, max_attempts=3)
-                                                        if tp_correct_success:
-                                                            logger.info(f"[TP_AUTO_CORRECT_SUCCESS] Ticket {ticket} | {tp_correct_reason}")
-                                                        else:
-                                                            logger.warning(f"[TP_AUTO_CORRECT_FAILED] Ticket {ticket} | {tp_correct_reason}")
-                                    except Exception as tp_check_error:
-                                        logger.debug(f"Error checking/correcting TP for Ticket {ticket}: {tp_check_error}")
-                                
-                                # CRITICAL FIX: Auto-correct SL for negative positions if SL is wrong
-                                # Check if position is negative and SL doesn't match expected -$3.00
-                                # Get fresh position for SL correction check
-                                fresh_pos_for_sl_check = self.order_manager.get_position_by_ticket(ticket)
-                                if fresh_pos_for_sl_check:
-                                    current_profit_check = fresh_pos_for_sl_check.get('profit', 0.0)
-                                    if current_profit_check < 0:  # Negative position
-                                        current_sl_check = fresh_pos_for_sl_check.get('sl', 0.0)
-                                        if current_sl_check > 0:  # SL is set
-                                            # Calculate expected SL for -$3.00
-                                            expected_sl_result = self._enforce_strict_loss_limit(fresh_pos_for_sl_check)
-                                            if expected_sl_result[0]:  # Success
-                                                expected_sl_price = expected_sl_result[2]
-                                                if expected_sl_price is not None:
-                                                    symbol_info_sl = self.mt5_connector.get_symbol_info(fresh_pos_for_sl_check.get('symbol', ''))
-                                                    if symbol_info_sl:
-                                                        point = symbol_info_sl.get('point', 0.00001)
-                                                        sl_tolerance = point * 10  # 1 pip tolerance
+                                                    # Check if SL is wrong (significantly different from expected)
+                                                    if abs(current_sl_check - expected_sl_price) > sl_tolerance:
+                                                        # Calculate effective SL to verify it's wrong
+                                                        effective_sl_profit_check = self.get_effective_sl_profit(fresh_pos_for_sl_check)
+                                                        target_effective_sl = -self.max_risk_usd
                                                         
-                                                        # Check if SL is wrong (significantly different from expected)
-                                                        if abs(current_sl_check - expected_sl_price) > sl_tolerance:
-                                                            # Calculate effective SL to verify it's wrong
-                                                            effective_sl_profit_check = self.get_effective_sl_profit(fresh_pos_for_sl_check)
-                                                            target_effective_sl = -self.max_risk_usd
-                                                            
-                                                            # If effective SL is worse than -$3.00, correct it
-                                                            if effective_sl_profit_check < target_effective_sl:
-                                                                logger.warning(f"[SL_AUTO_CORRECT] {fresh_pos_for_sl_check.get('symbol', 'N/A')} Ticket {ticket} | "
-                                                                             f"SL is wrong for negative position | Current SL: {current_sl_check:.5f} | "
-                                                                             f"Expected SL: {expected_sl_price:.5f} | "
-                                                                             f"Effective SL: ${effective_sl_profit_check:.2f} (target: ${target_effective_sl:.2f}) | "
-                                                                             f"Auto-correcting...")
-                                                                # Force SL correction
-                                                                sl_correct_success, sl_correct_reason = self.update_sl_atomic(ticket, fresh_pos_for_sl_check)
-                                                                if sl_correct_success:
-                                                                    logger.info(f"[SL_AUTO_CORRECT_SUCCESS] Ticket {ticket} | {sl_correct_reason}")
-                                                                else:
-                                                                    logger.warning(f"[SL_AUTO_CORRECT_FAILED] Ticket {ticket} | {sl_correct_reason}")
-                                
-                                # Track success/failure
-                                with self._tracking_lock:
-                                    if success:
-                                        self._last_sl_success[ticket] = attempt_time
-                                        self._consecutive_failures[ticket] = 0  # Reset failure counter
+                                                        # If effective SL is worse than -$3.00, correct it
+                                                        if effective_sl_profit_check < target_effective_sl:
+                                                            logger.warning(f"[SL_AUTO_CORRECT] {fresh_pos_for_sl_check.get('symbol', 'N/A')} Ticket {ticket} | "
+                                                                         f"SL is wrong for negative position | Current SL: {current_sl_check:.5f} | "
+                                                                         f"Expected SL: {expected_sl_price:.5f} | "
+                                                                         f"Effective SL: ${effective_sl_profit_check:.2f} (target: ${target_effective_sl:.2f}) | "
+                                                                         f"Auto-correcting...")
+                                                            # Force SL correction
+                                                            sl_correct_success, sl_correct_reason = self.update_sl_atomic(ticket, fresh_pos_for_sl_check)
+                                                            if sl_correct_success:
+                                                                logger.info(f"[SL_AUTO_CORRECT_SUCCESS] Ticket {ticket} | {sl_correct_reason}")
+                                                            else:
+                                                                logger.warning(f"[SL_AUTO_CORRECT_FAILED] Ticket {ticket} | {sl_correct_reason}")
+                            
+                            # Track success/failure
+                            with self._tracking_lock:
+                                if success:
+                                    self._last_sl_success[ticket] = attempt_time
+                                    self._consecutive_failures[ticket] = 0  # Reset failure counter
+                                else:
+                                    # PHASE 1 FIX 1.2: Count timeout as failure for circuit breaker
+                                    # CRITICAL: Trigger circuit breaker IMMEDIATELY on timeout (don't wait for 3 failures)
+                                    # This prevents the same position from timing out repeatedly and blocking the worker loop
+                                    if timeout_reached:
+                                        self._consecutive_failures[ticket] += 1
+                                        failures = self._consecutive_failures[ticket]
+                                        logger.warning(f"[TIMEOUT_FAILURE] Ticket {ticket} | "
+                                                      f"Timeout counted as failure | "
+                                                      f"Consecutive failures: {failures}")
+                                        
+                                        # PHASE 1 FIX 1.2: Trigger circuit breaker IMMEDIATELY on timeout (not after 3 failures)
+                                        # This prevents repeated 2-second timeouts from blocking the worker loop
+                                        if not is_profit_locking:
+                                            disabled_until = time.time() + self._circuit_breaker_cooldown
+                                            self._ticket_circuit_breaker[ticket] = disabled_until
+                                            logger.critical(f"🚨 CIRCUIT BREAKER: Ticket {ticket} disabled for {self._circuit_breaker_cooldown:.0f}s "
+                                                          f"after timeout (took {update_duration:.1f}ms, limit: {self.sl_update_timeout_seconds*1000:.0f}ms)")
+                                            # PHASE 1 FIX 1.2: Track circuit breaker activation
+                                            with self._verification_lock:
+                                                self._verification_metrics['circuit_breaker_activations'] += 1
+                                                self._verification_metrics['sl_update_timeouts'] += 1
+                                        else:
+                                            # Profit-locking trades bypass circuit breaker but still track timeout
+                                            logger.warning(f"[TIMEOUT_WARNING] Profit-locking Ticket {ticket} timed out but bypassing circuit breaker")
+                                            with self._verification_lock:
+                                                self._verification_metrics['sl_update_timeouts'] += 1
                                     else:
-                                        # PHASE 1 FIX 1.2: Count timeout as failure for circuit breaker
-                                        # CRITICAL: Trigger circuit breaker IMMEDIATELY on timeout (don't wait for 3 failures)
-                                        # This prevents the same position from timing out repeatedly and blocking the worker loop
-                                        if timeout_reached:
+                                        # CRITICAL FIX #2: Count lock timeouts as failures to trigger circuit breaker
+                                        # Lock timeouts indicate serious contention or deadlock conditions that prevent SL updates
+                                        # This is a failure that must be counted to prevent infinite retry loops
+                                        is_lock_timeout = "Lock acquisition timeout" in reason if reason else False
+                                        
+                                        if is_lock_timeout:
+                                            # Lock timeout is a failure - increment counter
                                             self._consecutive_failures[ticket] += 1
                                             failures = self._consecutive_failures[ticket]
-                                            logger.warning(f"[TIMEOUT_FAILURE] Ticket {ticket} | "
-                                                          f"Timeout counted as failure | "
-                                                          f"Consecutive failures: {failures}")
+                                            logger.warning(f"[LOCK_TIMEOUT_FAILURE] Ticket {ticket} | "
+                                                          f"Lock timeout counted as failure | "
+                                                          f"Consecutive failures: {failures} | "
+                                                          f"Reason: {reason}")
                                             
-                                            # PHASE 1 FIX 1.2: Trigger circuit breaker IMMEDIATELY on timeout (not after 3 failures)
-                                            # This prevents repeated 2-second timeouts from blocking the worker loop
-                                            if not is_profit_locking:
-                                                disabled_until = time.time() + self._circuit_breaker_cooldown
+                                            # Circuit breaker: disable after threshold consecutive failures (but NOT for profit-locking trades)
+                                            # CRITICAL FIX: Bypass circuit breaker for profit-locking trades to ensure SL updates always execute
+                                            if failures >= self._circuit_breaker_threshold and not is_profit_locking:
+                                                # Calculate exponential cooldown based on failure count
+                                                failure_bucket = min((failures - self._circuit_breaker_threshold) // 5, 3)  # 0, 1, 2, 3
+                                                cooldown = self._circuit_breaker_cooldown_base * (3 ** failure_bucket)  # 5, 15, 45, 135
+                                                disabled_until = time.time() + cooldown
                                                 self._ticket_circuit_breaker[ticket] = disabled_until
-                                                logger.critical(f"🚨 CIRCUIT BREAKER: Ticket {ticket} disabled for {self._circuit_breaker_cooldown:.0f}s "
-                                                              f"after timeout (took {update_duration:.1f}ms, limit: {self.sl_update_timeout_seconds*1000:.0f}ms)")
-                                                # PHASE 1 FIX 1.2: Track circuit breaker activation
-                                                with self._verification_lock:
-                                                    self._verification_metrics['circuit_breaker_activations'] += 1
-                                                    self._verification_metrics['sl_update_timeouts'] += 1
-                                            else:
-                                                # Profit-locking trades bypass circuit breaker but still track timeout
-                                                logger.warning(f"[TIMEOUT_WARNING] Profit-locking Ticket {ticket} timed out but bypassing circuit breaker")
-                                                with self._verification_lock:
-                                                    self._verification_metrics['sl_update_timeouts'] += 1
+                                                logger.critical(f"🚨 CIRCUIT BREAKER: Ticket {ticket} disabled for {cooldown:.0f}s "
+                                                              f"after {failures} consecutive lock timeout failures (bucket: {failure_bucket})")
+                                            elif failures >= self._circuit_breaker_threshold and is_profit_locking:
+                                                logger.warning(f"[WARNING] Profit-locking Ticket {ticket} has {failures} lock timeout failures, "
+                                                             f"but circuit breaker bypassed for profit-locking trades")
                                         else:
-                                            # CRITICAL FIX #2: Count lock timeouts as failures to trigger circuit breaker
-                                            # Lock timeouts indicate serious contention or deadlock conditions that prevent SL updates
-                                            # This is a failure that must be counted to prevent infinite retry loops
-                                            is_lock_timeout = "Lock acquisition timeout" in reason if reason else False
+                                            # Other errors also increment
+                                            self._consecutive_failures[ticket] += 1
+                                            failures = self._consecutive_failures[ticket]
                                             
-                                            if is_lock_timeout:
-                                                # Lock timeout is a failure - increment counter
-                                                self._consecutive_failures[ticket] += 1
-                                                failures = self._consecutive_failures[ticket]
-                                                logger.warning(f"[LOCK_TIMEOUT_FAILURE] Ticket {ticket} | "
-                                                              f"Lock timeout counted as failure | "
-                                                              f"Consecutive failures: {failures} | "
-                                                              f"Reason: {reason}")
-                                                
-                                                # Circuit breaker: disable after threshold consecutive failures (but NOT for profit-locking trades)
-                                                # CRITICAL FIX: Bypass circuit breaker for profit-locking trades to ensure SL updates always execute
-                                                if failures >= self._circuit_breaker_threshold and not is_profit_locking:
-                                                    # Calculate exponential cooldown based on failure count
-                                                    failure_bucket = min((failures - self._circuit_breaker_threshold) // 5, 3)  # 0, 1, 2, 3
-                                                    cooldown = self._circuit_breaker_cooldown_base * (3 ** failure_bucket)  # 5, 15, 45, 135
-                                                    disabled_until = time.time() + cooldown
-                                                    self._ticket_circuit_breaker[ticket] = disabled_until
-                                                    logger.critical(f"🚨 CIRCUIT BREAKER: Ticket {ticket} disabled for {cooldown:.0f}s "
-                                                                  f"after {failures} consecutive lock timeout failures (bucket: {failure_bucket})")
-                                                elif failures >= self._circuit_breaker_threshold and is_profit_locking:
-                                                    logger.warning(f"[WARNING] Profit-locking Ticket {ticket} has {failures} lock timeout failures, "
-                                                                 f"but circuit breaker bypassed for profit-locking trades")
-                                            else:
-                                                # Other errors also increment
-                                                self._consecutive_failures[ticket] += 1
-                                                failures = self._consecutive_failures[ticket]
-                                                
-                                                # Circuit breaker logic for non-timeout failures
-                                                if failures >= self._circuit_breaker_threshold and not is_profit_locking:
-                                                    failure_bucket = min((failures - self._circuit_breaker_threshold) // 5, 3)
-                                                    cooldown = self._circuit_breaker_cooldown_base * (3 ** failure_bucket)
-                                                    disabled_until = time.time() + cooldown
-                                                    self._ticket_circuit_breaker[ticket] = disabled_until
-                                                    logger.critical(f"🚨 CIRCUIT BREAKER: Ticket {ticket} disabled for {cooldown:.0f}s "
-                                                                  f"after {failures} consecutive failures (bucket: {failure_bucket})")
-                                                elif failures >= self._circuit_breaker_threshold and is_profit_locking:
-                                                    logger.warning(f"[WARNING] Profit-locking Ticket {ticket} has {failures} failures, "
-                                                                 f"but circuit breaker bypassed for profit-locking trades")
-                                
-                                # OPTIMIZATION: Queue MicroProfitEngine check to background thread
-                                # This involves position retrieval and profit calculations which can be slow
-                                if hasattr(self, '_risk_manager') and self._risk_manager:
-                                    micro_profit_engine = getattr(self._risk_manager, '_micro_profit_engine', None)
-                                    if micro_profit_engine:
-                                        try:
-                                            # Queue to background instead of blocking main loop
-                                            self._background_task_queue.put_nowait(('micro_profit_check', {
-                                                'ticket': ticket,
-                                                'micro_profit_engine': micro_profit_engine
-                                            }))
-                                        except queue.Full:
-                                            logger.debug(f"Background queue full, skipping MicroProfitEngine check for ticket {ticket}")
-                                        except Exception as e:
-                                            logger.debug(f"Error queueing MicroProfitEngine check: {e}")
+                                            # Circuit breaker logic for non-timeout failures
+                                            if failures >= self._circuit_breaker_threshold and not is_profit_locking:
+                                                failure_bucket = min((failures - self._circuit_breaker_threshold) // 5, 3)
+                                                cooldown = self._circuit_breaker_cooldown_base * (3 ** failure_bucket)
+                                                disabled_until = time.time() + cooldown
+                                                self._ticket_circuit_breaker[ticket] = disabled_until
+                                                logger.critical(f"🚨 CIRCUIT BREAKER: Ticket {ticket} disabled for {cooldown:.0f}s "
+                                                              f"after {failures} consecutive failures (bucket: {failure_bucket})")
+                                            elif failures >= self._circuit_breaker_threshold and is_profit_locking:
+                                                logger.warning(f"[WARNING] Profit-locking Ticket {ticket} has {failures} failures, "
+                                                             f"but circuit breaker bypassed for profit-locking trades")
                             
-                            except Exception as update_error:
-                                update_error_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                                logger.error(f"[{update_error_timestamp}] SL update exception for Ticket {ticket}: {update_error}", exc_info=True)
-                                success = False
-                                reason = f"Exception: {str(update_error)}"
-                                update_latency = (time.time() - update_start) * 1000
-                                
-                                # Track failure
-                                with self._tracking_lock:
-                                    # FIX 4: Circuit breaker adjustments - ignore lock-timeout failures
-                                    # Exception failures are genuine errors (not lock timeouts), so count them
-                                    self._consecutive_failures[ticket] += 1
-                                    failures = self._consecutive_failures[ticket]
-                                    
-                                    # Circuit breaker: disable after threshold consecutive failures (but NOT for profit-locking trades)
-                                    # CRITICAL FIX: Bypass circuit breaker for profit-locking trades
-                                    if failures >= self._circuit_breaker_threshold and not is_profit_locking:
-                                        disabled_until = time.time() + self._circuit_breaker_cooldown
-                                        self._ticket_circuit_breaker[ticket] = disabled_until
-                                        logger.critical(f"🚨 CIRCUIT BREAKER: Ticket {ticket} disabled for {self._circuit_breaker_cooldown:.0f}s after {failures} consecutive failures")
-                                    elif failures >= self._circuit_breaker_threshold and is_profit_locking:
-                                        logger.warning(f"[WARNING] Profit-locking Ticket {ticket} has {failures} failures, but circuit breaker bypassed for profit-locking trades")
-                                
-                                # Track timing
-                                with self._timing_lock:
-                                    if ticket not in self._timing_stats['ticket_update_times']:
-                                        self._timing_stats['ticket_update_times'][ticket] = []
-                                    self._timing_stats['ticket_update_times'][ticket].append(update_latency)
-                                    # Keep only last 100 measurements per ticket
-                                    if len(self._timing_stats['ticket_update_times'][ticket]) > 100:
-                                        self._timing_stats['ticket_update_times'][ticket].pop(0)
-                                    
-                                    self._timing_stats['update_counts'][ticket] += 1
-                                    self._timing_stats['last_update_time'] = datetime.now()
-                                
-                                # Log update with full details
-                                symbol = fresh_position.get('symbol', 'N/A')
-                                entry_price = fresh_position.get('price_open', 0.0)
-                                current_price = fresh_position.get('price_current', 0.0)
-                                profit = fresh_position.get('profit', 0.0)
-                                applied_sl = fresh_position.get('sl', 0.0)
-                                effective_sl_profit = self.get_effective_sl_profit(fresh_position)
-                                
-                                # Replace "Unknown" with concrete reason
-                                if reason == "Unknown" or "unknown" in reason.lower():
-                                    reason = f"SL update completed (success: {success})"
-                                
-                                # OPTIMIZATION: Only log SL updates if:
-                                # 1. Update failed (always log failures)
-                                # 2. Update was slow (>20ms latency)
-                                # 3. Profit-locking trade (important to track)
-                                # 4. First position in loop (to show loop is working)
-                                should_log_sl_update = (not success) or (update_latency > 20) or is_profit_locking or should_log_position
-                                if should_log_sl_update:
-                                    log_level = logger.warning if not success else logger.info
-                                    log_level(f"🔄 SL UPDATE | Ticket: {ticket} | Symbol: {symbol} | "
-                                             f"Entry: {entry_price:.5f} | Target SL: {applied_sl:.5f} | "
-                                             f"Applied SL: {applied_sl:.5f} | Effective SL Profit: ${effective_sl_profit:.2f} | "
-                                             f"Reason: {reason} | Latency: {update_latency:.1f}ms | Success: {success}")
-                                
-                                # OPTIMIZATION: Queue CSV write to background thread instead of blocking main loop
-                                # CSV writing involves file I/O which can be slow
-                                with self._tracking_lock:
-                                    last_update_time = self._last_sl_success.get(ticket) or self._last_sl_attempt.get(ticket)
-                                    consecutive_failures = self._consecutive_failures.get(ticket, 0)
-                                
-                                # Queue CSV write to background (non-blocking)
-                                try:
-                                    self._csv_write_queue.put_nowait({
-                                        'ticket': ticket, 'symbol': symbol, 'entry_price': entry_price,
-                                        'current_price': current_price, 'profit': profit,
-                                        'target_sl': applied_sl, 'applied_sl': applied_sl,
-                                        'effective_sl_profit': effective_sl_profit,
-                                        'last_update_time': last_update_time,
-                                        'last_update_result': 'SUCCESS' if success else 'FAILED',
-                                        'failure_reason': reason if not success else None,
-                                        'consecutive_failures': consecutive_failures
-                                    })
-                                except queue.Full:
-                                    logger.debug(f"CSV write queue full for ticket {ticket}, skipping")
-                                except Exception:
-                                    pass  # Ignore errors - CSV writing is non-critical
+                            # OPTIMIZATION: Queue MicroProfitEngine check to background thread
+                            # This involves position retrieval and profit calculations which can be slow
+                            if hasattr(self, '_risk_manager') and self._risk_manager:
+                                micro_profit_engine = getattr(self._risk_manager, '_micro_profit_engine', None)
+                                if micro_profit_engine:
+                                    # Queue to background instead of blocking main loop (one pending check per ticket)
+                                    self._background_tasks.submit('micro_profit_check', {
+                                        'ticket': ticket,
+                                        'micro_profit_engine': micro_profit_engine
+                                    }, key=ticket)
                         
-                        except Exception as position_error:
-                            # CRITICAL FIX: Catch any errors in position processing to prevent thread crash
-                            # Log error but continue processing other positions
-                            ticket_for_error = position.get('ticket', 0) if 'position' in locals() else 0
-                            symbol_for_error = position.get('symbol', 'N/A') if 'position' in locals() else 'N/A'
-                            logger.error(f"[POSITION_PROCESSING_ERROR] Error processing position Ticket {ticket_for_error} ({symbol_for_error}): {position_error}", exc_info=True)
-                            # Send heartbeat even on error to prevent false dead detection
+                        except Exception as update_error:
+                            update_error_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                            logger.error(f"[{update_error_timestamp}] SL update exception for Ticket {ticket}: {update_error}", exc_info=True)
+                            success = False
+                            reason = f"Exception: {str(update_error)}"
+                            update_latency = (time.time() - update_start) * 1000
+                            
+                            # Track failure
+                            with self._tracking_lock:
+                                # FIX 4: Circuit breaker adjustments - ignore lock-timeout failures
+                                # Exception failures are genuine errors (not lock timeouts), so count them
+                                self._consecutive_failures[ticket] += 1
+                                failures = self._consecutive_failures[ticket]
+                                
+                                # Circuit breaker: disable after threshold consecutive failures (but NOT for profit-locking trades)
+                                # CRITICAL FIX: Bypass circuit breaker for profit-locking trades
+                                if failures >= self._circuit_breaker_threshold and not is_profit_locking:
+                                    disabled_until = time.time() + self._circuit_breaker_cooldown
+                                    self._ticket_circuit_breaker[ticket] = disabled_until
+                                    logger.critical(f"🚨 CIRCUIT BREAKER: Ticket {ticket} disabled for {self._circuit_breaker_cooldown:.0f}s after {failures} consecutive failures")
+                                elif failures >= self._circuit_breaker_threshold and is_profit_locking:
+                                    logger.warning(f"[WARNING] Profit-locking Ticket {ticket} has {failures} failures, but circuit breaker bypassed for profit-locking trades")
+                            
+                            # Track timing
+                            self._ticket_update_histogram.record(update_latency)
+                            with self._timing_lock:
+                                self._timing_stats['update_counts'][ticket] += 1
+                                self._timing_stats['last_update_time'] = datetime.now()
+                            
+                            # Log update with full details
+                            symbol = fresh_position.get('symbol', 'N/A')
+                            entry_price = fresh_position.get('price_open', 0.0)
+                            current_price = fresh_position.get('price_current', 0.0)
+                            profit = fresh_position.get('profit', 0.0)
+                            applied_sl = fresh_position.get('sl', 0.0)
+                            effective_sl_profit = self.get_effective_sl_profit(fresh_position)
+                            
+                            # Replace "Unknown" with concrete reason
+                            if reason == "Unknown" or "unknown" in reason.lower():
+                                reason = f"SL update completed (success: {success})"
+                            
+                            # OPTIMIZATION: Only log SL updates if:
+                            # 1. Update failed (always log failures)
+                            # 2. Update was slow (>20ms latency)
+                            # 3. Profit-locking trade (important to track)
+                            # 4. First position in loop (to show loop is working)
+                            should_log_sl_update = (not success) or (update_latency > 20) or is_profit_locking or should_log_position
+                            if should_log_sl_update:
+                                log_level = logger.warning if not success else logger.info
+                                log_level(f"🔄 SL UPDATE | Ticket: {ticket} | Symbol: {symbol} | "
+                                         f"Entry: {entry_price:.5f} | Target SL: {applied_sl:.5f} | "
+                                         f"Applied SL: {applied_sl:.5f} | Effective SL Profit: ${effective_sl_profit:.2f} | "
+                                         f"Reason: {reason} | Latency: {update_latency:.1f}ms | Success: {success}")
+                            
+                            # OPTIMIZATION: Queue CSV write to background thread instead of blocking main loop
+                            # CSV writing involves file I/O which can be slow
+                            with self._tracking_lock:
+                                last_update_time = self._last_sl_success.get(ticket) or self._last_sl_attempt.get(ticket)
+                                consecutive_failures = self._consecutive_failures.get(ticket, 0)
+                            
+                            # Queue CSV write to background (non-blocking)
                             try:
-                                system_health.mark_thread_heartbeat("SLWorker")
+                                self._csv_write_queue.put_nowait({
+                                    'ticket': ticket, 'symbol': symbol, 'entry_price': entry_price,
+                                    'current_price': current_price, 'profit': profit,
+                                    'target_sl': applied_sl, 'applied_sl': applied_sl,
+                                    'effective_sl_profit': effective_sl_profit,
+                                    'last_update_time': last_update_time,
+                                    'last_update_result': 'SUCCESS' if success else 'FAILED',
+                                    'failure_reason': reason if not success else None,
+                                    'consecutive_failures': consecutive_failures
+                                })
+                            except queue.Full:
+                                logger.debug(f"CSV write queue full for ticket {ticket}, skipping")
                             except Exception:
-                                pass
-                            # Continue to next position - don't crash the thread
-                            continue
-                    
-                    # PHASE 1 FIX 1.2: Track loop duration for performance monitoring
-                    loop_duration = (time.time() - loop_start_time) * 1000  # Convert to ms
-                    with self._verification_lock:
-                        self._verification_metrics['worker_loop_durations'].append(loop_duration)
-                        # Keep only last 1000 measurements to prevent memory growth
-                        if len(self._verification_metrics['worker_loop_durations']) > 1000:
-                            self._verification_metrics['worker_loop_durations'].pop(0)
-                    with self._timing_lock:
-                        self._timing_stats['loop_durations'].append(loop_duration)
-                        if len(self._timing_stats['loop_durations']) > 1000:
-                            self._timing_stats['loop_durations'].pop(0)
-                        self._timing_stats['last_loop_time'] = datetime.now()
-                        # CRITICAL FIX: Update last_update_time at end of each loop iteration
-                        # This ensures trade gating checks know worker is active even when no SL updates occur
-                        # Prevents false "backlog detected" errors when worker is running normally
-                        self._timing_stats['last_update_time'] = datetime.now()
+                                pass  # Ignore errors - CSV writing is non-critical
                     
-                    # FIX 6: CRITICAL - If loop exceeds 1000ms, skip non-critical updates to prevent cascading delays
-                    # This prevents worker loop from getting stuck processing all positions when under load
-                    if loop_duration > 1000.0:
-                        logger.warning(f"[WORKER_LOOP_SLOW] Loop took {loop_duration:.1f}ms (target: <50ms) | "
-                                     f"Positions: {len(positions) if 'positions' in locals() else 0} | "
-                                     f"Skipping non-critical updates (trailing stops, profit locks) to prevent cascading delays | "
-                                     f"Only processing emergency SL updates (losing trades, first eligible)")
-                        # Skip non-critical updates for this iteration - only process emergency SL
-                        # This prevents the loop from getting slower and slower under load
-                        # Emergency updates (losing trades, first eligible) will still be processed
-                        # Non-emergency updates (trailing stops, profit locks) will be deferred to next iteration
-                        # This is a circuit breaker to prevent cascading performance degradation
+                    except Exception as position_error:
+                        # CRITICAL FIX: Catch any errors in position processing to prevent thread crash
+                        # Log error but continue processing other positions
+                        ticket_for_error = position.get('ticket', 0) if 'position' in locals() else 0
+                        symbol_for_error = position.get('symbol', 'N/A') if 'position' in locals() else 'N/A'
+                        logger.error(f"[POSITION_PROCESSING_ERROR] Error processing position Ticket {ticket_for_error} ({symbol_for_error}): {position_error}", exc_info=True)
+                        # Send heartbeat even on error to prevent false dead detection
+                        try:
+                            system_health.mark_thread_heartbeat(shard.name)
+                        except Exception:
+                            pass
+                        # Continue to next position - don't crash the thread
+                        continue
                     
-                    # CRITICAL FIX: Log performance warning if loop exceeds target
-                    # Target: <10ms ideal, <50ms acceptable
-                    if loop_duration > 50:
-                        loop_end_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                        logger.warning(f"[{loop_end_timestamp}] [WARNING] SL Worker loop exceeded 50ms target: {loop_duration:.1f}ms (target: <50ms, ideal: <10ms) | Positions: {len(positions) if 'positions' in locals() else 0}")
-                        tracer.trace(
-                            function_name="SLManager._sl_worker_loop",
-                            expected=f"Complete iteration {iteration} in <50ms",
-                            actual=f"Iteration {iteration} exceeded 50ms target (took {loop_duration:.1f}ms)",
-                            status="WARNING",
-                            iteration=iteration,
-                            duration_ms=loop_duration,
-                            position_count=len(positions) if 'positions' in locals() else 0
-                        )
-                    elif loop_duration > 10:
-                        # Log info if between 10-50ms (acceptable but not ideal)
-                        if iteration % 50 == 0:  # Only log every 50 iterations to reduce noise
-                            logger.info(f"SL Worker loop duration: {loop_duration:.1f}ms (acceptable, but target is <10ms) | Positions: {len(positions) if 'positions' in locals() else 0}")
+                # PHASE 1 FIX 1.2: Track loop duration for performance monitoring
+                loop_duration = (time.time() - loop_start_time) * 1000  # Convert to ms
+                with self._verification_lock:
+                    self._verification_metrics['worker_loop_durations'].append(loop_duration)
+                    # Keep only last 1000 measurements to prevent memory growth
+                    if len(self._verification_metrics['worker_loop_durations']) > 1000:
+                        self._verification_metrics['worker_loop_durations'].pop(0)
+                self._loop_duration_histogram.record(loop_duration)
+                with self._timing_lock:
+                    self._timing_stats['last_loop_time'] = datetime.now()
+                    # CRITICAL FIX: Update last_update_time at end of each loop iteration
+                    # This ensures trade gating checks know worker is active even when no SL updates occur
+                    # Prevents false "backlog detected" errors when worker is running normally
+                    self._timing_stats['last_update_time'] = datetime.now()
                     
-                    # Sleep to maintain cadence (or instant if interval = 0)
-                    elapsed = time.time() - loop_start_time
-                    sleep_time = max(0, self._sl_worker_interval - elapsed) if self._sl_worker_interval > 0 else 0
+                # FIX 6: CRITICAL - If loop exceeds 1000ms, skip non-critical updates to prevent cascading delays
+                # This prevents worker loop from getting stuck processing all positions when under load
+                if loop_duration > 1000.0:
+                    logger.warning(f"[WORKER_LOOP_SLOW] Loop took {loop_duration:.1f}ms (target: <50ms) | "
+                                 f"Positions: {len(positions) if 'positions' in locals() else 0} | "
+                                 f"Skipping non-critical updates (trailing stops, profit locks) to prevent cascading delays | "
+                                 f"Only processing emergency SL updates (losing trades, first eligible)")
+                    # Skip non-critical updates for this iteration - only process emergency SL
+                    # This prevents the loop from getting slower and slower under load
+                    # Emergency updates (losing trades, first eligible) will still be processed
+                    # Non-emergency updates (trailing stops, profit locks) will be deferred to next iteration
+                    # This is a circuit breaker to prevent cascading performance degradation
                     
+                # CRITICAL FIX: Log performance warning if loop exceeds target
+                # Target: <10ms ideal, <50ms acceptable
+                if loop_duration > 50:
+                    loop_end_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                    logger.warning(f"[{loop_end_timestamp}] [WARNING] SL Worker loop exceeded 50ms target: {loop_duration:.1f}ms (target: <50ms, ideal: <10ms) | Positions: {len(positions) if 'positions' in locals() else 0}")
                     tracer.trace(
                         function_name="SLManager._sl_worker_loop",
-                        expected=f"Complete iteration {iteration} and sleep {self._sl_worker_interval}s",
-                        actual=f"Iteration {iteration} completed in {elapsed:.3f}s, sleeping {sleep_time:.3f}s",
-                        status="OK",
+                        expected=f"Complete iteration {iteration} in <50ms",
+                        actual=f"Iteration {iteration} exceeded 50ms target (took {loop_duration:.1f}ms)",
+                        status="WARNING",
                         iteration=iteration,
-                        duration_seconds=round(elapsed, 3),
-                        positions_processed=len(positions) if 'positions' in locals() else 0
+                        duration_ms=loop_duration,
+                        position_count=len(positions) if 'positions' in locals() else 0
                     )
+                elif loop_duration > 10:
+                    # Log info if between 10-50ms (acceptable but not ideal)
+                    if iteration % 50 == 0:  # Only log every 50 iterations to reduce noise
+                        logger.info(f"SL Worker loop duration: {loop_duration:.1f}ms (acceptable, but target is <10ms) | Positions: {len(positions) if 'positions' in locals() else 0}")
                     
-                    if sleep_time > 0:
-                        time.sleep(sleep_time)
-                    else:
-                        # CRITICAL FIX: Even for instant trailing, sleep 10ms to prevent CPU spinning
-                        # This allows other threads to run and prevents lock contention
-                        min_sleep_ms = 10  # Minimum 10ms sleep even for instant trailing
-                        time.sleep(min_sleep_ms / 1000.0)
-                    # Note: Performance warning already logged above if loop_duration > 50ms
+                # Sleep to maintain cadence (or instant if interval = 0)
+                elapsed = time.time() - loop_start_time
+                sleep_time = max(0, self._sl_worker_interval - elapsed) if self._sl_worker_interval > 0 else 0
+                    
+                tracer.trace(
+                    function_name="SLManager._sl_worker_loop",
+                    expected=f"Complete iteration {iteration} and sleep {self._sl_worker_interval}s",
+                    actual=f"Iteration {iteration} completed in {elapsed:.3f}s, sleeping {sleep_time:.3f}s",
+                    status="OK",
+                    iteration=iteration,
+                    duration_seconds=round(elapsed, 3),
+                    positions_processed=len(positions) if 'positions' in locals() else 0
+                )
+                    
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+                else:
+                    # CRITICAL FIX: Even for instant trailing, sleep 10ms to prevent CPU spinning
+                    # This allows other threads to run and prevents lock contention
+                    min_sleep_ms = 10  # Minimum 10ms sleep even for instant trailing
+                    time.sleep(min_sleep_ms / 1000.0)
+                # Note: Performance warning already logged above if loop_duration > 50ms
             
             # FIX: Clean up all locks held by this thread when loop exits normally
             # This prevents orphaned locks that cause "Holder: No holder info" after thread restart
@@ -8028,9 +8514,9 @@ class SLManager:
                 })
             except Exception:
                 pass  # Fallback if system event logger fails
-            # Notify global health monitor that SLWorker died and block trading
+            # Notify global health monitor that this worker shard died and block trading
             try:
-                system_health.mark_thread_dead("SLWorker", f"exception: {type(e).__name__}")
+                system_health.mark_thread_dead(shard.name, f"exception: {type(e).__name__}")
             except Exception:
                 pass
             
@@ -8041,19 +8527,10 @@ class SLManager:
                 if self._sl_worker_running:  # Only restart if we're supposed to be running
                     logger.critical(f"[THREAD_RECOVERY] Attempting automatic restart of {thread_name}...")
                     try:
-                        # Clean up old thread state
-                        self._sl_worker_running = False
-                        if self._sl_worker_thread and self._sl_worker_thread.is_alive():
-                            # Thread is still alive but crashed - wait for it to finish
-                            self._sl_worker_thread.join(timeout=1.0)
-                        # Restart the worker
-                        self.start_sl_worker()
-                        logger.critical(f"[THREAD_RECOVERY] {thread_name} automatically restarted after crash")
-                        # Reset dead flag
-                        try:
-                            system_health.reset_thread_dead_flag("SLWorker")
-                        except Exception:
-                            pass
+                        # Replace only this shard's thread - the other shards keep running
+                        # (restart_sl_worker_shard also resets the dead flag)
+                        if self.restart_sl_worker_shard(shard.index):
+                            logger.critical(f"[THREAD_RECOVERY] {thread_name} automatically restarted after crash")
                     except Exception as restart_error:
                         logger.critical(f"[THREAD_RECOVERY] Failed to automatically restart {thread_name}: {restart_error}", exc_info=True)
             except Exception as recovery_error:
@@ -8107,102 +8584,111 @@ class SLManager:
     def _check_global_rpc_rate_limit(self, is_emergency: bool = False, consecutive_failures: int = 0, 
                                      is_profit_locking: bool = False, is_trailing: bool = False, 
                                      is_first_eligible: bool = False, ticket: Optional[int] = None, 
-                                     symbol: Optional[str] = None) -> Tuple[bool, float]:
+                                     symbol: Optional[str] = None,
+                                     position: Optional[Dict[str, Any]] = None) -> Tuple[bool, float]:
         """
         Check if global RPC rate limit allows an update.
         
+        Critical updates (emergency, 2+ consecutive failures, profit-locking, first eligible,
+        trailing) are always admitted, with a short backoff when their class bursts. Normal
+        updates over the limit are queued (one entry per ticket) for _drain_rpc_queue().
+        
         Args:
             is_emergency: If True, bypass rate limit (with short backoff to avoid flooding)
             consecutive_failures: Number of consecutive failures (triggers emergency bypass after 2)
             is_profit_locking: If True, bypass rate limit for profit protection
             is_trailing: If True, bypass rate limit for trailing stops
             is_first_eligible: If True, bypass rate limit for first eligible updates
-            ticket: Optional ticket number for logging purposes
+            ticket: Optional ticket number (required for queueing)
             symbol: Optional symbol name for logging purposes
+            position: Optional position dict dispatched when the queued update drains
         
         Returns:
             (allowed, backoff_delay) tuple. If allowed is False, backoff_delay is 0.
         """
-        with self._global_rpc_lock:
-            current_time = time.time()
-            
-            # Remove timestamps older than 1 second
-            self._global_rpc_timestamps = [
-                ts for ts in self._global_rpc_timestamps
-                if current_time - ts < 1.0
-            ]
-            
-            # FIX #4: Critical updates bypass rate limit: emergency, profit-locking, trailing, first eligible
-            is_critical_bypass = is_emergency or consecutive_failures >= 2 or is_profit_locking or is_trailing or is_first_eligible
-            
-            if is_critical_bypass:
-                # Critical update: apply short exponential backoff to avoid broker flooding
-                recent_critical_count = sum(1 for ts in self._global_rpc_timestamps if current_time - ts < 0.1)  # Last 100ms
-                if recent_critical_count > 5:  # More than 5 critical updates in 100ms
-                    backoff = self._emergency_backoff_base * (2 ** min(recent_critical_count - 5, 3))  # Max 400ms
-                    logger.debug(f"[WARNING] Critical update backoff: {backoff*1000:.0f}ms (recent critical: {recent_critical_count})")
-                    return True, backoff
-                return True, 0.0  # No backoff needed
-            
-            # P2-15 FIX: Check if we're at the limit - use priority queue for emergency updates
-            if len(self._global_rpc_timestamps) >= self._global_rpc_max_per_second:
-                # P2-15 FIX: Emergency updates go to priority queue, others to regular queue
-                if is_emergency or is_profit_locking:
-                    # Add to priority queue (will be processed first)
-                    if ticket is not None:
-                        self._global_rpc_priority_queue.append((ticket, current_time, 'emergency' if is_emergency else 'profit_locking'))
-                    ticket_str = f"Ticket {ticket}" if ticket is not None else "Unknown ticket"
-                    symbol_str = symbol if symbol else "Unknown"
-                    logger.debug(f"[RATE_LIMIT_PRIORITY] {symbol_str} {ticket_str} | Added to priority queue (type: {'emergency' if is_emergency else 'profit_locking'})")
-                else:
-                    # Add to regular queue
-                    if ticket is not None:
-                        self._global_rpc_queue.append((ticket, current_time))
-                    ticket_str = f"Ticket {ticket}" if ticket is not None else "Unknown ticket"
-                    symbol_str = symbol if symbol else "Unknown"
-                    logger.debug(f"[RATE_LIMIT_QUEUE] {symbol_str} {ticket_str} | Added to regular queue")
-                return False, 0.0
-            
-            # Allow update - add timestamp
-            self._global_rpc_timestamps.append(current_time)
-            return True, 0.0
+        rpc_class = GlobalRPCLimiter.classify(
+            is_emergency=is_emergency,
+            consecutive_failures=consecutive_failures,
+            is_profit_locking=is_profit_locking,
+            is_trailing=is_trailing,
+            is_first_eligible=is_first_eligible
+        )
+        allowed, backoff = self._rpc_limiter.admit(rpc_class, ticket=ticket, position=position, symbol=symbol)
+        if backoff > 0:
+            logger.debug(f"[WARNING] Critical update backoff: {backoff*1000:.0f}ms (class: {rpc_class.name})")
+        elif not allowed:
+            ticket_str = f"Ticket {ticket}" if ticket is not None else "Unknown ticket"
+            symbol_str = symbol if symbol else "Unknown"
+            logger.debug(f"[RATE_LIMIT_QUEUE] {symbol_str} {ticket_str} | Added to queue "
+                         f"(class: {rpc_class.name}, depth: {self._rpc_limiter.queue_depth()})")
+        return allowed, backoff
+    
+    def _drain_rpc_queue(self, positions: Optional[List[Dict[str, Any]]] = None,
+                         symbol_filter: Optional[Callable[[str], bool]] = None) -> Dict[int, Tuple[bool, str]]:
+        """
+        Dispatch SL updates deferred by the global rate limit, highest priority first.
+        
+        Args:
+            positions: Current open positions (latest data is used for the dispatch);
+                queued tickets missing from the list are dropped as closed
+            symbol_filter: Restrict the dispatch to symbols it accepts (SL worker shard
+                partition); positions must then cover at least those symbols
+        
+        Returns:
+            {ticket: (success, reason)} for every dispatched update
+        """
+        results = {}
+        if self._rpc_limiter.queue_depth() == 0:
+            return results
+        
+        open_positions = None
+        if positions is not None:
+            open_positions = {p.get('ticket'): p for p in positions if p.get('ticket')}
+        
+        for ticket, rpc_class, queued_position in self._rpc_limiter.drain(self._rpc_drain_max_per_cycle, symbol_filter):
+            position = open_positions.get(ticket) if open_positions is not None else queued_position
+            if position is None:
+                self._rpc_limiter.release_grant(ticket)
+                continue
+            try:
+                results[ticket] = self.update_sl_atomic(ticket, position)
+            except Exception as e:
+                logger.error(f"[RATE_LIMIT_DRAIN] Ticket {ticket} | Exception: {e}", exc_info=True)
+                results[ticket] = (False, f"Exception: {str(e)}")
+            finally:
+                self._rpc_limiter.release_grant(ticket)  # No-op if the update consumed it
+            logger.debug(f"[RATE_LIMIT_DRAIN] Ticket {ticket} | Class: {rpc_class.name} | "
+                         f"Success: {results[ticket][0]} | Reason: {results[ticket][1]}")
+        return results
     
     def get_timing_stats(self) -> Dict[str, Any]:
-        """Get timing statistics for monitoring."""
+        """
+        Get timing statistics for monitoring.
+        
+        Latencies (ms) come from streaming histograms: each entry has count/min/max/avg/
+        median/p95/p99 over the process lifetime plus 'windows' (1m/5m/1h) views, and is
+        present only once the histogram has samples.
+        """
         with self._timing_lock:
-            loop_durations = self._timing_stats['loop_durations']
-            ticket_times = self._timing_stats['ticket_update_times']
-            
             stats = {
-                'loop_count': len(loop_durations),
+                'loop_count': self._loop_duration_histogram.count,
                 'last_loop_time': self._timing_stats['last_loop_time'],
                 'last_update_time': self._timing_stats['last_update_time'],
                 'update_counts': dict(self._timing_stats['update_counts'])
             }
             
-            if loop_durations:
-                stats['loop_duration'] = {
-                    'min': min(loop_durations),
-                    'max': max(loop_durations),
-                    'avg': sum(loop_durations) / len(loop_durations),
-                    'p95': sorted(loop_durations)[int(len(loop_durations) * 0.95)] if len(loop_durations) > 0 else 0
-                }
-            
-            # Calculate per-ticket latencies
-            all_latencies = []
-            for ticket, latencies in ticket_times.items():
-                if latencies:
-                    all_latencies.extend(latencies)
-            
-            if all_latencies:
-                stats['ticket_update_latency'] = {
-                    'min': min(all_latencies),
-                    'max': max(all_latencies),
-                    'avg': sum(all_latencies) / len(all_latencies),
-                    'median': sorted(all_latencies)[len(all_latencies) // 2],
-                    'p95': sorted(all_latencies)[int(len(all_latencies) * 0.95)] if len(all_latencies) > 0 else 0
-                }
-            
+            for key, histogram in (('loop_duration', self._loop_duration_histogram),
+                                   ('ticket_update_latency', self._ticket_update_histogram),
+                                   ('lock_wait', self._lock_wait_histogram),
+                                   ('broker_modify_latency', self._broker_modify_histogram)):
+                if histogram.count:
+                    stats[key] = histogram.get_stats()
+            
+            stats['dirty_set'] = self._sl_dirty_tracker.get_stats()
+            stats['ticket_states'] = self._ticket_states.get_stats()
+            stats['sl_modify_queue'] = self._sl_modify_queue.get_stats()
+            stats['sl_verification'] = self._sl_verifier.get_stats()
+            stats['background_tasks'] = self._background_tasks.get_stats()
             return stats
     
     def get_worker_status(self) -> Dict[str, Any]:
@@ -8224,7 +8710,9 @@ class SLManager:
             'last_position_count': current_position_count,
             'last_active_tickets': len(current_active_tickets),
             'manual_review_tickets': list(self._manual_review_tickets),
-            'error_occurrence_metrics': dict(self._error_occurrence_metrics)
+            'error_occurrence_metrics': dict(self._error_occurrence_metrics),
+            # Threaded SL worker shards (empty unless start_sl_worker() was called)
+            'worker_shards': [shard.get_status() for shard in self._sl_worker_shards] if self._sl_worker_running else []
         }
     
     def _get_sl_worker_metrics(self) -> Dict[str, Any]:
@@ -8278,6 +8766,15 @@ class SLManager:
             else:
                 self._verification_metrics['lock_contention_count'] += 1
     
+    def get_lock_contention_report(self, top_n: int = 10) -> Dict[str, Any]:
+        """
+        Lock contention profile of the ticket, tracking, timing and global RPC locks.
+        
+        See LockContentionProfiler.get_report(): wait/hold distributions per lock class
+        and thread, and the top_n code sites by hold time and by timeouts they caused.
+        """
+        return self._lock_profiler.get_report(top_n)
+    
     def get_verification_metrics(self) -> Dict[str, Any]:
         """
         Get verification metrics for system health monitoring.
@@ -8399,6 +8896,8 @@ class SLManager:
             logger.info(f"  Lock Failures: {metrics['lock_acquisition_failures']} | "
                        f"Timeouts: {metrics['lock_timeouts']} | "
                        f"Contention: {metrics['lock_contention_count']}")
+            for line in self._lock_profiler.format_report():
+                logger.info(f"  {line}")
             
             if metrics['duplicate_update_attempts'] > 0:
                 logger.warning(f"  [WARNING] Duplicate Update Attempts: {metrics['duplicate_update_attempts']} "
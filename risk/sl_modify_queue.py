@@ -0,0 +1,201 @@
+"""
+SL Modification Queue
+Last-writer-wins SL modify coalescing per ticket.
+
+In fast markets update_sl_atomic() is reached for the same ticket from the SL
+worker, the synchronous pre-cycle update and the profit-locking path, and each
+caller used to send its own modify. Callers arriving while a modify is in
+flight queued behind the ticket lock and then re-sent the same (or an already
+superseded) SL, which the broker rejects as "no changes".
+
+Each ticket now has at most one in-flight modify and one pending target:
+- a caller whose target equals the in-flight target waits for that result
+- a target less protective (BUY: lower SL, SELL: higher SL) than the
+  in-flight or pending one is dropped and its caller waits for the modify that
+  supersedes it, so a stale caller can never loosen an SL sent or queued after
+  a tighter one
+- otherwise its target becomes the pending target, replacing an earlier
+  pending target
+- the thread that started the in-flight modify sends the pending target when
+  the modify completes; every caller receives the outcome of the modify that
+  carried its own target, or of the tighter modify that superseded it
+
+Completion listeners receive every finished modify (e.g. for verification).
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Shares the SLManager logger (configured with the live/backtest log path by SLManager)
+logger = logging.getLogger("sl_manager")
+
+# (ticket, target_sl, success) -> None
+CompletionListener = Callable[[int, float, bool], None]
+
+
+def is_at_least_as_protective(new_sl: float, old_sl: float, order_type: str) -> bool:
+    """True if new_sl protects the position at least as well as old_sl."""
+    if old_sl <= 0:
+        return True
+    if new_sl <= 0:
+        return False
+    if order_type == 'BUY':
+        return new_sl >= old_sl
+    return new_sl <= old_sl
+
+
+class _TicketSlot:
+    """In-flight and pending modify for one ticket."""
+
+    __slots__ = ('order_type', 'in_flight', 'in_flight_future', 'pending', 'pending_future')
+
+    def __init__(self, order_type: str):
+        self.order_type = order_type
+        self.in_flight: Optional[float] = None
+        self.in_flight_future: Optional[Future] = None
+        self.pending: Optional[float] = None
+        self.pending_future: Optional[Future] = None
+
+
+class SLModifyQueue:
+    """Per-ticket SL modify coalescing (thread-safe)."""
+
+    def __init__(self, wait_timeout_seconds: float = 5.0):
+        """
+        Initialize the queue.
+
+        Args:
+            wait_timeout_seconds: Maximum time a coalesced caller waits for the
+                modify carrying its target
+        """
+        self.wait_timeout = wait_timeout_seconds
+        self._lock = threading.Lock()
+        self._slots: Dict[int, _TicketSlot] = {}
+        self._listeners: List[CompletionListener] = []
+        self._stats = {
+            'submitted': 0,
+            'sent': 0,
+            'joined_in_flight': 0,
+            'coalesced_pending': 0,
+            'regressions_ignored': 0,
+            'wait_timeouts': 0,
+        }
+
+    def add_listener(self, listener: CompletionListener):
+        """Register a callback invoked after every completed modify."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def submit(self, ticket: int, order_type: str, target_sl: float,
+               execute: Callable[[float], bool], point: float = 0.0) -> Tuple[bool, float]:
+        """
+        Request an SL modify.
+
+        Args:
+            ticket: Position ticket
+            order_type: 'BUY' or 'SELL'
+            target_sl: Requested SL price
+            execute: Sends one modify for the given SL price; returns success
+            point: Symbol point (targets within half a point are the same SL)
+
+        Returns:
+            (success, applied_sl) of the modify that carried this request's target. A
+            target superseded by a tighter in-flight or pending one gets that modify's
+            outcome, so applied_sl may be more protective than target_sl, never less
+        """
+        tolerance = point / 2.0 if point > 0 else 1e-9
+        with self._lock:
+            self._stats['submitted'] += 1
+            slot = self._slots.get(ticket)
+            if slot is None:
+                slot = self._slots[ticket] = _TicketSlot(order_type)
+            if slot.in_flight is None:
+                slot.in_flight = target_sl
+                slot.in_flight_future = Future()
+                waiter = None
+            elif abs(target_sl - slot.in_flight) <= tolerance:
+                self._stats['joined_in_flight'] += 1
+                waiter = slot.in_flight_future
+            elif not is_at_least_as_protective(target_sl, slot.in_flight, slot.order_type):
+                # Stale target looser than the SL being sent - never queue it behind
+                self._stats['regressions_ignored'] += 1
+                waiter = slot.in_flight_future
+            else:
+                if slot.pending is None:
+                    slot.pending = target_sl
+                    slot.pending_future = Future()
+                elif is_at_least_as_protective(target_sl, slot.pending, slot.order_type):
+                    self._stats['coalesced_pending'] += 1
+                    slot.pending = target_sl
+                else:
+                    self._stats['regressions_ignored'] += 1
+                waiter = slot.pending_future
+
+        if waiter is not None:
+            try:
+                return waiter.result(timeout=self.wait_timeout)
+            except FutureTimeoutError:
+                with self._lock:
+                    self._stats['wait_timeouts'] += 1
+                logger.warning(f"[SL_MODIFY_QUEUE] Ticket {ticket} | Timed out waiting "
+                               f"{self.wait_timeout:.1f}s for queued SL {target_sl:.5f}")
+                return False, target_sl
+
+        return self._run(ticket, slot, execute)
+
+    def _run(self, ticket: int, slot: _TicketSlot, execute: Callable[[float], bool]) -> Tuple[bool, float]:
+        """
+        Send the in-flight target, then any pending target, until the slot is idle.
+
+        Returns the result of the caller's own (first) target; pending targets
+        are reported to their waiters through the pending future.
+        """
+        own_result = None
+        while True:
+            target = slot.in_flight
+            try:
+                success = bool(execute(target))
+            except Exception as e:
+                logger.error(f"[SL_MODIFY_QUEUE] Ticket {ticket} | Modify raised: {e}", exc_info=True)
+                success = False
+            result = (success, target)
+            if own_result is None:
+                own_result = result
+            slot.in_flight_future.set_result(result)
+            self._notify(ticket, target, success)
+            with self._lock:
+                self._stats['sent'] += 1
+                if slot.pending is None:
+                    slot.in_flight = None
+                    slot.in_flight_future = None
+                    if self._slots.get(ticket) is slot:
+                        del self._slots[ticket]
+                    return own_result
+                slot.in_flight, slot.in_flight_future = slot.pending, slot.pending_future
+                slot.pending = None
+                slot.pending_future = None
+
+    def _notify(self, ticket: int, target: float, success: bool):
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(ticket, target, success)
+            except Exception as e:
+                logger.debug(f"[SL_MODIFY_QUEUE] Completion listener failed for Ticket {ticket}: {e}")
+
+    def in_flight(self, ticket: int) -> Optional[float]:
+        """Target currently being sent for a ticket (None if idle)."""
+        with self._lock:
+            slot = self._slots.get(ticket)
+            return slot.in_flight if slot is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['active_tickets'] = len(self._slots)
+        saved = stats['joined_in_flight'] + stats['coalesced_pending'] + stats['regressions_ignored']
+        stats['modifies_saved'] = saved
+        return stats
@@ -0,0 +1,226 @@
+"""
+Deferred SL Verification
+Confirms SL modifies against the next position snapshot instead of blocking.
+
+update_sl_atomic() used to sleep sl_verification_delay_seconds (500ms) after
+every successful modify and re-read the position from the broker before moving
+on to the next position, and _execute_sl_modify_only() slept another 50ms for
+an immediate re-read. With one worker thread that serialised every position
+behind the slowest broker round trip.
+
+A successful modify now records the expected SL and returns. Every position
+snapshot (the shared position bus, the SL worker loop, the synchronous cycle)
+is checked against the outstanding expectations:
+
+- SL within tolerance (or already more protective): confirmed
+- snapshot captured at least settle_seconds after the modify with a different
+  SL: mismatch, reported to the on_mismatch callback
+- ticket missing from the snapshot: position closed, expectation dropped
+- nothing conclusive within timeout_seconds: timeout, queued for SLWatchdog
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from risk.sl_modify_queue import is_at_least_as_protective
+
+# Shares the SLManager logger (configured with the live/backtest log path by SLManager)
+logger = logging.getLogger("sl_manager")
+
+# (ticket, symbol, expected_sl, applied_sl) -> None
+MismatchCallback = Callable[[int, str, float, float], None]
+
+
+class _Expectation:
+    """Outstanding SL modify awaiting confirmation."""
+
+    __slots__ = ('ticket', 'symbol', 'order_type', 'expected_sl', 'tolerance', 'submitted_at')
+
+    def __init__(self, ticket: int, symbol: str, order_type: str, expected_sl: float,
+                 tolerance: float, submitted_at: float):
+        self.ticket = ticket
+        self.symbol = symbol
+        self.order_type = order_type
+        self.expected_sl = expected_sl
+        self.tolerance = tolerance
+        self.submitted_at = submitted_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ticket': self.ticket,
+            'symbol': self.symbol,
+            'expected_sl': self.expected_sl,
+            'submitted_at': self.submitted_at,
+        }
+
+
+class DeferredSLVerifier:
+    """Outstanding SL expectations checked against position snapshots (thread-safe)."""
+
+    def __init__(self, settle_seconds: float = 0.5, timeout_seconds: float = 5.0,
+                 max_timeouts: int = 100, on_mismatch: Optional[MismatchCallback] = None):
+        """
+        Initialize the verifier.
+
+        Args:
+            settle_seconds: Time the broker gets to reflect a modify before a
+                differing SL counts as a mismatch
+            timeout_seconds: Time after which an unconfirmed modify is reported
+            max_timeouts: Timeouts kept until SLWatchdog collects them
+            on_mismatch: Called (outside the verifier lock) for every mismatch
+        """
+        self.settle_seconds = max(0.0, settle_seconds)
+        self.timeout_seconds = max(self.settle_seconds, timeout_seconds)
+        self.on_mismatch = on_mismatch
+        self._lock = threading.Lock()
+        self._pending: Dict[int, _Expectation] = {}
+        self._timeouts = deque(maxlen=max_timeouts)
+        self._stats = {
+            'expected': 0,
+            'confirmed': 0,
+            'mismatched': 0,
+            'closed': 0,
+            'timed_out': 0,
+        }
+        self._confirm_latency_total = 0.0
+
+    def expect(self, ticket: int, symbol: str, expected_sl: float, tolerance: float,
+               order_type: str = '', submitted_at: Optional[float] = None):
+        """
+        Record the SL a successful modify should produce (replaces any earlier expectation).
+
+        Args:
+            ticket: Position ticket
+            symbol: Trading symbol
+            expected_sl: SL price sent to the broker
+            tolerance: Maximum price difference still counted as applied
+            order_type: 'BUY' or 'SELL' (a more protective SL also confirms)
+            submitted_at: Time the modify returned (defaults to now)
+        """
+        expectation = _Expectation(ticket, symbol, order_type, expected_sl, tolerance,
+                                   submitted_at if submitted_at is not None else time.time())
+        with self._lock:
+            self._pending[ticket] = expectation
+            self._stats['expected'] += 1
+
+    def is_pending(self, ticket: int) -> bool:
+        with self._lock:
+            return ticket in self._pending
+
+    def pending_tickets(self) -> List[int]:
+        """Tickets with an outstanding expectation."""
+        with self._lock:
+            return list(self._pending)
+
+    def forget(self, ticket: int):
+        """Drop the expectation for a closed position."""
+        with self._lock:
+            self._pending.pop(ticket, None)
+
+    def on_snapshot(self, snapshot):
+        """PositionSnapshotBus subscriber - checks the published snapshot."""
+        self.check_positions(snapshot.positions, snapshot.captured_at,
+                             open_tickets=snapshot.tickets(exclude_dec8=False))
+
+    def check_positions(self, positions: Iterable[Mapping[str, Any]], captured_at: float,
+                        open_tickets: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """
+        Resolve outstanding expectations against a position snapshot.
+
+        Args:
+            positions: Every open position at captured_at
+            captured_at: Time the positions were read from the broker
+            open_tickets: Open tickets if positions is not the complete set
+
+        Returns:
+            Count of expectations resolved per outcome
+        """
+        outcome = {'confirmed': 0, 'mismatched': 0, 'closed': 0, 'timed_out': 0}
+        with self._lock:
+            if not self._pending:
+                return outcome
+            by_ticket = {p.get('ticket'): p for p in positions}
+            open_set = set(open_tickets) if open_tickets is not None else set(by_ticket)
+            mismatches = []
+            for ticket, expectation in list(self._pending.items()):
+                # Only snapshots taken after the modify returned can prove anything
+                if captured_at < expectation.submitted_at:
+                    continue
+                if ticket not in open_set:
+                    del self._pending[ticket]
+                    outcome['closed'] += 1
+                    continue
+                position = by_ticket.get(ticket)
+                if position is None:
+                    continue
+                applied_sl = position.get('sl', 0.0)
+                if self._is_applied(expectation, applied_sl):
+                    del self._pending[ticket]
+                    outcome['confirmed'] += 1
+                    self._confirm_latency_total += captured_at - expectation.submitted_at
+                elif captured_at - expectation.submitted_at >= self.settle_seconds:
+                    del self._pending[ticket]
+                    outcome['mismatched'] += 1
+                    mismatches.append((expectation, applied_sl))
+            self._expire_locked(captured_at, outcome)
+            for key, count in outcome.items():
+                self._stats[key] += count
+
+        for expectation, applied_sl in mismatches:
+            logger.warning(f"[SL_VERIFY_MISMATCH] {expectation.symbol} Ticket {expectation.ticket} | "
+                           f"Expected: {expectation.expected_sl:.5f} | Applied: {applied_sl:.5f} | "
+                           f"Diff: {abs(applied_sl - expectation.expected_sl):.5f} "
+                           f"(tolerance: {expectation.tolerance:.5f})")
+            if self.on_mismatch is not None:
+                try:
+                    self.on_mismatch(expectation.ticket, expectation.symbol,
+                                     expectation.expected_sl, applied_sl)
+                except Exception as e:
+                    logger.error(f"[SL_VERIFY_MISMATCH] Callback failed for Ticket {expectation.ticket}: {e}",
+                                 exc_info=True)
+        return outcome
+
+    @staticmethod
+    def _is_applied(expectation: _Expectation, applied_sl: float) -> bool:
+        if abs(applied_sl - expectation.expected_sl) < expectation.tolerance:
+            return True
+        # Superseded by a later, tighter modify (e.g. a newer trailing rung)
+        return bool(expectation.order_type) and applied_sl > 0 and \
+            is_at_least_as_protective(applied_sl, expectation.expected_sl, expectation.order_type)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Move expectations older than timeout_seconds to the timeout queue."""
+        outcome = {'timed_out': 0}
+        with self._lock:
+            self._expire_locked(now if now is not None else time.time(), outcome)
+            self._stats['timed_out'] += outcome['timed_out']
+        return outcome['timed_out']
+
+    def _expire_locked(self, now: float, outcome: Dict[str, int]):
+        for ticket, expectation in list(self._pending.items()):
+            if now - expectation.submitted_at >= self.timeout_seconds:
+                del self._pending[ticket]
+                self._timeouts.append(expectation.to_dict())
+                outcome['timed_out'] += 1
+                logger.warning(f"[SL_VERIFY_TIMEOUT] {expectation.symbol} Ticket {ticket} | "
+                               f"Expected SL {expectation.expected_sl:.5f} not confirmed within "
+                               f"{self.timeout_seconds:.1f}s")
+
+    def pop_timeouts(self) -> List[Dict[str, Any]]:
+        """Timeouts recorded since the last call (consumed by SLWatchdog)."""
+        with self._lock:
+            timeouts = list(self._timeouts)
+            self._timeouts.clear()
+        return timeouts
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            stats['unreported_timeouts'] = len(self._timeouts)
+            confirmed = stats['confirmed']
+            stats['avg_confirm_ms'] = round(self._confirm_latency_total / confirmed * 1000, 1) if confirmed else 0.0
+        return stats
@@ -0,0 +1,93 @@
+"""
+SL Worker Shards
+Partitions open positions between SL worker threads by symbol.
+
+A single SL worker thread owned every ticket, so the 1-second loop time
+budget was shared by all open positions and slow iterations deferred the
+remaining tickets to the next loop. With execution.sl_worker.shards > 1 the
+worker runs N threads, each owning a deterministic partition of symbols:
+
+- a symbol always maps to the same shard (crc32, stable across restarts), so
+  every ticket is evaluated by exactly one thread and per-ticket locks are
+  never contended between shards
+- each shard has its own loop time budget, heartbeat (registered with
+  utils/system_health as SLWorker-<index>) and cached metrics
+- shard 0 (primary) also runs the once-per-loop housekeeping: deferred SL
+  verification, fail-safe / stale-lock queueing, summaries and lock cleanup
+
+With one shard the worker keeps the legacy "SLWorker" thread name.
+"""
+
+import threading
+import zlib
+from typing import Any, Dict, List, Optional
+
+
+def symbol_shard(symbol: str, shard_count: int) -> int:
+    """Shard index owning a symbol (deterministic across processes)."""
+    if shard_count <= 1:
+        return 0
+    return zlib.crc32((symbol or '').encode('utf-8')) % shard_count
+
+
+class SLWorkerShard:
+    """One SL worker thread and the symbol partition it owns."""
+
+    __slots__ = ('index', 'count', 'name', 'thread', 'last_position_count', 'last_active_tickets',
+                 'last_loop_time', 'iterations', 'restarts')
+
+    def __init__(self, index: int, count: int):
+        """
+        Initialize the shard.
+
+        Args:
+            index: Shard index (0 is the primary shard)
+            count: Total number of shards
+        """
+        self.index = index
+        self.count = max(1, count)
+        self.name = "SLWorker" if self.count == 1 else f"SLWorker-{index}"
+        self.thread: Optional[threading.Thread] = None
+        # Cached metrics for timer-based heartbeat (no MT5 calls from heartbeat thread)
+        self.last_position_count = 0
+        self.last_active_tickets = 0
+        self.last_loop_time: Optional[float] = None
+        self.iterations = 0
+        self.restarts = 0
+
+    @property
+    def is_primary(self) -> bool:
+        return self.index == 0
+
+    @property
+    def is_sharded(self) -> bool:
+        return self.count > 1
+
+    def owns(self, symbol: str) -> bool:
+        return symbol_shard(symbol, self.count) == self.index
+
+    def select(self, positions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Positions whose symbol belongs to this shard."""
+        if not self.is_sharded:
+            return positions
+        return [p for p in positions if self.owns(p.get('symbol', ''))]
+
+    def is_alive(self) -> bool:
+        return bool(self.thread and self.thread.is_alive())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "positions": self.last_position_count,
+            "active_tickets": self.last_active_tickets,
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'index': self.index,
+            'thread_alive': self.is_alive(),
+            'positions': self.last_position_count,
+            'iterations': self.iterations,
+            'last_loop_time': self.last_loop_time,
+            'restarts': self.restarts,
+        }
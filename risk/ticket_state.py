@@ -0,0 +1,285 @@
+"""
+Per-Ticket State Table
+One slotted TicketState record per open position for SLManager.
+
+SLManager used to keep per-ticket state in ~25 parallel dicts, each cleaned up
+separately (and several never cleaned up at all). The table holds a single
+TicketState per ticket; creating and removing a ticket is one atomic operation
+under a short leaf lock, so no field can outlive its position.
+
+Existing code keeps its dict-style access through TicketFieldView, a
+MutableMapping over one TicketState attribute:
+
+    self._last_sl_update = self._ticket_states.field('last_sl_update')
+    self._last_sl_update[ticket] = datetime.now()
+
+Removed tickets are kept in a bounded tombstone area. Late writes for a closed
+ticket (a worker racing with cleanup) land on the tombstone record instead of
+resurrecting the ticket in the live map.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Per-ticket fields (one per former SLManager dict)
+TICKET_FIELDS = (
+    'position_tracking',
+    'profit_zone_entry',
+    'last_sl_update',
+    'last_sl_price',
+    'last_sl_reason',
+    'last_sl_attempt',
+    'last_sl_success',
+    'consecutive_failures',
+    'first_eligible_update',
+    'profit_lock_failures',
+    'profit_lock_failure_timestamps',
+    'profit_lock_alert_cooldown',
+    'sl_update_cooldown',
+    'sl_update_rate_limit',
+    'emergency_enforcement_count',
+    'ticket_circuit_breaker',
+    'circuit_breaker_activation_times',
+    'circuit_breaker_failure_types',
+    'fail_safe_cooldown',
+    'lock_hold_times',
+    'lock_holders',
+    'lock_holder_stack_traces',
+    'orphaned_ticket_timestamps',
+    'sl_ladder',
+    'last_sl_modify',
+)
+
+
+class _Unset:
+    """Marker for a field that has no value (the old dict had no key)."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return '<unset>'
+
+
+UNSET = _Unset()
+
+
+class TicketState:
+    """All SLManager state for one ticket."""
+
+    __slots__ = ('ticket', 'created_at', 'closed_at') + TICKET_FIELDS
+
+    def __init__(self, ticket: int):
+        self.ticket = ticket
+        self.created_at = time.time()
+        self.closed_at = None
+        for name in TICKET_FIELDS:
+            setattr(self, name, UNSET)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fields that are set, keyed by field name."""
+        data = {}
+        for name in TICKET_FIELDS:
+            value = getattr(self, name)
+            if value is not UNSET:
+                data[name] = value
+        return data
+
+
+class TicketStateTable:
+    """Thread-safe map of ticket -> TicketState with a bounded tombstone area."""
+
+    def __init__(self, tombstone_limit: int = 256):
+        """
+        Initialize the table.
+
+        Args:
+            tombstone_limit: Number of recently removed tickets remembered
+        """
+        self.tombstone_limit = max(0, tombstone_limit)
+        self._lock = threading.Lock()  # Leaf lock - never held while acquiring another
+        self._live: Dict[int, TicketState] = {}
+        self._tombstones: 'OrderedDict[int, TicketState]' = OrderedDict()
+
+    def get(self, ticket: int) -> Optional[TicketState]:
+        """State for a live or recently removed ticket (None if unknown)."""
+        state = self._live.get(ticket)
+        if state is None:
+            state = self._tombstones.get(ticket)
+        return state
+
+    def get_or_create(self, ticket: int) -> TicketState:
+        """State for a ticket, created on first use (tombstoned tickets are not revived)."""
+        state = self._live.get(ticket)
+        if state is not None:
+            return state
+        with self._lock:
+            return self._get_or_create_locked(ticket)
+
+    def _get_or_create_locked(self, ticket: int) -> TicketState:
+        state = self._live.get(ticket)
+        if state is None:
+            state = self._tombstones.get(ticket)
+            if state is None:
+                state = self._live[ticket] = TicketState(ticket)
+        return state
+
+    def set_field(self, ticket: int, name: str, value: Any):
+        with self._lock:
+            setattr(self._get_or_create_locked(ticket), name, value)
+
+    def remove(self, ticket: int) -> Optional[TicketState]:
+        """
+        Remove a ticket and all of its fields.
+
+        Returns:
+            The removed state, or None if the ticket was not live
+        """
+        with self._lock:
+            state = self._live.pop(ticket, None)
+            if self.tombstone_limit:
+                tombstone = TicketState(ticket)
+                tombstone.closed_at = time.time()
+                self._tombstones[ticket] = tombstone
+                self._tombstones.move_to_end(ticket)
+                while len(self._tombstones) > self.tombstone_limit:
+                    self._tombstones.popitem(last=False)
+        return state
+
+    def prune(self, open_tickets: Iterable[int], as_of: Optional[float] = None) -> List[int]:
+        """
+        Remove every live ticket not in open_tickets; returns the removed tickets.
+
+        Args:
+            open_tickets: Tickets open at as_of
+            as_of: Time the open tickets were read; records created later are kept
+                (a position opened after the read is not in it)
+        """
+        open_tickets = set(open_tickets)
+        stale = [state.ticket for state in self.states()
+                 if state.ticket not in open_tickets and (as_of is None or state.created_at <= as_of)]
+        for ticket in stale:
+            self.remove(ticket)
+        return stale
+
+    def is_closed(self, ticket: int) -> bool:
+        return ticket not in self._live and ticket in self._tombstones
+
+    def tickets(self) -> List[int]:
+        """Snapshot of live tickets."""
+        with self._lock:
+            return list(self._live)
+
+    def states(self) -> List[TicketState]:
+        """Snapshot of live states."""
+        with self._lock:
+            return list(self._live.values())
+
+    def field(self, name: str, default_factory: Optional[Callable[[], Any]] = None) -> 'TicketFieldView':
+        """Dict-style view over one field (default_factory gives defaultdict behaviour)."""
+        if name not in TICKET_FIELDS:
+            raise KeyError(f"Unknown ticket field: {name}")
+        return TicketFieldView(self, name, default_factory)
+
+    def clear(self):
+        with self._lock:
+            self._live.clear()
+            self._tombstones.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'live': len(self._live),
+                'tombstones': len(self._tombstones),
+                'tombstone_limit': self.tombstone_limit,
+            }
+
+
+class TicketFieldView(MutableMapping):
+    """
+    {ticket: value} mapping over one TicketState field.
+
+    Point access (get, in, [], del) also sees tombstoned tickets so late writes
+    read back consistently; iteration and len() cover live tickets only.
+    """
+
+    __slots__ = ('_table', '_name', '_default_factory')
+
+    def __init__(self, table: TicketStateTable, name: str,
+                 default_factory: Optional[Callable[[], Any]] = None):
+        self._table = table
+        self._name = name
+        self._default_factory = default_factory
+
+    def __getitem__(self, ticket: int) -> Any:
+        state = self._table.get(ticket)
+        value = getattr(state, self._name) if state is not None else UNSET
+        if value is UNSET:
+            if self._default_factory is None:
+                raise KeyError(ticket)
+            value = self._default_factory()
+            self._table.set_field(ticket, self._name, value)
+        return value
+
+    def __setitem__(self, ticket: int, value: Any):
+        self._table.set_field(ticket, self._name, value)
+
+    def __delitem__(self, ticket: int):
+        state = self._table.get(ticket)
+        if state is None or getattr(state, self._name) is UNSET:
+            raise KeyError(ticket)
+        setattr(state, self._name, UNSET)
+
+    def __contains__(self, ticket: object) -> bool:
+        state = self._table.get(ticket)
+        return state is not None and getattr(state, self._name) is not UNSET
+
+    def get(self, ticket: int, default: Any = None) -> Any:
+        state = self._table.get(ticket)
+        if state is None:
+            return default
+        value = getattr(state, self._name)
+        return default if value is UNSET else value
+
+    def pop(self, ticket: int, *args: Any) -> Any:
+        state = self._table.get(ticket)
+        value = getattr(state, self._name) if state is not None else UNSET
+        if value is UNSET:
+            if args:
+                return args[0]
+            raise KeyError(ticket)
+        setattr(state, self._name, UNSET)
+        return value
+
+    def __iter__(self) -> Iterator[int]:
+        name = self._name
+        return iter([state.ticket for state in self._table.states()
+                     if getattr(state, name) is not UNSET])
+
+    def __len__(self) -> int:
+        name = self._name
+        return sum(1 for state in self._table.states() if getattr(state, name) is not UNSET)
+
+    def items(self):
+        name = self._name
+        pairs = []
+        for state in self._table.states():
+            value = getattr(state, name)
+            if value is not UNSET:
+                pairs.append((state.ticket, value))
+        return pairs
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def copy(self) -> Dict[int, Any]:
+        return dict(self.items())
+
+    def clear(self):
+        for state in self._table.states():
+            setattr(state, self._name, UNSET)
+
+    def __repr__(self) -> str:
+        return f"TicketFieldView({self._name}, {self.copy()!r})"
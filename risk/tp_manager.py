@@ -19,6 +19,8 @@ from collections import defaultdict
 
 from execution.mt5_connector import MT5Connector
 from execution.order_manager import OrderManager
+from execution.mt5_io import MT5Priority, mt5_call
+from execution.position_snapshot import read_position_snapshot, uses_position_bus
 from utils.logger_factory import get_logger
 import MetaTrader5 as mt5
 
@@ -641,7 +643,7 @@ class TPManager:
         filling_type = None
         filling_modes = symbol_info.get('filling_mode')
         if filling_modes is None:
-            symbol_info_obj = mt5.symbol_info(symbol)
+            symbol_info_obj = mt5_call(self.mt5_connector, mt5.symbol_info, symbol, priority=MT5Priority.CLOSE)
             if symbol_info_obj is not None:
                 filling_modes = symbol_info_obj.filling_mode if hasattr(symbol_info_obj, 'filling_mode') else None
         
@@ -670,7 +672,7 @@ class TPManager:
             "type_filling": filling_type,
         }
         
-        result = mt5.order_send(request)
+        result = mt5_call(self.mt5_connector, mt5.order_send, request, priority=MT5Priority.CLOSE)
         
         if result is None:
             logger.error(f"Partial close send returned None for ticket {ticket}")
@@ -890,9 +892,22 @@ class TPManager:
                 
                 logger.debug(f"[SOFT_TP_CHECK] Checking {len(tickets_to_monitor)} position(s) | Iteration: {loop_iteration}")
                 
+                # One shared snapshot per pass instead of a full positions_get() per ticket
+                snapshot = read_position_snapshot(self.order_manager, 'soft_tp')
+                if snapshot is None and uses_position_bus(self.order_manager):
+                    # Broker outage (no snapshot within the stale fallback limit) - per-ticket
+                    # reads would fail too and look like closures, so skip this pass
+                    logger.warning("[SOFT_TP_CHECK] No position snapshot within staleness limit - skipping pass")
+                    time.sleep(self._soft_tp_check_interval)
+                    continue
+                
                 # Check each position
                 for ticket, tp_price, tp_target_usd in tickets_to_monitor:
-                    position = self.order_manager.get_position_by_ticket(ticket)
+                    position = snapshot.by_ticket(ticket) if snapshot is not None else None
+                    if not position:
+                        # Missing from a possibly stale snapshot (or registered after it was
+                        # taken) - only a fresh read may confirm the position is closed
+                        position = self.order_manager.get_position_by_ticket(ticket)
                     if not position:
                         # Position closed - remove from tracking
                         logger.info(f"[SOFT_TP_POSITION_CLOSED] Ticket {ticket} | Position no longer exists - removing from tracking")
@@ -231,6 +231,7 @@ def inject_mt5_mock(broker):
         SyntheticMT5Wrapper instance
     """
     import sys
+    from execution.mt5_metrics import instrument_mt5
     wrapper = SyntheticMT5Wrapper(broker)
     
     # Inject into sys.modules to intercept all MetaTrader5 imports
@@ -238,8 +239,9 @@ def inject_mt5_mock(broker):
     sys.modules['MetaTrader5'] = wrapper
     
     # Also inject explicitly into modules that are already loaded
+    # (OrderManager keeps its call metrics on the synthetic broker too)
     import execution.order_manager as om_module
-    om_module.mt5 = wrapper
+    om_module.mt5 = instrument_mt5(wrapper)
     
     import risk.pair_filter as pf_module
     pf_module.mt5 = wrapper
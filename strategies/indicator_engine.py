@@ -0,0 +1,461 @@
+"""
+Incremental Indicator Engine
+Stateful SMA/RSI/ATR/ADX/Choppiness updated in O(1) per closed bar.
+
+TrendFilter's pandas helpers (calculate_sma, calculate_rsi, ...) recompute full
+rolling windows over the whole frame on every call, and the same symbol is
+evaluated several times per scan cycle. IndicatorEngine keeps the rolling state
+per symbol: each closed bar is pushed once, and the still-forming bar is
+evaluated with peek() without mutating state. Values match the pandas helpers
+(same formulas, same NaN/warm-up rules).
+
+The *_at() helpers compute a single pandas-equivalent value at an arbitrary
+frame row in O(period), for callers that read fixed row positions. The
+batch_*() helpers evaluate the same values for many symbols at once on 2-D
+arrays (one row per symbol).
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+NAN = float('nan')
+INDICATORS = ('sma_fast', 'sma_slow', 'rsi', 'atr', 'adx', 'choppiness')
+
+
+def _div(a: float, b: float) -> float:
+    """Float division with pandas semantics (x/0 -> +/-inf, 0/0 -> NaN)."""
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    """max(high-low, |high-prev_close|, |low-prev_close|), skipping NaN like DataFrame.max(axis=1)."""
+    tr = high - low
+    if not math.isnan(prev_close):
+        tr = max(tr, abs(high - prev_close), abs(low - prev_close))
+    return tr
+
+
+class _RollingMean:
+    """Fixed window mean/sum; NaN until the window is full of finite values (min_periods=window)."""
+
+    __slots__ = ('period', '_values', '_sum', '_bad', '_pushes')
+
+    # Re-sum from scratch periodically so running-sum rounding error stays bounded
+    _RESUM_EVERY = 4096
+
+    def __init__(self, period: int):
+        self.period = period
+        self._values: Deque[float] = deque(maxlen=period)
+        self._sum = 0.0
+        self._bad = 0  # Non-finite values in the window
+        self._pushes = 0
+
+    def _window_after(self, value: float) -> Tuple[float, int, int]:
+        total, bad, size = self._sum, self._bad, len(self._values)
+        if size == self.period:
+            old = self._values[0]
+            if math.isfinite(old):
+                total -= old
+            else:
+                bad -= 1
+            size -= 1
+        if math.isfinite(value):
+            total += value
+        else:
+            bad += 1
+        return total, bad, size + 1
+
+    def _result(self, total: float, bad: int, size: int, as_sum: bool) -> float:
+        if size < self.period or bad > 0:
+            return NAN
+        return total if as_sum else total / self.period
+
+    def push(self, value: float, as_sum: bool = False) -> float:
+        total, bad, size = self._window_after(value)
+        self._values.append(value)
+        self._pushes += 1
+        if self._pushes % self._RESUM_EVERY == 0:
+            total = math.fsum(v for v in self._values if math.isfinite(v))
+        self._sum, self._bad = total, bad
+        return self._result(total, bad, size, as_sum)
+
+    def peek(self, value: float, as_sum: bool = False) -> float:
+        return self._result(*self._window_after(value), as_sum)
+
+
+class _RollingExtreme:
+    """Rolling max (or min) via a monotonic deque; NaN until the window is full."""
+
+    __slots__ = ('period', '_sign', '_deque', '_count')
+
+    def __init__(self, period: int, maximum: bool = True):
+        self.period = period
+        self._sign = 1.0 if maximum else -1.0
+        self._deque: Deque[Tuple[int, float]] = deque()  # (bar index, signed value), decreasing
+        self._count = 0
+
+    def push(self, value: float) -> float:
+        signed = self._sign * value
+        index = self._count
+        self._count += 1
+        while self._deque and self._deque[-1][1] <= signed:
+            self._deque.pop()
+        self._deque.append((index, signed))
+        while self._deque[0][0] <= index - self.period:
+            self._deque.popleft()
+        if self._count < self.period:
+            return NAN
+        return self._sign * self._deque[0][1]
+
+    def peek(self, value: float) -> float:
+        if self._count + 1 < self.period:
+            return NAN
+        signed = self._sign * value
+        oldest_kept = self._count + 1 - self.period
+        # First deque entry still inside the window after the push (deque is decreasing,
+        # so it is the max of the surviving committed values)
+        best = signed
+        for index, candidate in self._deque:
+            if index >= oldest_kept:
+                best = max(best, candidate)
+                break
+        return self._sign * best
+
+
+class IndicatorEngine:
+    """
+    Incremental SMA/RSI/ATR/ADX/Choppiness for one symbol.
+
+    push() commits a closed bar and returns the indicator values at that bar.
+    peek() returns the values the next bar would produce (used for the forming
+    bar) without changing state. Each output keeps a short history so callers
+    can read recent values without recomputing.
+    """
+
+    def __init__(self, sma_fast: int = 20, sma_slow: int = 50, rsi_period: int = 14,
+                 atr_period: int = 14, adx_period: int = 14, chop_period: int = 14,
+                 history: int = 128):
+        self.periods = {
+            'sma_fast': sma_fast,
+            'sma_slow': sma_slow,
+            'rsi': rsi_period,
+            'atr': atr_period,
+            'adx': adx_period,
+            'choppiness': chop_period,
+        }
+        self.history_size = history
+        self.reset()
+
+    def reset(self):
+        """Drop all state (next push starts a new series)."""
+        p = self.periods
+        self._sma_fast = _RollingMean(p['sma_fast'])
+        self._sma_slow = _RollingMean(p['sma_slow'])
+        self._rsi_gain = _RollingMean(p['rsi'])
+        self._rsi_loss = _RollingMean(p['rsi'])
+        self._atr = _RollingMean(p['atr'])
+        self._adx_tr = _RollingMean(p['adx'])
+        self._adx_plus_dm = _RollingMean(p['adx'])
+        self._adx_minus_dm = _RollingMean(p['adx'])
+        self._adx = _RollingMean(p['adx'])
+        self._chop_tr = _RollingMean(p['choppiness'])
+        self._chop_atr_sum = _RollingMean(p['choppiness'])
+        self._chop_high = _RollingExtreme(p['choppiness'], maximum=True)
+        self._chop_low = _RollingExtreme(p['choppiness'], maximum=False)
+        self._chop_log_period = math.log10(p['choppiness'])
+
+        self._prev: Optional[Tuple[float, float, float]] = None  # (high, low, close)
+        self.last_time: Optional[int] = None
+        self.bars = 0
+        self._history: Dict[str, Deque[float]] = {name: deque(maxlen=self.history_size) for name in INDICATORS}
+
+    def _step(self, high: float, low: float, close: float, commit: bool) -> Dict[str, float]:
+        op = 'push' if commit else 'peek'
+        if self._prev is None:
+            prev_high = prev_low = prev_close = NAN
+        else:
+            prev_high, prev_low, prev_close = self._prev
+
+        sma_fast = getattr(self._sma_fast, op)(close)
+        sma_slow = getattr(self._sma_slow, op)(close)
+
+        # RSI (rolling-mean variant): NaN first delta counts as 0 gain / 0 loss
+        delta = close - prev_close
+        gain = getattr(self._rsi_gain, op)(delta if delta > 0 else 0.0)
+        loss = getattr(self._rsi_loss, op)(-delta if delta < 0 else 0.0)
+        rs = NAN if (math.isnan(gain) or math.isnan(loss) or loss == 0) else gain / loss
+        rsi = 100.0 if math.isnan(rs) else 100.0 - (100.0 / (1.0 + rs))
+
+        tr = _true_range(high, low, prev_close)
+        atr = getattr(self._atr, op)(tr)
+
+        # ADX: negative DM clipped to 0, first-bar DM stays NaN
+        plus_dm = high - prev_high
+        minus_dm = prev_low - low
+        if plus_dm < 0:
+            plus_dm = 0.0
+        if minus_dm < 0:
+            minus_dm = 0.0
+        adx_atr = getattr(self._adx_tr, op)(tr)
+        plus_di = 100.0 * _div(getattr(self._adx_plus_dm, op)(plus_dm), adx_atr)
+        minus_di = 100.0 * _div(getattr(self._adx_minus_dm, op)(minus_dm), adx_atr)
+        dx = 100.0 * _div(abs(plus_di - minus_di), plus_di + minus_di)
+        adx = getattr(self._adx, op)(dx)
+
+        # Choppiness (normalized 0-1)
+        chop_atr = getattr(self._chop_tr, op)(tr)
+        atr_sum = getattr(self._chop_atr_sum, op)(chop_atr, as_sum=True)
+        highest = getattr(self._chop_high, op)(high)
+        lowest = getattr(self._chop_low, op)(low)
+        ratio = _div(atr_sum, highest - lowest)
+        if math.isnan(ratio):
+            chop = NAN
+        elif ratio <= 0:
+            chop = -math.inf if ratio == 0 else NAN
+        else:
+            chop = math.log10(ratio) / self._chop_log_period  # (100 * ci / 100)
+
+        return {
+            'sma_fast': sma_fast,
+            'sma_slow': sma_slow,
+            'rsi': rsi,
+            'atr': atr,
+            'adx': adx,
+            'choppiness': chop,
+        }
+
+    def push(self, high: float, low: float, close: float, bar_time: Optional[int] = None) -> Dict[str, float]:
+        """
+        Commit a closed bar.
+
+        Args:
+            high, low, close: Bar prices
+            bar_time: Bar open time (epoch seconds), tracked for syncing
+
+        Returns:
+            Indicator values at this bar
+        """
+        values = self._step(float(high), float(low), float(close), commit=True)
+        self._prev = (float(high), float(low), float(close))
+        self.last_time = bar_time
+        self.bars += 1
+        for name, value in values.items():
+            self._history[name].append(value)
+        return values
+
+    def matches_last_bar(self, high: float, low: float, close: float) -> bool:
+        """True if the last committed bar has these prices (history was not revised)."""
+        return self._prev == (float(high), float(low), float(close))
+
+    def peek(self, high: float, low: float, close: float) -> Dict[str, float]:
+        """Indicator values if this bar were pushed next (state is unchanged)."""
+        return self._step(float(high), float(low), float(close), commit=False)
+
+    def history(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """Last n committed values of an indicator (oldest first)."""
+        values = self._history[name]
+        if n is None or n >= len(values):
+            return np.fromiter(values, dtype=float, count=len(values))
+        return np.fromiter((values[i] for i in range(len(values) - n, len(values))), dtype=float, count=n)
+
+
+class IndicatorView:
+    """Indicator values aligned to a rates frame: committed history plus the forming bar."""
+
+    __slots__ = ('_engine', 'forming', 'bar_time')
+
+    def __init__(self, engine: IndicatorEngine, forming: Dict[str, float], bar_time: Optional[int]):
+        self._engine = engine
+        self.forming = forming
+        self.bar_time = bar_time
+
+    def latest(self, name: str) -> float:
+        """Value at the newest (forming) bar - equivalent to series.iloc[-1]."""
+        return self.forming[name]
+
+    def tail(self, name: str, n: int) -> np.ndarray:
+        """Last n values including the forming bar - equivalent to series.iloc[-n:]."""
+        if n <= 0:
+            return np.empty(0)
+        committed = self._engine.history(name, n - 1)
+        return np.append(committed, self.forming[name])
+
+
+def sync_engine(engine: IndicatorEngine, times: np.ndarray, high: np.ndarray,
+                low: np.ndarray, close: np.ndarray) -> Optional[IndicatorView]:
+    """
+    Bring an engine up to date with a rates frame (oldest first, last row forming).
+
+    Closed bars newer than engine.last_time are pushed; if the frame does not
+    contain the engine's last bar unchanged (first use, gap, revised history) the engine is rebuilt
+    from the frame. Returns None for frames that are not strictly ascending.
+
+    Args:
+        engine: Engine to update
+        times: Bar times (epoch seconds)
+        high, low, close: Bar prices
+    """
+    n = len(times)
+    if n < 2 or times[-1] <= times[0]:
+        return None
+
+    start = 0
+    if engine.last_time is not None:
+        idx = int(np.searchsorted(times, engine.last_time))
+        if idx < n - 1 and times[idx] == engine.last_time and engine.matches_last_bar(high[idx], low[idx], close[idx]):
+            start = idx + 1
+        else:
+            engine.reset()
+    else:
+        engine.reset()
+
+    for i in range(start, n - 1):
+        engine.push(high[i], low[i], close[i], bar_time=int(times[i]))
+
+    forming = engine.peek(high[-1], low[-1], close[-1])
+    return IndicatorView(engine, forming, int(times[-1]))
+
+
+# ----------------------------------------------------------------------
+# Point evaluations at a fixed frame row (pandas-equivalent, O(period))
+# ----------------------------------------------------------------------
+
+def sma_at(close: np.ndarray, index: int, period: int) -> float:
+    """calculate_sma(df, period).iloc[index]"""
+    if index < period - 1 or index >= len(close):
+        return NAN
+    return float(np.mean(close[index - period + 1:index + 1]))
+
+
+def rsi_at(close: np.ndarray, index: int, period: int) -> float:
+    """calculate_rsi(df, period).iloc[index]"""
+    if index < period - 1 or index >= len(close):
+        return 100.0  # rolling NaN -> filled with 100
+    lo = index - period + 1
+    window = close[max(lo - 1, 0):index + 1]
+    delta = np.diff(window)
+    if lo == 0:
+        delta = np.concatenate(([0.0], delta))  # First row: NaN diff counts as 0
+    gain = float(np.mean(np.where(delta > 0, delta, 0.0)))
+    loss = float(np.mean(np.where(delta < 0, -delta, 0.0)))
+    if loss == 0:
+        return 100.0
+    return 100.0 - (100.0 / (1.0 + gain / loss))
+
+
+def atr_at(high: np.ndarray, low: np.ndarray, close: np.ndarray, index: int, period: int) -> float:
+    """calculate_atr(df, period).iloc[index]"""
+    if index < period - 1 or index >= len(close):
+        return NAN
+    lo = index - period + 1
+    h = high[lo:index + 1]
+    l = low[lo:index + 1]
+    tr = h - l
+    if lo > 0:
+        prev_close = close[lo - 1:index]
+        tr = np.maximum(tr, np.maximum(np.abs(h - prev_close), np.abs(l - prev_close)))
+    else:
+        prev_close = close[:index]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(h[1:] - prev_close), np.abs(l[1:] - prev_close)))
+    return float(np.mean(tr))
+
+
+def frame_arrays(df) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(times, high, low, close) float/int arrays from a rates DataFrame."""
+    times = df['time'].to_numpy()
+    if np.issubdtype(times.dtype, np.datetime64):
+        times = times.astype('datetime64[s]').astype(np.int64)
+    return (times,
+            df['high'].to_numpy(dtype=float),
+            df['low'].to_numpy(dtype=float),
+            df['close'].to_numpy(dtype=float))
+
+
+# ----------------------------------------------------------------------
+# Cross-symbol batch evaluations on 2-D arrays (one row per symbol)
+# ----------------------------------------------------------------------
+
+def _rolling_mean_2d(x: np.ndarray, period: int) -> np.ndarray:
+    """Row-wise rolling mean (min_periods=period, NaN if any value in the window is non-finite)."""
+    rows, cols = x.shape
+    out = np.full((rows, cols), NAN)
+    if cols < period:
+        return out
+    valid = np.isfinite(x)
+    sums = np.zeros((rows, cols + 1))
+    bad = np.zeros((rows, cols + 1), dtype=np.int64)
+    np.cumsum(np.where(valid, x, 0.0), axis=1, out=sums[:, 1:])
+    np.cumsum(~valid, axis=1, out=bad[:, 1:])
+    window = (sums[:, period:] - sums[:, :-period]) / period
+    window[(bad[:, period:] - bad[:, :-period]) > 0] = NAN
+    out[:, period - 1:] = window
+    return out
+
+
+def batch_sma_at(close: np.ndarray, index: int, period: int) -> np.ndarray:
+    """sma_at() for every row of a 2-D close array."""
+    if index < period - 1 or index >= close.shape[1]:
+        return np.full(close.shape[0], NAN)
+    return close[:, index - period + 1:index + 1].mean(axis=1)
+
+
+def batch_rsi_at(close: np.ndarray, index: int, period: int) -> np.ndarray:
+    """rsi_at() for every row of a 2-D close array."""
+    if index < period - 1 or index >= close.shape[1]:
+        return np.full(close.shape[0], 100.0)
+    lo = index - period + 1
+    delta = np.diff(close[:, max(lo - 1, 0):index + 1], axis=1)
+    if lo == 0:
+        delta = np.hstack((np.zeros((close.shape[0], 1)), delta))
+    gain = np.where(delta > 0, delta, 0.0).mean(axis=1)
+    loss = np.where(delta < 0, -delta, 0.0).mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - (100.0 / (1.0 + gain / loss))
+    rsi[loss == 0] = 100.0
+    return rsi
+
+
+def _true_range_2d(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    tr = high - low
+    prev_close = close[:, :-1]
+    tr[:, 1:] = np.fmax(tr[:, 1:], np.fmax(np.abs(high[:, 1:] - prev_close), np.abs(low[:, 1:] - prev_close)))
+    return tr
+
+
+def batch_atr_at(high: np.ndarray, low: np.ndarray, close: np.ndarray, index: int, period: int) -> np.ndarray:
+    """atr_at() for every row of 2-D high/low/close arrays (columns are frame rows)."""
+    if index < period - 1 or index >= close.shape[1]:
+        return np.full(close.shape[0], NAN)
+    lo = index - period + 1
+    start = max(lo - 1, 0)
+    tr = _true_range_2d(high[:, start:index + 1], low[:, start:index + 1], close[:, start:index + 1])
+    return tr[:, lo - start:].mean(axis=1)
+
+
+def batch_adx_last(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """
+    calculate_adx(df, period).iloc[-1] for every row.
+
+    Pass at least the last 2 * period + 1 bars of each frame; fewer columns
+    yield NaN (not enough history for the last DX window).
+    """
+    plus_dm = np.full(high.shape, NAN)
+    minus_dm = np.full(low.shape, NAN)
+    plus_dm[:, 1:] = np.diff(high, axis=1)
+    minus_dm[:, 1:] = -np.diff(low, axis=1)
+    plus_dm[plus_dm < 0] = 0.0
+    minus_dm[minus_dm < 0] = 0.0
+    atr = _rolling_mean_2d(_true_range_2d(high, low, close), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100.0 * (_rolling_mean_2d(plus_dm, period) / atr)
+        minus_di = 100.0 * (_rolling_mean_2d(minus_dm, period) / atr)
+        dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return _rolling_mean_2d(dx, period)[:, -1]
+
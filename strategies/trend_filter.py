@@ -8,13 +8,22 @@ import pandas as pd
 import numpy as np
 import time
 import threading
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 from execution.mt5_connector import MT5Connector
+from execution.candle_store import get_candle_store
+from execution.mt5_io import MT5Priority, mt5_call
+from strategies.indicator_engine import (
+    IndicatorEngine, IndicatorView, sync_engine, sma_at, rsi_at, atr_at, frame_arrays,
+    batch_sma_at, batch_rsi_at, batch_atr_at, batch_adx_last
+)
 from utils.logger_factory import get_logger
 
 # Module-level logger - will be reinitialized in __init__ based on mode
 logger = None
 
+# Bars read per symbol for get_trend_signals_batch() (same as get_trend_signal())
+BATCH_RATES_COUNT = 100
+
 
 class TrendFilter:
     """Analyzes market trends using SMA indicators."""
@@ -89,6 +98,12 @@ class TrendFilter:
         self._rates_cache = {}  # {symbol: (dataframe, timestamp)}
         self._rates_cache_ttl = 60.0  # seconds (matches M1 timeframe)
         self._rates_cache_lock = threading.Lock()
+        # DataFrames built from the shared candle store: {cache_key: (store_version, dataframe)}
+        self._store_frames = {}
+        
+        # Incremental indicator state per symbol (closed bars pushed once, forming bar peeked)
+        self._indicator_engines = {}  # {symbol: IndicatorEngine}
+        self._indicator_lock = threading.Lock()
     
     def _parse_timeframe(self, tf: str) -> int:
         """Convert timeframe string to MT5 constant."""
@@ -114,6 +129,12 @@ class TrendFilter:
         # 🔍 Disable caching in SIM_LIVE mode to ensure fresh data (candles change frequently)
         is_sim_live = self.config.get('mode') == 'SIM_LIVE'
         
+        # Live: serve from the shared candle store (only new bars are fetched, and the
+        # DataFrame is rebuilt only when the stored bars changed)
+        candle_store = None if is_sim_live else get_candle_store(self.mt5_connector)
+        if candle_store is not None:
+            return self._get_rates_from_store(candle_store, symbol, count, cache_key)
+        
         # Check cache first (skip in SIM_LIVE)
         if not is_sim_live:
             with self._rates_cache_lock:
@@ -130,12 +151,74 @@ class TrendFilter:
             rates = self.mt5_connector.copy_rates_from_pos(symbol, self.timeframe, 0, count)
         else:
             # Live mode - use MT5 directly
-            rates = mt5.copy_rates_from_pos(symbol, self.timeframe, 0, count)
+            rates = mt5_call(self.mt5_connector, mt5.copy_rates_from_pos, symbol, self.timeframe, 0, count,
+                             priority=MT5Priority.MARKET_DATA)
         
         if rates is None or len(rates) == 0:
             logger.error(f"Failed to get rates for {symbol}")
             return None
         
+        df = self._rates_to_dataframe(symbol, rates, is_sim_live)
+        if df is None:
+            return None
+        
+        # Update cache
+        with self._rates_cache_lock:
+            self._rates_cache[cache_key] = (df.copy(), now)
+            
+            # Cleanup old cache entries (keep only recent ones)
+            if len(self._rates_cache) > 100:  # Limit cache size
+                cutoff_time = now - self._rates_cache_ttl * 2
+                self._rates_cache = {
+                    k: v for k, v in self._rates_cache.items()
+                    if v[1] > cutoff_time
+                }
+        
+        return df
+    
+    def _get_rates_from_store(self, candle_store, symbol: str, count: int, cache_key: str) -> Optional[pd.DataFrame]:
+        """
+        Build (or reuse) the rates DataFrame from the shared candle store.
+        
+        The returned DataFrame is shared between callers until the bars change -
+        treat it as read-only.
+        """
+        bars, version = candle_store.get_versioned(symbol, self.timeframe, count,
+                                                   max_age_seconds=self._rates_cache_ttl)
+        if bars is None or len(bars) == 0:
+            logger.error(f"Failed to get rates for {symbol}")
+            return None
+        
+        with self._rates_cache_lock:
+            cached = self._store_frames.get(cache_key)
+            if cached is not None and version >= 0 and cached[0] == version:
+                return cached[1]
+        
+        # Broker bars are normally clean - only fall back to the NaN-repair path when needed
+        if len(bars) < 2 or not np.isfinite(bars['close']).all():
+            return self._rates_to_dataframe(symbol, bars, is_sim_live=False)
+        
+        df = pd.DataFrame({
+            'time': pd.to_datetime(bars['time'], unit='s'),
+            'open': bars['open'],
+            'high': bars['high'],
+            'low': bars['low'],
+            'close': bars['close'],
+            'tick_volume': bars['tick_volume'],
+            'spread': bars['spread'],
+            'real_volume': bars['real_volume'],
+        })
+        
+        if len(df) < self.sma_slow:
+            logger.debug(f"{symbol}: Only {len(df)} bars available, need {self.sma_slow} for SMA calculation")
+        
+        if version >= 0:
+            with self._rates_cache_lock:
+                self._store_frames[cache_key] = (version, df)
+        return df
+    
+    def _rates_to_dataframe(self, symbol: str, rates, is_sim_live: bool) -> Optional[pd.DataFrame]:
+        """Convert broker rates to a validated DataFrame (NaN repair, time conversion)."""
         # Convert NumPy structured array to DataFrame
         # Handle both NumPy structured arrays and regular arrays
         try:
@@ -262,18 +345,6 @@ class TrendFilter:
             logger.debug(f"{symbol}: Only {len(df)} bars available, need {self.sma_slow} for SMA calculation")
             # Still return the data, but SMA will have NaN for early periods (this is expected)
         
-        # Update cache
-        with self._rates_cache_lock:
-            self._rates_cache[cache_key] = (df.copy(), now)
-            
-            # Cleanup old cache entries (keep only recent ones)
-            if len(self._rates_cache) > 100:  # Limit cache size
-                cutoff_time = now - self._rates_cache_ttl * 2
-                self._rates_cache = {
-                    k: v for k, v in self._rates_cache.items()
-                    if v[1] > cutoff_time
-                }
-        
         return df
     
     def calculate_sma(self, df: pd.DataFrame, period: int, column: str = 'close') -> pd.Series:
@@ -433,6 +504,52 @@ class TrendFilter:
         
         return ci_normalized
     
+    def _get_indicator_view(self, symbol: str, df: pd.DataFrame) -> Optional[IndicatorView]:
+        """
+        Indicator values for the newest bars of df from the symbol's incremental engine.
+        
+        Returns None in SIM_LIVE (the pandas helpers carry its diagnostics) or for
+        frames the engine cannot follow (newest-first, too short) - callers then use
+        the calculate_* helpers.
+        """
+        if self.config.get('mode') == 'SIM_LIVE':
+            return None
+        try:
+            arrays = frame_arrays(df)
+        except Exception as e:
+            logger.debug(f"{symbol}: Indicator engine unavailable for frame: {e}")
+            return None
+        with self._indicator_lock:
+            engine = self._indicator_engines.get(symbol)
+            if engine is None:
+                engine = IndicatorEngine(
+                    sma_fast=self.sma_fast,
+                    sma_slow=self.sma_slow,
+                    rsi_period=self.rsi_period,
+                    atr_period=self.atr_period,
+                    history=max(128, self.sma_slow * 2)
+                )
+                self._indicator_engines[symbol] = engine
+            return sync_engine(engine, *arrays)
+    
+    @staticmethod
+    def _frame_head_value(value_at, period: int, length: int, default: float) -> float:
+        """
+        series.iloc[period-1] if valid, else series.iloc[-1] if valid, else default.
+        
+        Mirrors the positional reads in get_trend_signal / calculate_dynamic_stop_loss
+        using an O(period) point evaluation instead of a full rolling series.
+        """
+        if length >= period:
+            value = value_at(period - 1)
+            if not np.isnan(value):
+                return value
+        if length > 0:
+            value = value_at(length - 1)
+            if not np.isnan(value):
+                return value
+        return default
+    
     # ------------------------------------------------------------------
     # ENTRY TIMING HELPERS (READ-ONLY, PRE-TRADE BLOCKS ONLY)
     # ------------------------------------------------------------------
@@ -455,11 +572,18 @@ class TrendFilter:
                 return True, "Trend phase: insufficient data to evaluate"
             
             close = df["close"]
-            sma_fast_series = self.calculate_sma(df, self.sma_fast)
-            sma_slow_series = self.calculate_sma(df, self.sma_slow)
+            lookback = min(50, len(df) - 1)
+            view = self._get_indicator_view(symbol, df)
+            if view is not None:
+                latest_sma_slow = view.latest('sma_slow')
+                fast_minus_slow = view.tail('sma_fast', lookback) - view.tail('sma_slow', lookback)
+            else:
+                sma_fast_series = self.calculate_sma(df, self.sma_fast)
+                sma_slow_series = self.calculate_sma(df, self.sma_slow)
+                latest_sma_slow = sma_slow_series.iloc[-1]
+                fast_minus_slow = sma_fast_series.iloc[-lookback:] - sma_slow_series.iloc[-lookback:]
             
             latest_close = close.iloc[-1]
-            latest_sma_slow = sma_slow_series.iloc[-1]
             if pd.isna(latest_sma_slow) or latest_sma_slow <= 0:
                 return True, "Trend phase: invalid SMA data"
             
@@ -467,8 +591,6 @@ class TrendFilter:
             dist_pct = abs(latest_close - latest_sma_slow) / latest_sma_slow * 100.0
             
             # Bars since SMA20/50 cross (approximate trend age)
-            lookback = min(50, len(df) - 1)
-            fast_minus_slow = sma_fast_series.iloc[-lookback:] - sma_slow_series.iloc[-lookback:]
             # Count how many of the last N bars had the same sign as current signal
             current_signal = trend_signal.get("signal", "NONE")
             if current_signal == "LONG":
@@ -706,6 +828,7 @@ class TrendFilter:
         
         reasons = []
         score = 0
+        view = self._get_indicator_view(symbol, df)
         
         # 1. Trend strength (SMA separation + ADX consolidated) - 35 points max
         sma_separation = abs(trend_signal.get('sma_fast', 0) - trend_signal.get('sma_slow', 0))
@@ -715,8 +838,8 @@ class TrendFilter:
         latest_adx = None
         adx_score = 0
         try:
-            adx = self.calculate_adx(df, period=14)
-            latest_adx = adx.iloc[-1] if not pd.isna(adx.iloc[-1]) else 0
+            latest_adx = view.latest('adx') if view is not None else self.calculate_adx(df, period=14).iloc[-1]
+            latest_adx = latest_adx if not pd.isna(latest_adx) else 0
             
             if latest_adx >= self.min_adx:
                 adx_score = 20  # Reduced from 25 to fit in 35 total
@@ -781,8 +904,11 @@ class TrendFilter:
         latest_choppiness = None
         if self.use_volatility_filter:
             try:
-                choppiness = self.calculate_choppiness(df, period=14)
-                latest_choppiness = choppiness.iloc[-1] if not pd.isna(choppiness.iloc[-1]) else 1.0
+                if view is not None:
+                    latest_choppiness = view.latest('choppiness')
+                else:
+                    latest_choppiness = self.calculate_choppiness(df, period=14).iloc[-1]
+                latest_choppiness = latest_choppiness if not pd.isna(latest_choppiness) else 1.0
                 
                 if latest_choppiness < self.max_choppiness:
                     score += 20
@@ -829,8 +955,9 @@ class TrendFilter:
         # Calculate ATR
         # CRITICAL FIX: DataFrame is newest-first, so ATR rolling calculates from index 0 forward
         # Newest valid ATR is at index (atr_period-1), not -1
-        atr = self.calculate_atr(df, self.atr_period)
-        latest_atr = atr.iloc[self.atr_period-1] if len(atr) >= self.atr_period and not pd.isna(atr.iloc[self.atr_period-1]) else (atr.iloc[-1] if len(atr) > 0 and not pd.isna(atr.iloc[-1]) else 0)
+        _, high, low, close = frame_arrays(df)
+        latest_atr = self._frame_head_value(lambda i: atr_at(high, low, close, i, self.atr_period),
+                                            self.atr_period, len(df), 0)
         
         if pd.isna(latest_atr) or latest_atr <= 0:
             return min_stop_loss_pips
@@ -943,20 +1070,26 @@ class TrendFilter:
                     'rsi_filter_passed': True
                 }
         
-        # Calculate indicators
-        sma_fast = self.calculate_sma(df, self.sma_fast)
-        sma_slow = self.calculate_sma(df, self.sma_slow)
-        rsi = self.calculate_rsi(df, self.rsi_period)
-        
         # Get latest values (handle NaN)
         # CRITICAL FIX: DataFrame is newest-first, so:
         # - rolling() calculates SMA/RSI progressively: row 0-19 → SMA at row 19, etc.
         # - Newest valid SMA20 is at index 19 (period-1), newest SMA50 is at index 49
         # - Newest valid RSI is at index 13 (period-1)
         # - Using iloc[-1] would get the OLDEST value (wrong!)
-        latest_sma_fast = sma_fast.iloc[self.sma_fast-1] if len(sma_fast) >= self.sma_fast and not pd.isna(sma_fast.iloc[self.sma_fast-1]) else (sma_fast.iloc[-1] if len(sma_fast) > 0 else np.nan)
-        latest_sma_slow = sma_slow.iloc[self.sma_slow-1] if len(sma_slow) >= self.sma_slow and not pd.isna(sma_slow.iloc[self.sma_slow-1]) else (sma_slow.iloc[-1] if len(sma_slow) > 0 else np.nan)
-        latest_rsi = rsi.iloc[self.rsi_period-1] if len(rsi) >= self.rsi_period and not pd.isna(rsi.iloc[self.rsi_period-1]) else (rsi.iloc[-1] if len(rsi) > 0 and not pd.isna(rsi.iloc[-1]) else 50)
+        if is_sim_live:
+            # Full pandas series (carries SIM_LIVE diagnostics)
+            sma_fast = self.calculate_sma(df, self.sma_fast)
+            sma_slow = self.calculate_sma(df, self.sma_slow)
+            rsi = self.calculate_rsi(df, self.rsi_period)
+            latest_sma_fast = sma_fast.iloc[self.sma_fast-1] if len(sma_fast) >= self.sma_fast and not pd.isna(sma_fast.iloc[self.sma_fast-1]) else (sma_fast.iloc[-1] if len(sma_fast) > 0 else np.nan)
+            latest_sma_slow = sma_slow.iloc[self.sma_slow-1] if len(sma_slow) >= self.sma_slow and not pd.isna(sma_slow.iloc[self.sma_slow-1]) else (sma_slow.iloc[-1] if len(sma_slow) > 0 else np.nan)
+            latest_rsi = rsi.iloc[self.rsi_period-1] if len(rsi) >= self.rsi_period and not pd.isna(rsi.iloc[self.rsi_period-1]) else (rsi.iloc[-1] if len(rsi) > 0 and not pd.isna(rsi.iloc[-1]) else 50)
+        else:
+            # Same positions, evaluated in O(period) instead of full rolling series
+            _, high, low, close = frame_arrays(df)
+            latest_sma_fast = self._frame_head_value(lambda i: sma_at(close, i, self.sma_fast), self.sma_fast, len(df), np.nan)
+            latest_sma_slow = self._frame_head_value(lambda i: sma_at(close, i, self.sma_slow), self.sma_slow, len(df), np.nan)
+            latest_rsi = self._frame_head_value(lambda i: rsi_at(close, i, self.rsi_period), self.rsi_period, len(df), 50)
         
         # Handle NaN values - check if we have enough data for valid SMA
         if pd.isna(latest_sma_fast) or pd.isna(latest_sma_slow):
@@ -972,6 +1105,30 @@ class TrendFilter:
                 'rsi_filter_passed': True
             }
         
+        # Calculate ATR for dynamic stop loss
+        # CRITICAL FIX: DataFrame is newest-first, so ATR rolling calculates from index 0 forward
+        # Newest valid ATR is at index (atr_period-1), not -1
+        if is_sim_live:
+            atr = self.calculate_atr(df, self.atr_period)
+            latest_atr = atr.iloc[self.atr_period-1] if len(atr) >= self.atr_period and not pd.isna(atr.iloc[self.atr_period-1]) else (atr.iloc[-1] if len(atr) > 0 and not pd.isna(atr.iloc[-1]) else 0)
+        else:
+            latest_atr = self._frame_head_value(lambda i: atr_at(high, low, close, i, self.atr_period),
+                                                self.atr_period, len(df), 0)
+        
+        return self._build_trend_signal(symbol, latest_sma_fast, latest_sma_slow, latest_rsi, latest_atr)
+    
+    def _build_trend_signal(self, symbol: str, latest_sma_fast: float, latest_sma_slow: float,
+                            latest_rsi: float, latest_atr: float) -> Dict[str, Any]:
+        """
+        Turn indicator values into the get_trend_signal() result (shared by the batch path).
+        
+        Args:
+            symbol: Trading symbol (for logging)
+            latest_sma_fast: SMA fast value
+            latest_sma_slow: SMA slow value
+            latest_rsi: RSI value
+            latest_atr: ATR value
+        """
         # SIMPLE TREND LOGIC: SMA20 > SMA50 = BUY, SMA20 < SMA50 = SELL
         sma_diff = latest_sma_fast - latest_sma_slow
         sma_diff_pct = (sma_diff / latest_sma_slow * 100) if latest_sma_slow > 0 else 0
@@ -1005,12 +1162,6 @@ class TrendFilter:
             elif latest_rsi < 20:
                 logger.debug(f"{symbol}: RSI very oversold ({latest_rsi:.1f}) - informational only, NOT blocking trade")
         
-        # Calculate ATR for dynamic stop loss
-        # CRITICAL FIX: DataFrame is newest-first, so ATR rolling calculates from index 0 forward
-        # Newest valid ATR is at index (atr_period-1), not -1
-        atr = self.calculate_atr(df, self.atr_period)
-        latest_atr = atr.iloc[self.atr_period-1] if len(atr) >= self.atr_period and not pd.isna(atr.iloc[self.atr_period-1]) else (atr.iloc[-1] if len(atr) > 0 and not pd.isna(atr.iloc[-1]) else 0)
-        
         result = {
             'signal': signal,
             'trend': trend,
@@ -1023,6 +1174,78 @@ class TrendFilter:
         
         return result
     
+    def get_trend_signals_batch(self, symbols: List[str],
+                                frames: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Trend signals for many symbols in one vectorized pass.
+        
+        Frames are stacked into 2-D arrays (one row per symbol) and SMA/RSI/ATR/ADX
+        are evaluated for all rows at once, at the same frame positions as
+        get_trend_signal(). Symbols without enough clean data are left out so the
+        caller can fall back to get_trend_signal() for them.
+        
+        Args:
+            symbols: Symbols to evaluate
+            frames: get_rates(symbol, BATCH_RATES_COUNT) frames already read by the caller
+                    (symbols missing from it are left out); None reads them here, one by one
+        
+        Returns:
+            {symbol: signal dict as returned by get_trend_signal(), plus 'adx'}
+        """
+        if self.config.get('mode') == 'SIM_LIVE' or not symbols:
+            return {}
+        
+        start = time.time()
+        head_len = max(self.sma_fast, self.sma_slow, self.rsi_period, self.atr_period)
+        adx_period = 14
+        adx_len = 2 * adx_period + 1  # Bars needed for the last ADX value
+        
+        names = []
+        heads = ([], [], [])  # high, low, close (first head_len rows)
+        tails = ([], [], [])  # high, low, close (last adx_len rows)
+        for symbol in symbols:
+            if frames is not None:
+                df = frames.get(symbol)
+            else:
+                try:
+                    df = self.get_rates(symbol, count=BATCH_RATES_COUNT)
+                except Exception as e:
+                    logger.debug(f"{symbol}: Batch trend rates failed: {e}")
+                    continue
+            if df is None or len(df) < head_len:
+                continue
+            _, high, low, close = frame_arrays(df)
+            if not (np.isfinite(close).all() and np.isfinite(high).all() and np.isfinite(low).all()):
+                continue  # get_trend_signal() repairs / falls back on gaps
+            names.append(symbol)
+            for rows, values in zip(heads, (high, low, close)):
+                rows.append(values[:head_len])
+            for rows, values in zip(tails, (high, low, close)):
+                if len(values) >= adx_len:
+                    rows.append(values[-adx_len:])
+                else:
+                    rows.append(np.full(adx_len, np.nan))
+        
+        if not names:
+            return {}
+        
+        high, low, close = (np.vstack(rows) for rows in heads)
+        sma_fast = batch_sma_at(close, self.sma_fast - 1, self.sma_fast)
+        sma_slow = batch_sma_at(close, self.sma_slow - 1, self.sma_slow)
+        rsi = batch_rsi_at(close, self.rsi_period - 1, self.rsi_period)
+        atr = batch_atr_at(high, low, close, self.atr_period - 1, self.atr_period)
+        adx = batch_adx_last(*(np.vstack(rows) for rows in tails), adx_period)
+        
+        results = {}
+        for i, symbol in enumerate(names):
+            signal = self._build_trend_signal(symbol, float(sma_fast[i]), float(sma_slow[i]),
+                                              float(rsi[i]), float(atr[i]))
+            signal['adx'] = float(adx[i])
+            results[symbol] = signal
+        
+        logger.debug(f"[TREND_BATCH] {len(results)}/{len(symbols)} symbols evaluated in {(time.time() - start) * 1000:.1f}ms")
+        return results
+    
     def check_price_action_confirmation(self, symbol: str, trend_signal: Dict[str, Any]) -> Tuple[bool, str]:
         """
         Check price action confirmation (support/resistance, candlestick patterns).
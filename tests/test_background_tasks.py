@@ -0,0 +1,94 @@
+"""
+Test for the SLManager background task scheduler.
+
+Verifies that identical pending tasks collapse, that per-type minimum
+intervals hold tasks back, that keyed tasks stay separate, and that
+execution times reach SLManager.get_timing_stats().
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.background_tasks import BackgroundTaskScheduler
+from risk.sl_manager import SLManager
+
+
+class TestBackgroundTaskScheduler(unittest.TestCase):
+    """Test cases for BackgroundTaskScheduler."""
+
+    def test_identical_tasks_collapse(self):
+        scheduler = BackgroundTaskScheduler()
+        self.assertTrue(scheduler.submit('fail_safe_check'))
+        self.assertFalse(scheduler.submit('fail_safe_check'))
+        self.assertFalse(scheduler.submit('fail_safe_check'))
+        task = scheduler.get(timeout=0)
+        self.assertEqual(task.task_type, 'fail_safe_check')
+        self.assertEqual(task.collapsed, 2)
+        self.assertIsNone(scheduler.get(timeout=0))
+        scheduler.task_done(task, 1.5)
+        stats = scheduler.get_stats()['tasks']['fail_safe_check']
+        self.assertEqual((stats['submitted'], stats['collapsed'], stats['executed']), (3, 2, 1))
+        self.assertEqual(stats['execution']['count'], 1)
+
+    def test_keyed_tasks_keep_latest_data(self):
+        scheduler = BackgroundTaskScheduler()
+        scheduler.submit('micro_profit_check', {'profit': 0.1}, key=1)
+        scheduler.submit('micro_profit_check', {'profit': 0.2}, key=2)
+        scheduler.submit('micro_profit_check', {'profit': 0.3}, key=1)
+        first, second = scheduler.get(timeout=0), scheduler.get(timeout=0)
+        self.assertEqual((first.key, first.data), (1, {'profit': 0.3}))
+        self.assertEqual(second.key, 2)
+
+    def test_min_interval_delays_next_run(self):
+        scheduler = BackgroundTaskScheduler(min_intervals={'check_stale_locks': 0.2})
+        scheduler.submit('check_stale_locks')
+        scheduler.task_done(scheduler.get(timeout=0), 0.1)
+        scheduler.submit('check_stale_locks')
+        self.assertIsNone(scheduler.get(timeout=0.05))
+        start = time.time()
+        self.assertIsNotNone(scheduler.get(timeout=1.0))
+        self.assertGreater(time.time() - start, 0.05)
+
+    def test_full_scheduler_rejects_new_keys(self):
+        scheduler = BackgroundTaskScheduler(max_pending=1)
+        self.assertTrue(scheduler.submit('micro_profit_check', key=1))
+        self.assertFalse(scheduler.submit('micro_profit_check', key=2))
+        self.assertEqual(scheduler.get_stats()['tasks']['micro_profit_check']['rejected'], 1)
+
+
+class TestSLManagerBackgroundTasks(unittest.TestCase):
+    """Test cases for the SLManager background worker using the scheduler."""
+
+    def test_fail_safe_checks_collapse(self):
+        config = {'risk': {'max_risk_per_trade_usd': 2.0},
+                  'execution': {'background_tasks': {'min_interval_seconds': {'fail_safe_check': 0.0}}}}
+        order_manager = Mock()
+        order_manager.get_open_positions.return_value = []
+        sl_manager = SLManager(config, Mock(), order_manager)
+        for _ in range(20):
+            sl_manager._background_tasks.submit('fail_safe_check')
+        sl_manager._background_worker_running = True
+        try:
+            worker = threading.Thread(target=sl_manager._background_worker_loop, daemon=True)
+            worker.start()
+            deadline = time.time() + 2.0
+            while time.time() < deadline and sl_manager._background_tasks.pending_count():
+                time.sleep(0.01)
+            time.sleep(0.05)
+        finally:
+            sl_manager._background_worker_running = False
+            worker.join(timeout=2.0)
+        stats = sl_manager.get_timing_stats()['background_tasks']['tasks']['fail_safe_check']
+        self.assertEqual(stats['executed'], 1)
+        self.assertEqual(stats['collapsed'], 19)
+
+
+if __name__ == '__main__':
+    unittest.main()
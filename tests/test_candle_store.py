@@ -0,0 +1,128 @@
+"""
+Test for the shared candle store.
+
+Verifies incremental bar fetching (only bars newer than the last stored bar),
+forming-bar overwrite, ring wrap-around and read-only views.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.candle_store import CandleStore, RATES_DTYPE, get_candle_store, timeframe_seconds
+
+
+class FakeBroker:
+    """Serves the newest `count` bars of a growing M1 history."""
+
+    def __init__(self, bars: int):
+        self.bars = np.zeros(bars, dtype=RATES_DTYPE)
+        self.bars['time'] = np.arange(bars) * 60
+        self.bars['close'] = np.arange(bars, dtype=float)
+        self.bars['tick_volume'] = 10
+        self.requests = []
+
+    def append(self, n: int = 1):
+        new = np.zeros(n, dtype=RATES_DTYPE)
+        start = int(self.bars['time'][-1]) + 60
+        new['time'] = start + np.arange(n) * 60
+        new['close'] = float(self.bars['close'][-1]) + 1 + np.arange(n)
+        new['tick_volume'] = 10
+        self.bars = np.concatenate([self.bars, new])
+
+    def __call__(self, symbol, timeframe, start_pos, count):
+        self.requests.append(count)
+        return self.bars[-count:].copy()
+
+
+class TestCandleStore(unittest.TestCase):
+    """Test cases for CandleStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.broker = FakeBroker(50)
+        self.store = CandleStore(self.broker, capacity=20, initial_bars=10, min_refresh_seconds=0.0)
+
+    def test_initial_load_and_hit(self):
+        """First access loads initial_bars; fresh reads do not hit the broker."""
+        bars = self.store.get('EURUSDm', 1, 5, max_age_seconds=60)
+        self.assertEqual(list(bars['close']), [45.0, 46.0, 47.0, 48.0, 49.0])
+        self.assertEqual(self.broker.requests, [10])
+        self.store.get('EURUSDm', 1, 8, max_age_seconds=60)
+        self.assertEqual(self.broker.requests, [10])
+        self.assertEqual(self.store.get_stats()['hits'], 1)
+
+    def test_incremental_fetch_appends_new_bars(self):
+        """Stale reads fetch only the recent window and append new bars."""
+        with patch('execution.candle_store.time.time', return_value=1000.0):
+            self.store.get('EURUSDm', 1, 10)
+        self.broker.append(2)
+        with patch('execution.candle_store.time.time', return_value=1120.0):
+            bars = self.store.get('EURUSDm', 1, 10)
+        self.assertEqual(float(bars['close'][-1]), 51.0)
+        self.assertEqual(list(np.diff(bars['time'])), [60] * 9)
+        self.assertEqual(self.broker.requests[-1], 4)  # 2 elapsed bars + forming bar + margin
+        self.assertEqual(self.store.get_stats()['full_loads'], 1)
+
+    def test_forming_bar_overwritten(self):
+        """The last stored bar is replaced, not duplicated."""
+        self.store.get('EURUSDm', 1, 10)
+        self.broker.bars['close'][-1] = 99.0
+        bars = self.store.get('EURUSDm', 1, 10)
+        self.assertEqual(float(bars['close'][-1]), 99.0)
+        self.assertEqual(len(np.unique(bars['time'])), 10)
+
+    def test_wraparound_view_is_contiguous(self):
+        """Views stay ordered after the ring wraps."""
+        self.store.get('EURUSDm', 1, 10)
+        for _ in range(15):
+            self.broker.append(1)
+            self.store.get('EURUSDm', 1, 10)
+        bars = self.store.get('EURUSDm', 1, 20)
+        self.assertEqual(len(bars), 20)
+        self.assertTrue((np.diff(bars['time']) == 60).all())
+        self.assertEqual(float(bars['close'][-1]), float(self.broker.bars['close'][-1]))
+
+    def test_views_are_read_only(self):
+        """Consumers cannot mutate the shared buffer."""
+        bars = self.store.get('EURUSDm', 1, 5)
+        with self.assertRaises(ValueError):
+            bars['close'][0] = 0.0
+
+    def test_version_changes_only_with_data(self):
+        """Series version is stable across cache hits."""
+        _, v1 = self.store.get_versioned('EURUSDm', 1, 5, max_age_seconds=60)
+        _, v2 = self.store.get_versioned('EURUSDm', 1, 5, max_age_seconds=60)
+        self.assertEqual(v1, v2)
+        self.broker.append(1)
+        _, v3 = self.store.get_versioned('EURUSDm', 1, 5, max_age_seconds=0)
+        self.assertNotEqual(v1, v3)
+
+    def test_failed_fetch_serves_last_bars(self):
+        """A broker failure keeps serving the stored bars."""
+        self.store.get('EURUSDm', 1, 5)
+        store = self.store
+        store._rates_fn = lambda *args: None
+        bars = store.get('EURUSDm', 1, 5)
+        self.assertEqual(len(bars), 5)
+        self.assertIsNone(store.get('GBPUSDm', 1, 5))
+
+    def test_helpers(self):
+        """Timeframe decoding and connector lookup."""
+        self.assertEqual(timeframe_seconds(1), 60)
+        self.assertEqual(timeframe_seconds(0x4001), 3600)
+        self.assertEqual(timeframe_seconds(0x4018), 86400)
+        self.assertIsNone(get_candle_store(Mock()))
+        connector = Mock()
+        connector.candle_store = self.store
+        self.assertIs(get_candle_store(connector), self.store)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Test for batch closure detection.
+
+Verifies that PositionMonitor resolves a burst of closures with one deal
+journal read, logs them and hands them to the closure callback as one batch,
+retries closures whose exit deal is not in the history yet, and that
+RiskManager records each closed ticket once.
+"""
+
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.deal_journal import DEAL_ENTRY_IN, DEAL_ENTRY_OUT, DealJournal
+from execution.position_monitor import PositionMonitor
+from risk.risk_manager import RiskManager
+from execution.mt5_connector import MT5Connector
+from execution.order_manager import OrderManager
+
+
+def make_deal(ticket, position_id, entry, deal_time, profit=0.0):
+    return SimpleNamespace(ticket=ticket, order=ticket, position_id=position_id, time=deal_time, type=0,
+                           entry=entry, price=1.1, volume=0.01, symbol='EURUSD', profit=profit,
+                           commission=0.0, swap=0.0, magic=0, reason=0, comment='')
+
+
+class FakeMT5:
+    DEAL_ENTRY_IN = DEAL_ENTRY_IN
+    DEAL_ENTRY_OUT = DEAL_ENTRY_OUT
+
+    def __init__(self, deals):
+        self.deals = list(deals)
+        self.calls = 0
+
+    def history_deals_get(self, date_from=None, date_to=None, position=None):
+        self.calls += 1
+        if position is not None:
+            return tuple(deal for deal in self.deals if deal.position_id == position)
+        return tuple(deal for deal in self.deals if deal.time >= date_from.timestamp())
+
+
+class TestClosureBatch(unittest.TestCase):
+    """Test cases for batch closure detection."""
+
+    def setUp(self):
+        self.connector = Mock()
+        self.connector.ensure_connected.return_value = True
+        self.connector.mt5_io = None
+        self.now = int(time.time())
+        self.trade_logger = Mock()
+        self.monitor = PositionMonitor({}, self.trade_logger)
+        self.monitor.mt5_connector = self.connector
+
+    def attach_journal(self, deals):
+        fake = FakeMT5(deals)
+        self.monitor.deal_journal = DealJournal(self.connector, mt5_provider=lambda: fake,
+                                                poll_interval_seconds=0.0, min_refresh_interval_seconds=0.0)
+        return fake
+
+    def test_burst_resolved_with_one_read_and_one_callback(self):
+        deals = []
+        for position in range(1, 31):
+            deals.append(make_deal(position * 10, position, DEAL_ENTRY_IN, self.now - 60))
+            deals.append(make_deal(position * 10 + 1, position, DEAL_ENTRY_OUT, self.now - position, profit=-2.0))
+        fake = self.attach_journal(deals)
+        batches = []
+        self.monitor.set_closure_callback(batches.append)
+
+        closures = self.monitor.detect_and_log_closures(set(range(1, 32)), current_tickets={31})
+
+        self.assertEqual(fake.calls, 1)
+        self.assertEqual(len(closures), 30)
+        self.assertEqual(self.trade_logger.log_position_closure.call_count, 30)
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([closure['ticket'] for closure in batches[0]], list(range(30, 0, -1)))  # Close order
+        self.assertEqual(closures[0]['close_reason'], 'Stop Loss')
+
+    def test_closure_without_exit_deal_is_retried(self):
+        fake = self.attach_journal([make_deal(10, 1, DEAL_ENTRY_IN, self.now - 60)])
+
+        self.assertEqual(self.monitor.detect_and_log_closures({1}, current_tickets=set()), [])
+        fake.deals.append(make_deal(11, 1, DEAL_ENTRY_OUT, self.now, profit=0.2))
+        closures = self.monitor.detect_and_log_closures(set(), current_tickets=set())
+
+        self.assertEqual([closure['ticket'] for closure in closures], [1])
+        self.assertEqual(self.monitor._unresolved_closures, {})
+
+    def test_risk_manager_records_each_ticket_once(self):
+        risk_manager = RiskManager({'risk': {'max_risk_per_trade_usd': 2.0}}, Mock(spec=MT5Connector),
+                                   Mock(spec=OrderManager))
+
+        self.assertEqual(risk_manager.record_closed_trades([(1, -2.0), (2, -2.0), (None, 1.0)]), [1, 2, None])
+        self.assertFalse(risk_manager.record_closed_trade(-2.0, ticket=1))
+        self.assertEqual(risk_manager.record_closed_trades([(2, -2.0), (3, 0.5)]), [3])
+        self.assertAlmostEqual(risk_manager._daily_pnl, -2.5)
+        self.assertEqual(risk_manager._consecutive_losses, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
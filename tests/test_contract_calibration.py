@@ -0,0 +1,136 @@
+"""
+Test for the contract size calibration store.
+
+Verifies TTL expiry, persistence per broker server across store instances,
+background recalibration when the tick value changes, that SLManager and
+RiskManager keep their corrections apart in a shared store, and that SLManager
+only stops a store it created.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.contract_calibration import ContractCalibrationStore, spec_changed, spec_from_symbol_info
+from risk.sl_manager import SLManager
+
+
+SYMBOL_INFO = {'contract_size': 1.0, 'trade_tick_value': 0.01, 'trade_tick_size': 0.01, 'point': 0.01}
+INPUTS = {'entry_price': 40000.0, 'lot_size': 0.01, 'target_loss_usd': 2.0}
+
+
+class TestContractCalibrationStore(unittest.TestCase):
+    """Test cases for ContractCalibrationStore."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = Path(self.tmp_dir) / 'calibration.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_ttl_expiry(self):
+        store = ContractCalibrationStore(ttl_seconds=60)
+        store.put('US30m', 'sl_manager', 10.0, 'multiplier', SYMBOL_INFO, INPUTS, now=1000.0)
+        self.assertEqual(store.get('US30m', 'sl_manager', now=1030.0), 10.0)
+        self.assertIsNone(store.get('US30m', 'risk_manager', now=1030.0))
+        self.assertIsNone(store.get('US30m', 'sl_manager', now=1061.0))
+        self.assertEqual(store.get_stats()['records'], 0)
+
+    def test_persisted_per_server(self):
+        store = ContractCalibrationStore('Broker-Live', self.path)
+        store.put('BTCUSDm', 'sl_manager', 100.0, 'multiplier', SYMBOL_INFO, INPUTS)
+        self.assertTrue(store.flush())
+        self.assertFalse(store.flush())  # Nothing changed
+
+        other = ContractCalibrationStore('Broker-Demo', self.path)
+        self.assertIsNone(other.get('BTCUSDm', 'sl_manager'))
+        other.put('BTCUSDm', 'sl_manager', 1.0, 'reported', SYMBOL_INFO, INPUTS)
+        other.flush()
+
+        reloaded = ContractCalibrationStore('Broker-Live', self.path)
+        record = reloaded.get_record('BTCUSDm', 'sl_manager')
+        self.assertEqual(record.value, 100.0)
+        self.assertEqual(record.inputs, INPUTS)
+        self.assertEqual(record.spec['trade_tick_value'], 0.01)
+        with open(self.path) as f:
+            self.assertEqual(set(json.load(f)['servers']), {'Broker-Live', 'Broker-Demo'})
+
+    def test_corrupt_file_starts_empty(self):
+        self.path.write_text('{not json')
+        store = ContractCalibrationStore('Broker-Live', self.path)
+        self.assertEqual(store.get_stats()['records'], 0)
+
+    def test_refresh_on_tick_value_change(self):
+        spec = dict(SYMBOL_INFO)
+        store = ContractCalibrationStore(spec_provider=lambda symbol: spec, refresh_ahead_seconds=0)
+        refresher = Mock(return_value=(1000.0, 'multiplier'))
+        store.register_refresher('sl_manager', refresher)
+        store.put('US30m', 'sl_manager', 100.0, 'multiplier', SYMBOL_INFO, INPUTS)
+        store.put('ETHUSDm', 'sl_manager', 5.0, 'reverse_engineered', SYMBOL_INFO, INPUTS)
+
+        self.assertEqual(store.refresh()['refreshed'], 0)
+        refresher.assert_not_called()
+
+        spec['trade_tick_value'] = 0.1
+        refresher.side_effect = lambda symbol, record: None if symbol == 'ETHUSDm' else (1000.0, 'multiplier')
+        counts = store.refresh()
+        self.assertEqual((counts['refreshed'], counts['dropped']), (1, 1))
+        record = store.get_record('US30m', 'sl_manager')
+        self.assertEqual(record.value, 1000.0)
+        self.assertEqual(record.spec['trade_tick_value'], 0.1)
+        self.assertIsNone(store.get('ETHUSDm', 'sl_manager'))
+
+    def test_spec_changed_tolerance(self):
+        old = spec_from_symbol_info(SYMBOL_INFO)
+        self.assertFalse(spec_changed(old, spec_from_symbol_info(dict(SYMBOL_INFO, trade_tick_value=0.01002)), 0.5))
+        self.assertTrue(spec_changed(old, spec_from_symbol_info(dict(SYMBOL_INFO, trade_tick_value=0.011)), 0.5))
+        self.assertTrue(spec_changed(old, spec_from_symbol_info(dict(SYMBOL_INFO, trade_tick_value=None)), 0.5))
+
+
+class TestSLManagerCalibration(unittest.TestCase):
+    """Test cases for SLManager contract size corrections through the calibration store."""
+
+    def test_shared_store_keeps_kinds_apart(self):
+        mt5_connector = Mock()
+        mt5_connector.get_symbol_info.return_value = dict(SYMBOL_INFO)
+        store = ContractCalibrationStore()
+        sl_manager = SLManager({'risk': {'max_risk_per_trade_usd': 2.0}}, mt5_connector, Mock(),
+                               calibration_store=store)
+        store.put('US30m', 'risk_manager', 0.1, 'corrected', SYMBOL_INFO, INPUTS)
+
+        size = sl_manager._get_corrected_contract_size('US30m', 1000.0, 0.01, 2.0)
+        self.assertEqual(size, 10.0)
+        self.assertEqual(store.get_record('US30m', 'sl_manager').source, 'multiplier')
+        self.assertEqual(store.get('US30m', 'risk_manager'), 0.1)
+
+        # Served from the store without another symbol_info call
+        mt5_connector.get_symbol_info.reset_mock()
+        self.assertEqual(sl_manager._get_corrected_contract_size('US30m', 1000.0, 0.01, 2.0), 10.0)
+        mt5_connector.get_symbol_info.assert_not_called()
+
+    def test_shutdown_stops_only_own_store(self):
+        injected = ContractCalibrationStore()
+        sl_manager = SLManager({'risk': {'max_risk_per_trade_usd': 2.0}}, Mock(), Mock(),
+                               calibration_store=injected)
+        standalone = SLManager({'risk': {'max_risk_per_trade_usd': 2.0}}, Mock(), Mock())
+        own_store = standalone._calibration_store
+        own_store.start()
+
+        sl_manager.shutdown()
+        standalone.shutdown()
+        self.assertFalse(injected._shutdown_event.is_set())
+        self.assertTrue(own_store._shutdown_event.is_set())
+        self.assertFalse(own_store._thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
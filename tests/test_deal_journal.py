@@ -0,0 +1,162 @@
+"""
+Test for the incremental deal journal.
+
+Verifies that closure lookups for many positions share one range read, that
+syncs resume from the persisted high-water mark, that positions outside the
+journal window or opened before a restart fall back to a per-position read,
+and that providers without range queries keep working.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.deal_journal import DEAL_ENTRY_IN, DEAL_ENTRY_OUT, DealJournal
+
+
+def make_deal(ticket, position_id, entry, deal_time, profit=0.0, symbol='EURUSD', price=1.1):
+    return SimpleNamespace(ticket=ticket, order=ticket, position_id=position_id, time=deal_time, type=0,
+                           entry=entry, price=price, volume=0.01, symbol=symbol, profit=profit,
+                           commission=0.0, swap=0.0, magic=0, reason=0, comment='')
+
+
+class FakeMT5:
+    """history_deals_get over a fixed deal list (range or position filter)."""
+
+    DEAL_ENTRY_IN = DEAL_ENTRY_IN
+    DEAL_ENTRY_OUT = DEAL_ENTRY_OUT
+
+    def __init__(self, deals):
+        self.deals = list(deals)
+        self.range_calls = []
+        self.position_calls = []
+
+    def history_deals_get(self, date_from=None, date_to=None, position=None):
+        if position is not None:
+            self.position_calls.append(position)
+            return tuple(deal for deal in self.deals if deal.position_id == position)
+        self.range_calls.append((date_from, date_to))
+        start = date_from.timestamp()
+        return tuple(deal for deal in self.deals if deal.time >= start)
+
+
+class TestDealJournal(unittest.TestCase):
+    """Test cases for DealJournal."""
+
+    def setUp(self):
+        self.connector = Mock()
+        self.connector.ensure_connected.return_value = True
+        self.connector.mt5_io = None
+        self.now = int(time.time())
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def make_journal(self, fake, **kwargs):
+        kwargs.setdefault('poll_interval_seconds', 0.0)
+        kwargs.setdefault('min_refresh_interval_seconds', 0.0)
+        return DealJournal(self.connector, mt5_provider=lambda: fake, **kwargs)
+
+    def test_burst_of_closures_costs_one_range_read(self):
+        deals = []
+        for position in range(100, 130):
+            deals.append(make_deal(position * 10, position, DEAL_ENTRY_IN, self.now - 120))
+            deals.append(make_deal(position * 10 + 1, position, DEAL_ENTRY_OUT, self.now - 5, profit=-2.0))
+        fake = FakeMT5(deals)
+        journal = self.make_journal(fake)
+
+        self.assertEqual(journal.prefetch(range(100, 130)), 0)
+        summaries = [journal.get_position_summary(position, require_exit=True) for position in range(100, 130)]
+
+        self.assertEqual(len(fake.range_calls), 1)
+        self.assertEqual(fake.position_calls, [])
+        for summary in summaries:
+            self.assertEqual(summary['status'], 'CLOSED')
+            self.assertAlmostEqual(summary['total_profit'], -2.0)
+            self.assertEqual(summary['entry_deal']['symbol'], 'EURUSD')
+        self.assertEqual(journal.get_deal(1001).position_id, 100)
+
+    def test_missing_exit_deal_triggers_incremental_sync(self):
+        fake = FakeMT5([make_deal(1, 7, DEAL_ENTRY_IN, self.now - 60)])
+        journal = self.make_journal(fake)
+        journal.sync(force=True)
+        self.assertEqual(journal.get_position_summary(7)['status'], 'OPEN')
+
+        fake.deals.append(make_deal(2, 7, DEAL_ENTRY_OUT, self.now, profit=0.3))
+        summary = journal.get_position_summary(7, require_exit=True)
+
+        self.assertEqual(summary['status'], 'CLOSED')
+        self.assertEqual(summary['exit_deal']['ticket'], 2)
+        # Second read starts at the high-water mark minus the overlap, not the lookback window
+        self.assertAlmostEqual(fake.range_calls[1][0].timestamp(), self.now - 60 - journal.overlap_seconds, delta=1)
+
+    def test_high_water_mark_persisted_across_restarts(self):
+        state_path = os.path.join(self.tmpdir, 'deal_journal_state.json')
+        fake = FakeMT5([make_deal(1, 7, DEAL_ENTRY_IN, self.now - 30)])
+        journal = self.make_journal(fake, state_path=state_path)
+        journal.sync(force=True)
+        with open(state_path) as f:
+            self.assertEqual(json.load(f)['high_water_time'], self.now - 30)
+
+        restarted = self.make_journal(FakeMT5([]), state_path=state_path)
+        self.assertEqual(restarted.get_stats()['high_water_time'], self.now - 30)
+
+    def test_position_opened_before_restart_reads_entry_deal(self):
+        state_path = os.path.join(self.tmpdir, 'deal_journal_state.json')
+        with open(state_path, 'w') as f:
+            json.dump({'high_water_time': self.now - 30}, f)
+        # Opened an hour before the restart, closed after it
+        fake = FakeMT5([make_deal(1, 7, DEAL_ENTRY_IN, self.now - 3600, price=1.1),
+                        make_deal(2, 7, DEAL_ENTRY_OUT, self.now - 5, profit=-2.0, price=1.098)])
+        journal = self.make_journal(fake, state_path=state_path)
+        journal.sync(force=True)
+        self.assertIsNone(journal.get_deal(1))  # Resumed range starts after the entry
+
+        summary = journal.get_position_summary(7, require_exit=True)
+
+        self.assertEqual(fake.position_calls, [7])
+        self.assertEqual(summary['entry_deal']['ticket'], 1)
+        self.assertEqual(summary['entry_deal']['price'], 1.1)
+        self.assertEqual(summary['exit_deal']['ticket'], 2)
+        # Indexed now - later lookups are served from memory
+        journal.get_position_summary(7, require_exit=True)
+        self.assertEqual(fake.position_calls, [7])
+
+    def test_position_outside_window_falls_back_to_position_read(self):
+        old = self.now - 3 * 24 * 3600
+        fake = FakeMT5([make_deal(1, 9, DEAL_ENTRY_IN, old), make_deal(2, 9, DEAL_ENTRY_OUT, old + 60)])
+        journal = self.make_journal(fake)
+
+        summary = journal.get_position_summary(9, require_exit=True)
+
+        self.assertEqual(summary['status'], 'CLOSED')
+        self.assertEqual(fake.position_calls, [9])
+        self.assertEqual(journal.get_stats()['position_fallbacks'], 1)
+
+    def test_provider_without_range_queries(self):
+        # SIM_LIVE wrapper signature: history_deals_get(ticket=None, **kwargs) returning dicts
+        sim = SimpleNamespace(history_deals_get=lambda ticket=None, **kwargs: [
+            {'ticket': 5, 'position_id': 3, 'entry': DEAL_ENTRY_IN, 'time': self.now, 'price': 1.2,
+             'volume': 0.01, 'symbol': 'GBPUSD', 'profit': 0.0}])
+        journal = DealJournal(self.connector, mt5_provider=lambda: sim, poll_interval_seconds=0.0,
+                              min_refresh_interval_seconds=0.0)
+
+        self.assertFalse(journal.sync(force=True))
+        summary = journal.get_position_summary(3)
+
+        self.assertFalse(journal.get_stats()['range_supported'])
+        self.assertEqual(summary['entry_deal']['symbol'], 'GBPUSD')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,255 @@
+"""
+Parity tests for the incremental indicator engine.
+
+The reference functions below are the pandas formulas used by
+TrendFilter.calculate_sma / calculate_rsi / calculate_atr / calculate_adx /
+calculate_choppiness (without the SIM_LIVE logging). The engine, fed one bar at
+a time, must reproduce them at every row.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.indicator_engine import (
+    IndicatorEngine, sync_engine, sma_at, rsi_at, atr_at, frame_arrays,
+    batch_sma_at, batch_rsi_at, batch_atr_at, batch_adx_last
+)
+
+
+def ref_sma(df, period):
+    return df['close'].rolling(window=period).mean()
+
+
+def ref_rsi(df, period):
+    delta = df['close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss.replace(0, np.nan)
+    rsi = 100 - (100 / (1 + rs))
+    return rsi.fillna(100)
+
+
+def _ref_tr(df):
+    high, low, close = df['high'], df['low'], df['close']
+    tr1 = high - low
+    tr2 = abs(high - close.shift())
+    tr3 = abs(low - close.shift())
+    return pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+
+
+def ref_atr(df, period):
+    return _ref_tr(df).rolling(window=period).mean()
+
+
+def ref_adx(df, period):
+    high, low = df['high'], df['low']
+    plus_dm = high.diff()
+    minus_dm = -low.diff()
+    plus_dm[plus_dm < 0] = 0
+    minus_dm[minus_dm < 0] = 0
+    atr = _ref_tr(df).rolling(window=period).mean()
+    plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr)
+    minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr)
+    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    return dx.rolling(window=period).mean()
+
+
+def ref_choppiness(df, period):
+    atr = _ref_tr(df).rolling(window=period).mean()
+    highest_high = df['high'].rolling(window=period).max()
+    lowest_low = df['low'].rolling(window=period).min()
+    ci = 100 * np.log10(atr.rolling(window=period).sum() / (highest_high - lowest_low)) / np.log10(period)
+    return ci / 100.0
+
+
+def make_frame(n, seed=7, start_time=1_700_000_000):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0004, n))
+    spread = np.abs(rng.normal(0, 0.0003, n))
+    high = close + spread
+    low = close - np.abs(rng.normal(0, 0.0003, n))
+    return pd.DataFrame({
+        'time': pd.to_datetime(start_time + np.arange(n) * 60, unit='s'),
+        'open': close,
+        'high': high,
+        'low': low,
+        'close': close,
+    })
+
+
+REFERENCES = {
+    'sma_fast': lambda df: ref_sma(df, 20),
+    'sma_slow': lambda df: ref_sma(df, 50),
+    'rsi': lambda df: ref_rsi(df, 14),
+    'atr': lambda df: ref_atr(df, 14),
+    'adx': lambda df: ref_adx(df, 14),
+    'choppiness': lambda df: ref_choppiness(df, 14),
+}
+
+
+class TestIndicatorEngineParity(unittest.TestCase):
+    """Engine output must match the pandas implementations row by row."""
+
+    def setUp(self):
+        self.df = make_frame(300)
+
+    def assertSeriesParity(self, name, actual, expected):
+        expected = np.asarray(expected, dtype=float)
+        actual = np.asarray(actual, dtype=float)
+        np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected), err_msg=f"{name} NaN mask")
+        mask = ~np.isnan(expected)
+        np.testing.assert_allclose(actual[mask], expected[mask], rtol=1e-9, atol=1e-12, err_msg=name)
+
+    def test_push_matches_pandas_every_row(self):
+        """Pushing bars one at a time reproduces every pandas row."""
+        engine = IndicatorEngine()
+        rows = {name: [] for name in REFERENCES}
+        for high, low, close in zip(self.df['high'], self.df['low'], self.df['close']):
+            values = engine.push(high, low, close)
+            for name in REFERENCES:
+                rows[name].append(values[name])
+        for name, ref in REFERENCES.items():
+            self.assertSeriesParity(name, rows[name], ref(self.df))
+
+    def test_peek_matches_push_without_mutating(self):
+        """peek() returns what push() would, and leaves state untouched."""
+        engine = IndicatorEngine()
+        for high, low, close in zip(self.df['high'][:-1], self.df['low'][:-1], self.df['close'][:-1]):
+            engine.push(high, low, close)
+        last = self.df.iloc[-1]
+        peeked = engine.peek(last['high'], last['low'], last['close'])
+        peeked_again = engine.peek(last['high'], last['low'], last['close'])
+        pushed = engine.push(last['high'], last['low'], last['close'])
+        for name in REFERENCES:
+            self.assertEqual(peeked[name], peeked_again[name])
+            self.assertAlmostEqual(peeked[name], pushed[name], places=12)
+
+    def test_sync_sliding_window(self):
+        """Syncing a sliding 100-bar frame matches pandas on that frame at the tail."""
+        engine = IndicatorEngine()
+        for end in range(100, 300, 7):
+            frame = self.df.iloc[end - 100:end].reset_index(drop=True)
+            view = sync_engine(engine, *frame_arrays(frame))
+            self.assertIsNotNone(view)
+            for name, ref in REFERENCES.items():
+                expected = ref(frame)
+                self.assertAlmostEqual(view.latest(name), expected.iloc[-1], places=9, msg=name)
+            # Tail history (used by trend maturity)
+            self.assertSeriesParity('sma_slow tail', view.tail('sma_slow', 50),
+                                    ref_sma(frame, 50).iloc[-50:])
+
+    def test_sync_forming_bar_update(self):
+        """A changed forming bar is re-evaluated without committing it."""
+        engine = IndicatorEngine()
+        frame = self.df.iloc[:100].reset_index(drop=True)
+        sync_engine(engine, *frame_arrays(frame))
+        bars_before = engine.bars
+        frame.loc[frame.index[-1], 'close'] += 0.001
+        frame.loc[frame.index[-1], 'high'] += 0.001
+        view = sync_engine(engine, *frame_arrays(frame))
+        self.assertEqual(engine.bars, bars_before)
+        self.assertAlmostEqual(view.latest('sma_fast'), ref_sma(frame, 20).iloc[-1], places=12)
+        self.assertAlmostEqual(view.latest('choppiness'), ref_choppiness(frame, 14).iloc[-1], places=9)
+
+    def test_sync_rebuilds_on_revised_history(self):
+        """A frame whose bar at the engine's last time differs forces a rebuild."""
+        engine = IndicatorEngine()
+        frame = self.df.iloc[:100].reset_index(drop=True)
+        sync_engine(engine, *frame_arrays(frame))
+        revised = make_frame(100, seed=99)
+        view = sync_engine(engine, *frame_arrays(revised))
+        self.assertAlmostEqual(view.latest('adx'), ref_adx(revised, 14).iloc[-1], places=9)
+
+    def test_sync_rejects_descending_frames(self):
+        """Newest-first frames (SIM_LIVE) are not handled by the engine."""
+        frame = self.df.iloc[:100].iloc[::-1].reset_index(drop=True)
+        self.assertIsNone(sync_engine(IndicatorEngine(), *frame_arrays(frame)))
+
+    def test_flat_market_edge_cases(self):
+        """Zero ranges (0/0 and x/0) follow pandas NaN/inf semantics."""
+        df = make_frame(60)
+        df.loc[20:45, ['high', 'low', 'close']] = 1.2
+        engine = IndicatorEngine()
+        rows = {'adx': [], 'rsi': [], 'choppiness': []}
+        for high, low, close in zip(df['high'], df['low'], df['close']):
+            values = engine.push(high, low, close)
+            for name in rows:
+                rows[name].append(values[name])
+        self.assertSeriesParity('rsi', rows['rsi'], ref_rsi(df, 14))
+        self.assertSeriesParity('adx', rows['adx'], ref_adx(df, 14))
+        expected_chop = ref_choppiness(df, 14).to_numpy()
+        finite = np.isfinite(expected_chop)
+        np.testing.assert_allclose(np.asarray(rows['choppiness'])[finite], expected_chop[finite], rtol=1e-9)
+
+
+class TestPointEvaluations(unittest.TestCase):
+    """sma_at / rsi_at / atr_at equal the pandas series at any row."""
+
+    def test_every_row(self):
+        df = make_frame(80, seed=11)
+        _, high, low, close = frame_arrays(df)
+        sma = ref_sma(df, 20)
+        rsi = ref_rsi(df, 14)
+        atr = ref_atr(df, 14)
+        for i in range(len(df)):
+            for actual, expected in ((sma_at(close, i, 20), sma.iloc[i]),
+                                     (rsi_at(close, i, 14), rsi.iloc[i]),
+                                     (atr_at(high, low, close, i, 14), atr.iloc[i])):
+                if np.isnan(expected):
+                    self.assertTrue(np.isnan(actual))
+                else:
+                    self.assertAlmostEqual(actual, expected, places=9)
+
+
+
+class TestBatchEvaluations(unittest.TestCase):
+    """Cross-symbol batch helpers equal the per-symbol evaluations row by row."""
+
+    def setUp(self):
+        self.frames = [make_frame(100, seed=seed) for seed in range(6)]
+        self.frames[2].loc[30:60, ['high', 'low', 'close']] = 1.2  # Flat stretch
+        arrays = [frame_arrays(df) for df in self.frames]
+        self.high = np.vstack([a[1] for a in arrays])
+        self.low = np.vstack([a[2] for a in arrays])
+        self.close = np.vstack([a[3] for a in arrays])
+
+    def test_point_values_match(self):
+        for index in (0, 13, 19, 49, 99):
+            sma = batch_sma_at(self.close, index, 20)
+            rsi = batch_rsi_at(self.close, index, 14)
+            atr = batch_atr_at(self.high, self.low, self.close, index, 14)
+            for row in range(len(self.frames)):
+                h, l, c = self.high[row], self.low[row], self.close[row]
+                for actual, expected in ((sma[row], sma_at(c, index, 20)),
+                                         (rsi[row], rsi_at(c, index, 14)),
+                                         (atr[row], atr_at(h, l, c, index, 14))):
+                    if np.isnan(expected):
+                        self.assertTrue(np.isnan(actual))
+                    else:
+                        self.assertAlmostEqual(actual, expected, places=12)
+
+    def test_adx_from_tail_window(self):
+        """ADX from the last 2*period+1 bars equals pandas ADX over the full frame."""
+        tail = slice(-(2 * 14 + 1), None)
+        adx = batch_adx_last(self.high[:, tail], self.low[:, tail], self.close[:, tail], 14)
+        for row, df in enumerate(self.frames):
+            expected = ref_adx(df, 14).iloc[-1]
+            if np.isnan(expected):
+                self.assertTrue(np.isnan(adx[row]))
+            else:
+                self.assertAlmostEqual(adx[row], expected, places=9)
+
+    def test_short_window_is_nan(self):
+        adx = batch_adx_last(self.high[:, -10:], self.low[:, -10:], self.close[:, -10:], 14)
+        self.assertTrue(np.isnan(adx).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Test for the streaming latency histograms.
+
+Verifies bucket bounds, percentile accuracy against sorted samples, windowed
+views expiring old slots, snapshot merging, and the SLManager timing stats.
+"""
+
+import random
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.latency_histogram import (BUCKET_COUNT, SLOT_SECONDS, StreamingHistogram, bucket_bounds,
+                                     bucket_index)
+from risk.sl_manager import SLManager
+
+
+class TestStreamingHistogram(unittest.TestCase):
+    """Test cases for StreamingHistogram."""
+
+    def test_bucket_bounds_contain_value(self):
+        for value_us in (0, 1, 127, 128, 129, 1000, 12345, 999999, 10 ** 7):
+            low, high = bucket_bounds(bucket_index(value_us))
+            self.assertLessEqual(low, value_us)
+            self.assertLess(value_us, high)
+        self.assertEqual(bucket_index(10 ** 12), BUCKET_COUNT - 1)
+
+    def test_percentiles_match_sorted_samples(self):
+        rng = random.Random(7)
+        samples = [rng.expovariate(1 / 20.0) for _ in range(5000)]
+        histogram = StreamingHistogram()
+        for value in samples:
+            histogram.record(value, now=1000.0)
+        ordered = sorted(samples)
+        stats = histogram.summary()
+        self.assertEqual(stats['count'], len(samples))
+        self.assertAlmostEqual(stats['max'], ordered[-1], places=3)
+        self.assertAlmostEqual(stats['median'], ordered[len(ordered) // 2], delta=ordered[len(ordered) // 2] * 0.02)
+        self.assertAlmostEqual(stats['p95'], ordered[int(len(ordered) * 0.95)],
+                               delta=ordered[int(len(ordered) * 0.95)] * 0.02)
+
+    def test_windows_expire_old_samples(self):
+        histogram = StreamingHistogram()
+        histogram.record(100.0, now=1000.0)
+        histogram.record(5.0, now=1000.0 + 120)
+        self.assertEqual(histogram.summary('1m', now=1000.0 + 120)['count'], 1)
+        self.assertEqual(histogram.summary('5m', now=1000.0 + 120)['count'], 2)
+        self.assertEqual(histogram.summary('5m', now=1000.0 + 400 + SLOT_SECONDS)['count'], 1)
+        self.assertEqual(histogram.summary('1h', now=1000.0 + 7200)['count'], 0)
+        # Lifetime view keeps everything
+        self.assertEqual(histogram.summary()['count'], 2)
+
+    def test_snapshot_merge(self):
+        a, b = StreamingHistogram(), StreamingHistogram()
+        for value in (1.0, 2.0, 3.0):
+            a.record(value)
+        b.record(50.0)
+        merged = a.snapshot().merge(b.snapshot())
+        self.assertEqual(merged.count, 4)
+        self.assertEqual(merged.min_ms, 1.0)
+        self.assertEqual(merged.max_ms, 50.0)
+        self.assertAlmostEqual(merged.percentile(100), 50.0, delta=0.5)
+
+    def test_summary_cached_until_next_record(self):
+        histogram = StreamingHistogram()
+        histogram.record(10.0, now=1000.0)
+        first = histogram.summary()
+        self.assertEqual(histogram.summary(), first)
+        histogram.record(20.0, now=1000.0)
+        self.assertEqual(histogram.summary()['count'], 2)
+
+
+class TestSLManagerTimingStats(unittest.TestCase):
+    """Test cases for SLManager.get_timing_stats latency histograms."""
+
+    def test_timing_stats_report_histograms(self):
+        sl_manager = SLManager({'risk': {'max_risk_per_trade_usd': 2.0}}, Mock(), Mock())
+        self.assertNotIn('loop_duration', sl_manager.get_timing_stats())
+        for value in (10.0, 20.0, 30.0):
+            sl_manager._loop_duration_histogram.record(value)
+        sl_manager._broker_modify_histogram.record(42.0)
+        stats = sl_manager.get_timing_stats()
+        self.assertEqual(stats['loop_count'], 3)
+        self.assertAlmostEqual(stats['loop_duration']['avg'], 20.0)
+        self.assertEqual(set(stats['loop_duration']['windows']), {'1m', '5m', '1h'})
+        self.assertEqual(stats['broker_modify_latency']['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Test for the lock contention profiler.
+
+Verifies wait/hold recording, reentrant acquisitions counted once, timeout
+attribution to the holding code site, and SLManager's profiled locks.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.lock_profiler import LockContentionProfiler, ProfiledLock
+from risk.sl_manager import SLManager
+
+
+def hold_lock(lock, seconds):
+    with lock:
+        time.sleep(seconds)
+
+
+class TestLockContentionProfiler(unittest.TestCase):
+    """Test cases for LockContentionProfiler and ProfiledLock."""
+
+    def setUp(self):
+        self.profiler = LockContentionProfiler(capture_sites=True)
+
+    def test_hold_time_and_site(self):
+        lock = self.profiler.wrap(threading.Lock(), 'tracking')
+        hold_lock(lock, 0.02)
+        report = self.profiler.get_report()
+        stats = report['classes']['tracking']
+        self.assertEqual(stats['acquisitions'], 1)
+        self.assertGreaterEqual(stats['hold']['max'], 15.0)
+        site = report['top_hold_sites'][0]
+        self.assertIn('hold_lock', site['site'])
+        self.assertIn(threading.current_thread().name, report['threads'])
+
+    def test_reentrant_acquisition_counted_once(self):
+        lock = self.profiler.wrap(threading.RLock(), 'ticket')
+        with lock:
+            with lock:
+                pass
+            self.assertTrue(lock.acquire(blocking=False))
+            lock.release()
+        self.assertEqual(self.profiler.get_report()['classes']['ticket']['acquisitions'], 1)
+        # Released completely: releasing again raises like a plain RLock
+        self.assertRaises(RuntimeError, lock.release)
+
+    def test_timeout_attributed_to_holder(self):
+        lock = self.profiler.wrap(threading.RLock(), 'ticket')
+        holder = threading.Thread(target=hold_lock, args=(lock, 0.2))
+        holder.start()
+        time.sleep(0.05)
+        self.assertFalse(lock.acquire(timeout=0.02))
+        holder.join()
+        report = self.profiler.get_report()
+        self.assertEqual(report['classes']['ticket']['timeouts'], 1)
+        blocking = report['top_blocking_sites'][0]
+        self.assertIn('hold_lock', blocking['site'])
+        self.assertEqual(blocking['blocked_others'], 1)
+
+    def test_disabled_profiler_returns_lock(self):
+        lock = threading.Lock()
+        self.assertIs(LockContentionProfiler(enabled=False).wrap(lock, 'timing'), lock)
+
+
+class TestSLManagerLockProfiling(unittest.TestCase):
+    """Test cases for SLManager lock profiling."""
+
+    def test_profiling_is_opt_in(self):
+        sl_manager = SLManager({'risk': {'max_risk_per_trade_usd': 2.0}}, Mock(), Mock())
+        self.assertNotIsInstance(sl_manager._get_ticket_lock(1), ProfiledLock)
+        self.assertNotIsInstance(sl_manager._tracking_lock, ProfiledLock)
+
+    def test_locks_are_profiled(self):
+        config = {'risk': {'max_risk_per_trade_usd': 2.0},
+                  'execution': {'lock_profiler': {'enabled': True, 'capture_sites': True}}}
+        sl_manager = SLManager(config, Mock(), Mock())
+        self.assertIsInstance(sl_manager._get_ticket_lock(1), ProfiledLock)
+        acquired, tracked_lock, _ = sl_manager._acquire_ticket_lock_with_timeout(1)
+        self.assertTrue(acquired)
+        with tracked_lock:
+            pass
+        sl_manager.get_timing_stats()
+        report = sl_manager.get_lock_contention_report()
+        self.assertIn('ticket', report['classes'])
+        self.assertIn('timing', report['classes'])
+        ticket_sites = [s['site'] for s in report['top_hold_sites'] if s['lock_class'] == 'ticket']
+        self.assertTrue(any('test_locks_are_profiled' in site for site in ticket_sites))
+
+
+if __name__ == '__main__':
+    unittest.main()
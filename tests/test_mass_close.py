@@ -0,0 +1,120 @@
+"""
+Test for the mass-close engine.
+
+Verifies that closes run concurrently, that a failed close is retried with
+backoff without holding up the other tickets, that a ticket gone after a
+failed attempt counts as closed, and the completion summary.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.mass_close import ALREADY_CLOSED, CLOSED, FAILED, MassCloseEngine
+from execution.mt5_connector import MT5Connector
+from execution.order_manager import OrderManager
+
+
+class TestMassClose(unittest.TestCase):
+    """Test cases for MassCloseEngine."""
+
+    def test_closes_run_concurrently(self):
+        def close(ticket, comment):
+            time.sleep(0.1)
+            return True
+
+        engine = MassCloseEngine(close, max_workers=10)
+        start = time.perf_counter()
+        report = engine.close_all(range(1, 11), "Kill switch")
+        elapsed = time.perf_counter() - start
+
+        self.assertTrue(report.all_closed)
+        self.assertEqual({outcome.status for outcome in report.outcomes}, {CLOSED})
+        self.assertLess(elapsed, 0.5)  # Serial would take 1s
+        self.assertEqual([outcome.ticket for outcome in report.outcomes], list(range(1, 11)))
+
+    def test_failed_close_retried_with_backoff(self):
+        attempts = {}
+        lock = threading.Lock()
+
+        def close(ticket, comment):
+            with lock:
+                attempts[ticket] = attempts.get(ticket, 0) + 1
+                return ticket != 1 or attempts[ticket] >= 3
+
+        engine = MassCloseEngine(close, max_workers=4, max_attempts=3, backoff_seconds=0.01)
+        report = engine.close_all([1, 2, 2, 3], "Kill switch")
+
+        self.assertTrue(report.all_closed)
+        self.assertEqual(attempts, {1: 3, 2: 1, 3: 1})  # Duplicates closed once
+        self.assertEqual(report.outcomes[0].attempts, 3)
+        self.assertEqual(report.summary()['retries'], 2)
+
+    def test_ticket_gone_after_failure_counts_as_closed(self):
+        engine = MassCloseEngine(lambda ticket, comment: False, is_open_fn=lambda ticket: ticket != 5,
+                                 max_attempts=3, backoff_seconds=0.01)
+        report = engine.close_all([5, 6], "Kill switch", reason="test")
+
+        statuses = {outcome.ticket: (outcome.status, outcome.attempts) for outcome in report.outcomes}
+        self.assertEqual(statuses[5], (ALREADY_CLOSED, 1))
+        self.assertEqual(statuses[6], (FAILED, 3))
+        self.assertEqual(report.failed_tickets, [6])
+        self.assertFalse(report.all_closed)
+
+    def test_failed_open_check_keeps_ticket_open(self):
+        # None = positions read failed (disconnected): unknown, not closed
+        engine = MassCloseEngine(lambda ticket, comment: False, is_open_fn=lambda ticket: None,
+                                 max_attempts=3, backoff_seconds=0.01)
+        report = engine.close_all([8], "Kill switch")
+
+        self.assertEqual((report.outcomes[0].status, report.outcomes[0].attempts), (FAILED, 3))
+        self.assertFalse(report.all_closed)
+
+    def test_order_manager_outage_is_not_reported_flat(self):
+        connector = Mock(spec=MT5Connector)
+        connector.ensure_connected.return_value = False
+        connector.mt5_io = None
+        order_manager = OrderManager(connector)
+        order_manager.mass_close_engine.backoff_seconds = 0.01
+
+        self.assertIsNone(order_manager._is_position_open(1))
+        report = order_manager.close_positions([1, 2, 3], comment="Kill switch")
+
+        summary = report.summary()
+        self.assertEqual((summary['already_closed'], summary['failed']), (0, 3))
+        self.assertFalse(report.all_closed)
+
+    def test_exceptions_and_deadline(self):
+        def close(ticket, comment):
+            raise RuntimeError("terminal busy")
+
+        engine = MassCloseEngine(close, max_attempts=5, backoff_seconds=0.5, deadline_seconds=0.1)
+        report = engine.close_all([7], "Kill switch")
+
+        outcome = report.outcomes[0]
+        self.assertEqual((outcome.status, outcome.attempts), (FAILED, 1))  # No retry past the deadline
+        self.assertIn("terminal busy", outcome.error)
+
+    def test_summary(self):
+        engine = MassCloseEngine(lambda ticket, comment: ticket % 2 == 0, is_open_fn=lambda ticket: True,
+                                 max_attempts=1)
+        report = engine.close_all([1, 2, 3, 4], "Kill switch", reason="Kill switch")
+        summary = report.summary()
+
+        self.assertEqual((summary['requested'], summary['closed'], summary['failed']), (4, 2, 2))
+        self.assertEqual(summary['failed_tickets'], [1, 3])
+        self.assertEqual(set(summary['latency_ms']), {'p50', 'p95', 'max'})
+        self.assertIn("[MASS_CLOSE] Kill switch", report.format())
+        self.assertEqual(engine.close_all([], "Kill switch").summary()['requested'], 0)
+        self.assertEqual(MassCloseEngine.from_config({'execution': {'mass_close': {'max_workers': 3}}},
+                                                     lambda ticket, comment: True).max_workers, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
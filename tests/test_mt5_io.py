@@ -0,0 +1,140 @@
+"""
+Test for the prioritized MT5 I/O executor.
+
+Verifies priority ordering, deadline expiry, inline fallback and the
+thread-local priority scopes.
+"""
+
+import unittest
+from unittest.mock import Mock
+import threading
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.mt5_io import (
+    MT5IOExecutor, MT5Priority, MT5RequestTimeout, current_priority, mt5_call,
+    priority_scope, with_priority
+)
+
+
+class TestMT5IOExecutor(unittest.TestCase):
+    """Test cases for MT5IOExecutor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.executor = MT5IOExecutor(default_timeout=5.0)
+
+    def tearDown(self):
+        self.executor.stop()
+
+    def _block_io_thread(self):
+        """Occupy the I/O thread until the returned event is set."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def gate():
+            started.set()
+            release.wait(5.0)
+
+        self.executor.submit(gate)
+        self.assertTrue(started.wait(5.0))
+        return release
+
+    def test_served_in_priority_order(self):
+        """Queued requests run most urgent first, FIFO within a priority."""
+        release = self._block_io_thread()
+        order = []
+        futures = [
+            self.executor.submit(order.append, 'monitor', priority=MT5Priority.MONITORING),
+            self.executor.submit(order.append, 'data', priority=MT5Priority.MARKET_DATA),
+            self.executor.submit(order.append, 'trail-1', priority=MT5Priority.SL_TRAIL),
+            self.executor.submit(order.append, 'emergency', priority=MT5Priority.EMERGENCY_SL),
+            self.executor.submit(order.append, 'trail-2', priority=MT5Priority.SL_TRAIL),
+        ]
+        release.set()
+        for future in futures:
+            future.result(5.0)
+        self.assertEqual(order, ['emergency', 'trail-1', 'trail-2', 'data', 'monitor'])
+        self.assertEqual(self.executor.get_stats()['max_queue_depth'], 5)
+
+    def test_expired_request_is_dropped(self):
+        """A request still queued past its deadline fails without running."""
+        release = self._block_io_thread()
+        fn = Mock(return_value=1)
+        future = self.executor.submit(fn, timeout=0.0)
+        release.set()
+        with self.assertRaises(MT5RequestTimeout):
+            future.result(5.0)
+        fn.assert_not_called()
+        self.assertEqual(self.executor.get_stats()['expired'], 1)
+
+    def test_exceptions_propagate(self):
+        """Errors raised by the MT5 call reach the caller."""
+        def boom():
+            raise ValueError("terminal gone")
+        with self.assertRaises(ValueError):
+            self.executor.call(boom)
+        self.assertEqual(self.executor.call(lambda: 42), 42)
+
+    def test_disabled_runs_inline(self):
+        """A disabled executor calls in the caller's thread."""
+        executor = MT5IOExecutor(enabled=False)
+        self.assertIs(executor.call(threading.current_thread), threading.current_thread())
+        self.assertFalse(executor.is_running())
+        self.assertEqual(executor.get_stats()['inline'], 1)
+
+    def test_nested_call_from_io_thread(self):
+        """A request that submits another one does not deadlock."""
+        result = self.executor.call(lambda: self.executor.call(lambda: 'inner'))
+        self.assertEqual(result, 'inner')
+
+
+class TestPriorityHelpers(unittest.TestCase):
+    """Test cases for priority scopes and mt5_call."""
+
+    def test_nested_scopes_keep_most_urgent(self):
+        self.assertEqual(current_priority(), MT5Priority.MARKET_DATA)
+        with priority_scope(MT5Priority.SL_TRAIL):
+            with priority_scope(MT5Priority.MONITORING):
+                self.assertEqual(current_priority(), MT5Priority.SL_TRAIL)
+            with priority_scope(MT5Priority.EMERGENCY_SL):
+                self.assertEqual(current_priority(), MT5Priority.EMERGENCY_SL)
+            self.assertEqual(current_priority(), MT5Priority.SL_TRAIL)
+        self.assertEqual(current_priority(), MT5Priority.MARKET_DATA)
+
+    def test_with_priority_decorator(self):
+        @with_priority(MT5Priority.CLOSE)
+        def close():
+            return current_priority()
+        self.assertEqual(close(), MT5Priority.CLOSE)
+
+    def test_mt5_call_without_executor(self):
+        """Mock connectors call the MT5 function directly."""
+        fn = Mock(return_value='rates')
+        self.assertEqual(mt5_call(Mock(), fn, 'EURUSDm', count=5), 'rates')
+        fn.assert_called_once_with('EURUSDm', count=5)
+
+    def test_mt5_call_timeout_returns_none(self):
+        """An expired request looks like a failed MT5 call."""
+        executor = MT5IOExecutor()
+        started = threading.Event()
+        release = threading.Event()
+        executor.submit(lambda: (started.set(), release.wait(5.0)))
+        self.assertTrue(started.wait(5.0))
+        connector = Mock()
+        connector.mt5_io = executor
+        result = []
+        worker = threading.Thread(target=lambda: result.append(
+            mt5_call(connector, lambda: 'late', timeout=0.0)))
+        worker.start()
+        release.set()
+        worker.join(5.0)
+        executor.stop()
+        self.assertEqual(result, [None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Test for MT5 RPC instrumentation.
+
+Verifies the instrumented module proxy, latency histograms, caller-thread
+attribution through the I/O executor and the system_health snapshot.
+"""
+
+import unittest
+import threading
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.mt5_io import MT5IOExecutor
+from execution.mt5_metrics import InstrumentedMT5, LatencyHistogram, MT5CallMetrics, instrument_mt5
+from utils import system_health
+
+
+class FakeMT5:
+    """Minimal MT5 module stand-in."""
+
+    ORDER_TYPE_BUY = 0
+
+    def __init__(self):
+        self.symbols = {'EURUSDm': 'info'}
+
+    def symbol_info(self, symbol):
+        return self.symbols.get(symbol)
+
+    def order_send(self, request):
+        raise RuntimeError("terminal gone")
+
+    def shutdown(self):
+        return None
+
+
+class TestInstrumentedMT5(unittest.TestCase):
+    """Test cases for the instrumented MT5 proxy."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.metrics = MT5CallMetrics()
+        self.module = FakeMT5()
+        self.mt5 = InstrumentedMT5(self.module, self.metrics)
+
+    def test_constants_and_results_pass_through(self):
+        self.assertEqual(self.mt5.ORDER_TYPE_BUY, 0)
+        self.assertEqual(self.mt5.symbol_info('EURUSDm'), 'info')
+        self.assertIs(instrument_mt5(self.mt5), self.mt5)
+
+    def test_counts_and_errors(self):
+        """None results and exceptions count as errors (except shutdown)."""
+        self.mt5.symbol_info('EURUSDm')
+        self.mt5.symbol_info('XXXm')
+        with self.assertRaises(RuntimeError):
+            self.mt5.order_send({})
+        self.mt5.shutdown()
+        functions = self.metrics.get_snapshot()['functions']
+        self.assertEqual((functions['symbol_info']['count'], functions['symbol_info']['errors']), (2, 1))
+        self.assertEqual(functions['order_send']['errors'], 1)
+        self.assertEqual(functions['shutdown']['errors'], 0)
+
+    def test_patched_module_is_resolved_at_call_time(self):
+        self.mt5.symbol_info('EURUSDm')
+        self.module.symbol_info = lambda symbol: 'patched'
+        self.assertEqual(self.mt5.symbol_info('EURUSDm'), 'patched')
+
+    def test_executor_calls_attributed_to_submitter(self):
+        """Calls served on the I/O thread are recorded under the calling thread."""
+        executor = MT5IOExecutor()
+        worker = threading.Thread(
+            target=lambda: executor.call(self.mt5.symbol_info, 'EURUSDm'), name='SLWorker')
+        worker.start()
+        worker.join(5.0)
+        executor.stop()
+        threads = self.metrics.get_snapshot()['threads']
+        self.assertIn('SLWorker', threads)
+        self.assertNotIn('MT5-IO', threads)
+        self.assertIn('[MT5_RPC_STATS] symbol_info calls=1', self.metrics.format_summary()[0])
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test cases for LatencyHistogram."""
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.8, False)
+        for _ in range(10):
+            histogram.record(40.0, True)
+        self.assertAlmostEqual(histogram.percentile(50), 0.8, delta=0.01)
+        self.assertAlmostEqual(histogram.percentile(95), 40.0, delta=0.4)
+        self.assertLessEqual(histogram.percentile(99), 40.0)  # Capped at the observed max
+        data = histogram.to_dict()
+        self.assertEqual(data['errors'], 10)
+        self.assertEqual(data['buckets'], {'le_1ms': 90, 'le_50ms': 10})
+
+
+class TestHealthSnapshot(unittest.TestCase):
+    """Metrics sources appear in system_health.get_health_snapshot()."""
+
+    def test_registered_source(self):
+        system_health.register_metrics_source('test_rpc', lambda: {'total_calls': 3})
+        try:
+            snapshot = system_health.get_health_snapshot()
+            self.assertEqual(snapshot['test_rpc'], {'total_calls': 3})
+            self.assertIn('PositionMonitor', snapshot)
+        finally:
+            with system_health._lock:
+                system_health._metrics_sources.pop('test_rpc', None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Test for per-symbol order templates.
+
+Verifies price rounding, volume grid snapping, filling mode preference, the
+request fill, and that the template cache rebuilds only when the symbol
+specification changes.
+"""
+
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.order_template import OrderTemplate, OrderTemplateCache
+
+MT5 = SimpleNamespace(ORDER_FILLING_FOK=0, ORDER_FILLING_IOC=1, ORDER_FILLING_RETURN=2,
+                      TRADE_ACTION_DEAL=1, ORDER_TIME_GTC=0)
+
+
+def symbol_info(**overrides):
+    info = {'name': 'EURUSD', 'point': 0.00001, 'digits': 5, 'trade_stops_level': 10,
+            'volume_min': 0.01, 'volume_max': 100.0, 'volume_step': 0.01, 'filling_mode': 3,
+            'bid': 1.1, 'ask': 1.10002}
+    info.update(overrides)
+    return info
+
+
+class TestOrderTemplate(unittest.TestCase):
+    """Test cases for OrderTemplate and OrderTemplateCache."""
+
+    def test_derived_fields_and_rounding(self):
+        template = OrderTemplate(symbol_info(), 3, MT5)
+        self.assertAlmostEqual(template.pip_value, 0.0001)
+        self.assertAlmostEqual(template.min_stop_distance, 0.0001)
+        self.assertEqual(template.round_price(1.1234567), 1.12346)
+        # IOC preferred over FOK
+        self.assertEqual(template.filling_types, (MT5.ORDER_FILLING_IOC, MT5.ORDER_FILLING_FOK))
+
+    def test_volume_grid(self):
+        template = OrderTemplate(symbol_info(volume_step=0.01), 3, MT5)
+        self.assertEqual(template.normalize_volume(0.03), 0.03)
+        self.assertEqual(template.normalize_volume(0.0399), 0.03)  # Snapped down, never up
+        self.assertIsNone(template.normalize_volume(0.005))
+        self.assertIsNone(template.normalize_volume(150.0))
+        quarter = OrderTemplate(symbol_info(volume_min=0.25, volume_step=0.25), 3, MT5)
+        self.assertEqual(quarter.normalize_volume(0.75), 0.75)
+        self.assertEqual(quarter.normalize_volume(0.99), 0.75)
+        self.assertEqual(quarter.normalize_volume(1.25), 1.25)
+        unconstrained = OrderTemplate(symbol_info(volume_min=None, volume_max=None, volume_step=None), 3, MT5)
+        self.assertEqual(unconstrained.normalize_volume(0.123), 0.123)
+
+    def test_request_fill(self):
+        template = OrderTemplate(symbol_info(), 4, MT5, deviation=5)
+        request = template.request(0, 0.02, 1.10002, "Trading Bot", sl=1.099, tp=0.0)
+        self.assertEqual(request['type_filling'], MT5.ORDER_FILLING_RETURN)
+        self.assertEqual(request['deviation'], 5)
+        self.assertEqual(request['sl'], 1.099)
+        self.assertNotIn('tp', request)
+        # Requests do not share state
+        self.assertNotIn('sl', template.request(0, 0.02, 1.10002, "Trading Bot"))
+
+    def test_no_filling_mode_uses_default(self):
+        self.assertIsNone(OrderTemplate(symbol_info(), 0, MT5).filling_type)
+        self.assertEqual(OrderTemplate(symbol_info(), None, MT5, default_filling=MT5.ORDER_FILLING_RETURN)
+                         .filling_type, MT5.ORDER_FILLING_RETURN)
+
+    def test_cache_rebuilds_on_spec_change(self):
+        builds = []
+
+        def build(info):
+            builds.append(info['name'])
+            return OrderTemplate(info, info.get('filling_mode'), MT5)
+
+        cache = OrderTemplateCache(build)
+        first = cache.get(symbol_info())
+        self.assertIs(cache.get(symbol_info(bid=1.2, ask=1.20002)), first)  # Quote change only
+        second = cache.get(symbol_info(trade_stops_level=20))
+        self.assertIsNot(second, first)
+        self.assertEqual(second.stops_level, 20)
+        cache.invalidate('EURUSD')
+        cache.get(symbol_info(trade_stops_level=20))
+        stats = cache.get_stats()
+        self.assertEqual((stats['builds'], stats['hits'], stats['spec_changes']), (3, 1, 1))
+        self.assertEqual(len(builds), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Test for the parallel symbol scan pipeline.
+
+Verifies that symbol scans fan out over the worker pool, that results are
+merged in PairFilter priority order regardless of completion order, that
+per-symbol errors and SIM_LIVE deferral are reported like the sequential scan,
+that batch trend rates are read on the pool after the cheap filters, and that
+pending signal confirmation does its broker reads outside the shared lock.
+"""
+
+import unittest
+import threading
+import time
+import sys
+import os
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.trading_bot import TradingBot, _SCAN_DEFERRED
+
+
+class TestParallelSymbolScan(unittest.TestCase):
+    """Test cases for TradingBot._run_symbol_scans()."""
+
+    def setUp(self):
+        """Set up a bot with only the scan pool state."""
+        self.bot = TradingBot.__new__(TradingBot)
+        self.bot.is_sim_live = False
+        self.bot.is_backtest = False
+        self.bot.running = True
+        self.bot.parallel_scan_enabled = True
+        self.bot.scan_max_workers = 4
+        self.bot._scan_pool = None
+        self.bot._scan_pool_lock = threading.Lock()
+        self.bot._scan_stats_lock = threading.Lock()
+        self.bot.trade_stats = {'filtered_opportunities': 0}
+        self.symbols = ['EURUSDm', 'GBPUSDm', 'USDJPYm', 'XAUUSDm', 'BTCUSDm', 'US30m']
+        # Module logger is created in TradingBot.__init__
+        logger_patch = patch('bot.trading_bot.logger')
+        logger_patch.start()
+        self.addCleanup(logger_patch.stop)
+
+    def tearDown(self):
+        self.bot._shutdown_scan_pool()
+
+    def test_results_keep_symbol_order(self):
+        """Slow early symbols do not reorder the merged results."""
+        delays = {symbol: 0.05 * (len(self.symbols) - i) for i, symbol in enumerate(self.symbols)}
+
+        def scan(symbol, batch):
+            time.sleep(delays[symbol])
+            return {'symbol': symbol}
+
+        self.bot._scan_symbol = scan
+        results = self.bot._run_symbol_scans(self.symbols, {})
+        self.assertEqual([r[0] for r in results], self.symbols)
+        self.assertEqual([r[1]['symbol'] for r in results], self.symbols)
+
+    def test_scans_overlap_within_worker_limit(self):
+        """Symbols run concurrently, never more than max_workers at once."""
+        active = []
+        peak = [0]
+        lock = threading.Lock()
+
+        def scan(symbol, batch):
+            with lock:
+                active.append(symbol)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(symbol)
+            return None
+
+        self.bot._scan_symbol = scan
+        start = time.time()
+        self.bot._run_symbol_scans(self.symbols, {})
+        self.assertLess(time.time() - start, 0.05 * len(self.symbols))
+        self.assertGreater(peak[0], 1)
+        self.assertLessEqual(peak[0], self.bot.scan_max_workers)
+
+    def test_errors_are_returned_per_symbol(self):
+        """A failing symbol is reported without affecting the others."""
+        def scan(symbol, batch):
+            if symbol == 'USDJPYm':
+                raise ValueError("boom")
+            return {'symbol': symbol}
+
+        self.bot._scan_symbol = scan
+        results = self.bot._run_symbol_scans(self.symbols, {})
+        errors = {symbol: error for symbol, _, error in results if error is not None}
+        self.assertEqual(list(errors), ['USDJPYm'])
+        self.assertEqual(sum(1 for _, result, _ in results if result), len(self.symbols) - 1)
+
+    def test_sim_live_runs_sequentially_and_defers(self):
+        """SIM_LIVE scans inline and stops at a deferral."""
+        self.bot.is_sim_live = True
+        calls = []
+
+        def scan(symbol, batch):
+            calls.append(threading.current_thread().name)
+            return _SCAN_DEFERRED if len(calls) == 2 else None
+
+        self.bot._scan_symbol = scan
+        results = self.bot._run_symbol_scans(self.symbols, {})
+        self.assertEqual(len(calls), 2)
+        self.assertIs(results[-1][1], _SCAN_DEFERRED)
+        self.assertEqual(set(calls), {threading.current_thread().name})
+        self.assertIsNone(self.bot._scan_pool)
+
+    def test_filtered_counter_is_thread_safe(self):
+        """Concurrent filter counts are not lost."""
+        def scan(symbol, batch):
+            for _ in range(1000):
+                self.bot._count_filtered_opportunity()
+            return None
+
+        self.bot._scan_symbol = scan
+        self.bot._run_symbol_scans(self.symbols, {})
+        self.assertEqual(self.bot.trade_stats['filtered_opportunities'], 1000 * len(self.symbols))
+
+    def test_prefiltered_symbols_skip_cheap_filters(self):
+        """Symbols whose cheap filters already ran get their filter results passed through."""
+        seen = {}
+
+        def scan(symbol, batch, filter_results=None):
+            seen[symbol] = filter_results
+            return None
+
+        self.bot._scan_symbol = scan
+        prefiltered = {symbol: {'news': {'passed': True}} for symbol in self.symbols[:2]}
+        self.bot._run_symbol_scans(self.symbols[:3], {}, prefiltered)
+        self.assertEqual(seen, {self.symbols[0]: prefiltered[self.symbols[0]],
+                                self.symbols[1]: prefiltered[self.symbols[1]],
+                                self.symbols[2]: None})
+
+    def test_batch_trend_rates_read_on_pool(self):
+        """Batch trend rates are read on the scan pool and handed to the batch evaluation."""
+        threads = {}
+
+        def get_rates(symbol, count):
+            threads[symbol] = threading.current_thread().name
+            if symbol == 'US30m':
+                raise RuntimeError("no rates")
+            return symbol.lower()
+
+        self.bot.trend_filter = Mock()
+        self.bot.trend_filter.get_rates.side_effect = get_rates
+        self.bot.trend_filter.get_trend_signals_batch.return_value = {'EURUSDm': {'signal': 'LONG'}}
+        signals = self.bot._get_batch_trend_signals(self.symbols)
+        self.assertEqual(signals, {'EURUSDm': {'signal': 'LONG'}})
+        self.assertTrue(all(name.startswith('SymbolScan') for name in threads.values()))
+        symbols, = self.bot.trend_filter.get_trend_signals_batch.call_args[0]
+        frames = self.bot.trend_filter.get_trend_signals_batch.call_args[1]['frames']
+        self.assertEqual(symbols, self.symbols)
+        self.assertEqual(sorted(frames), sorted(s for s in self.symbols if s != 'US30m'))
+
+
+class TestPendingSignalConfirmation(unittest.TestCase):
+    """Test cases for the one-candle confirmation in TradingBot._scan_symbol()."""
+
+    def setUp(self):
+        """Set up a bot with only the pending signal state."""
+        self.bot = TradingBot.__new__(TradingBot)
+        self.bot.is_sim_live = False
+        self.bot._scan_stats_lock = threading.Lock()
+        self.bot.trade_stats = {'filtered_opportunities': 0}
+        self.bot._pending_signals_lock = threading.Lock()
+        self.pending = {'direction': 'LONG', 'candle_time': 100, 'opportunity_data': {'symbol': 'EURUSDm'}}
+        self.bot._pending_signals = {'EURUSDm': self.pending}
+        self.bot.trend_filter = Mock()
+        self.lock_held = []
+
+        def get_rates(symbol, count):
+            self.lock_held.append(self.bot._pending_signals_lock.locked())
+            return pd.DataFrame({'time': [200]})
+
+        self.bot.trend_filter.get_rates.side_effect = get_rates
+        logger_patch = patch('bot.trading_bot.logger')
+        logger_patch.start()
+        self.addCleanup(logger_patch.stop)
+
+    def test_confirmation_reads_broker_without_lock(self):
+        result = self.bot._scan_symbol('EURUSDm', {'EURUSDm': {'signal': 'LONG'}}, filter_results={})
+        self.assertEqual(result, {'symbol': 'EURUSDm'})
+        self.assertEqual(self.lock_held, [False])
+        self.assertEqual(self.bot._pending_signals, {})
+
+    def test_replaced_signal_is_kept(self):
+        """An entry replaced while the broker was read is neither confirmed nor deleted."""
+        replacement = dict(self.pending, candle_time=200)
+
+        def get_rates(symbol, count):
+            self.bot._pending_signals['EURUSDm'] = replacement
+            return pd.DataFrame({'time': [200]})
+
+        self.bot.trend_filter.get_rates.side_effect = get_rates
+        self.assertIsNone(self.bot._scan_symbol('EURUSDm', {'EURUSDm': {'signal': 'LONG'}}, filter_results={}))
+        self.assertIs(self.bot._pending_signals['EURUSDm'], replacement)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Test for the shared position snapshot bus.
+
+Verifies that monitoring threads share one broker read, that staleness budgets
+trigger a single-flight refresh, that broker failures never publish an
+empty ("all closed") snapshot, and that an outage past the stale fallback limit
+reads as "unknown" rather than the last snapshot.
+"""
+
+import unittest
+import threading
+import time
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.position_snapshot import (
+    PositionSnapshotBus, read_open_positions, read_position_snapshot
+)
+
+
+def _position(ticket, sl=1.0):
+    return {'ticket': ticket, 'symbol': 'EURUSDm', 'type': 'BUY', 'sl': sl, 'profit': 0.0}
+
+
+class TestPositionSnapshotBus(unittest.TestCase):
+    """Test cases for PositionSnapshotBus."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.fetch_calls = 0
+        self.positions = [_position(1), _position(2)]
+        self.excluded = {2}
+        self.fail = False
+
+        def fetch():
+            self.fetch_calls += 1
+            if self.fail:
+                return None
+            return list(self.positions), set(self.excluded)
+
+        self.bus = PositionSnapshotBus(fetch_fn=fetch, interval_seconds=0.05)
+
+    def tearDown(self):
+        self.bus.stop()
+
+    def test_fresh_snapshot_is_shared(self):
+        """Consumers within their staleness budget reuse the same snapshot."""
+        first = self.bus.get(max_age_seconds=10.0)
+        second = self.bus.get(max_age_seconds=10.0)
+        self.assertIs(first, second)
+        self.assertEqual(self.fetch_calls, 1)
+        self.assertEqual(self.bus.get_stats()['cache_hits'], 1)
+
+    def test_stale_snapshot_triggers_refresh(self):
+        """A consumer with a tighter budget than the snapshot age refreshes it."""
+        first = self.bus.get(max_age_seconds=10.0)
+        time.sleep(0.02)
+        second = self.bus.get(max_age_seconds=0.001)
+        self.assertGreater(second.sequence, first.sequence)
+        self.assertEqual(self.fetch_calls, 2)
+
+    def test_exclusions_preserved(self):
+        """Excluded tickets are hidden by default, available on request."""
+        snapshot = self.bus.refresh()
+        self.assertEqual([p['ticket'] for p in snapshot.as_dicts()], [1])
+        self.assertEqual(len(snapshot.as_dicts(exclude_dec8=False)), 2)
+        self.assertIsNotNone(snapshot.by_ticket(1))
+        self.assertIsNone(snapshot.by_ticket(99))
+
+    def test_snapshot_is_immutable(self):
+        """Consumers cannot mutate the shared snapshot."""
+        snapshot = self.bus.refresh()
+        with self.assertRaises(TypeError):
+            snapshot.by_ticket(1)['sl'] = 0.0
+        copies = snapshot.as_dicts()
+        copies[0]['sl'] = 0.0
+        self.assertEqual(snapshot.by_ticket(1)['sl'], 1.0)
+
+    def test_failed_fetch_keeps_last_snapshot(self):
+        """A broker failure must not publish an empty snapshot."""
+        good = self.bus.refresh()
+        self.fail = True
+        self.assertIsNone(self.bus.refresh())
+        self.assertIs(self.bus.latest(), good)
+        self.assertEqual(self.bus.get_stats()['fetch_failures'], 1)
+
+    def test_failed_refresh_serves_last_snapshot_within_limit(self):
+        """A failed refresh falls back to the last snapshot only up to the hard limit."""
+        good = self.bus.refresh()
+        self.fail = True
+        self.assertIs(self.bus.get(max_age_seconds=0.005), good)  # Within 10x the budget
+        time.sleep(0.06)
+        self.assertIsNone(self.bus.get(max_age_seconds=0.005))  # 60ms+ old, limit 50ms
+        self.assertEqual(self.bus.get_stats()['stale_rejections'], 1)
+
+    def test_concurrent_refreshes_are_coalesced(self):
+        """Threads that wait on an in-flight fetch reuse its result."""
+        gate = threading.Event()
+
+        def slow_fetch():
+            self.fetch_calls += 1
+            gate.wait(1.0)
+            return list(self.positions), set()
+
+        bus = PositionSnapshotBus(fetch_fn=slow_fetch)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(bus.refresh())) for _ in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        gate.set()
+        for t in threads:
+            t.join(2.0)
+
+        self.assertEqual(self.fetch_calls, 1)
+        self.assertEqual(len({r.sequence for r in results}), 1)
+
+    def test_producer_publishes_and_notifies(self):
+        """The producer thread publishes on its cadence and wakes waiters."""
+        received = []
+        self.bus.subscribe(received.append)
+        self.bus.start()
+        snapshot = self.bus.wait_for_next(0, timeout=1.0)
+        self.assertIsNotNone(snapshot)
+        self.assertTrue(self.bus.is_running())
+        self.assertTrue(received)
+
+
+class TestReadHelpers(unittest.TestCase):
+    """Test cases for the consumer read helpers."""
+
+    def test_fallback_without_bus(self):
+        """Order managers without a bus (mocks) use get_open_positions()."""
+        order_manager = Mock()
+        order_manager.get_open_positions.return_value = [_position(5)]
+        self.assertEqual(read_open_positions(order_manager, 'sl_worker'), [_position(5)])
+        order_manager.get_open_positions.assert_called_once_with()
+        self.assertIsNone(read_position_snapshot(order_manager, 'soft_tp'))
+
+    def test_reads_from_bus(self):
+        """Order managers with a bus serve consumers from the snapshot."""
+        order_manager = Mock()
+        order_manager.position_bus = PositionSnapshotBus(fetch_fn=lambda: ([_position(7)], set()))
+        self.assertEqual(read_open_positions(order_manager, 'sl_worker'), [_position(7)])
+        order_manager.get_open_positions.assert_not_called()
+
+    def test_outage_reads_as_unknown(self):
+        """Past the stale fallback limit consumers get None, never an empty position list."""
+        order_manager = Mock()
+        order_manager.position_bus = PositionSnapshotBus(fetch_fn=lambda: None)
+        self.assertIsNone(read_open_positions(order_manager, 'sl_worker'))
+        self.assertIsNone(read_position_snapshot(order_manager, 'soft_tp'))
+        order_manager.get_open_positions.assert_not_called()
+
+    def test_disabled_bus_fetches_directly(self):
+        """A disabled bus refreshes on every read (legacy behaviour)."""
+        calls = []
+        bus = PositionSnapshotBus(fetch_fn=lambda: calls.append(1) or ([], set()), enabled=False)
+        bus.get('sl_worker')
+        bus.get('sl_worker')
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
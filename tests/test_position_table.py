@@ -0,0 +1,84 @@
+"""
+Test for the columnar position table.
+
+Verifies that PositionTable.from_mt5() reproduces the legacy position dicts,
+applies the Dec 8 / 12 hour / previous-day exclusion rules on epoch seconds,
+and that row views work as read-only position mappings in snapshots.
+"""
+
+import unittest
+from collections import namedtuple
+from datetime import datetime, timedelta
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.position_snapshot import PositionSnapshot
+from execution.position_table import POSITION_KEYS, PositionRow, PositionTable
+
+MT5Position = namedtuple('MT5Position', 'ticket symbol type volume price_open price_current sl tp profit swap time comment')
+NOW = datetime(2026, 3, 10, 15, 0, 0)
+
+
+def mt5_position(ticket, opened, order_type=0):
+    return MT5Position(ticket, 'EURUSDm', order_type, 0.01, 1.1, 1.1002, 1.09, 0.0, 0.2, -0.01,
+                       int(opened.timestamp()), 'bot')
+
+
+class TestPositionTable(unittest.TestCase):
+    """Test cases for PositionTable."""
+
+    def setUp(self):
+        self.positions = [
+            mt5_position(1, NOW - timedelta(minutes=5)),
+            mt5_position(2, NOW - timedelta(hours=1), order_type=1),
+            mt5_position(3, datetime(2025, 12, 8, 10, 0)),
+            mt5_position(4, NOW - timedelta(hours=13)),
+        ]
+        self.table = PositionTable.from_mt5(self.positions, buy_type=0, now=NOW)
+
+    def test_row_dict_matches_legacy_shape(self):
+        row = self.table.as_dicts(exclude_dec8=False)[1]
+        self.assertEqual(tuple(row), POSITION_KEYS)
+        self.assertEqual(row['type'], 'SELL')
+        self.assertEqual(row['time_open'], datetime.fromtimestamp(self.positions[1].time))
+        self.assertEqual(row['swap'], -0.01)
+
+    def test_exclusions(self):
+        self.assertEqual(set(self.table.exclusions), {3, 4})
+        self.assertIn('Dec 8, 2025', self.table.exclusions[3])
+        self.assertIn('older than 12 hours', self.table.exclusions[4])
+        self.assertEqual([row['ticket'] for row in self.table.rows()], [1, 2])
+        self.assertEqual(len(self.table.rows(exclude_dec8=False)), 4)
+
+    def test_row_view_is_read_only_mapping(self):
+        row = self.table.get(1)
+        self.assertIsInstance(row, PositionRow)
+        self.assertEqual(row.get('profit'), 0.2)
+        self.assertIsNone(row.get('missing'))
+        self.assertEqual(dict(row), row.copy())
+        with self.assertRaises(TypeError):
+            row['sl'] = 1.0
+        self.assertIsNone(self.table.get(99))
+
+    def test_numeric_columns(self):
+        profits = self.table.array('profit')
+        self.assertEqual(profits.shape, (4,))
+        self.assertIs(self.table.array('profit'), profits)
+        self.assertFalse(profits.flags.writeable)
+        with self.assertRaises(KeyError):
+            self.table.array('symbol')
+
+    def test_snapshot_keeps_rows(self):
+        snapshot = PositionSnapshot.build(1, self.table.rows(exclude_dec8=False), set(self.table.exclusions))
+        self.assertIs(snapshot.by_ticket(2)._table, self.table)
+        dicts = snapshot.as_dicts()
+        self.assertEqual([pos['ticket'] for pos in dicts], [1, 2])
+        dicts[0]['sl'] = 0.0  # Mutable copies
+        self.assertEqual(snapshot.by_ticket(1)['sl'], 1.09)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Test for the global SL RPC token-bucket limiter.
+
+Verifies class admission, critical backoff, per-ticket coalescing, priority
+drain order (optionally per symbol partition) and SLManager dispatch of
+queued updates.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.rpc_rate_limiter import GlobalRPCLimiter, RPCClass
+from risk.sl_manager import SLManager
+
+
+class TestGlobalRPCLimiter(unittest.TestCase):
+    """Test cases for GlobalRPCLimiter."""
+
+    def setUp(self):
+        """Set up test fixtures (clock frozen so buckets do not refill)."""
+        patcher = patch('risk.rpc_rate_limiter.time.monotonic', return_value=1000.0)
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limiter = GlobalRPCLimiter(max_per_second=3, critical_burst=2)
+
+    def test_normal_updates_queue_when_empty(self):
+        for ticket in (1, 2, 3):
+            self.assertEqual(self.limiter.admit(RPCClass.NORMAL, ticket), (True, 0.0))
+        self.assertEqual(self.limiter.admit(RPCClass.NORMAL, 4), (False, 0.0))
+        self.assertEqual(self.limiter.queue_depth(), 1)
+
+    def test_critical_always_admitted_with_backoff(self):
+        """Critical classes bypass the limit; bursts per class get backoff."""
+        for _ in range(5):
+            self.limiter.admit(RPCClass.NORMAL, 9)
+        self.assertEqual(self.limiter.admit(RPCClass.EMERGENCY, 1), (True, 0.0))
+        self.assertEqual(self.limiter.admit(RPCClass.EMERGENCY, 2), (True, 0.0))
+        allowed, backoff = self.limiter.admit(RPCClass.EMERGENCY, 3)
+        self.assertTrue(allowed)
+        self.assertGreater(backoff, 0.0)
+        # Another class has its own burst
+        self.assertEqual(self.limiter.admit(RPCClass.TRAILING, 4), (True, 0.0))
+
+    def test_coalescing_and_priority_drain(self):
+        for ticket in (1, 2, 3):
+            self.limiter.admit(RPCClass.NORMAL, ticket)
+        self.limiter.admit(RPCClass.NORMAL, 10, position={'v': 1})
+        self.limiter.admit(RPCClass.NORMAL, 11, position={'v': 1})
+        self.limiter.admit(RPCClass.NORMAL, 11, position={'v': 2})  # Coalesced
+        self.limiter._enqueue(12, RPCClass.PROFIT_LOCK, {'v': 3}, None, 1000.0)
+        self.assertEqual(self.limiter.queue_depth(), 3)
+        self.assertEqual(self.limiter.drain(), [])  # No tokens yet
+        self.clock.return_value = 1001.0
+        drained = self.limiter.drain()
+        self.assertEqual([t for t, _, _ in drained], [12, 10, 11])
+        self.assertEqual(drained[2][2], {'v': 2})
+        # Granted tickets are admitted without charging again
+        self.assertEqual(self.limiter.admit(RPCClass.NORMAL, 11), (True, 0.0))
+        self.assertEqual(self.limiter.get_stats()['coalesced'], 1)
+
+    def test_drain_symbol_filter_keeps_other_symbols_queued(self):
+        """A shard drains its own symbols; other symbols keep their queue slot."""
+        for ticket in (1, 2, 3):
+            self.limiter.admit(RPCClass.NORMAL, ticket)
+        self.limiter.admit(RPCClass.NORMAL, 10, symbol='EURUSDm')
+        self.limiter.admit(RPCClass.NORMAL, 11, position={'symbol': 'XAUUSDm'})
+        self.clock.return_value = 1001.0
+        drained = self.limiter.drain(symbol_filter=lambda symbol: symbol == 'XAUUSDm')
+        self.assertEqual([t for t, _, _ in drained], [11])
+        self.assertEqual(self.limiter.queue_depth(), 1)
+        self.assertEqual([t for t, _, _ in self.limiter.drain()], [10])
+
+    def test_classify(self):
+        self.assertEqual(GlobalRPCLimiter.classify(consecutive_failures=2), RPCClass.EMERGENCY)
+        self.assertEqual(GlobalRPCLimiter.classify(is_first_eligible=True), RPCClass.PROFIT_LOCK)
+        self.assertEqual(GlobalRPCLimiter.classify(is_trailing=True), RPCClass.TRAILING)
+        self.assertEqual(GlobalRPCLimiter.classify(), RPCClass.NORMAL)
+
+
+class TestSLManagerRPCDrain(unittest.TestCase):
+    """SLManager dispatches queued updates with the latest position data."""
+
+    def test_drain_dispatches_open_positions_only(self):
+        order_manager = Mock()
+        order_manager.get_open_positions.return_value = []
+        sl_manager = SLManager({'execution': {'global_rpc_max_per_second': 1}}, Mock(), order_manager)
+        sl_manager._check_global_rpc_rate_limit(ticket=1)
+        self.assertFalse(sl_manager._check_global_rpc_rate_limit(ticket=2, position={'ticket': 2})[0])
+        self.assertFalse(sl_manager._check_global_rpc_rate_limit(ticket=3, position={'ticket': 3})[0])
+        sl_manager._rpc_limiter._global.tokens = 2.0
+        sl_manager.update_sl_atomic = Mock(return_value=(True, 'ok'))
+        results = sl_manager._drain_rpc_queue([{'ticket': 2, 'profit': 0.5}])
+        self.assertEqual(results, {2: (True, 'ok')})
+        sl_manager.update_sl_atomic.assert_called_once_with(2, {'ticket': 2, 'profit': 0.5})
+        self.assertEqual(sl_manager._rpc_limiter.get_stats()['granted'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
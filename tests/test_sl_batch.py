@@ -0,0 +1,134 @@
+"""
+Test for the batched authoritative SL computation.
+
+Verifies that compute_sl_targets() matches the per-position SLLadder results
+and that SLManager.compute_authoritative_sl_batch() returns the same result
+dicts as the scalar compute_authoritative_sl() path.
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.sl_batch import (AUTHORITY_HARD, AUTHORITY_NONE, AUTHORITY_PROFIT_LOCK, AUTHORITY_TRAILING,
+                           AUTHORITY_VIOLATION, PositionColumns, compute_sl_targets, rung_table)
+from risk.sl_ladder import SLLadder
+from risk.sl_manager import SLManager
+
+
+INCREMENT = 0.10
+MAX_RUNGS = 500
+SYMBOL_INFO = {'point': 0.00001, 'digits': 5, 'trade_tick_value': 1.0, 'contract_size': 100000,
+               'trade_stops_level': 0}
+
+
+def make_ladder(order_type, entry, volume=0.01):
+    usd_per_price = volume * SYMBOL_INFO['trade_tick_value'] / SYMBOL_INFO['point']
+    return SLLadder(1, 'EURUSDm', order_type, entry, volume, SYMBOL_INFO['point'], SYMBOL_INFO['digits'],
+                    (), usd_per_price, INCREMENT, MAX_RUNGS)
+
+
+def make_columns(rows, bid, ask):
+    """rows: (order_type, entry, current_sl, profit)"""
+    ladders = [make_ladder(order_type, entry) for order_type, entry, _, _ in rows]
+    n = len(rows)
+    return ladders, PositionColumns(
+        range(1, n + 1), [1.0 if r[0] == 'BUY' else -1.0 for r in rows], [r[1] for r in rows],
+        [0.01] * n, [r[2] for r in rows], [r[3] for r in rows], [bid] * n, [ask] * n,
+        [SYMBOL_INFO['point']] * n, [SYMBOL_INFO['digits']] * n, [0] * n,
+        [l.usd_per_price for l in ladders], [len(l.locks) for l in ladders], [True] * n)
+
+
+class TestComputeSLTargets(unittest.TestCase):
+    """Test cases for compute_sl_targets."""
+
+    def setUp(self):
+        self.thresholds, self.locks = rung_table(INCREMENT, MAX_RUNGS)
+
+    def _targets(self, cols, **kwargs):
+        return compute_sl_targets(cols, INCREMENT, self.thresholds, self.locks, 0.03, 0.10, 2.0, **kwargs)
+
+    def test_rung_table_matches_ladder(self):
+        ladder = make_ladder('BUY', 1.10000)
+        n = len(ladder.locks)
+        np.testing.assert_allclose(self.thresholds[:n], ladder.thresholds)
+        np.testing.assert_allclose(self.locks[:n], ladder.locks)
+
+    def test_trailing_matches_ladder(self):
+        rows = [('BUY', 1.10000, 0.0, p) for p in (0.15, 0.21, 0.47, 1.33)] + \
+               [('SELL', 1.10000, 0.0, p) for p in (0.15, 0.21, 0.47, 1.33)]
+        ladders, cols = make_columns(rows, 1.10200, 1.10202)
+        targets = self._targets(cols)
+        for i, (ladder, row) in enumerate(zip(ladders, rows)):
+            lock, price = ladder.trailing_sl(row[3], 1.10200, 1.10202)
+            self.assertEqual(targets.authority[i], AUTHORITY_TRAILING)
+            self.assertAlmostEqual(targets.target_profit[i], lock)
+            if row[0] == 'BUY':
+                self.assertAlmostEqual(targets.target_sl[i], price)
+
+    def test_sweet_spot_hard_and_violation(self):
+        rows = [('BUY', 1.10000, 0.0, 0.05), ('BUY', 1.10000, 0.0, -0.50),
+                ('BUY', 1.10000, 0.0, -2.50), ('BUY', 1.10000, 0.0, 0.01)]
+        ladders, cols = make_columns(rows, 1.09990, 1.09992)
+        targets = self._targets(cols)
+        self.assertEqual(list(targets.authority),
+                         [AUTHORITY_PROFIT_LOCK, AUTHORITY_HARD, AUTHORITY_VIOLATION, AUTHORITY_NONE])
+        self.assertAlmostEqual(targets.target_sl[1], ladders[1].sl_for_profit(-2.0, 1.09990, 1.09992))
+        self.assertTrue(targets.must_close[2])
+        self.assertTrue(np.isnan(targets.target_sl[2]))
+        self.assertFalse(targets.scalar.any())
+
+    def test_scalar_rows(self):
+        rows = [('BUY', 1.10000, 0.0, 0.05), ('BUY', 1.10000, 0.0, 10_000.0)]
+        _, cols = make_columns(rows, 1.10000, 1.10002)
+        targets = self._targets(cols, profit_lock_scalar=True)
+        # Sweet spot goes to the ProfitLockingEngine, profit past the top rung to the full calculation
+        self.assertEqual(list(targets.scalar), [True, True])
+
+    def test_current_sl_never_loosened(self):
+        rows = [('BUY', 1.10000, 1.10100, 0.15), ('SELL', 1.10300, 1.10250, 0.15)]
+        _, cols = make_columns(rows, 1.10200, 1.10202)
+        targets = self._targets(cols)
+        self.assertEqual(list(targets.target_sl), [1.10100, 1.10250])
+        self.assertFalse(targets.regression.any())
+
+
+class TestSLManagerBatch(unittest.TestCase):
+    """Test cases for SLManager.compute_authoritative_sl_batch."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config = {'risk': {'max_risk_per_trade_usd': 2.0}}
+        self.mt5_connector = Mock()
+        self.mt5_connector.get_symbol_info.return_value = dict(SYMBOL_INFO)
+        self.mt5_connector.get_symbol_info_tick.return_value = Mock(bid=1.10200, ask=1.10202)
+        self.sl_manager = SLManager(self.config, self.mt5_connector, Mock())
+
+    def test_batch_matches_scalar(self):
+        positions = [
+            {'ticket': 1, 'symbol': 'EURUSDm', 'type': 'BUY', 'price_open': 1.10000, 'volume': 0.01,
+             'sl': 0.0, 'profit': 0.27, 'price_current': 1.10200},
+            {'ticket': 2, 'symbol': 'EURUSDm', 'type': 'SELL', 'price_open': 1.10300, 'volume': 0.01,
+             'sl': 0.0, 'profit': -1.00, 'price_current': 1.10202},
+            {'ticket': 3, 'symbol': 'EURUSDm', 'type': 'BUY', 'price_open': 1.10150, 'volume': 0.01,
+             'sl': 0.0, 'profit': 0.05, 'price_current': 1.10200},
+        ]
+        batch = self.sl_manager.compute_authoritative_sl_batch([dict(p) for p in positions])
+        scalar = [self.sl_manager._compute_authoritative_sl_scalar(dict(p)) for p in positions]
+        self.assertEqual(len(batch), len(scalar))
+        for b, s in zip(batch, scalar):
+            self.assertEqual(b['authority_source'], s['authority_source'])
+            self.assertEqual(b['state'], s['state'])
+            self.assertEqual(b['reason'], s['reason'])
+            self.assertAlmostEqual(b['target_sl_price'], s['target_sl_price'])
+            self.assertAlmostEqual(b['target_profit_usd'], s['target_profit_usd'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Test for the SL worker dirty-set tracker.
+
+Verifies that unchanged positions are skipped and that price moves, rung or
+profit-zone changes, SL / volume changes, failures and the full sweep mark a
+position dirty again.
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.sl_dirty_tracker import SLDirtyTracker
+from risk.sl_ladder import SLLadder
+from risk.sl_manager import SLManager
+
+
+class TestSLDirtyTracker(unittest.TestCase):
+    """Test cases for SLDirtyTracker."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tracker = SLDirtyTracker(price_delta_points=5, full_sweep_interval_seconds=1.0,
+                                      zone_boundaries=(-2.0, 0.0, 0.03, 0.10))
+        self.ladder = SLLadder(1001, 'EURUSDm', 'BUY', 1.10000, 0.01, 0.00001, 5, (), 1000.0, 0.10, 50)
+        self.position = {'ticket': 1001, 'symbol': 'EURUSDm', 'price_current': 1.10050,
+                         'profit': 0.50, 'sl': 1.09800, 'volume': 0.01}
+        self.tracker.mark_evaluated(self.position, True, self.ladder, now=100.0)
+
+    def test_unchanged_position_is_clean(self):
+        self.assertFalse(self.tracker.is_dirty(dict(self.position), self.ladder, now=100.5))
+        self.assertTrue(self.tracker.is_dirty({'ticket': 2002}, now=100.5))  # Never evaluated
+        stats = self.tracker.get_stats()
+        self.assertEqual((stats['evaluated'], stats['skipped']), (1, 1))
+
+    def test_price_move_threshold(self):
+        """Moves up to price_delta_points stay clean; larger moves are dirty."""
+        position = dict(self.position, price_current=1.10054)
+        self.assertFalse(self.tracker.is_dirty(position, self.ladder, now=100.5))
+        position['price_current'] = 1.10060
+        self.assertTrue(self.tracker.is_dirty(position, self.ladder, now=100.5))
+        # Without a ladder any move is dirty
+        self.assertTrue(self.tracker.is_dirty(dict(self.position, price_current=1.10051), now=100.5))
+
+    def test_rung_zone_sl_and_volume_changes(self):
+        self.assertTrue(self.tracker.is_dirty(dict(self.position, profit=0.61), self.ladder, now=100.5))
+        self.assertTrue(self.tracker.is_dirty(dict(self.position, sl=1.09900), self.ladder, now=100.5))
+        self.assertTrue(self.tracker.is_dirty(dict(self.position, volume=0.02), self.ladder, now=100.5))
+        self.tracker.mark_evaluated(dict(self.position, profit=0.05), True, now=100.0)
+        self.assertTrue(self.tracker.is_dirty(dict(self.position, profit=-0.01), now=100.5))
+
+    def test_failure_and_full_sweep(self):
+        self.assertTrue(self.tracker.is_dirty(dict(self.position), self.ladder, now=101.0))
+        self.tracker.mark_evaluated(self.position, False, self.ladder, now=100.0)
+        self.assertTrue(self.tracker.is_dirty(dict(self.position), self.ladder, now=100.1))
+        self.tracker.forget(1001)
+        self.assertEqual(self.tracker.get_stats()['tracked'], 0)
+
+    def test_sl_manager_wiring(self):
+        """SLManager builds the tracker from config and forgets closed tickets."""
+        order_manager = Mock()
+        order_manager.get_open_positions.return_value = []
+        config = {'risk': {'sl_dirty_set': {'price_delta_points': 3, 'full_sweep_interval_seconds': 2.0}}}
+        sl_manager = SLManager(config, Mock(), order_manager)
+        tracker = sl_manager._sl_dirty_tracker
+        self.assertEqual((tracker.price_delta_points, tracker.full_sweep_interval), (3, 2.0))
+        tracker.mark_evaluated(self.position, True)
+        sl_manager.cleanup_closed_position(1001)
+        self.assertEqual(tracker.get_stats()['tracked'], 0)
+        self.assertIn('dirty_set', sl_manager.get_timing_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Test for the per-position SL ladder.
+
+Verifies that ladder SL prices match SLManager._calculate_target_sl_price(),
+the trailing rung thresholds, and rebuilds on volume / specification changes.
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.sl_manager import SLManager
+from risk.sl_ladder import SLLadder
+
+
+def make_tick(bid, ask):
+    tick = Mock()
+    tick.bid = bid
+    tick.ask = ask
+    return tick
+
+
+class TestSLLadder(unittest.TestCase):
+    """Test cases for SLLadder."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config = {
+            'risk': {
+                'max_risk_per_trade_usd': 2.0,
+                'trailing_stop_increment_usd': 0.10,
+                'profit_locking': {
+                    'min_profit_threshold_usd': 0.03,
+                    'max_profit_threshold_usd': 0.10
+                }
+            }
+        }
+        self.mt5_connector = Mock()
+        self.order_manager = Mock()
+        self.order_manager.get_open_positions.return_value = []
+        self.sl_manager = SLManager(self.config, self.mt5_connector, self.order_manager)
+        self.symbols = {
+            'EURUSDm': {'name': 'EURUSDm', 'point': 0.00001, 'digits': 5, 'contract_size': 100000,
+                        'trade_tick_value': None},
+            'USOILm': {'name': 'USOILm', 'point': 0.001, 'digits': 3, 'contract_size': 1000,
+                       'trade_tick_value': 1.0},
+        }
+        self.mt5_connector.get_symbol_info.side_effect = lambda symbol, **kw: self.symbols.get(symbol)
+
+    def _position(self, symbol, order_type, entry, volume=0.01, profit=0.0):
+        return {'ticket': 1001, 'symbol': symbol, 'type': order_type, 'price_open': entry,
+                'volume': volume, 'profit': profit, 'sl': 0.0, 'price_current': entry}
+
+    def test_prices_match_full_calculation(self):
+        """Rung, sweet-spot and hard-SL prices equal the full calculation."""
+        cases = (('EURUSDm', 'BUY', 1.10020, 1.10000, 1.10020),
+                 ('EURUSDm', 'SELL', 1.10000, 1.10000, 1.10020),
+                 ('EURUSDm', 'BUY', 1.10000, 1.10000, 1.10020),  # BID-side BUY entry
+                 ('USOILm', 'SELL', 75.250, 75.250, 75.280))
+        for symbol, order_type, entry, bid, ask in cases:
+            self.mt5_connector.get_symbol_info_tick.return_value = make_tick(bid, ask)
+            position = self._position(symbol, order_type, entry)
+            symbol_info = self.symbols[symbol]
+            ladder = self.sl_manager._get_sl_ladder(position, symbol_info)
+            self.assertIsNotNone(ladder)
+            for profit in (0.15, 0.35, 1.27, 4.0):
+                lock, sl = ladder.trailing_sl(profit, bid, ask)
+                expected = self.sl_manager._calculate_target_sl_price(entry, lock, order_type, 0.01, symbol_info)
+                self.assertAlmostEqual(sl, expected, places=9, msg=f"{symbol} {order_type} {profit}")
+            for target in (0.07, -2.0):
+                expected = self.sl_manager._calculate_target_sl_price(entry, target, order_type, 0.01, symbol_info)
+                self.assertAlmostEqual(ladder.sl_for_profit(target, bid, ask), expected, places=9)
+
+    def test_trailing_rungs(self):
+        """Locked profit trails one increment behind, in whole increments."""
+        ladder = SLLadder(1, 'EURUSDm', 'BUY', 1.1, 0.01, 0.00001, 5, (), 1000.0, 0.10, 50)
+        self.assertIsNone(ladder.trailing_lock(0.10))
+        self.assertEqual(ladder.trailing_lock(0.11)[1], 0.1)
+        self.assertEqual(ladder.trailing_lock(0.29)[1], 0.1)
+        self.assertEqual(ladder.trailing_lock(0.30)[1], 0.2)
+        self.assertEqual(ladder.trailing_lock(1.05)[1], 0.9)
+        self.assertIsNone(ladder.trailing_lock(100.0))  # Beyond the top rung
+
+    def test_rebuilt_on_volume_or_spec_change(self):
+        position = self._position('EURUSDm', 'BUY', 1.10020)
+        ladder = self.sl_manager._get_sl_ladder(position, self.symbols['EURUSDm'])
+        self.assertIs(self.sl_manager._get_sl_ladder(position, self.symbols['EURUSDm']), ladder)
+        position['volume'] = 0.02
+        rebuilt = self.sl_manager._get_sl_ladder(position, self.symbols['EURUSDm'])
+        self.assertIsNot(rebuilt, ladder)
+        self.assertAlmostEqual(rebuilt.usd_per_price, 2 * ladder.usd_per_price)
+        self.sl_manager.cleanup_closed_position(1001)
+        self.assertNotIn(1001, self.sl_manager._sl_ladders)
+
+    def test_reverse_engineered_symbols_use_full_calculation(self):
+        """Crypto/index symbols without trade_tick_value get no ladder."""
+        symbol_info = {'name': 'BTCUSDm', 'point': 0.01, 'digits': 2, 'contract_size': 1.0,
+                       'trade_tick_value': None}
+        position = self._position('BTCUSDm', 'BUY', 65000.0)
+        self.assertIsNone(self.sl_manager._get_sl_ladder(position, symbol_info))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Test for the last-writer-wins SL modify queue.
+
+Verifies that callers arriving while a modify is in flight join it or
+coalesce into one pending target, that neither the pending target nor a
+stale caller can loosen the SL, that each caller gets its own target's result,
+and that completion listeners see every modify sent.
+"""
+
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.sl_modify_queue import SLModifyQueue, is_at_least_as_protective
+
+
+class TestSLModifyQueue(unittest.TestCase):
+    """Test cases for SLModifyQueue."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.queue = SLModifyQueue(wait_timeout_seconds=5.0)
+        self.sent = []
+        self.completed = []
+        self.release = threading.Event()
+        self.queue.add_listener(lambda ticket, target, success: self.completed.append((ticket, target, success)))
+
+    def _execute(self, sl_price):
+        self.sent.append(sl_price)
+        self.release.wait(5.0)
+        return True
+
+    def _submit_async(self, target, results, order_type='BUY'):
+        index = len(results)
+        results.append(None)
+
+        def run():
+            results[index] = self.queue.submit(1001, order_type, target, self._execute, point=0.00001)
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    def _wait_for(self, predicate):
+        deadline = time.time() + 5.0
+        while not predicate() and time.time() < deadline:
+            time.sleep(0.005)
+
+    def test_coalescing_while_in_flight(self):
+        results = []
+        threads = [self._submit_async(1.10010, results)]
+        self._wait_for(lambda: self.queue.in_flight(1001) is not None)
+        threads.append(self._submit_async(1.10010, results))  # Joins the in-flight modify
+        threads.append(self._submit_async(1.10020, results))  # Becomes pending
+        self._wait_for(lambda: self.queue.get_stats()['submitted'] == 3)
+        threads.append(self._submit_async(1.10015, results))  # Looser than pending - ignored
+        threads.append(self._submit_async(1.10030, results))  # Tighter - replaces pending
+        self._wait_for(lambda: self.queue.get_stats()['submitted'] == 5)
+        self.release.set()
+        for thread in threads:
+            thread.join(5.0)
+
+        self.assertEqual(self.sent, [1.10010, 1.10030])
+        self.assertEqual(results[0], (True, 1.10010))  # Sender reports its own target
+        self.assertEqual(results[1], (True, 1.10010))  # Joined the in-flight modify
+        self.assertEqual(results[2:], [(True, 1.10030)] * 3)
+        self.assertEqual([target for _, target, _ in self.completed], [1.10010, 1.10030])
+        stats = self.queue.get_stats()
+        self.assertEqual((stats['sent'], stats['modifies_saved'], stats['active_tickets']), (2, 3, 0))
+
+    def test_stale_target_never_sent_after_tighter_in_flight(self):
+        results = []
+        threads = [self._submit_async(1.10100, results)]
+        self._wait_for(lambda: self.queue.in_flight(1001) is not None)
+        threads.append(self._submit_async(1.10050, results))  # Stale: looser than the in-flight SL
+        self._wait_for(lambda: self.queue.get_stats()['submitted'] == 2)
+        self.release.set()
+        for thread in threads:
+            thread.join(5.0)
+
+        self.assertEqual(self.sent, [1.10100])
+        self.assertEqual(results, [(True, 1.10100), (True, 1.10100)])
+        self.assertEqual(self.queue.get_stats()['regressions_ignored'], 1)
+
+    def test_stale_sell_target_dropped_with_pending(self):
+        results = []
+        threads = [self._submit_async(1.20100, results, order_type='SELL')]
+        self._wait_for(lambda: self.queue.in_flight(1001) is not None)
+        threads.append(self._submit_async(1.20050, results, order_type='SELL'))  # Tighter - pending
+        self._wait_for(lambda: self.queue.get_stats()['submitted'] == 2)
+        threads.append(self._submit_async(1.20150, results, order_type='SELL'))  # Looser than in-flight
+        self._wait_for(lambda: self.queue.get_stats()['submitted'] == 3)
+        self.release.set()
+        for thread in threads:
+            thread.join(5.0)
+
+        self.assertEqual(self.sent, [1.20100, 1.20050])
+        self.assertEqual(results, [(True, 1.20100), (True, 1.20050), (True, 1.20100)])
+
+    def test_idle_submit_sends_immediately(self):
+        self.release.set()
+        self.assertEqual(self.queue.submit(7, 'SELL', 1.2, self._execute), (True, 1.2))
+        self.assertIsNone(self.queue.in_flight(7))
+
+    def test_failed_modify_is_reported(self):
+        self.assertEqual(self.queue.submit(7, 'SELL', 1.2, lambda sl: False), (False, 1.2))
+        self.assertEqual(self.queue.submit(8, 'SELL', 1.2, lambda sl: 1 / 0), (False, 1.2))
+
+    def test_protective_ordering(self):
+        self.assertTrue(is_at_least_as_protective(1.1, 1.0, 'BUY'))
+        self.assertFalse(is_at_least_as_protective(1.0, 1.1, 'BUY'))
+        self.assertTrue(is_at_least_as_protective(1.0, 1.1, 'SELL'))
+        self.assertTrue(is_at_least_as_protective(1.0, 0.0, 'SELL'))
+
+
+if __name__ == '__main__':
+    unittest.main()
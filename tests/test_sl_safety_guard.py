@@ -0,0 +1,61 @@
+"""
+Test for the SL safety guard's broker confirmation of SL=0.0 violations.
+
+Verifies that a failed fresh read keeps the snapshot violations and that only
+a successful read can drop a ticket as closed.
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.position_table import PositionTable
+from monitor.sl_safety_guard import SLSafetyGuard
+
+
+def _violation(ticket):
+    return {'ticket': ticket, 'symbol': 'EURUSDm', 'sl': 0.0, 'position': {'ticket': ticket}}
+
+
+def _table(rows, exclusions=None):
+    columns = {name: [row[name] for row in rows] for name in
+               ('ticket', 'symbol', 'type', 'volume', 'price_open', 'price_current',
+                'sl', 'tp', 'profit', 'swap', 'time', 'comment')}
+    return PositionTable(columns, exclusions)
+
+
+def _row(ticket, sl):
+    return {'ticket': ticket, 'symbol': 'EURUSDm', 'type': 'BUY', 'volume': 0.01,
+            'price_open': 1.1, 'price_current': 1.1, 'sl': sl, 'tp': 0.0,
+            'profit': 0.0, 'swap': 0.0, 'time': 1700000000, 'comment': ''}
+
+
+class TestSLSafetyGuardConfirm(unittest.TestCase):
+    """Test cases for SLSafetyGuard._confirm_violations()."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.order_manager = Mock()
+        self.guard = SLSafetyGuard(self.order_manager, Mock(), Mock())
+
+    def test_failed_read_keeps_violations(self):
+        self.order_manager.get_position_table.return_value = None
+        violations = [_violation(1), _violation(2)]
+        self.assertEqual(self.guard._confirm_violations(violations), violations)
+        self.order_manager.get_open_positions.assert_not_called()
+
+    def test_successful_read_confirms_and_drops(self):
+        # 1 still SL=0.0, 2 got its SL, 3 closed, 4 excluded from the default view but open
+        self.order_manager.get_position_table.return_value = _table(
+            [_row(1, 0.0), _row(2, 1.09), _row(4, 0.0)], exclusions={4: 'old position'})
+        confirmed = self.guard._confirm_violations([_violation(t) for t in (1, 2, 3, 4)])
+        self.assertEqual([v['ticket'] for v in confirmed], [1, 4])
+        self.assertEqual(confirmed[0]['position']['sl'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
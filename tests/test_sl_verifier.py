@@ -0,0 +1,220 @@
+"""
+Test for deferred SL verification.
+
+Verifies that expected SLs are confirmed, flagged or timed out against later
+position snapshots, that SLManager no longer sleeps after a modify, and that
+a failed or partial read never counts a position as closed, and that the
+SL recorded after a modify is the one actually sent, and concurrent modifies
+for one ticket coalesce instead of queueing on the ticket lock.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.sl_verifier import DeferredSLVerifier
+from risk.sl_manager import SLManager
+from monitor.sl_watchdog import SLWatchdog
+
+
+def make_position(ticket, sl, order_type='BUY'):
+    return {'ticket': ticket, 'symbol': 'EURUSDm', 'type': order_type, 'sl': sl}
+
+
+class TestDeferredSLVerifier(unittest.TestCase):
+    """Test cases for DeferredSLVerifier."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mismatches = []
+        self.verifier = DeferredSLVerifier(
+            settle_seconds=0.5, timeout_seconds=5.0,
+            on_mismatch=lambda *args: self.mismatches.append(args))
+
+    def test_confirmed_by_later_snapshot(self):
+        self.verifier.expect(1, 'EURUSDm', 1.10000, 0.0001, order_type='BUY', submitted_at=100.0)
+        outcome = self.verifier.check_positions([make_position(1, 1.10005)], captured_at=100.1)
+        self.assertEqual(outcome['confirmed'], 1)
+        self.assertFalse(self.verifier.is_pending(1))
+
+    def test_snapshot_before_modify_is_ignored(self):
+        self.verifier.expect(1, 'EURUSDm', 1.10000, 0.0001, submitted_at=100.0)
+        self.verifier.check_positions([make_position(1, 1.09000)], captured_at=99.9)
+        self.assertTrue(self.verifier.is_pending(1))
+        self.assertEqual(self.mismatches, [])
+
+    def test_mismatch_only_after_settle_time(self):
+        """A differing SL is tolerated until the broker had settle_seconds to apply it."""
+        self.verifier.expect(1, 'EURUSDm', 1.10000, 0.0001, order_type='BUY', submitted_at=100.0)
+        self.verifier.check_positions([make_position(1, 1.09000)], captured_at=100.2)
+        self.assertTrue(self.verifier.is_pending(1))
+        self.verifier.check_positions([make_position(1, 1.09000)], captured_at=100.6)
+        self.assertFalse(self.verifier.is_pending(1))
+        self.assertEqual(self.mismatches, [(1, 'EURUSDm', 1.10000, 1.09000)])
+
+    def test_more_protective_sl_confirms(self):
+        self.verifier.expect(1, 'EURUSDm', 1.10000, 0.0001, order_type='BUY', submitted_at=100.0)
+        self.verifier.expect(2, 'EURUSDm', 1.10000, 0.0001, order_type='SELL', submitted_at=100.0)
+        outcome = self.verifier.check_positions([make_position(1, 1.10100), make_position(2, 1.09900, 'SELL')],
+                                                captured_at=101.0)
+        self.assertEqual(outcome['confirmed'], 2)
+
+    def test_closed_and_timed_out(self):
+        self.verifier.expect(1, 'EURUSDm', 1.10000, 0.0001, submitted_at=100.0)
+        self.verifier.check_positions([], captured_at=100.1)
+        self.assertFalse(self.verifier.is_pending(1))
+
+        self.verifier.expect(2, 'EURUSDm', 1.10000, 0.0001)
+        self.assertEqual(self.verifier.expire(now=self.verifier.timeout_seconds + 1e12), 1)
+        timeouts = self.verifier.pop_timeouts()
+        self.assertEqual([entry['ticket'] for entry in timeouts], [2])
+        self.assertEqual(self.verifier.pop_timeouts(), [])
+        stats = self.verifier.get_stats()
+        self.assertEqual((stats['closed'], stats['timed_out'], stats['pending']), (1, 1, 0))
+
+
+class TestSLManagerDeferredVerification(unittest.TestCase):
+    """Integration with SLManager and SLWatchdog."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config = {'risk': {'max_risk_per_trade_usd': 2.0}}
+        self.mt5_connector = Mock()
+        self.mt5_connector.get_symbol_info.return_value = {'point': 0.00001}
+        self.order_manager = Mock()
+        self.order_manager.get_open_positions.return_value = []
+        self.sl_manager = SLManager(self.config, self.mt5_connector, self.order_manager)
+
+    def test_modify_records_expectation_without_sleeping(self):
+        with patch('risk.sl_manager.time.sleep') as sleep:
+            self.sl_manager._expect_sl_applied(1001, 'EURUSDm', 'BUY', 1.10000)
+        sleep.assert_not_called()
+        self.order_manager.get_position_by_ticket.assert_not_called()
+        self.assertTrue(self.sl_manager._sl_verifier.is_pending(1001))
+
+    def test_mismatch_marks_ticket_for_retry(self):
+        verifier = self.sl_manager._sl_verifier
+        verifier.expect(1001, 'EURUSDm', 1.10000, 0.0001, order_type='BUY', submitted_at=100.0)
+        self.sl_manager._check_sl_verifications([make_position(1001, 1.09000)], 101.0)
+        self.assertEqual(self.sl_manager._consecutive_failures[1001], 1)
+        self.assertIn('mismatch', self.sl_manager._last_sl_reason[1001])
+
+    def test_empty_read_resolves_nothing(self):
+        verifier = self.sl_manager._sl_verifier
+        now = time.time()
+        verifier.expect(1001, 'EURUSDm', 1.10000, 0.0001, order_type='BUY', submitted_at=now)
+        self.sl_manager._check_sl_verifications([], now + 0.1)  # Failed fetch (snapshot bus off)
+        self.assertTrue(verifier.is_pending(1001))
+
+    def test_excluded_position_is_not_treated_as_closed(self):
+        verifier = self.sl_manager._sl_verifier
+        verifier.expect(1001, 'EURUSDm', 1.10000, 0.0001, order_type='BUY', submitted_at=100.0)
+        # 1001 is a Dec 8 / old position: missing from the default read, listed with exclude_dec8=False
+        self.order_manager.get_open_positions.return_value = [make_position(1001, 1.10000),
+                                                              make_position(2002, 1.20000)]
+        self.sl_manager._check_sl_verifications([make_position(2002, 1.20000)], 101.0)
+        self.order_manager.get_open_positions.assert_called_with(exclude_dec8=False)
+        self.assertTrue(verifier.is_pending(1001))
+
+        self.order_manager.get_open_positions.return_value = [make_position(2002, 1.20000)]
+        self.sl_manager._check_sl_verifications([make_position(2002, 1.20000)], 101.0)
+        self.assertFalse(verifier.is_pending(1001))  # Closed
+
+    def test_blocked_update_releases_ticket_lock(self):
+        """A delta-blocked update (e.g. right after a modify recorded _last_sl_price) frees the lock."""
+        position = {'ticket': 1001, 'symbol': 'EURUSDm', 'type': 'BUY', 'price_open': 1.10000,
+                    'sl': 1.09000, 'volume': 0.01, 'profit': 0.05}
+        self.order_manager.get_position_by_ticket.return_value = dict(position)
+        authoritative = {'target_sl_price': 1.10010, 'target_profit_usd': 0.01, 'reason': 'Test',
+                         'authority_source': 'TEST', 'state': 'MANAGING'}
+        with patch.object(self.sl_manager, 'compute_authoritative_sl', return_value=authoritative), \
+                patch.object(self.sl_manager, '_check_global_rpc_rate_limit', return_value=(True, 0.0)), \
+                patch.object(self.sl_manager, '_prepare_sl_update',
+                             return_value=(False, 'DELTA_TOO_SMALL', None)):
+            result = self.sl_manager.update_sl_atomic(1001, dict(position))
+        self.assertEqual(result, (False, 'DELTA_TOO_SMALL'))
+        self.assertNotIn(1001, self.sl_manager._lock_holders)
+
+        # RLock is reentrant for this thread, so probe it from another one
+        acquired = []
+        lock = self.sl_manager._get_ticket_lock(1001)
+
+        def probe():
+            acquired.append(lock.acquire(blocking=False))
+            if acquired[-1]:
+                lock.release()
+
+        prober = threading.Thread(target=probe)
+        prober.start()
+        prober.join()
+        self.assertEqual(acquired, [True])
+
+    def test_standard_update_records_sent_sl(self):
+        """_last_sl_price holds the broker-adjusted SL that was sent, not the raw target."""
+        position = {'ticket': 1001, 'symbol': 'EURUSDm', 'type': 'BUY', 'price_open': 1.10000,
+                    'sl': 1.09000, 'volume': 0.01, 'profit': 0.05}
+        self.order_manager.get_position_by_ticket.return_value = dict(position)
+        authoritative = {'target_sl_price': 1.10010, 'target_profit_usd': 0.01, 'reason': 'Test',
+                         'authority_source': 'TEST', 'state': 'MANAGING'}
+        with patch.object(self.sl_manager, 'compute_authoritative_sl', return_value=authoritative), \
+                patch.object(self.sl_manager, '_check_global_rpc_rate_limit', return_value=(True, 0.0)), \
+                patch.object(self.sl_manager, '_prepare_sl_update', return_value=(True, None, 1.10004)), \
+                patch.object(self.sl_manager, '_modify_sl_under_lock', return_value=True), \
+                patch.object(self.sl_manager, '_expect_sl_applied'):
+            success, _ = self.sl_manager.update_sl_atomic(1001, dict(position))
+        self.assertTrue(success)
+        self.assertEqual(self.sl_manager._last_sl_price[1001], 1.10004)
+
+    def test_concurrent_updates_coalesce_without_ticket_lock(self):
+        """A second caller joins the in-flight modify instead of waiting on the ticket lock."""
+        position = {'ticket': 1001, 'symbol': 'EURUSDm', 'type': 'BUY', 'price_open': 1.10000,
+                    'sl': 1.09000, 'volume': 0.01, 'profit': 0.05}
+        self.order_manager.get_position_by_ticket.return_value = dict(position)
+        authoritative = {'target_sl_price': 1.10010, 'target_profit_usd': 0.01, 'reason': 'Test',
+                         'authority_source': 'TEST', 'state': 'MANAGING'}
+        lock = self.sl_manager._get_ticket_lock(1001)
+        started, release = threading.Event(), threading.Event()
+        owners = []
+
+        def slow_modify(ticket, symbol, sl_price):
+            owners.append(lock._is_owned())
+            started.set()
+            release.wait(2.0)
+            return True
+
+        results = []
+        with patch.object(self.sl_manager, 'compute_authoritative_sl', return_value=authoritative), \
+                patch.object(self.sl_manager, '_check_global_rpc_rate_limit', return_value=(True, 0.0)), \
+                patch.object(self.sl_manager, '_prepare_sl_update', return_value=(True, None, 1.10004)), \
+                patch.object(self.sl_manager, '_execute_sl_modify_only', side_effect=slow_modify), \
+                patch.object(self.sl_manager, '_expect_sl_applied'):
+            callers = [threading.Thread(target=lambda: results.append(
+                self.sl_manager.update_sl_atomic(1001, dict(position)))) for _ in range(2)]
+            callers[0].start()
+            self.assertTrue(started.wait(2.0))
+            callers[1].start()
+            time.sleep(0.05)
+            release.set()
+            for caller in callers:
+                caller.join(5.0)
+        self.assertEqual(owners, [True])  # One modify, sent while its own thread held the lock
+        self.assertEqual([success for success, _ in results], [True, True])
+        self.assertEqual(self.sl_manager._sl_modify_queue.get_stats()['joined_in_flight'], 1)
+        self.assertNotIn(1001, self.sl_manager._lock_holders)
+
+    def test_watchdog_collects_timeouts(self):
+        watchdog = SLWatchdog(self.sl_manager)
+        self.sl_manager._sl_verifier.expect(1001, 'EURUSDm', 1.10000, 0.0001, submitted_at=0.0)
+        watchdog._check_sl_verification_timeouts()
+        self.assertEqual(watchdog.sl_verification_timeouts_total, 1)
+        self.assertFalse(self.sl_manager._sl_verifier.is_pending(1001))
+
+
+if __name__ == '__main__':
+    unittest.main()
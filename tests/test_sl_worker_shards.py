@@ -0,0 +1,105 @@
+"""
+Test for the sharded SL worker.
+
+Verifies that symbols map to one stable shard, that each shard only sees its
+own positions, and that SLManager / SLWatchdog start, report and restart
+shards individually.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.sl_worker_shards import SLWorkerShard, symbol_shard
+from risk.sl_manager import SLManager
+from monitor.sl_watchdog import SLWatchdog
+from utils import system_health
+
+
+SYMBOLS = ['EURUSDm', 'GBPUSDm', 'XAUUSDm', 'BTCUSDm', 'US30m', 'USDJPYm', 'DE30m', 'AUDUSDm']
+
+
+class TestSymbolPartition(unittest.TestCase):
+    """Test cases for symbol_shard and SLWorkerShard."""
+
+    def test_partition_is_deterministic_and_complete(self):
+        shards = [SLWorkerShard(index, 4) for index in range(4)]
+        positions = [{'ticket': i, 'symbol': symbol} for i, symbol in enumerate(SYMBOLS)]
+        selected = [shard.select(positions) for shard in shards]
+        # Every position belongs to exactly one shard
+        self.assertEqual(sorted(p['ticket'] for part in selected for p in part), list(range(len(SYMBOLS))))
+        for symbol in SYMBOLS:
+            self.assertEqual(symbol_shard(symbol, 4), symbol_shard(symbol, 4))
+            self.assertEqual([shard.owns(symbol) for shard in shards].count(True), 1)
+
+    def test_single_shard_keeps_legacy_name(self):
+        shard = SLWorkerShard(0, 1)
+        self.assertEqual(shard.name, 'SLWorker')
+        self.assertFalse(shard.is_sharded)
+        positions = [{'ticket': 1, 'symbol': 'EURUSDm'}]
+        self.assertIs(shard.select(positions), positions)
+        self.assertEqual(SLWorkerShard(2, 3).name, 'SLWorker-2')
+
+
+class TestSLManagerShards(unittest.TestCase):
+    """SLManager shard lifecycle and SLWatchdog monitoring."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.config = {'risk': {'max_risk_per_trade_usd': 2.0}, 'execution': {'sl_worker': {'shards': 3}}}
+        self.order_manager = Mock()
+        self.order_manager.get_open_positions.return_value = []
+        self.sl_manager = SLManager(self.config, Mock(), self.order_manager)
+
+    def tearDown(self):
+        self.sl_manager.stop_sl_worker()
+
+    def test_start_registers_one_thread_per_shard(self):
+        self.sl_manager.start_sl_worker()
+        status = self.sl_manager.get_worker_status()['worker_shards']
+        self.assertEqual([s['name'] for s in status], ['SLWorker-0', 'SLWorker-1', 'SLWorker-2'])
+        self.assertTrue(all(s['thread_alive'] for s in status))
+        self.assertIn('SLWorker-1', system_health.get_health_snapshot())
+        self.sl_manager.stop_sl_worker()
+        self.assertNotIn('SLWorker-1', system_health.get_health_snapshot())
+
+    def test_watchdog_restarts_only_dead_shard(self):
+        self.sl_manager.start_sl_worker()
+        shards = self.sl_manager._sl_worker_shards
+        other_threads = [shards[0].thread, shards[2].thread]
+        is_alive = SLWorkerShard.is_alive
+        with patch.object(SLWorkerShard, 'is_alive', autospec=True,
+                          side_effect=lambda shard: shard is not shards[1] and is_alive(shard)):
+            watchdog = SLWatchdog(self.sl_manager)
+            with patch.object(self.sl_manager, '_start_sl_worker_shard') as start:
+                watchdog._check_worker_shards(self.sl_manager.get_worker_status()['worker_shards'])
+        start.assert_called_once_with(shards[1])
+        self.assertEqual(shards[1].restarts, 1)
+        self.assertEqual([shards[0].thread, shards[2].thread], other_threads)
+
+    def test_primary_queues_housekeeping_when_its_partition_is_empty(self):
+        self.sl_manager._sl_worker_interval = 0.0
+        self.sl_manager._sl_worker_running = True
+        # Both symbols hash to shard 1 of 2 - shard 0 owns no open position
+        positions = [{'ticket': 1, 'symbol': 'EURUSD'}, {'ticket': 2, 'symbol': 'XAUUSD'}]
+        shard = SLWorkerShard(0, 2)
+        self.assertEqual(shard.select(positions), [])
+
+        def read_once(order_manager, consumer):
+            self.sl_manager._sl_worker_running = False
+            return positions
+
+        with patch('risk.sl_manager.read_open_positions', side_effect=read_once), \
+                patch.object(self.sl_manager._background_tasks, 'submit') as submit:
+            self.sl_manager._sl_worker_loop(shard)
+
+        self.assertEqual([c.args[0] for c in submit.call_args_list], ['fail_safe_check', 'check_stale_locks'])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Test for the tiered symbol info cache in MT5Connector.get_symbol_info().
+
+Verifies that specifications are loaded once per session, quotes are refreshed
+from symbol_info_tick on their own TTL, tick value / margin / swaps on a slower
+cadence, and invalidation / reconnect reload the specification.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution.mt5_connector import MT5Connector
+
+
+def make_symbol_info(bid=1.1000, ask=1.1002, tick_value=1.0, quote_time=None):
+    info = Mock()
+    info.name = 'EURUSDm'
+    info.bid = bid
+    info.ask = ask
+    info.spread = 20
+    info.time = quote_time if quote_time is not None else time.time()
+    info.point = 0.00001
+    info.digits = 5
+    info.trade_mode = 4
+    info.trade_stops_level = 0
+    info.trade_freeze_level = 0
+    info.trade_contract_size = 100000
+    info.trade_tick_value = tick_value
+    info.trade_tick_size = 0.00001
+    info.margin_initial = 0.0
+    info.swap_mode = 0
+    info.swap_long = 0.0
+    info.swap_short = 0.0
+    info.volume_min = 0.01
+    info.volume_max = 100.0
+    info.volume_step = 0.01
+    info.filling_mode = 2
+    return info
+
+
+def make_tick(bid=1.1000, ask=1.1002, quote_time=None):
+    tick = Mock()
+    tick.bid = bid
+    tick.ask = ask
+    tick.time = quote_time if quote_time is not None else time.time()
+    return tick
+
+
+class TestSymbolInfoCache(unittest.TestCase):
+    """Test cases for the symbol spec / quote cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.connector = MT5Connector({'mt5': {'io_executor': {'enabled': False}}})
+        self.connector.connected = True
+        patcher = patch('execution.mt5_connector.mt5')
+        self.mock_mt5 = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_mt5.terminal_info.return_value = Mock()
+        self.mock_mt5.symbol_info.return_value = make_symbol_info()
+        self.mock_mt5.symbol_info_tick.return_value = make_tick()
+
+    def test_first_call_loads_spec(self):
+        info = self.connector.get_symbol_info('EURUSDm')
+        self.assertEqual(info['contract_size'], 100000)
+        self.assertEqual(info['bid'], 1.1000)
+        self.assertEqual(info['spread'], 20)
+        self.assertEqual(self.mock_mt5.symbol_info.call_count, 1)
+
+    def test_expired_quote_reads_tick_only(self):
+        """After the quote TTL prices come from symbol_info_tick; spec and tick value are reused."""
+        self.connector.get_symbol_info('EURUSDm')
+        self.mock_mt5.symbol_info.return_value = make_symbol_info(tick_value=0.92)
+        self.mock_mt5.symbol_info_tick.return_value = make_tick(1.1010, 1.1013)
+        with patch('execution.mt5_connector.time.time', return_value=time.time() + 6):
+            info = self.connector.get_symbol_info('EURUSDm')
+        self.assertEqual(self.mock_mt5.symbol_info.call_count, 1)
+        self.assertEqual(self.mock_mt5.symbol_info_tick.call_count, 2)
+        self.assertEqual((info['bid'], info['ask'], info['spread']), (1.1010, 1.1013, 30))
+        self.assertEqual(info['trade_tick_value'], 1.0)
+        self.assertEqual(info['volume_step'], 0.01)
+
+    def test_expired_rates_refresh_valuation(self):
+        """Tick value, margin and swaps are re-read after symbol_rate_max_age_seconds; the spec is reused."""
+        self.connector.get_symbol_info('EURUSDm')
+        self.mock_mt5.symbol_info.return_value = make_symbol_info(tick_value=0.92)
+        with patch('execution.mt5_connector.time.time', return_value=time.time() + 61):
+            info = self.connector.get_symbol_info('EURUSDm')
+        self.assertEqual(self.mock_mt5.symbol_info.call_count, 2)
+        stats = self.connector.get_symbol_cache_stats()
+        self.assertEqual((stats['spec_loads'], stats['rate_loads']), (1, 2))
+        self.assertEqual(info['trade_tick_value'], 0.92)
+
+    def test_tick_read_feeds_quote_cache(self):
+        self.connector.get_symbol_info('EURUSDm')
+        self.mock_mt5.symbol_info_tick.return_value = make_tick(1.1020, 1.1021)
+        self.connector.get_symbol_info_tick('EURUSDm')
+        info = self.connector.get_symbol_info('EURUSDm')
+        self.assertEqual(info['bid'], 1.1020)
+        self.assertEqual(self.mock_mt5.symbol_info_tick.call_count, 2)
+
+    def test_fresh_quote_is_a_hit(self):
+        first = self.connector.get_symbol_info('EURUSDm')
+        second = self.connector.get_symbol_info('EURUSDm')
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)  # Callers get their own dict
+        self.assertEqual(self.connector.get_symbol_cache_stats()['hits'], 1)
+
+    def test_stale_price_rejected_for_orders(self):
+        self.connector.get_symbol_info('EURUSDm')
+        self.mock_mt5.symbol_info_tick.return_value = make_tick(1.1010, 1.1013, quote_time=time.time() - 30)
+        with patch('execution.mt5_connector.time.time', return_value=time.time() + 3):
+            self.assertIsNone(self.connector.get_symbol_info('EURUSDm', check_price_staleness=True))
+
+    def test_invalidate_reloads_spec(self):
+        self.connector.get_symbol_info('EURUSDm')
+        self.connector.invalidate_symbol_info('EURUSDm')
+        self.connector.get_symbol_info('EURUSDm')
+        self.assertEqual(self.mock_mt5.symbol_info.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Test for the consolidated per-ticket state table used by SLManager.
+
+Verifies dict-compatible field views, atomic removal of every field, tombstone
+handling for late writes, SLManager cleanup, and that a failed broker read
+never tombstones live tickets during reconciliation.
+"""
+
+import time
+import unittest
+from unittest.mock import Mock, patch
+from datetime import datetime
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk.ticket_state import TicketStateTable
+from risk.sl_manager import SLManager
+from bot.trading_bot import TradingBot
+
+
+class TestTicketStateTable(unittest.TestCase):
+    """Test cases for TicketStateTable and TicketFieldView."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.table = TicketStateTable(tombstone_limit=2)
+        self.last_update = self.table.field('last_sl_update')
+        self.failures = self.table.field('consecutive_failures', int)
+
+    def test_field_view_behaves_like_dict(self):
+        self.last_update[1] = 'a'
+        self.last_update[2] = 'b'
+        self.assertIn(1, self.last_update)
+        self.assertNotIn(3, self.last_update)
+        self.assertEqual(self.last_update.get(3, 'x'), 'x')
+        self.assertEqual(self.last_update.copy(), {1: 'a', 2: 'b'})
+        del self.last_update[1]
+        self.assertEqual(dict(self.last_update), {2: 'b'})
+        self.assertEqual(self.last_update.pop(2), 'b')
+        self.assertEqual(len(self.last_update), 0)
+        with self.assertRaises(KeyError):
+            self.last_update[1]
+
+    def test_default_factory(self):
+        """Views with a default factory behave like defaultdict(int)."""
+        self.failures[7] += 1
+        self.failures[7] += 1
+        self.assertEqual(self.failures[7], 2)
+        self.assertEqual(self.failures.get(8, 0), 0)
+
+    def test_remove_drops_all_fields_and_absorbs_late_writes(self):
+        self.last_update[1] = 'a'
+        self.failures[1] += 1
+        removed = self.table.remove(1)
+        self.assertEqual(removed.to_dict(), {'last_sl_update': 'a', 'consecutive_failures': 1})
+        self.assertNotIn(1, self.last_update)
+        self.assertNotIn(1, self.failures)
+        # A late write lands on the tombstone, not in the live map
+        self.last_update[1] = 'late'
+        self.assertEqual(self.last_update[1], 'late')
+        self.assertEqual(list(self.last_update), [])
+        self.assertTrue(self.table.is_closed(1))
+        self.assertEqual(self.table.get_stats()['live'], 0)
+
+    def test_tombstones_are_bounded(self):
+        for ticket in (1, 2, 3):
+            self.table.remove(ticket)
+        self.assertEqual(self.table.get_stats()['tombstones'], 2)
+        self.assertFalse(self.table.is_closed(1))
+
+    def test_prune(self):
+        for ticket in (1, 2, 3):
+            self.last_update[ticket] = ticket
+        self.assertEqual(sorted(self.table.prune({2})), [1, 3])
+        self.assertEqual(self.table.tickets(), [2])
+
+    def test_prune_keeps_tickets_created_after_the_read(self):
+        self.last_update[1] = 'closed'
+        read_at = time.time()
+        self.table.get(1).created_at = read_at - 1.0
+        self.last_update[2] = 'opened after the read'
+        self.table.get(2).created_at = read_at + 1.0
+
+        self.assertEqual(self.table.prune(set(), as_of=read_at), [1])
+        self.assertEqual(list(self.last_update), [2])
+        self.assertFalse(self.table.is_closed(2))
+
+
+class TestSLManagerTicketState(unittest.TestCase):
+    """SLManager per-ticket attributes share one state record."""
+
+    def test_cleanup_closed_position_removes_everything(self):
+        order_manager = Mock()
+        order_manager.get_open_positions.return_value = []
+        sl_manager = SLManager({'risk': {}}, Mock(), order_manager)
+        sl_manager._last_sl_attempt[1001] = datetime.now()
+        sl_manager._last_sl_success[1001] = datetime.now()
+        sl_manager._consecutive_failures[1001] += 1
+        sl_manager._ticket_circuit_breaker[1001] = 0.0
+        sl_manager._profit_zone_entry[1001] = {'entry_time': datetime.now(), 'symbol': 'EURUSDm',
+                                               'sl_updated': True, 'update_attempts': 1}
+        self.assertEqual(sl_manager._ticket_states.tickets(), [1001])
+        sl_manager.cleanup_closed_position(1001)
+        self.assertEqual(sl_manager._ticket_states.get_stats()['live'], 0)
+        self.assertEqual(dict(sl_manager._consecutive_failures), {})
+        self.assertEqual(sl_manager._last_sl_success.copy(), {})
+
+
+class TestReconciliationTicketState(unittest.TestCase):
+    """Periodic reconciliation and SLManager ticket state."""
+
+    def setUp(self):
+        """Set up a bot with only the reconciliation state."""
+        logger_patch = patch('bot.trading_bot.logger')
+        logger_patch.start()
+        self.addCleanup(logger_patch.stop)
+        self.order_manager = Mock()
+        self.sl_manager = SLManager({'risk': {'max_risk_per_trade_usd': 2.0}}, Mock(), self.order_manager)
+        self.bot = TradingBot.__new__(TradingBot)
+        self.bot.order_manager = self.order_manager
+        self.bot.risk_manager = Mock(sl_manager=self.sl_manager)
+        self.bot.position_monitor = Mock()
+        self.bot.tracked_tickets = {1001}
+        self.sl_manager._last_sl_reason[1001] = 'Initial'
+
+    def test_failed_read_keeps_tracked_tickets(self):
+        self.order_manager.get_position_table.return_value = None
+        result = self.bot._reconcile_positions_periodic()
+        self.assertEqual(result['orphaned'], 0)
+        self.assertIn('error', result)
+        self.assertEqual(self.bot.tracked_tickets, {1001})
+        self.assertIn(1001, self.sl_manager._ticket_states.tickets())
+        self.order_manager.get_open_positions.assert_not_called()
+
+    def test_closed_ticket_is_cleaned_up(self):
+        self.order_manager.get_position_table.return_value.as_dicts.return_value = []
+        self.assertEqual(self.bot._reconcile_positions_periodic()['orphaned'], 1)
+        self.assertEqual(self.bot.tracked_tickets, set())
+        self.assertNotIn(1001, self.sl_manager._ticket_states.tickets())
+
+
+if __name__ == '__main__':
+    unittest.main()
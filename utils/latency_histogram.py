@@ -0,0 +1,281 @@
+"""
+Streaming Latency Histograms
+Fixed-memory latency distributions with HDR-style log-linear buckets.
+
+SLManager timing stats kept raw latency lists and sorted them on every read.
+StreamingHistogram records a value in O(1) into a fixed set of buckets:
+
+- values are tracked in microseconds; below 2^SUB_BUCKET_BITS every value has
+  its own bucket, above it each power of two is split into 2^(SUB_BUCKET_BITS-1)
+  linear sub-buckets (relative error < 1/64 with 7 bits)
+- values past the top bucket (~268s) are clamped into it
+- windowed views (1m / 5m / 1h by default) are kept as running dense totals;
+  recording adds to every window, and SLOT_SECONDS-long slots are subtracted
+  again once they fall out of a window
+- reads scan the fixed bucket array (cost independent of the sample count) and
+  are cached until the next record or slot rotation
+
+HistogramSnapshot is an immutable copy that can be merged with other snapshots
+(e.g. across shards or metrics) before computing percentiles. The MT5 RPC
+metrics (execution/mt5_metrics.py) and the lock profiler use the same histogram.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+MAX_SHIFT = 21  # Top bucket ends at SUB_BUCKET_COUNT << MAX_SHIFT microseconds (~268s)
+BUCKET_COUNT = SUB_BUCKET_COUNT + MAX_SHIFT * SUB_BUCKET_HALF
+
+SLOT_SECONDS = 5.0
+DEFAULT_WINDOWS: Tuple[Tuple[str, float], ...] = (('1m', 60.0), ('5m', 300.0), ('1h', 3600.0))
+
+
+def bucket_index(value_us: int) -> int:
+    """Bucket holding a value in microseconds."""
+    if value_us < SUB_BUCKET_COUNT:
+        return max(0, value_us)
+    shift = value_us.bit_length() - SUB_BUCKET_BITS
+    if shift > MAX_SHIFT:
+        return BUCKET_COUNT - 1
+    return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (value_us >> shift) - SUB_BUCKET_HALF
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """[low, high) bounds of a bucket in microseconds."""
+    if index < SUB_BUCKET_COUNT:
+        return index, index + 1
+    shift = (index - SUB_BUCKET_COUNT) // SUB_BUCKET_HALF + 1
+    mantissa = (index - SUB_BUCKET_COUNT) % SUB_BUCKET_HALF + SUB_BUCKET_HALF
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+def _bucket_value_ms(index: int) -> float:
+    """Representative value of a bucket (midpoint) in milliseconds."""
+    low, high = bucket_bounds(index)
+    return (low + high - 1) / 2000.0
+
+
+class HistogramSnapshot:
+    """Point-in-time copy of a latency distribution (mergeable)."""
+
+    __slots__ = ('counts', 'count', 'total_ms', 'min_ms', 'max_ms')
+
+    def __init__(self, counts: Optional[List[int]] = None, count: int = 0, total_ms: float = 0.0,
+                 min_ms: Optional[float] = None, max_ms: float = 0.0):
+        self.counts = counts if counts is not None else [0] * BUCKET_COUNT
+        self.count = count
+        self.total_ms = total_ms
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+
+    def merge(self, other: 'HistogramSnapshot') -> 'HistogramSnapshot':
+        """New snapshot holding the samples of both."""
+        if other.min_ms is None:
+            min_ms = self.min_ms
+        elif self.min_ms is None:
+            min_ms = other.min_ms
+        else:
+            min_ms = min(self.min_ms, other.min_ms)
+        return HistogramSnapshot([a + b for a, b in zip(self.counts, other.counts)],
+                                 self.count + other.count, self.total_ms + other.total_ms,
+                                 min_ms, max(self.max_ms, other.max_ms))
+
+    def percentiles(self, *pcts: float) -> List[float]:
+        """Values at the given percentiles (one pass over the buckets, capped at the max)."""
+        if self.count == 0:
+            return [0.0] * len(pcts)
+        ranks = sorted((max(1, int(round(self.count * pct / 100.0))), i) for i, pct in enumerate(pcts))
+        values = [0.0] * len(pcts)
+        seen = 0
+        r = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            while r < len(ranks) and seen >= ranks[r][0]:
+                values[ranks[r][1]] = min(_bucket_value_ms(index), self.max_ms)
+                r += 1
+            if r == len(ranks):
+                break
+        for rank, i in ranks[r:]:
+            values[i] = self.max_ms
+        return values
+
+    def percentile(self, pct: float) -> float:
+        return self.percentiles(pct)[0]
+
+    def bucket_counts(self, bounds_ms: Sequence[float]) -> List[int]:
+        """Sample counts per coarse bucket (<= bounds_ms[i], plus one open-ended bucket)."""
+        counts = [0] * (len(bounds_ms) + 1)
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                counts[bisect.bisect_left(bounds_ms, _bucket_value_ms(index))] += bucket_count
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary in the get_timing_stats() format (values in ms)."""
+        median, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            'count': self.count,
+            'min': round(self.min_ms or 0.0, 3),
+            'max': round(self.max_ms, 3),
+            'avg': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'median': round(median, 3),
+            'p95': round(p95, 3),
+            'p99': round(p99, 3),
+        }
+
+
+class _Slot:
+    """Samples recorded during one SLOT_SECONDS interval (sparse)."""
+
+    __slots__ = ('slot_id', 'counts', 'count', 'total_ms')
+
+    def __init__(self, slot_id: int):
+        self.slot_id = slot_id
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+
+
+class _Window:
+    """Running dense totals over the most recent slots."""
+
+    __slots__ = ('name', 'slot_count', 'slots', 'counts', 'count', 'total_ms')
+
+    def __init__(self, name: str, seconds: float):
+        self.name = name
+        self.slot_count = max(1, int(round(seconds / SLOT_SECONDS)))
+        self.slots: Deque[_Slot] = deque()
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ms = 0.0
+
+    def expire(self, current_slot_id: int):
+        while self.slots and self.slots[0].slot_id <= current_slot_id - self.slot_count:
+            slot = self.slots.popleft()
+            for index, n in slot.counts.items():
+                self.counts[index] -= n
+            self.count -= slot.count
+            self.total_ms -= slot.total_ms
+        if not self.count:
+            self.total_ms = 0.0  # Drop float drift once the window is empty
+
+
+class StreamingHistogram:
+    """Thread-safe latency histogram with lifetime and windowed views."""
+
+    def __init__(self, windows: Tuple[Tuple[str, float], ...] = DEFAULT_WINDOWS):
+        """
+        Initialize the histogram.
+
+        Args:
+            windows: (name, seconds) of the windowed views
+        """
+        self._lock = threading.Lock()
+        self._lifetime = HistogramSnapshot()
+        self._windows = [_Window(name, seconds) for name, seconds in windows]
+        self._current: Optional[_Slot] = None
+        self._version = 0
+        self._cache: Dict[Optional[str], Tuple[int, Dict[str, Any]]] = {}
+
+    def _advance(self, now: float) -> _Slot:
+        slot_id = int(now // SLOT_SECONDS)
+        current = self._current
+        if current is None or current.slot_id < slot_id:  # Late timestamps stay in the current slot
+            current = self._current = _Slot(slot_id)
+            for window in self._windows:
+                window.slots.append(current)
+                window.expire(slot_id)
+            self._version += 1
+        return current
+
+    def record(self, value_ms: float, now: Optional[float] = None):
+        """Record one latency in milliseconds."""
+        value_ms = max(0.0, value_ms)
+        index = bucket_index(int(value_ms * 1000.0))
+        with self._lock:
+            slot = self._advance(now if now is not None else time.time())
+            slot.counts[index] = slot.counts.get(index, 0) + 1
+            slot.count += 1
+            slot.total_ms += value_ms
+            for window in self._windows:
+                window.counts[index] += 1
+                window.count += 1
+                window.total_ms += value_ms
+            lifetime = self._lifetime
+            lifetime.counts[index] += 1
+            lifetime.count += 1
+            lifetime.total_ms += value_ms
+            if lifetime.min_ms is None or value_ms < lifetime.min_ms:
+                lifetime.min_ms = value_ms
+            if value_ms > lifetime.max_ms:
+                lifetime.max_ms = value_ms
+            self._version += 1
+
+    @property
+    def count(self) -> int:
+        return self._lifetime.count
+
+    @property
+    def window_names(self) -> List[str]:
+        return [window.name for window in self._windows]
+
+    def snapshot(self, window: Optional[str] = None, now: Optional[float] = None) -> HistogramSnapshot:
+        """
+        Copy of the lifetime distribution, or of a windowed view.
+
+        Window min/max are bucket bounds (the exact values are only kept for the lifetime view).
+        """
+        with self._lock:
+            return self._snapshot_locked(window, now if now is not None else time.time())
+
+    def _snapshot_locked(self, window: Optional[str], now: float) -> HistogramSnapshot:
+        lifetime = self._lifetime
+        if window is None:
+            return HistogramSnapshot(list(lifetime.counts), lifetime.count, lifetime.total_ms,
+                                     lifetime.min_ms, lifetime.max_ms)
+        self._advance(now)
+        for view in self._windows:
+            if view.name == window:
+                break
+        else:
+            raise KeyError(window)
+        if not view.count:
+            return HistogramSnapshot()
+        nonzero = [index for index, n in enumerate(view.counts) if n]
+        min_ms = max(bucket_bounds(nonzero[0])[0] / 1000.0, lifetime.min_ms or 0.0)
+        max_ms = min(bucket_bounds(nonzero[-1])[1] / 1000.0, lifetime.max_ms)
+        return HistogramSnapshot(list(view.counts), view.count, view.total_ms, min_ms, max_ms)
+
+    def summary(self, window: Optional[str] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        """to_dict() of snapshot(window), cached until the distribution changes."""
+        with self._lock:
+            if window is not None:
+                self._advance(now if now is not None else time.time())
+            cached = self._cache.get(window)
+            if cached is not None and cached[0] == self._version:
+                return dict(cached[1])
+            summary = self._snapshot_locked(window, now if now is not None else time.time()).to_dict()
+            self._cache[window] = (self._version, summary)
+            return dict(summary)
+
+    def get_stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Lifetime summary with a 'windows' entry per windowed view."""
+        stats = self.summary(now=now)
+        stats['windows'] = {name: self.summary(name, now=now) for name in self.window_names}
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._lifetime = HistogramSnapshot()
+            self._windows = [_Window(window.name, window.slot_count * SLOT_SECONDS) for window in self._windows]
+            self._current = None
+            self._version += 1
+            self._cache.clear()
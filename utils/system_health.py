@@ -14,7 +14,7 @@ import os
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 from utils.logger_factory import get_logger, get_system_event_logger
 
@@ -47,6 +47,12 @@ _heartbeat_interval_seconds: float = 5.0
 _system_ready_logged: bool = False
 _trading_blocked: bool = False
 
+# Subsystem metrics exposed through get_health_snapshot() (e.g. MT5 RPC latency)
+_metrics_sources: Dict[str, Callable[[], Dict[str, object]]] = {}
+_metrics_summaries: Dict[str, Callable[[], List[str]]] = {}
+_metrics_dump_interval_seconds: float = 60.0
+_last_metrics_dump_ts: float = time.time()
+
 # Use logger factory to write to system_startup.log (same as TradingBot logger)
 def _get_system_health_logger():
     """Get logger that writes to system_startup.log for consistency"""
@@ -102,6 +108,8 @@ def _run_heartbeat_cycle() -> None:
     """
     global _system_ready_logged, _trading_blocked
 
+    _dump_metrics_if_due()
+
     with _lock:
         now = time.time()
         all_started = True
@@ -219,6 +227,27 @@ def register_critical_thread(
     _ensure_heartbeat_thread_running()
 
 
+def add_critical_thread(name: str) -> None:
+    """
+    Add a critical thread name at runtime (e.g. SL worker shards SLWorker-<n>).
+
+    The thread then gates trading like the built-in critical threads until
+    remove_critical_thread() is called.
+    """
+    with _lock:
+        if name in _CRITICAL_THREADS:
+            return
+        _CRITICAL_THREADS.add(name)
+        _thread_states[name] = ThreadHealthState(name=name)
+
+
+def remove_critical_thread(name: str) -> None:
+    """Stop tracking a thread added with add_critical_thread() (clean shutdown)."""
+    with _lock:
+        _CRITICAL_THREADS.discard(name)
+        _thread_states.pop(name, None)
+
+
 def mark_thread_started(name: str) -> None:
     """Mark a critical thread as started."""
     if name not in _CRITICAL_THREADS:
@@ -368,10 +397,53 @@ def reset_thread_dead_flag(name: str) -> None:
             # when all threads are detected as alive again
 
 
+def register_metrics_source(
+    name: str,
+    provider: Callable[[], Dict[str, object]],
+    summary: Optional[Callable[[], List[str]]] = None,
+) -> None:
+    """
+    Expose subsystem metrics through get_health_snapshot().
+
+    The provider's snapshot appears under `name` next to the thread states. If
+    `summary` is given, its log lines are written by the heartbeat monitor every
+    _metrics_dump_interval_seconds.
+    """
+    with _lock:
+        _metrics_sources[name] = provider
+        if summary is not None:
+            _metrics_summaries[name] = summary
+        else:
+            _metrics_summaries.pop(name, None)
+
+
+def _dump_metrics_if_due() -> None:
+    """Write registered metrics summaries to the system log (rate-limited)."""
+    global _last_metrics_dump_ts
+    now = time.time()
+    with _lock:
+        if now - _last_metrics_dump_ts < _metrics_dump_interval_seconds:
+            return
+        _last_metrics_dump_ts = now
+        summaries = list(_metrics_summaries.items())
+
+    for name, summary in summaries:
+        try:
+            for line in summary():
+                _logger.info(line)
+        except Exception as e:  # pragma: no cover - defensive logging only
+            _logger.debug(f"Error dumping metrics for {name}: {e}")
+
+
 def get_health_snapshot() -> Dict[str, Dict[str, object]]:
-    """Return a snapshot of current thread health state (for debugging / tests)."""
+    """
+    Return a snapshot of current thread health state (for debugging / tests).
+
+    Registered metrics sources (see register_metrics_source) are included under
+    their own names, e.g. snapshot["mt5_rpc"].
+    """
     with _lock:
-        return {
+        snapshot = {
             name: {
                 "started": state.started,
                 "dead": state.dead,
@@ -380,5 +452,13 @@ def get_health_snapshot() -> Dict[str, Dict[str, object]]:
             }
             for name, state in _thread_states.items()
         }
+        sources = list(_metrics_sources.items())
+
+    for name, provider in sources:
+        try:
+            snapshot[name] = provider()
+        except Exception as e:  # pragma: no cover - defensive logging only
+            _logger.debug(f"Error in metrics source {name}: {e}")
+    return snapshot
 
 
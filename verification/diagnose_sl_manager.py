@@ -113,14 +113,14 @@ def diagnose_sl_manager():
     diagnostics['ticket_diagnostics'] = ticket_diagnostics
     
     # Global RPC rate limit status
-    with sl_manager._global_rpc_lock:
-        current_time = time.time()
-        recent_timestamps = [ts for ts in sl_manager._global_rpc_timestamps if current_time - ts < 1.0]
-        diagnostics['global_rpc_rate_limit'] = {
-            'recent_updates_last_second': len(recent_timestamps),
-            'max_allowed': sl_manager._global_rpc_max_per_second,
-            'is_at_limit': len(recent_timestamps) >= sl_manager._global_rpc_max_per_second,
-        }
+    limiter_stats = sl_manager._rpc_limiter.get_stats()
+    diagnostics['global_rpc_rate_limit'] = {
+        'tokens_available': limiter_stats['tokens'],
+        'max_allowed': sl_manager._global_rpc_max_per_second,
+        'is_at_limit': limiter_stats['tokens'] < 1.0,
+        'queue_depth': limiter_stats['queue_depth'],
+        'classes': limiter_stats['classes'],
+    }
     
     # Lock contention stats
     lock_stats = {}
@@ -131,14 +131,15 @@ def diagnose_sl_manager():
             }
     
     diagnostics['lock_stats'] = lock_stats
+    diagnostics['lock_contention'] = sl_manager.get_lock_contention_report()
     
     # Timing stats
     timing_stats = sl_manager.get_timing_stats()
     diagnostics['timing_stats'] = timing_stats
     
-    # Contract size cache
-    with sl_manager._contract_size_lock:
-        diagnostics['contract_size_cache'] = dict(sl_manager._contract_size_cache)
+    # Contract size calibrations
+    diagnostics['contract_size_cache'] = sl_manager._calibration_store.records()
+    diagnostics['contract_calibration_stats'] = sl_manager._calibration_store.get_stats()
     
     # Error occurrence metrics
     diagnostics['error_occurrence_metrics'] = dict(sl_manager._error_occurrence_metrics)